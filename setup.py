@@ -120,6 +120,7 @@ setup(
                             'yggtime_os=yggdrasil.command_line:yggtime_os',
                             'yggtime_py=yggdrasil.command_line:yggtime_py',
                             'yggtime_paper=yggdrasil.command_line:yggtime_paper',
+                            'yggtime_micro=yggdrasil.command_line:yggtime_micro',
                             'yggvalidate=yggdrasil.command_line:validate_yaml',
                             'ygginstall=yggdrasil.command_line:ygginstall',
                             'yggclean=yggdrasil.command_line:yggclean',
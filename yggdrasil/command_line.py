@@ -186,12 +186,51 @@ def yggrun():
     parser = argparse.ArgumentParser(description='Run an integration.')
     parser.add_argument('yamlfile', nargs='+',
                         help='One or more yaml specification files.')
+    parser.add_argument('--connection-task-method',
+                        choices=['thread', 'process', 'reactor', 'pool'],
+                        default='thread',
+                        help=('Method used to run connections. \'reactor\' '
+                              'runs all connections as coroutines on a '
+                              'shared event loop.'))
+    parser.add_argument('--connection-reactors', type=int, default=1,
+                        help=('Number of event loops that connections are '
+                              'distributed between if '
+                              '--connection-task-method is \'reactor\'.'))
+    parser.add_argument('--connection-workers', type=int, default=None,
+                        help=('Number of worker processes that connections '
+                              'are distributed between if '
+                              '--connection-task-method is \'pool\'. '
+                              'Defaults to the number of CPUs.'))
+    parser.add_argument('--ensemble', action='store_true',
+                        help=('Treat the YAML file as the specification '
+                              'of an ensemble of runs of an integration.'))
+    parser.add_argument('--ensemble-concurrency', type=int, default=None,
+                        help=('Maximum number of ensemble members that '
+                              'should be run at once. Defaults to the value '
+                              'in the ensemble specification or the number '
+                              'of CPUs.'))
     config.get_config_parser(parser, skip_sections='testing')
     args = parser.parse_args()
     prog = sys.argv[0].split(os.path.sep)[-1]
+    kwargs = dict(ygg_debug_prefix=prog,
+                  production_run=args.production_run,
+                  connection_task_method=args.connection_task_method,
+                  connection_reactors=args.connection_reactors,
+                  connection_workers=args.connection_workers)
     with config.parser_config(args):
-        runner.run(args.yamlfile, ygg_debug_prefix=prog,
-                   production_run=args.production_run)
+        if args.ensemble:
+            from yggdrasil import ensemble
+            if len(args.yamlfile) != 1:
+                parser.error("--ensemble requires exactly one ensemble "
+                             "specification.")
+            x = ensemble.YggEnsemble(args.yamlfile[0],
+                                     concurrency=args.ensemble_concurrency,
+                                     **kwargs)
+            x.run()
+            if x.error_flag:
+                sys.exit(1)
+        else:
+            runner.run(args.yamlfile, **kwargs)
 
 
 def yggclean():
@@ -331,12 +370,14 @@ def regen_metaschema():
     
 
 def regen_schema():
-    r"""Regenerate the yggdrasil schema."""
-    from yggdrasil import schema
+    r"""Regenerate the yggdrasil schema and component manifest."""
+    from yggdrasil import schema, components
     if os.path.isfile(schema._schema_fname):
         os.remove(schema._schema_fname)
     schema.clear_schema()
     schema.init_schema()
+    components.save_manifest()
+    components.clear_manifest()
 
 
 def validate_yaml():
@@ -430,6 +471,51 @@ def yggtime_py():
     timing.plot_scalings(compare='python')
 
 
+def yggtime_micro():
+    r"""Time comm and serializer operations in-process and check for
+    regressions against a baseline."""
+    from yggdrasil import timing
+    parser = argparse.ArgumentParser(
+        description=('Time comm send/recv, serialization, and datatype '
+                     'encoding in-process and compare to a baseline.'))
+    parser.add_argument('--output', default='microbench.json',
+                        help='pyperf JSON file that results are saved to.')
+    parser.add_argument('--baseline', default=timing._micro_baseline,
+                        help='pyperf JSON file containing baseline results.')
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help=('Fractional slowdown relative to the baseline '
+                              'that is considered a regression.'))
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Overwrite the baseline with the new results.')
+    parser.add_argument('--targets', nargs='+', default=None,
+                        choices=timing._micro_targets,
+                        help='Operations that should be timed.')
+    parser.add_argument('--datatypes', nargs='+', default=None,
+                        choices=timing._micro_datatypes,
+                        help='Message datatypes that should be timed.')
+    parser.add_argument('--sizes', nargs='+', type=int, default=None,
+                        help='Message sizes (in bytes) that should be timed.')
+    parser.add_argument('--comms', nargs='+', default=None,
+                        help='Communication types that should be timed.')
+    parser.add_argument('--nrep', type=int, default=5,
+                        help='Number of values recorded for each benchmark.')
+    parser.add_argument('--loops', type=int, default=10,
+                        help='Number of operations timed for each value.')
+    args = parser.parse_args()
+    if args.update_baseline:
+        args.output = args.baseline
+    results = timing.run_microbenchmarks(
+        filename=args.output, targets=args.targets, datatypes=args.datatypes,
+        sizes=args.sizes, comms=args.comms, nrep=args.nrep, loops=args.loops,
+        overwrite=True)
+    if args.update_baseline or (not os.path.isfile(args.baseline)):
+        return
+    regressions = timing.compare_microbenchmarks(
+        results, baseline=args.baseline, threshold=args.threshold)
+    if regressions:
+        sys.exit(1)
+
+
 def yggtime_paper():
     r"""Create plots for timing."""
     from yggdrasil import timing
@@ -1,4 +1,5 @@
 import uuid
+import time
 from yggdrasil import multitasking
 from yggdrasil.communication import CommBase
 
@@ -25,6 +26,8 @@ class AsyncComm(CommBase.CommBase):
             message in the send backlog.
         backlog_recv_ready (multitasking.Event): Event set when there is a
             message in the recv backlog.
+        recv_listeners (list): Conditions that are notified when a message is
+            added to the recv backlog or the backlog is closed.
         
     """
     
@@ -36,13 +39,21 @@ class AsyncComm(CommBase.CommBase):
         self.dont_backlog = (dont_backlog or kwargs.get('is_interface', False))
         self._backlog_recv = []
         self._backlog_send = []
+        self._backlog_recv_times = []
+        self._backlog_send_times = []
         self._backlog_thread = None
         self.backlog_send_ready = multitasking.Event()
         self.backlog_recv_ready = multitasking.Event()
         self.backlog_open = False
         self._used_direct = False
+        self.recv_listeners = []
         super(AsyncComm, self).__init__(name, **kwargs)
 
+    def __getstate__(self):
+        out = super(AsyncComm, self).__getstate__()
+        out['recv_listeners'] = []
+        return out
+
     def get_status_message(self, nindent=0):
         r"""Return lines composing a status message.
         
@@ -75,10 +86,12 @@ class AsyncComm(CommBase.CommBase):
         if self._backlog_thread is None:
             if self.direction == 'send':
                 self._backlog_thread = CommBase.CommTaskLoop(
-                    self, target=self.run_backlog_send, suffix='SendBacklog')
+                    self, target=self.run_backlog_send, suffix='SendBacklog',
+                    reactor=self.reactor)
             else:
                 self._backlog_thread = CommBase.CommTaskLoop(
-                    self, target=self.run_backlog_recv, suffix='RecvBacklog')
+                    self, target=self.run_backlog_recv, suffix='RecvBacklog',
+                    reactor=self.reactor)
         return self._backlog_thread
 
     def open(self):
@@ -111,6 +124,7 @@ class AsyncComm(CommBase.CommBase):
             self.backlog_thread.set_break_flag()
         self.backlog_send_ready.set()
         self.backlog_recv_ready.set()
+        self.notify_recv_listeners()
         if ((wait and (not self.dont_backlog)
              and (self._backlog_thread is not None))):
             self.backlog_thread.wait(key=str(uuid.uuid4()))
@@ -258,7 +272,38 @@ class AsyncComm(CommBase.CommBase):
         with self.backlog_thread.lock:
             self.debug("Added %d bytes to recv backlog.", len(msg))
             self._backlog_recv.append(msg)
+            self._backlog_recv_times.append(time.perf_counter())
+            self.metrics.set_gauge('backlog_recv', len(self._backlog_recv))
             self.backlog_recv_ready.set()
+        self.notify_recv_listeners()
+
+    def add_recv_listener(self, condition):
+        r"""Add a condition that should be notified when a message is added
+        to the recv backlog so that a consumer can wait on multiple comms at
+        once.
+
+        Args:
+            condition (threading.Condition): Condition to notify.
+
+        """
+        if condition not in self.recv_listeners:
+            self.recv_listeners.append(condition)
+
+    def remove_recv_listener(self, condition):
+        r"""Remove a condition added by add_recv_listener.
+
+        Args:
+            condition (threading.Condition): Condition to remove.
+
+        """
+        if condition in self.recv_listeners:
+            self.recv_listeners.remove(condition)
+
+    def notify_recv_listeners(self):
+        r"""Notify conditions waiting for messages in the recv backlog."""
+        for x in list(self.recv_listeners):
+            with x:
+                x.notify_all()
 
     def add_backlog_send(self, msg, **kwargs):
         r"""Add a message to the backlog of messages to be sent.
@@ -272,6 +317,8 @@ class AsyncComm(CommBase.CommBase):
         with self.backlog_thread.lock:
             self.debug("Added %d bytes to send backlog.", len(msg))
             self._backlog_send.append((msg, kwargs))
+            self._backlog_send_times.append(time.perf_counter())
+            self.metrics.set_gauge('backlog_send', len(self._backlog_send))
             self.backlog_send_ready.set()
 
     def pop_backlog_recv(self):
@@ -283,6 +330,10 @@ class AsyncComm(CommBase.CommBase):
         """
         with self.backlog_thread.lock:
             msg = self._backlog_recv.pop(0)
+            self.metrics.observe(
+                'backlog_recv_wait',
+                time.perf_counter() - self._backlog_recv_times.pop(0))
+            self.metrics.set_gauge('backlog_recv', len(self._backlog_recv))
             self.debug("Popped %d bytes from recv backlog.", len(msg))
             if len(self._backlog_recv) == 0:
                 self.backlog_recv_ready.clear()
@@ -298,6 +349,10 @@ class AsyncComm(CommBase.CommBase):
         """
         with self.backlog_thread.lock:
             msg, kwargs = self._backlog_send.pop(0)
+            self.metrics.observe(
+                'backlog_send_wait',
+                time.perf_counter() - self._backlog_send_times.pop(0))
+            self.metrics.set_gauge('backlog_send', len(self._backlog_send))
             self.debug("Popped %d bytes from send backlog.", len(msg))
             if len(self._backlog_send) == 0:
                 self.backlog_send_ready.clear()
@@ -316,7 +371,7 @@ class AsyncComm(CommBase.CommBase):
         self.periodic_debug('run_backlog_send', period=1000)(
             "Sleeping (is_confirmed_send=%s, n_msg_send=%d)",
             str(self.is_confirmed_send), self.n_msg_backlog_send)
-        self.sleep()
+        self.backlog_thread.loop_sleep(self.sleeptime)
 
     def run_backlog_recv(self):
         r"""Continue buffering received messages."""
@@ -336,7 +391,7 @@ class AsyncComm(CommBase.CommBase):
         self.periodic_debug('run_backlog_recv', period=1000)(
             "Sleeping (is_confirmed_recv=%s)",
             str(self.is_confirmed_recv))
-        self.sleep()
+        self.backlog_thread.loop_sleep(self.sleeptime)
 
     def send_backlog(self):
         r"""Send a message from the send backlog to the queue."""
@@ -538,3 +593,5 @@ class AsyncComm(CommBase.CommBase):
             self.backlog_send_ready.clear()
             self._backlog_recv = []
             self._backlog_send = []
+            self._backlog_recv_times = []
+            self._backlog_send_times = []
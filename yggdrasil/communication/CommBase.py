@@ -1,16 +1,21 @@
 import os
 import copy
+import collections
 import uuid
 import atexit
+import asyncio
+import functools
 import logging
 import types
 import time
-from yggdrasil import tools, multitasking
+from yggdrasil import tools, multitasking, metrics, tracing, hooks
 from yggdrasil.tools import YGG_MSG_EOF
 from yggdrasil.communication import new_comm, get_comm, determine_suffix
 from yggdrasil.components import import_component, create_component
 from yggdrasil.metaschema.datatypes import MetaschemaTypeError
 from yggdrasil.metaschema.datatypes.MetaschemaType import MetaschemaType
+from yggdrasil.metaschema.datatypes.JSONObjectMetaschemaType import (
+    LazyObject)
 from yggdrasil.communication.transforms.TransformBase import TransformBase
 
 
@@ -135,6 +140,11 @@ class CommTaskLoop(multitasking.YggTaskLoop):
         comm (:class:.CommBase): Comm class that thread is for.
 
     """
+
+    # Comm tasks (e.g. backlogs) only make non-blocking calls to the
+    # underlying connection so they are run directly on the reactor
+    _reactor_blocking = False
+
     def __init__(self, comm, name=None, suffix='CommTask', **kwargs):
         self.comm = comm
         if name is None:
@@ -293,11 +303,18 @@ class CommBase(tools.YggClass):
             or that output should be sent to (for output comms) in
             the event that a yaml does not pair the comm with another
             model comm or a file.
+        reactor (:class:.multitasking.YggReactor, optional): Reactor that
+            should host any tasks (e.g. backlogs) used by the comm as
+            coroutines instead of threads. Defaults to None.
         **kwargs: Additional keywords arguments are passed to parent class.
 
     Class Attributes:
         is_file (bool): True if the comm accesses a file.
         _maxMsgSize (int): Maximum size of a single message that should be sent.
+        _max_work_comm_pool (int): Maximum number of work comms that will be
+            kept open and reused to send messages larger than _maxMsgSize
+            to a partner written in Python. One work comm is used for
+            partners written in other languages.
         address_description (str): Description of the information constituting
             an address for this communication mechanism.
 
@@ -332,6 +349,8 @@ class CommBase(tools.YggClass):
         send_converter (func): Converter that should be used on sent objects.
         filter (:class:.FilterBase): Callable class that will be used to determine when
             messages should be sent/received.
+        reactor (:class:.multitasking.YggReactor): Reactor hosting tasks
+            used by the comm.
 
     Raises:
         RuntimeError: If the comm class is not installed.
@@ -394,6 +413,7 @@ class CommBase(tools.YggClass):
     _schema_excluded_from_class_validation = ['datatype']
     is_file = False
     _maxMsgSize = 0
+    _max_work_comm_pool = 4
     address_description = None
     no_serialization = False
     _model_schema_prop = ['is_default', 'outside_loop', 'default_file']
@@ -407,8 +427,9 @@ class CommBase(tools.YggClass):
                  single_use=False, reverse_names=False, no_suffix=False,
                  is_client=False, is_response_client=False,
                  is_server=False, is_response_server=False,
-                 comm=None, touches_model=False, **kwargs):
+                 comm=None, touches_model=False, reactor=None, **kwargs):
         self._comm_class = None
+        self.reactor = reactor
         if comm is not None:
             assert(comm == self.comm_class)
         if isinstance(kwargs.get('datatype', None), MetaschemaType):
@@ -459,6 +480,7 @@ class CommBase(tools.YggClass):
         self.close_on_eof_recv = close_on_eof_recv
         self.close_on_eof_send = close_on_eof_send
         self._work_comms = {}
+        self._work_comm_pool = collections.deque()
         self.single_use = single_use
         self.touches_model = touches_model
         self._used = False
@@ -478,6 +500,11 @@ class CommBase(tools.YggClass):
         # Add interface tag
         if self.is_interface:
             self._name += '_I'
+        self.metrics = metrics.Metrics(
+            self.name, kind='comm', comm_class=self.comm_class,
+            direction=self.direction, address=str(self.address),
+            model=self.model_name)
+        self._trace_file = tracing.get_trace_file()
         # if self.is_interface:
         #     self._timeout_drain = False
         # else:
@@ -877,8 +904,10 @@ class CommBase(tools.YggClass):
         if linger and self.is_open:
             self.linger()
         else:
-            self._closing_thread.set_terminated_flag()
             linger = False
+        # Interrupt receives blocked while holding the lock (e.g. a file
+        # comm following with recv_timeout=False)
+        self._closing_thread.set_terminated_flag()
         # Close with lock
         with self._closing_thread.lock:
             self._close(linger=linger)
@@ -893,6 +922,7 @@ class CommBase(tools.YggClass):
                 keys = [k for k in self._work_comms.keys()]
                 for c in keys:
                     self.remove_work_comm(c, linger=linger)
+                self._work_comm_pool.clear()
                 self.debug("Finished cleaning up work comms")
         self.debug("done")
 
@@ -1067,11 +1097,42 @@ class CommBase(tools.YggClass):
         out = (isinstance(msg, bytes) and (msg == self.eof_msg))
         return out
 
-    def apply_transform(self, msg_in):
+    @property
+    def lazy_recv(self):
+        r"""bool: True if received messages should be decoded lazily because
+        the first transform/filter applied to them can operate on messages
+        that are not completely decoded."""
+        if self.direction != 'recv':
+            return False
+        if self.transform:
+            return self.transform[0].accepts_lazy
+        return bool(self.filter and self.filter.accepts_lazy)
+
+    @classmethod
+    def materialize(cls, msg):
+        r"""Complete decoding of a message that was decoded lazily.
+
+        Args:
+            msg (object): Message object.
+
+        Returns:
+            object: Completely decoded message.
+
+        """
+        if isinstance(msg, LazyObject):
+            msg = msg.materialize()
+        return msg
+
+    @hooks.stage('apply_transform')
+    def apply_transform(self, msg_in, no_copy=False):
         r"""Evaluate the transform to alter the emssage being sent/received.
 
         Args:
             msg_in (object): Message being transformed.
+            no_copy (bool, optional): If True, the transformed message may
+                share data with msg_in (e.g. if msg_in is owned by the comm
+                or will only be serialized). Otherwise, at most one copy is
+                made by the first transform in the chain. Defaults to False.
 
         Returns:
             object: Transformed message.
@@ -1096,7 +1157,12 @@ class CommBase(tools.YggClass):
         no_init = ((self.direction == 'recv')
                    and (not self.serializer.initialized))
         for iconv in self.transform:
-            msg_out = iconv(msg_out, no_init=no_init)
+            if not iconv.accepts_lazy:
+                msg_out = self.materialize(msg_out)
+            msg_out = iconv(msg_out, no_copy=no_copy, no_init=no_init)
+            # Transforms do not modify their input, so the intermediate
+            # messages produced by the chain never need to be copied
+            no_copy = True
         return msg_out
 
     def evaluate_filter(self, *msg_in):
@@ -1166,7 +1232,7 @@ class CommBase(tools.YggClass):
             bool: True if the object is empty, False otherwise.
 
         """
-        smsg = self.apply_transform(msg)
+        smsg = self.apply_transform(msg, no_copy=True)
         emsg, _ = self.deserialize(self.empty_bytes_msg)
         return self.is_empty(smsg, emsg)
         
@@ -1265,6 +1331,11 @@ class CommBase(tools.YggClass):
         c = self._work_comms.get(header['id'], None)
         if c is not None:
             return c
+        # Senders that reuse a work comm may not reuse the id
+        for c in self._work_comms.values():
+            if ((c.direction == 'recv') and c.is_open
+                    and (c.address == header['address'])):
+                return c
         c = self.header2workcomm(header, **kwargs)
         self.add_work_comm(c)
         return c
@@ -1293,6 +1364,59 @@ class CommBase(tools.YggClass):
         self.add_work_comm(c)
         return c
 
+    @property
+    def reuse_work_comms(self):
+        r"""bool: True if work comms created to send large messages should
+        be kept open and reused for subsequent large messages. Work comms are
+        not reused by comms that may be connected to more than one partner
+        (e.g. clients and servers) as multiple receivers could then read from
+        the same work comm."""
+        return ((self._max_work_comm_pool > 0) and (not self.single_use)
+                and (not (self.is_client or self.is_server
+                          or self.is_response_client
+                          or self.is_response_server)))
+
+    def lease_work_comm(self):
+        r"""Get a work comm from the pool of open work comms that can be
+        used to send a large message, creating one if there are not any
+        idle work comms and the pool is not full. If the pool is full and
+        all of the work comms are still being drained by the receiver, the
+        least recently used work comm is reused as messages will be
+        received in the order they were sent. Comms whose partner is not
+        written in Python only use one work comm, as the interfaces for
+        other languages only cache the work comm for the most recent
+        address and free it (removing queued parts) when a new address is
+        received.
+
+        Returns:
+            :class:.CommBase: Work comm.
+
+        """
+        if not self.reuse_work_comms:
+            return self.create_work_comm()
+        max_pool = self._max_work_comm_pool
+        if self.partner_language != 'python':
+            max_pool = 1
+        for k in list(self._work_comm_pool):
+            c = self._work_comms.get(k, None)
+            if (c is None) or c.is_closed:  # pragma: debug
+                self._work_comm_pool.remove(k)
+                self.remove_work_comm(k)
+        for k in self._work_comm_pool:
+            c = self._work_comms[k]
+            if c.is_confirmed_send and (c.n_msg_send_drain == 0):
+                break
+        else:
+            if len(self._work_comm_pool) < max_pool:
+                c = self.create_work_comm()
+                self._work_comm_pool.append(c.uuid)
+                return c
+            k = self._work_comm_pool[0]
+        # Move to the end so that the least recently used is at the front
+        self._work_comm_pool.remove(k)
+        self._work_comm_pool.append(k)
+        return self._work_comms[k]
+
     def add_work_comm(self, comm):
         r"""Add work comm to dict.
 
@@ -1321,6 +1445,8 @@ class CommBase(tools.YggClass):
         """
         if key not in self._work_comms:
             return
+        if key in self._work_comm_pool:
+            self._work_comm_pool.remove(key)
         if not in_thread:
             c = self._work_comms.pop(key)
             c.close(linger=linger)
@@ -1373,19 +1499,27 @@ class CommBase(tools.YggClass):
         return c
 
     # SERIALIZATION/DESERIALIZATION METHODS
+    @hooks.stage('serialize')
     def serialize(self, *args, **kwargs):
         r"""Serialize a message using the associated serializer."""
         # Don't send metadata for files
         # kwargs.setdefault('dont_encode', self.is_file)
         kwargs.setdefault('no_metadata', self.is_file)
         kwargs.setdefault('max_header_size', self.maxMsgSize)
-        return self.serializer.serialize(*args, **kwargs)
+        t0 = time.perf_counter()
+        out = self.serializer.serialize(*args, **kwargs)
+        self.metrics.observe('serialize', time.perf_counter() - t0)
+        return out
 
+    @hooks.stage('deserialize')
     def deserialize(self, *args, **kwargs):
         r"""Deserialize a message using the associated deserializer."""
         # Don't serialize files using JSON
         # kwargs.setdefault('dont_decode', self.is_file)
-        return self.serializer.deserialize(*args, **kwargs)
+        t0 = time.perf_counter()
+        out = self.serializer.deserialize(*args, **kwargs)
+        self.metrics.observe('deserialize', time.perf_counter() - t0)
+        return out
 
     # SEND METHODS
     def _safe_send(self, *args, **kwargs):
@@ -1529,7 +1663,12 @@ class CommBase(tools.YggClass):
         else:
             flag = True
             # Covert object
-            msg_ = self.apply_transform(msg)
+            msg_ = self.apply_transform(msg, no_copy=True)
+            if self._trace_file:
+                header_kwargs = tracing.stamp(
+                    dict(header_kwargs or {}),
+                    'model_send' if self.is_interface else 'forward',
+                    comm=self.name, filename=self._trace_file)
             # Serialize
             add_sinfo = (self._send_serializer and (not self.is_file))
             if add_sinfo:
@@ -1544,7 +1683,7 @@ class CommBase(tools.YggClass):
             if (msg_len > self.maxMsgSize) and (self.maxMsgSize != 0):
                 if header_kwargs is None:
                     header_kwargs = dict()
-                work_comm = self.create_work_comm()
+                work_comm = self.lease_work_comm()
                 # if 'address' not in header_kwargs:
                 #     work_comm = self.create_work_comm()
                 # else:
@@ -1553,6 +1692,7 @@ class CommBase(tools.YggClass):
                 msg_s = self.serialize(msg_, header_kwargs=header_kwargs)
         return flag, msg_s, header_kwargs
 
+    @hooks.stage('send')
     def send(self, *args, **kwargs):
         r"""Send a message.
 
@@ -1601,6 +1741,7 @@ class CommBase(tools.YggClass):
             # self.close_in_thread(no_wait=True, timeout=False)
         return ret
 
+    @hooks.stage('send_multipart')
     def send_multipart(self, msg, header_kwargs=None, **kwargs):
         r"""Send a multipart message. If the message is smaller than maxMsgSize,
         it is sent using _send, otherwise it is sent to a worker comm using
@@ -1617,6 +1758,7 @@ class CommBase(tools.YggClass):
             bool: Success or failure of send.
         
         """
+        t0 = time.perf_counter()
         # Create serialized message that should be sent
         flag, msg_s, header = self.on_send(msg, header_kwargs=header_kwargs)
         if not flag:
@@ -1640,6 +1782,7 @@ class CommBase(tools.YggClass):
             else:  # pragma: debug
                 self.special_debug("Sending message header failed.")
         if flag:
+            self.metrics.record('sent', msg_len, time.perf_counter() - t0)
             self.debug('Sent %d bytes to %s', msg_len, self.address)
         else:  # pragma: debug
             self.special_debug('Failed to send %d bytes', msg_len)
@@ -1683,6 +1826,7 @@ class CommBase(tools.YggClass):
         r"""Raw recv. Should be overridden by inheriting class."""
         raise NotImplementedError("_recv method needs implemented.")
 
+    @hooks.stage('_recv_multipart')
     def _recv_multipart(self, data, leng_exp, **kwargs):
         r"""Receive a message larger than YGG_MSG_MAX that is sent in multiple
         parts.
@@ -1762,12 +1906,20 @@ class CommBase(tools.YggClass):
         """
         flag = True
         metadata = previous_header
-        msg_, header = self.deserialize(s_msg, metadata=metadata)
+        msg_, header = self.deserialize(s_msg, metadata=metadata,
+                                        lazy=self.lazy_recv)
         if self.is_eof(msg_):
             flag = self.on_recv_eof()
             msg = msg_
         elif not header.get('incomplete', False):
-            msg = self.apply_transform(msg_)
+            if self._trace_file and ('trace_id' in header):
+                tracing.stamp(
+                    header,
+                    'model_recv' if self.is_interface else 'connection_recv',
+                    comm=self.name, filename=self._trace_file)
+            msg = self.apply_transform(msg_, no_copy=True)
+            if not (self.filter and self.filter.accepts_lazy):
+                msg = self.materialize(msg)
         else:
             msg = msg_
         if not header.get('incomplete', False):
@@ -1777,6 +1929,7 @@ class CommBase(tools.YggClass):
             self._used = True
         return flag, msg, header
 
+    @hooks.stage('recv')
     def recv(self, *args, **kwargs):
         r"""Receive a message.
 
@@ -1809,6 +1962,7 @@ class CommBase(tools.YggClass):
             self.debug("Recieved message skipped based on filter: %.100s", str(msg))
             kwargs['return_header'] = return_header
             return self.recv(*args, **kwargs)
+        msg = self.materialize(msg)
         if self.single_use and self._used:
             self.debug('Linger close on single use')
             self.linger_close()
@@ -1819,6 +1973,70 @@ class CommBase(tools.YggClass):
         out = self.language_driver.python2language(out)
         return out
 
+    async def run_blocking(self, func, *args, **kwargs):
+        r"""Run a call that may block on another thread so that the event
+        loop is not blocked. The reactor's pool of threads is used if the
+        comm is hosted by a reactor, otherwise the event loop's default
+        executor is used.
+
+        Args:
+            func (callable): Function that should be called.
+            *args: Arguments are passed to func.
+            **kwargs: Keyword arguments are passed to func.
+
+        Returns:
+            object: Result of func.
+
+        """
+        if self.reactor is not None:
+            return await self.reactor.run_blocking(func, *args, **kwargs)
+        return await asyncio.get_event_loop().run_in_executor(
+            None, functools.partial(func, *args, **kwargs))
+
+    async def send_async(self, *args, **kwargs):
+        r"""Coroutine equivalent of send that runs the send on another
+        thread (see run_blocking) so that other coroutines can run.
+
+        Args:
+            *args: All arguments are passed to send.
+            **kwargs: All keywords arguments are passed to send.
+
+        Returns:
+            bool: Success or failure of send.
+
+        """
+        return await self.run_blocking(self.send, *args, **kwargs)
+
+    async def recv_async(self, *args, timeout=None, **kwargs):
+        r"""Coroutine equivalent of recv that yields to the event loop while
+        waiting for a message instead of blocking. Each attempt is run on
+        another thread (see run_blocking).
+
+        Args:
+            *args: All arguments are passed to recv.
+            timeout (float, optional): Time that should be waited for a
+                message. Defaults to None and recv_timeout is used. A value
+                of False indicates that the coroutine should wait until a
+                message is received or the comm is closed.
+            **kwargs: All keywords arguments are passed to recv.
+
+        Returns:
+            tuple (bool, obj): Success or failure of receive and received
+                message.
+
+        """
+        if timeout is None:
+            timeout = self.recv_timeout
+        T = tools.TimeOut(timeout)
+        while True:
+            out = await self.run_blocking(self.recv, *args, timeout=0,
+                                          **kwargs)
+            if (((not out[0]) or (not self.is_empty_recv(out[1]))
+                 or T.is_out)):
+                return out
+            await asyncio.sleep(self.sleeptime)
+
+    @hooks.stage('recv_multipart')
     def recv_multipart(self, *args, **kwargs):
         r"""Receive a multipart message. If a message is received without a
         header, it assumed to be complete. Otherwise, the message is received
@@ -1834,6 +2052,7 @@ class CommBase(tools.YggClass):
 
         """
         header = None
+        t0 = time.perf_counter()
         # Receive first part of message
         flag, s_msg = self._safe_recv(*args, **kwargs)
         if not flag:
@@ -1857,6 +2076,7 @@ class CommBase(tools.YggClass):
         else:
             msg_len = 1
         if flag and (msg_len > 0):
+            self.metrics.record('recv', msg_len, time.perf_counter() - t0)
             self.debug('%d bytes received from %s', msg_len, self.address)
         return flag, msg, header
         
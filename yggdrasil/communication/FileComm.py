@@ -1,11 +1,144 @@
 import os
 import copy
+import time
+import select
+import ctypes
+import ctypes.util
 import tempfile
 from yggdrasil import platform, tools
 from yggdrasil.serialize.SerializeBase import SerializeBase
 from yggdrasil.communication import CommBase
 
 
+# inotify events signaling that a followed file may have grown
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_MASK = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE
+            | _IN_DELETE_SELF | _IN_MOVE_SELF)
+
+
+def _load_inotify():
+    r"""Load the C library providing inotify on Linux.
+
+    Returns:
+        ctypes.CDLL: C library with inotify functions. None is returned if
+            inotify is not available.
+
+    """
+    if not platform._is_linux:  # pragma: no cover
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6',
+                           use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):  # pragma: debug
+        return None
+    return libc
+
+
+_inotify_lib = _load_inotify()
+
+
+class FileWatcher(object):
+    r"""Class for waiting for a file to grow. On Linux, inotify is used to
+    sleep until the file is modified. Otherwise, the file size is polled.
+
+    Args:
+        address (str): Path to the file that should be watched.
+        use_inotify (bool, optional): If False, the file size will be polled
+            even if inotify is available. Defaults to True.
+        interval (float, optional): Time (in seconds) between checks of the
+            file size when polling. Defaults to 0.01.
+
+    Attributes:
+        address (str): Path to the file being watched.
+        interval (float): Time between checks of the file size when polling.
+        inotify_fd (int): inotify file descriptor. None if the file size is
+            polled.
+
+    """
+
+    _max_block = 0.1
+
+    def __init__(self, address, use_inotify=True, interval=0.01):
+        self.address = address
+        self.interval = interval
+        self.inotify_fd = None
+        if use_inotify and (_inotify_lib is not None):
+            fd = _inotify_lib.inotify_init1(
+                os.O_NONBLOCK | getattr(os, 'O_CLOEXEC', 0))
+            if fd >= 0:
+                wd = _inotify_lib.inotify_add_watch(
+                    fd, os.fsencode(address), _IN_MASK)
+                if wd >= 0:
+                    self.inotify_fd = fd
+                else:  # pragma: debug
+                    os.close(fd)
+
+    def __del__(self):
+        self.close()
+
+    @property
+    def uses_inotify(self):
+        r"""bool: True if inotify is used to watch the file."""
+        return (self.inotify_fd is not None)
+
+    @property
+    def size(self):
+        r"""int: Current size of the file."""
+        try:
+            return os.path.getsize(self.address)
+        except OSError:  # pragma: debug
+            return 0
+
+    def close(self):
+        r"""Stop watching the file."""
+        if self.inotify_fd is not None:
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+
+    def wait(self, size, timeout=False, interrupt=None):
+        r"""Wait for the file to grow larger than a given size.
+
+        Args:
+            size (int): Size (in bytes) that the file should exceed.
+            timeout (float, bool, optional): Maximum time (in seconds) that
+                should be waited. If False, there is no maximum. Defaults to
+                False.
+            interrupt (callable, optional): Function that returns True if
+                the wait should be stopped early. It is checked each time
+                the wait wakes up. Defaults to None.
+
+        Returns:
+            bool: True if the file is larger than size, False otherwise.
+
+        """
+        T = tools.TimeOut(timeout)
+        while True:
+            if self.size > size:
+                return True
+            if T.is_out or ((interrupt is not None) and interrupt()):
+                return False
+            if self.uses_inotify:
+                block = self._max_block
+            else:
+                block = self.interval
+            if timeout is not False:
+                block = max(min(block, timeout - T.elapsed), 0)
+            if self.uses_inotify:
+                if select.select([self.inotify_fd], [], [], block)[0]:
+                    try:
+                        os.read(self.inotify_fd, 4096)
+                    except BlockingIOError:  # pragma: debug
+                        pass
+            else:
+                time.sleep(block)
+
+
 class FileComm(CommBase.CommBase):
     r"""Class for handling I/O from/to a file on disk.
 
@@ -38,6 +171,11 @@ class FileComm(CommBase.CommBase):
         wait_for_creation (float, optional): Time (in seconds) that should be
             waited before opening for the file to be created if it dosn't exist.
             Defaults to 0 s and file will attempt to be opened immediately.
+        follow (bool, optional): If True and reading, the file is kept open
+            when the end is reached and receives wait for up to the receive
+            timeout for another process to append to the file before reading
+            the new data. The wait uses inotify on Linux and polls the file
+            size otherwise. Defaults to False.
         **kwargs: Additional keywords arguments are passed to parent class.
 
     Attributes:
@@ -51,6 +189,10 @@ class FileComm(CommBase.CommBase):
             reached. If writing, each output will be to a new file in the series.
         platform_newline (str): String indicating a newline on the current
             platform.
+        follow (bool): If True and reading, new data appended to the file
+            is waited for when the end of the file is reached.
+        watcher (FileWatcher): Watcher used to wait for the file to grow
+            when following.
 
     Raises:
         ValueError: If the read_meth is not one of the supported values.
@@ -75,6 +217,7 @@ class FileComm(CommBase.CommBase):
         'in_temp': {'type': 'boolean', 'default': False},
         'is_series': {'type': 'boolean', 'default': False},
         'wait_for_creation': {'type': 'float', 'default': 0.0},
+        'follow': {'type': 'boolean', 'default': False},
         'serializer': {'oneOf': [{'$ref': '#/definitions/serializer'},
                                  {'type': 'instance',
                                   'class': SerializeBase}],
@@ -104,6 +247,7 @@ class FileComm(CommBase.CommBase):
         # Process file class keywords
         if not hasattr(self, '_fd'):
             self._fd = None
+        self.watcher = None
         self.platform_newline = platform._newline
         if self.in_temp:
             self.address = os.path.join(tempfile.gettempdir(), self.address)
@@ -115,6 +259,8 @@ class FileComm(CommBase.CommBase):
             self.read_meth = self.serializer.read_meth
         assert(self.read_meth in ['read', 'readline'])
         # Force overwrite for concatenation in append mode
+        if self.follow and (self.direction == 'recv'):
+            self.close_on_eof_recv = False
         if self.append:
             if self.direction == 'recv':
                 self.close_on_eof_recv = False
@@ -461,6 +607,8 @@ class FileComm(CommBase.CommBase):
                     self.sleep()
                 self.stop_timeout()
             self._fd = self._file_open(address, self.open_mode)
+            if self.follow and (self.direction == 'recv'):
+                self.watcher = FileWatcher(address, interval=self.sleeptime)
         T = self.start_timeout()
         while (not T.is_out) and (not self.is_open):  # pragma: debug
             self.sleep()
@@ -485,6 +633,9 @@ class FileComm(CommBase.CommBase):
                 if self.is_open:
                     raise
         self._fd = None
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
 
     def open(self):
         r"""Open the file."""
@@ -572,10 +723,10 @@ class FileComm(CommBase.CommBase):
             pos = self.record_position()
             try:
                 out = 0
-                flag, msg = self._recv()
+                flag, msg = self._recv(timeout=0)
                 while len(msg) != 0 and (not self.is_eof(msg)):
                     out += 1
-                    flag, msg = self._recv()
+                    flag, msg = self._recv(timeout=0)
             except ValueError:  # pragma: debug
                 out = 0
             self.change_position(*pos)
@@ -654,60 +805,115 @@ class FileComm(CommBase.CommBase):
             raise NotImplementedError("Invalid read_meth: '%s'" % self.read_meth)
         return out
 
-    def _recv(self, timeout=0):
+    def wait_for_data(self, file_pos, timeout=None):
+        r"""Wait for data to be appended to a followed file.
+
+        Args:
+            file_pos (int): Position (in bytes) that the file must grow
+                beyond.
+            timeout (float, optional): Time in seconds to wait for data.
+                Defaults to None and self.recv_timeout is used. If False,
+                the wait will continue until data is appended or the comm
+                is closed.
+
+        Returns:
+            bool: True if the file grew beyond file_pos, False otherwise.
+
+        """
+        if self.watcher is None:
+            return False
+        if timeout is None:
+            timeout = self.recv_timeout
+        return self.watcher.wait(
+            file_pos, timeout=timeout,
+            interrupt=lambda: self._closing_thread.was_terminated)
+
+    def _recv(self, timeout=None):
         r"""Reads message from a file.
 
         Args:
-            timeout (float, optional): Time in seconds to wait for a message.
-                Defaults to self.recv_timeout. Unused.
+            timeout (float, optional): Time in seconds to wait for data to
+                be appended to the file if follow is True and the end of the
+                file is reached. The time is shared by all waits during the
+                receive. Defaults to None and self.recv_timeout is used.
+                Unused if follow is False.
 
         Returns:
             tuple (bool, str): Success or failure of reading from the file and
                 the read messages as bytes.
 
         """
-        flag = True
-        prev_pos = 0
-        try:
-            self.read_header()
-            prev_pos = self.file_tell()
-            out = self._file_recv()
-        except BaseException:  # pragma: debug
-            # Use this to catch case where close called during receive.
-            # In the future this should be handled via a lock.
-            out = ''
-        if len(out) == 0:
-            if self.advance_in_series():
-                self.debug("Advanced to %d", self._series_index)
-                flag, out = self._recv()
-            elif self.append and self.is_open:
-                self.file_seek(prev_pos)
-                out = self.empty_bytes_msg
+        if timeout is None:
+            timeout = self.recv_timeout
+        T = tools.TimeOut(timeout)
+
+        def remaining():
+            if T.max_time is False:
+                return False
+            return max(T.max_time - T.elapsed, 0)
+
+        while True:
+            flag = True
+            prev_pos = 0
+            wait_pos = None
+            try:
+                self.read_header()
+                prev_pos = self.file_tell()
+                out = self._file_recv()
+                if ((self.follow and (self.read_meth == 'readline')
+                     and (len(out) > 0)
+                     and (out[-1:] not in [b'\n', '\n']))):
+                    # Wait for the remainder of a partially written line
+                    wait_pos = self.file_tell()
+                    self.file_seek(prev_pos)
+                    out = self.empty_bytes_msg
+            except BaseException:  # pragma: debug
+                # Use this to catch case where close called during receive.
+                # In the future this should be handled via a lock.
+                out = ''
+            if wait_pos is not None:
+                if self.wait_for_data(wait_pos, timeout=remaining()):
+                    continue
+                return (flag, out)
+            if len(out) == 0:
+                if self.advance_in_series():
+                    self.debug("Advanced to %d", self._series_index)
+                    continue
+                elif self.follow and self.is_open:
+                    self.file_seek(prev_pos)
+                    out = self.empty_bytes_msg
+                    if self.wait_for_data(prev_pos, timeout=remaining()):
+                        continue
+                elif self.append and self.is_open:
+                    self.file_seek(prev_pos)
+                    out = self.empty_bytes_msg
+                else:
+                    out = self.eof_msg
             else:
-                out = self.eof_msg
-        else:
-            if isinstance(out, bytes):
-                out = out.replace(self.platform_newline, self.serializer.newline)
-            if flag and (not self.is_eof(out)):
-                if (((self.read_meth == 'readline')
-                     and out.startswith(self.serializer.comment))):
-                    # Exclude comments
-                    flag, out = self._recv()
-                elif (((self.read_meth == 'read') and (prev_pos > 0)
-                       and (not self.concats_as_str))):
-                    # Rewind file and read entire contents if data was added to
-                    # the file type using a serialization method that dosn't
-                    # concatenate
-                    self.reset_position()
-                    flag, out = self._recv()
-                elif (self.read_meth == 'read') and self.serializer.is_framed:
-                    # Rewind if more than one frame read
-                    len0 = len(out)
-                    out = self.serializer.get_first_frame(out)
-                    len1 = len(out)
-                    if (len1 > 0) and (len0 != len1):
-                        self.file_seek(prev_pos + len1)
-        return (flag, out)
+                if isinstance(out, bytes):
+                    out = out.replace(self.platform_newline,
+                                      self.serializer.newline)
+                if flag and (not self.is_eof(out)):
+                    if (((self.read_meth == 'readline')
+                         and out.startswith(self.serializer.comment))):
+                        # Exclude comments
+                        continue
+                    elif (((self.read_meth == 'read') and (prev_pos > 0)
+                           and (not self.concats_as_str))):
+                        # Rewind file and read entire contents if data was
+                        # added to the file type using a serialization
+                        # method that dosn't concatenate
+                        self.reset_position()
+                        continue
+                    elif ((self.read_meth == 'read')
+                          and self.serializer.is_framed):
+                        # Rewind if more than one frame read
+                        len0 = len(out)
+                        out = self.serializer.get_first_frame(out)
+                        len1 = len(out)
+                        if (len1 > 0) and (len0 != len1):
+                            self.file_seek(prev_pos + len1)
+            return (flag, out)
 
     def purge(self):
         r"""Purge all messages from the comm."""
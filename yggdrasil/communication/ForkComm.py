@@ -1,3 +1,7 @@
+import time
+import threading
+from concurrent import futures
+from yggdrasil import tracing
 from yggdrasil.communication import CommBase, get_comm
 from yggdrasil.components import import_component
 
@@ -27,20 +31,47 @@ class ForkComm(CommBase.CommBase):
             stored.
         comm (list, optional): The list of options for the comms that
             should be bundled. If not provided, the bundle will be empty.
+        fanout (str, optional): How messages are sent to the comms. If
+            'serial', the message is sent to each comm in turn. If
+            'broadcast', the message is serialized once when the comms allow
+            it and the result is sent to all of the comms concurrently.
+            Defaults to 'serial'.
+        fanin (str, optional): How messages are received from the comms. If
+            'round_robin', the comms are checked in turn with a sleep between
+            rounds. If 'wait', the comms are waited on together (using a
+            zmq.Poller if all of the comms are ZeroMQ comms receiving
+            directly or a condition notified by the recv backlogs if all of
+            the comms are asynchronous) and then checked in turn. Defaults to
+            'round_robin'.
         **kwargs: Additional keyword arguments are passed to the parent class.
 
     Attributes:
         comm_list (list): Comms included in this fork.
         curr_comm_index (int): Index comm that next receive will be from.
+        fanout (str): How messages are sent to the comms.
+        fanin (str): How messages are received from the comms.
 
     """
 
     _dont_register = True
+    _fanout_modes = ['serial', 'broadcast']
+    _fanin_modes = ['round_robin', 'wait']
     
-    def __init__(self, name, comm=None, **kwargs):
+    def __init__(self, name, comm=None, fanout='serial', fanin='round_robin',
+                 **kwargs):
         self.comm_list = []
         self.curr_comm_index = 0
         self.eof_recv = []
+        self.fanout = fanout
+        self.fanin = fanin
+        self._executor = None
+        self._recv_condition = None
+        if fanout not in self._fanout_modes:
+            raise ValueError("Invalid fanout '%s'. Valid modes are: %s"
+                             % (fanout, self._fanout_modes))
+        if fanin not in self._fanin_modes:
+            raise ValueError("Invalid fanin '%s'. Valid modes are: %s"
+                             % (fanin, self._fanin_modes))
         address = kwargs.pop('address', None)
         if (comm in [None, 'ForkComm']):
             if isinstance(address, list):
@@ -73,6 +104,12 @@ class ForkComm(CommBase.CommBase):
         assert(not self.is_server)
         assert(not self.is_client)
 
+    def __getstate__(self):
+        out = super(ForkComm, self).__getstate__()
+        out['_executor'] = None
+        out['_recv_condition'] = None
+        return out
+
     def disconnect(self):
         r"""Disconnect attributes that are aliases."""
         for x in self.comm_list:
@@ -161,6 +198,14 @@ class ForkComm(CommBase.CommBase):
         r"""Close the connection."""
         for x in self.comm_list:
             x.close(*args, **kwargs)
+        if self._recv_condition is not None:
+            for x in self.comm_list:
+                if hasattr(x, 'remove_recv_listener'):
+                    x.remove_recv_listener(self._recv_condition)
+            self._recv_condition = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
     def close_in_thread(self, *args, **kwargs):  # pragma: debug
         r"""In a new thread, close the comm when it is empty."""
@@ -237,12 +282,125 @@ class ForkComm(CommBase.CommBase):
             bool: Success or failure of send.
 
         """
+        if (self.fanout == 'broadcast') and (len(self) > 1):
+            return self.send_broadcast(*args, **kwargs)
         for x in self.comm_list:
             out = x.send(*args, **kwargs)
             if not out:
                 return out
         return out
 
+    @property
+    def executor(self):
+        r"""concurrent.futures.ThreadPoolExecutor: Threads used to send to
+        the comms concurrently."""
+        if self._executor is None:
+            self._executor = futures.ThreadPoolExecutor(
+                max_workers=len(self),
+                thread_name_prefix='%s.fanout' % self.name)
+        return self._executor
+
+    def map_comms(self, func):
+        r"""Call a function for each comm concurrently.
+
+        Args:
+            func (function): Function that takes a comm as input.
+
+        Returns:
+            list: Results for each comm.
+
+        """
+        return list(self.executor.map(func, self.comm_list))
+
+    @property
+    def can_serialize_once(self):
+        r"""bool: True if a message can be serialized once and the result
+        sent to all of the comms. This requires that the comms are of the
+        same class, do not alter the message or header on a per-comm basis,
+        and serialize messages."""
+        cls = type(self.comm_list[0])
+        for x in self.comm_list:
+            if ((not isinstance(x, cls)) or x.transform or x.filter
+                    or x.no_serialization or x.is_file or x.is_closed
+                    or (type(x).on_send is not CommBase.CommBase.on_send)):
+                return False
+        return True
+
+    def serialize_once(self, msg, header_kwargs=None):
+        r"""Serialize a message so that it can be sent to all of the comms.
+
+        Args:
+            msg (tuple): Message arguments.
+            header_kwargs (dict, optional): Keyword arguments that should be
+                added to the header.
+
+        Returns:
+            bytes: Serialized message or None if the message cannot be sent
+                as a single part to all of the comms (EOF messages and
+                messages larger than maxMsgSize).
+
+        """
+        x = self.comm_list[0]
+        if len(msg) == 1:
+            msg = msg[0]
+        if x.is_eof(msg):
+            return None
+        if x._trace_file:
+            header_kwargs = tracing.stamp(
+                dict(header_kwargs or {}),
+                'model_send' if x.is_interface else 'forward',
+                comm=self.name, filename=x._trace_file)
+        add_sinfo = any(y._send_serializer for y in self.comm_list)
+        msg_s = x.serialize(msg, header_kwargs=header_kwargs,
+                            add_serializer_info=add_sinfo)
+        if (len(msg_s) >= self.maxMsgSize) and (self.maxMsgSize != 0):
+            return None
+        return msg_s
+
+    def send_broadcast(self, *args, **kwargs):
+        r"""Send a message to all of the comms concurrently, serializing it
+        once if possible.
+
+        Args:
+            *args: All arguments are assumed to be part of the message.
+            **kwargs: All keywords arguments are passed to comm send or
+                _safe_send methods.
+
+        Returns:
+            bool: Success or failure of send.
+
+        """
+        msg_s = None
+        if self.can_serialize_once:
+            x = self.comm_list[0]
+            msg = x.language_driver.language2python(args)
+            header_kwargs = kwargs.pop('header_kwargs', None)
+            try:
+                msg_s = self.serialize_once(msg, header_kwargs=header_kwargs)
+            except BaseException:
+                self.exception('Failed to serialize: %.100s.', str(msg))
+                return False
+            if msg_s is None:
+                kwargs['header_kwargs'] = header_kwargs
+        if msg_s is None:
+            return all(self.map_comms(lambda x: x.send(*args, **kwargs)))
+
+        def send_bytes(x):
+            t0 = time.perf_counter()
+            try:
+                flag = x._safe_send(msg_s, **kwargs)
+            except BaseException:
+                x.exception('Failed to send %d bytes.', len(msg_s))
+                return False
+            if flag:
+                x._used = True
+                x._send_serializer = False
+                x.metrics.record('sent', len(msg_s), time.perf_counter() - t0)
+                x.debug('Sent %d bytes to %s', len(msg_s), x.address)
+            return flag
+
+        return all(self.map_comms(send_bytes))
+
     def recv(self, *args, **kwargs):
         r"""Receive a message.
 
@@ -280,7 +438,10 @@ class ForkComm(CommBase.CommBase):
                 self.curr_comm_index += 1
             first_comm = False
             if out is None:
-                self.sleep()
+                if self.fanin == 'wait':
+                    self.wait_for_message(T)
+                else:
+                    self.sleep()
         self.stop_timeout(key_suffix='recv:forkd')
         if out is None:
             if self.is_closed:
@@ -292,6 +453,40 @@ class ForkComm(CommBase.CommBase):
             out = (out[0], out[1])
         return out
 
+    def wait_for_message(self, T):
+        r"""Wait until a message may be available from one of the comms
+        or the timeout is reached.
+
+        Args:
+            T (tools.TimeOut): Timeout for the receive.
+
+        """
+        if T.max_time is False:
+            timeout = 1.0
+        else:
+            timeout = min(max(T.max_time - T.elapsed, 0.0), 1.0)
+        comms = [x for x in self.comm_list if x.is_open]
+        if not comms:
+            return
+        if all(x._commtype == 'zmq' and x.dont_backlog and x.is_open_direct
+               for x in comms):
+            import zmq
+            poller = zmq.Poller()
+            for x in comms:
+                poller.register(x.socket, zmq.POLLIN)
+            poller.poll(int(1000 * timeout))
+        elif all(hasattr(x, 'add_recv_listener') and x.is_open_backlog
+                 and (not x.dont_backlog) for x in comms):
+            if self._recv_condition is None:
+                self._recv_condition = threading.Condition()
+            for x in comms:
+                x.add_recv_listener(self._recv_condition)
+            with self._recv_condition:
+                if not any(x.backlog_recv_ready.is_set() for x in comms):
+                    self._recv_condition.wait(timeout)
+        else:
+            self.sleep()
+
     def purge(self):
         r"""Purge all messages from the comm."""
         super(ForkComm, self).purge()
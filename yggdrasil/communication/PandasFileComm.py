@@ -16,3 +16,8 @@ class PandasFileComm(AsciiTableComm):
     _filetype = 'pandas'
     _schema_subtype_description = ('The file is a Pandas frame output as a table.')
     _default_serializer = 'pandas'
+
+    def _init_before_open(self, **kwargs):
+        r"""Disable binary frames so that files are written as CSV."""
+        super(PandasFileComm, self)._init_before_open(**kwargs)
+        self.serializer.binary_frames = False
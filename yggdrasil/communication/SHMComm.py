@@ -0,0 +1,442 @@
+import os
+import mmap
+import uuid
+import struct
+import logging
+import tempfile
+from yggdrasil import platform
+from yggdrasil.communication import CommBase, AsyncComm
+logger = logging.getLogger(__name__)
+try:
+    import sysv_ipc
+    _shm_installed = (platform._is_linux or platform._is_mac)
+except ImportError:  # pragma: windows
+    logger.debug("Could not import sysv_ipc. "
+                 + "Shared memory support will be disabled.")
+    sysv_ipc = None
+    _shm_installed = False
+
+
+# Layout of the header at the start of the shared memory segment (must
+# match shm_header_t in languages/C/communication/SHMComm.h). The head and
+# tail are the total number of bytes written to and read from the ring
+# buffer so that the number of bytes in use is always head - tail.
+_magic = b'YGGSHMRB'
+_header_fmt = '@8sQQQqq'
+_header_size = 64
+_offset_head = 16
+_offset_tail = 24
+_record_fmt = '@Q'
+_record_size = struct.calcsize(_record_fmt)
+_default_capacity = 2**22
+
+
+def get_shm_directory():
+    r"""Get the directory where shared memory segments should be created.
+    On Linux, this is the tmpfs mount used by shm_open so that segments
+    are never written to disk.
+
+    Returns:
+        str: Full path to the directory.
+
+    """
+    if platform._is_linux and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return tempfile.gettempdir()
+
+
+class SharedRingBuffer(object):
+    r"""Ring buffer of length prefixed messages in a memory mapped file that
+    can be shared between processes. Access is coordinated by two SysV
+    semaphores, one counting the messages in the buffer and one serving as
+    a lock for updating the head and tail of the buffer.
+
+    Args:
+        address (str): Full path to the file backing the shared memory.
+        create (bool, optional): If True, the file and semaphores are
+            created. Defaults to False and existing ones are attached to.
+        capacity (int, optional): Size (in bytes) of the ring buffer when it
+            is created. Defaults to _default_capacity.
+
+    Attributes:
+        address (str): Full path to the file backing the shared memory.
+        capacity (int): Size (in bytes) of the ring buffer.
+        mm (mmap.mmap): Memory map of the file.
+        count (sysv_ipc.Semaphore): Semaphore counting messages.
+        lock (sysv_ipc.Semaphore): Semaphore used as a lock.
+
+    Raises:
+        sysv_ipc.ExistentialError: If the address is not a valid shared
+            memory segment or the semaphores do not exist.
+
+    """
+
+    def __init__(self, address, create=False, capacity=None):
+        self.address = address
+        self.mm = None
+        self.count = None
+        self.lock = None
+        if create:
+            if capacity is None:
+                capacity = _default_capacity
+            self.count = sysv_ipc.Semaphore(None, sysv_ipc.IPC_CREX,
+                                            initial_value=0)
+            self.lock = sysv_ipc.Semaphore(None, sysv_ipc.IPC_CREX,
+                                           initial_value=1)
+            fd = os.open(address, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+            try:
+                os.ftruncate(fd, _header_size + capacity)
+                self.mm = mmap.mmap(fd, _header_size + capacity)
+            finally:
+                os.close(fd)
+            struct.pack_into(_header_fmt, self.mm, 0, _magic, capacity,
+                             0, 0, self.count.key, self.lock.key)
+        else:
+            try:
+                fd = os.open(address, os.O_RDWR)
+            except OSError:
+                raise sysv_ipc.ExistentialError(
+                    "Shared memory segment '%s' does not exist." % address)
+            try:
+                self.mm = mmap.mmap(fd, 0)
+            finally:
+                os.close(fd)
+            magic, capacity, _, _, count_key, lock_key = struct.unpack_from(
+                _header_fmt, self.mm, 0)
+            if magic != _magic:  # pragma: debug
+                raise sysv_ipc.ExistentialError(
+                    "'%s' is not a shared memory segment." % address)
+            self.count = sysv_ipc.Semaphore(count_key)
+            self.lock = sysv_ipc.Semaphore(lock_key)
+        # Timeouts are not supported on all platforms so the message count
+        # is checked without blocking and the caller waits
+        self.count.block = False
+        self.lock.undo = True
+        self.capacity = capacity
+
+    @classmethod
+    def create(cls, capacity=None):
+        r"""Create a new shared memory segment with a unique address.
+
+        Args:
+            capacity (int, optional): Size (in bytes) of the ring buffer.
+                Defaults to _default_capacity.
+
+        Returns:
+            SharedRingBuffer: New ring buffer.
+
+        """
+        address = os.path.join(get_shm_directory(),
+                               'ygg-%s.shm' % uuid.uuid4().hex)
+        return cls(address, create=True, capacity=capacity)
+
+    @property
+    def nmsg(self):
+        r"""int: Number of messages in the buffer."""
+        return self.count.value
+
+    def _get(self, offset):
+        return struct.unpack_from(_record_fmt, self.mm, offset)[0]
+
+    def _set(self, offset, value):
+        struct.pack_into(_record_fmt, self.mm, offset, value)
+
+    def _copy_in(self, pos, data):
+        start = pos % self.capacity
+        n = min(len(data), self.capacity - start)
+        self.mm[(_header_size + start):(_header_size + start + n)] = data[:n]
+        if n < len(data):
+            self.mm[_header_size:(_header_size + len(data) - n)] = data[n:]
+
+    def _copy_out(self, pos, size):
+        start = pos % self.capacity
+        n = min(size, self.capacity - start)
+        out = self.mm[(_header_size + start):(_header_size + start + n)]
+        if n < size:
+            out += self.mm[_header_size:(_header_size + size - n)]
+        return out
+
+    def write(self, data):
+        r"""Write a message to the buffer.
+
+        Args:
+            data (bytes): Message.
+
+        Returns:
+            bool: True if the message was written, False if there is not
+                currently enough room in the buffer.
+
+        Raises:
+            ValueError: If the message is larger than the buffer.
+
+        """
+        size = _record_size + len(data)
+        if size > self.capacity:
+            raise ValueError(("Message (%d bytes) is larger than the shared "
+                              "memory buffer (%d bytes).")
+                             % (len(data), self.capacity))
+        if self.count.value >= sysv_ipc.SEMAPHORE_VALUE_MAX:  # pragma: debug
+            return False
+        self.lock.acquire()
+        try:
+            head = self._get(_offset_head)
+            tail = self._get(_offset_tail)
+            if (self.capacity - (head - tail)) < size:
+                return False
+            self._copy_in(head, struct.pack(_record_fmt, len(data)))
+            self._copy_in(head + _record_size, data)
+            self._set(_offset_head, head + size)
+        finally:
+            self.lock.release()
+        self.count.release()
+        return True
+
+    def read(self):
+        r"""Read a message from the buffer.
+
+        Returns:
+            bytes: Message or None if there are not any messages in the
+                buffer.
+
+        """
+        try:
+            self.count.acquire()
+        except sysv_ipc.BusyError:
+            return None
+        self.lock.acquire()
+        try:
+            tail = self._get(_offset_tail)
+            size = struct.unpack(_record_fmt,
+                                 self._copy_out(tail, _record_size))[0]
+            out = self._copy_out(tail + _record_size, size)
+            self._set(_offset_tail, tail + _record_size + size)
+        finally:
+            self.lock.release()
+        return out
+
+    def remove(self):
+        r"""Remove the semaphores and the file backing the shared memory.
+        Processes that have already mapped the file can continue to access
+        the memory, but will receive errors when using the semaphores.
+
+        Returns:
+            bool: True if the segment was removed, False if it was already
+                removed.
+
+        """
+        out = True
+        for x in [self.count, self.lock]:
+            try:
+                x.remove()
+            except sysv_ipc.ExistentialError:  # pragma: debug
+                out = False
+        try:
+            os.remove(self.address)
+        except OSError:  # pragma: debug
+            out = False
+        return out
+
+
+def get_segment(address=None):
+    r"""Create or return a shared memory ring buffer and register it.
+
+    Args:
+        address (str, optional): If provided, address of an existing
+            segment that should be returned. Defaults to None and a new
+            segment is created.
+
+    Returns:
+        SharedRingBuffer: Shared memory ring buffer.
+
+    """
+    if _shm_installed:
+        if address is None:
+            out = SharedRingBuffer.create()
+        else:
+            out = CommBase.get_comm_registry('SHMComm').get(address, None)
+            if out is None:
+                out = SharedRingBuffer(address)
+        CommBase.register_comm('SHMComm', out.address, out)
+        return out
+    else:  # pragma: windows
+        logger.warning("Shared memory not installed. "
+                       "Segment cannot be returned.")
+        return None
+
+
+class SHMComm(AsyncComm.AsyncComm):
+    r"""Class for handling I/O via a ring buffer in shared memory. Unlike
+    IPC message queues, messages are limited by the size of the shared
+    memory buffer rather than the operating system so large messages can
+    be sent without being split into many small parts.
+
+    Attributes:
+        segment (SharedRingBuffer): Shared memory ring buffer.
+
+    """
+
+    _commtype = 'shm'
+    _schema_subtype_description = ('Ring buffer in shared memory.')
+    _maxMsgSize = 2**20
+    address_description = ("Path to the file backing the shared memory "
+                           "segment.")
+
+    def _init_before_open(self, **kwargs):
+        r"""Initialize empty segment."""
+        self.segment = None
+        super(SHMComm, self)._init_before_open(**kwargs)
+
+    @classmethod
+    def underlying_comm_class(self):
+        r"""str: Name of underlying communication class."""
+        return 'SHMComm'
+
+    @classmethod
+    def close_registry_entry(cls, value):
+        r"""Close a registry entry."""
+        return value.remove()
+
+    @classmethod
+    def new_comm_kwargs(cls, *args, **kwargs):
+        r"""Initialize communication with new segment."""
+        if 'address' not in kwargs:
+            kwargs.setdefault('address', 'generate')
+        return args, kwargs
+
+    def bind(self):
+        r"""Create a new segment if address is generate."""
+        if not self._bound:
+            if self.address == 'generate':
+                self._bound = True
+                self.address = get_segment().address
+        super(SHMComm, self).bind()
+
+    def open_after_bind(self):
+        r"""Open the connection by attaching to the segment at the bound
+        address."""
+        self.segment = get_segment(self.address)
+
+    def _open_direct(self):
+        r"""Open the segment."""
+        if not self.is_open_direct:
+            self.bind()
+            self.open_after_bind()
+            self.debug("segment: %s", self.address)
+
+    def _close_direct(self, skip_remove=False):
+        r"""Close the segment."""
+        if self._bound and (self.segment is None):
+            try:
+                self.open_after_bind()
+            except sysv_ipc.ExistentialError:  # pragma: debug
+                self.segment = None
+                self._bound = False
+        # Remove the segment
+        dont_close = (skip_remove or self.is_client)
+        if (self.segment is not None) and (not dont_close):
+            # Dont close for client because server will not be able
+            # to unregister the comm
+            self.unregister_comm(self.address, dont_close=dont_close)
+        self.segment = None
+        self._bound = False
+
+    @property
+    def is_open_direct(self):
+        r"""bool: True if the segment is not None."""
+        if self.segment is None:
+            return False
+        try:
+            self.segment.nmsg
+        except AttributeError:  # pragma: debug
+            if self.segment is not None:
+                raise
+            return False
+        except sysv_ipc.ExistentialError:  # pragma: debug
+            self._close_direct()
+            return False
+        return True
+
+    def confirm_send(self, noblock=False):
+        r"""Confirm that sent message was received."""
+        if noblock:
+            return True
+        return (self.n_msg_direct_send == 0)
+
+    def confirm_recv(self, noblock=False):
+        r"""Confirm that message was received."""
+        return True
+
+    @property
+    def n_msg_direct_send(self):
+        r"""int: Number of messages in the segment to send."""
+        if self.is_open_direct:
+            try:
+                return self.segment.nmsg
+            except AttributeError:  # pragma: debug
+                if self.is_open_direct:
+                    raise
+                return 0
+            except sysv_ipc.ExistentialError:  # pragma: debug
+                self._close_direct()
+                return 0
+        else:
+            return 0
+
+    @property
+    def n_msg_direct_recv(self):
+        r"""int: Number of messages in the segment to recv."""
+        return self.n_msg_direct_send
+
+    def _send_direct(self, payload):
+        r"""Send a message to the comm directly.
+
+        Args:
+            payload (str): Message to send.
+
+        Returns:
+            bool: Success or failure of sending the message.
+
+        """
+        if not self.is_open_direct:  # pragma: debug
+            return False
+        try:
+            self.debug('Sending %d bytes', len(payload))
+            if not self.segment.write(payload):
+                self.debug("Shared memory buffer full")
+                raise AsyncComm.AsyncTryAgain
+            self.debug('Sent %d bytes', len(payload))
+        except sysv_ipc.ExistentialError:  # pragma: debug
+            self.debug("Send failed")
+            self._close_direct()
+            return False
+        except AttributeError:  # pragma: debug
+            if self.is_closed:
+                self.debug("Comm closed")
+                return False
+            raise
+        return True
+
+    def _recv_direct(self):
+        r"""Receive a message from the comm directly.
+
+        Returns:
+            tuple (bool, str): The success or failure of receiving a message
+                and the message received.
+
+        """
+        self.debug("Message ready, reading it.")
+        try:
+            data = self.segment.read()
+            if data is None:  # pragma: debug
+                data = self.empty_bytes_msg
+            self.debug("Received %d bytes", len(data))
+        except sysv_ipc.ExistentialError:  # pragma: debug
+            self.debug("sysv_ipc.ExistentialError: closing")
+            self._close_direct()
+            return (False, self.empty_bytes_msg)
+        except AttributeError:  # pragma: debug
+            if self.is_closed:
+                self.debug("Segment closed")
+                return (False, self.empty_bytes_msg)
+            raise
+        return (True, data)
@@ -1,10 +1,12 @@
 import os
 import tempfile
+import threading
 import uuid
 import zmq
 import logging
-from yggdrasil import tools
+from yggdrasil import tools, platform
 from yggdrasil import multitasking
+from yggdrasil.config import ygg_cfg
 from yggdrasil.communication import CommBase, AsyncComm
 
 
@@ -20,10 +22,17 @@ _socket_protocols = ['tcp', 'inproc', 'ipc', 'udp', 'pgm', 'epgm']
 _flag_zmq_filter = b'_ZMQFILTER_'
 _default_socket_type = 4
 _default_protocol = 'tcp'
+# Frames at least this large are sent without copying them into a ZeroMQ
+# message (smaller frames are cheaper to copy than to track)
+_zero_copy_threshold = 2**16
 _wait_send_t = 0  # 0.0001
 _reply_msg = b'YGG_REPLY'
 _purge_msg = b'YGG_PURGE'
 _global_context = zmq.Context.instance()
+# Inproc endpoints that sockets bound to ipc addresses in this process are
+# also bound to, keyed by the ipc address
+_inproc_aliases = {}
+_inproc_aliases_lock = threading.Lock()
 
 
 def get_ipc_host():
@@ -35,6 +44,131 @@ def get_ipc_host():
     """
     return os.path.join(tempfile.gettempdir(), str(uuid.uuid4()) + '.ipc')
 
+
+def is_local_host(host):
+    r"""Determine if a host refers to the local machine.
+
+    Args:
+        host (str): Host name or IP address.
+
+    Returns:
+        bool: True if the host is the local machine.
+
+    """
+    import socket
+    return host in ['localhost', '127.0.0.1', '0.0.0.0', '*',
+                    socket.gethostname()]
+
+
+def get_default_protocol():
+    r"""Get the protocol that should be used for new addresses from the
+    'zmq_protocol' option in the 'general' section of the config file.
+
+    Returns:
+        str: Protocol.
+
+    """
+    return ygg_cfg.get('general', 'zmq_protocol', None) or _default_protocol
+
+
+def select_protocol(host=None):
+    r"""Select the fastest transport that can be used to reach a host. ipc
+    is used for the local host if the platform and ZeroMQ library support
+    it and tcp is used otherwise. Sockets bound to ipc addresses are also
+    bound to an inproc alias that is used by sockets connecting from the
+    same process (see get_connect_address).
+
+    Args:
+        host (str, optional): Host that the address should point to.
+            Defaults to None and the local host is assumed.
+
+    Returns:
+        str: Protocol.
+
+    """
+    if (host is not None) and (not is_local_host(host)):
+        return 'tcp'
+    if platform._is_win or (not zmq.has('ipc')):  # pragma: windows
+        return 'tcp'
+    return 'ipc'
+
+
+def get_inproc_alias(address):
+    r"""Get the inproc endpoint used as an alias for an ipc address.
+
+    Args:
+        address (str): ipc address.
+
+    Returns:
+        str: inproc address.
+
+    """
+    return format_address('inproc', parse_address(address)['host'])
+
+
+def bind_inproc_alias(socket, address, context):
+    r"""Bind a socket that is bound to an ipc address to the inproc alias
+    for the address so that sockets in the same process can connect without
+    going through the operating system.
+
+    Args:
+        socket (zmq.Socket): Socket that is bound to the ipc address.
+        address (str): ipc address that the socket is bound to.
+        context (zmq.Context): Context that the socket belongs to. Only
+            sockets with the same context can connect to the alias.
+
+    Returns:
+        str: inproc address that the socket was bound to or None if it
+            could not be bound.
+
+    """
+    alias = get_inproc_alias(address)
+    try:
+        socket.bind(alias)
+    except zmq.ZMQError:  # pragma: debug
+        logger.debug("Could not bind inproc alias %s", alias)
+        return None
+    with _inproc_aliases_lock:
+        _inproc_aliases[address] = (alias, context)
+    return alias
+
+
+def unbind_inproc_alias(socket, address):
+    r"""Unbind a socket from the inproc alias for an ipc address.
+
+    Args:
+        socket (zmq.Socket): Socket that is bound to the alias.
+        address (str): ipc address.
+
+    """
+    with _inproc_aliases_lock:
+        entry = _inproc_aliases.pop(address, None)
+    if entry is not None:
+        try:
+            socket.unbind(entry[0])
+        except zmq.ZMQError:  # pragma: debug
+            pass
+
+
+def get_connect_address(address, context):
+    r"""Get the address that a socket should connect to in order to reach
+    an address, using the inproc alias if the address is an ipc address
+    bound in this process with the same context.
+
+    Args:
+        address (str): Address to connect to.
+        context (zmq.Context): Context of the connecting socket.
+
+    Returns:
+        str: Address that should be connected to.
+
+    """
+    with _inproc_aliases_lock:
+        entry = _inproc_aliases.get(address, None)
+    if (entry is not None) and (entry[1] is context):
+        return entry[0]
+    return address
+
         
 def get_socket_type_mate(t_in):
     r"""Find the counterpart socket type.
@@ -505,8 +639,9 @@ class ZMQComm(AsyncComm.AsyncComm):
         Args:
             name (str): Name of new socket.
             protocol (str, optional): The protocol that should be used.
-                Defaults to None and is set to _default_protocol. See zmq for
-                details.
+                If 'auto', the protocol is selected by select_protocol.
+                Defaults to None and is set by get_default_protocol. See zmq
+                for details.
             host (str, optional): The host that should be used. Invalid for
                 'inproc' protocol. Defaults to 'localhost'.
             port (int, optional): The port used. Invalid for 'inproc' protocol.
@@ -520,7 +655,11 @@ class ZMQComm(AsyncComm.AsyncComm):
         """
         args = [name]
         if protocol is None:
-            protocol = _default_protocol
+            protocol = get_default_protocol()
+        if protocol == 'auto':
+            protocol = select_protocol(host)
+            if (protocol == 'ipc') and (host is not None):
+                host = None
         if host is None:
             if protocol in ['inproc', 'ipc']:
                 host = get_ipc_host()
@@ -588,6 +727,9 @@ class ZMQComm(AsyncComm.AsyncComm):
                     raise e
                 self.debug('Bound %s socket to %s.',
                            self.socket_type_name, self.address)
+                if self.protocol == 'ipc':
+                    bind_inproc_alias(self.socket, self.address,
+                                      self.context)
                 # Unbind if action should be connect
                 if self.socket_action == 'connect':
                     self.unbind(dont_close=True)
@@ -603,9 +745,10 @@ class ZMQComm(AsyncComm.AsyncComm):
         with self.socket_lock:
             if (self.socket_action == 'connect'):
                 self._connected = True
+                address = get_connect_address(self.address, self.context)
                 self.debug("Connecting %s socket to %s",
-                           self.socket_type_name, self.address)
-                self.socket.connect(self.address)
+                           self.socket_type_name, address)
+                self.socket.connect(address)
             if self._connected:
                 self.register_comm(self.registry_key, self.socket)
 
@@ -618,6 +761,8 @@ class ZMQComm(AsyncComm.AsyncComm):
                     self.socket.unbind(self.address)
                 except zmq.ZMQError:  # pragma: debug
                     pass
+                if self.protocol == 'ipc':
+                    unbind_inproc_alias(self.socket, self.address)
                 self.unregister_comm(self.registry_key, dont_close=dont_close)
                 self._bound = False
             self.debug('Unbound socket')
@@ -660,8 +805,13 @@ class ZMQComm(AsyncComm.AsyncComm):
         if self.reply_socket_send is None:
             s = self.context.socket(zmq.REP)
             s.setsockopt(zmq.LINGER, 0)
-            address = format_address(_default_protocol, 'localhost')
+            if self.protocol == 'ipc':
+                address = format_address('ipc', get_ipc_host())
+            else:
+                address = format_address(_default_protocol, 'localhost')
             address = bind_socket(s, address)
+            if self.protocol == 'ipc':
+                bind_inproc_alias(s, address, self.context)
             self.register_comm('REPLY_SEND_' + address, s)
             with self.reply_socket_lock:
                 self.reply_socket_send = s
@@ -675,7 +825,7 @@ class ZMQComm(AsyncComm.AsyncComm):
         if address not in self.reply_socket_recv:
             s = self.context.socket(zmq.REQ)
             s.setsockopt(zmq.LINGER, 0)
-            s.connect(address)
+            s.connect(get_connect_address(address, self.context))
             self.register_comm('REPLY_RECV_' + address, s)
             with self.reply_socket_lock:
                 self._n_reply_recv[address] = 0
@@ -818,6 +968,8 @@ class ZMQComm(AsyncComm.AsyncComm):
         super(ZMQComm, self)._close_backlog(wait=wait)
         if self.direction == 'send':
             if (self.reply_socket_send is not None):
+                unbind_inproc_alias(self.reply_socket_send,
+                                    self.reply_socket_address)
                 self.reply_socket_send.close(linger=0)  # self.zmq_sleeptime)
                 self.unregister_comm("REPLY_SEND_" + self.reply_socket_address)
         else:
@@ -1015,6 +1167,9 @@ class ZMQComm(AsyncComm.AsyncComm):
             total_msg = msg
         total_msg = self.check_reply_socket_send(total_msg)
         kwargs.setdefault('flags', zmq.NOBLOCK)
+        # Large frames are sent without copying (bytes are immutable so
+        # ZeroMQ can reference the buffer until the frame is sent)
+        kwargs.setdefault('copy', len(total_msg) < _zero_copy_threshold)
         with self.socket_lock:
             try:
                 if self.socket.closed:  # pragma: debug
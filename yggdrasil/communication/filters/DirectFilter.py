@@ -5,6 +5,7 @@ class DirectFilter(FilterBase):
     r"""Class that always passes messages."""
 
     _filtertype = 'direct'
+    accepts_lazy = True
 
     def evaluate_filter(self, x):
         r"""Call filter on the provided message.
@@ -9,12 +9,18 @@ class FilterBase(ComponentBase):
         initial_state (dict, optional): Dictionary of initial state variables
             that should be set when the filter is created.
 
+    Class Attributes:
+        accepts_lazy (bool): True if the filter can be applied to
+            messages that have not been completely decoded (see
+            yggdrasil.metaschema.datatypes.JSONObjectMetaschemaType.LazyObject).
+
     """
 
     _filtertype = None
     _schema_type = 'filter'
     _schema_subtype_key = 'filtertype'
     _schema_properties = {'initial_state': {'type': 'object'}}
+    accepts_lazy = False
 
     def __init__(self, *args, **kwargs):
         self._state = {}
@@ -1,3 +1,4 @@
+import threading
 from yggdrasil.communication.tests import test_CommBase
 
 
@@ -11,3 +12,19 @@ class TestBufferComm(test_CommBase.TestCommBase):
         # Skipped because the name is not used to intialize
         # the address for a buffer
         pass
+
+    def test_recv_metrics(self):
+        r"""Test that the time spent waiting for a message is included in
+        the receive latency."""
+        delay = 0.2
+        timer = threading.Timer(delay, self.send_instance.send,
+                                args=(self.test_msg, ))
+        timer.start()
+        try:
+            flag, msg_recv = self.recv_instance.recv(timeout=self.timeout)
+        finally:
+            timer.join()
+        assert(flag)
+        self.assert_msg_equal(msg_recv, self.test_msg)
+        assert(self.recv_instance.metrics.histograms['recv'].max
+               >= 0.5 * delay)
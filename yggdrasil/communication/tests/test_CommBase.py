@@ -1,10 +1,16 @@
+import asyncio
 import os
 import uuid
 import unittest
+import numpy as np
 from yggdrasil.tests import YggTestClassInfo, assert_equal
 from yggdrasil.communication import new_comm, get_comm, CommBase
 from yggdrasil.communication.filters.StatementFilter import StatementFilter
 from yggdrasil.communication.filters.FunctionFilter import FunctionFilter
+from yggdrasil.communication.transforms.SelectFieldsTransform import (
+    SelectFieldsTransform)
+from yggdrasil.metaschema.datatypes.JSONObjectMetaschemaType import (
+    LazyObject)
 
 
 def test_registry():
@@ -24,6 +30,42 @@ def test_registry():
     assert(not CommBase.unregister_comm(comm_class, key))
 
 
+def test_lazy_recv():
+    r"""Test lazy decoding of received objects."""
+    msg = {'a': np.zeros(3), 'b': np.ones(3)}
+
+    def fpass(x):
+        return True
+
+    send = CommBase.CommBase('test_lazy_send', address='address',
+                             direction='send')
+    recv = CommBase.CommBase('test_lazy_recv', address='address',
+                             direction='recv',
+                             transform=[SelectFieldsTransform(selected=['a'])],
+                             filter=StatementFilter(
+                                 statement='%x%["a"][0] == 0'))
+    recv_func = CommBase.CommBase('test_lazy_recv_func', address='address',
+                                  direction='recv',
+                                  filter=FunctionFilter(function=fpass))
+    try:
+        assert(not send.lazy_recv)
+        assert(recv.lazy_recv)
+        assert(not recv_func.lazy_recv)
+        s_msg = send.serialize(msg, add_serializer_info=True)
+        x = recv.deserialize(s_msg, lazy=True)[0]
+        assert(isinstance(x, LazyObject))
+        flag, y, _ = recv.on_recv(s_msg)
+        assert(flag)
+        assert(isinstance(y, LazyObject))
+        assert(recv.evaluate_filter(y))
+        assert_equal(recv.materialize(y), {'a': msg['a']})
+        assert_equal(recv.materialize(msg), msg)
+    finally:
+        send.close()
+        recv.close()
+        recv_func.close()
+
+
 class TestCommBase(YggTestClassInfo):
     r"""Tests for CommBase communication class.
 
@@ -465,6 +507,31 @@ class TestCommBase(YggTestClassInfo):
             assert(flag)
         assert(not msg_recv)
 
+    def test_send_recv_async(self):
+        r"""Test send/recv of a small message using the coroutines."""
+        loop = asyncio.new_event_loop()
+        try:
+            if not self.recv_instance.is_file:
+                # Timeout with no message
+                flag_recv, msg_recv = loop.run_until_complete(
+                    self.recv_instance.recv_async(timeout=self.sleeptime))
+                if self.comm not in ['CommBase', 'AsyncComm']:
+                    assert(flag_recv)
+                    assert(self.recv_instance.is_empty_recv(msg_recv))
+            flag_send = loop.run_until_complete(
+                self.send_instance.send_async(self.test_msg))
+            flag_recv, msg_recv = loop.run_until_complete(
+                self.recv_instance.recv_async(timeout=self.timeout))
+            if self.comm in ['CommBase', 'AsyncComm']:
+                assert(not flag_send)
+                assert(not flag_recv)
+            else:
+                assert(flag_send)
+                assert(flag_recv)
+                self.assert_msg_equal(msg_recv, self.test_msg)
+        finally:
+            loop.close()
+
     def add_filter(self, comm, filter=None):
         r"""Add a filter to a comm.
 
@@ -602,6 +669,39 @@ class TestCommBase(YggTestClassInfo):
                           send_kwargs=dict(header_kwargs=dict(x=self.msg_long)),
                           print_status=True)
 
+    def test_send_recv_nolimit_reuse(self):
+        r"""Test that work comms are reused for consecutive large messages."""
+        if ((self.comm in ['CommBase', 'AsyncComm'])
+                or (not self.send_instance.reuse_work_comms)
+                or (self.maxMsgSize == 0)):
+            return
+        for _ in range(3):
+            self.do_send_recv('send_nolimit', 'recv_nolimit', self.msg_long)
+        self.assert_equal(len(self.send_instance._work_comms), 1)
+        self.assert_equal(len(self.send_instance._work_comm_pool), 1)
+        self.assert_equal(len(self.recv_instance._work_comms), 1)
+
+    def test_send_recv_nolimit_partner_language(self):
+        r"""Test that only one work comm is used for large messages sent
+        to a partner that is not written in Python."""
+        if ((self.comm in ['CommBase', 'AsyncComm'])
+                or (not self.send_instance.reuse_work_comms)
+                or (self.maxMsgSize == 0)):
+            return
+        self.send_instance.partner_language = 'c'
+        nmsg = self.send_instance._max_work_comm_pool + 1
+        # Send all of the messages before receiving so that the work comm
+        # is still being drained when it is reused
+        for _ in range(nmsg):
+            assert(self.send_instance.send_nolimit(self.msg_long))
+        for _ in range(nmsg):
+            flag, msg_recv = self.recv_instance.recv_nolimit(
+                timeout=self.timeout)
+            assert(flag)
+            self.assert_msg_equal(msg_recv, self.msg_long)
+        self.assert_equal(len(self.send_instance._work_comm_pool), 1)
+        self.assert_equal(len(self.recv_instance._work_comms), 1)
+
     def test_send_recv_array(self):
         r"""Test send/recv of a array message."""
         msg_send = getattr(self, 'test_msg_array', None)
@@ -1,12 +1,43 @@
 import os
 import copy
+import time
+import tempfile
+import threading
 import unittest
 import jsonschema
+from yggdrasil import platform
 from yggdrasil.tests import assert_equal
-from yggdrasil.communication import new_comm
+from yggdrasil.communication import new_comm, FileComm
 from yggdrasil.communication.tests import test_CommBase as parent
 
 
+def test_FileWatcher():
+    r"""Test waiting for a file to grow with and without inotify."""
+    fname = os.path.join(tempfile.gettempdir(), 'temp_file_watch.txt')
+    with open(fname, 'wb') as fd:
+        fd.write(b'a')
+
+    def append_byte():
+        with open(fname, 'ab') as fd:
+            fd.write(b'b')
+
+    try:
+        for i, use_inotify in enumerate([True, False]):
+            x = FileComm.FileWatcher(fname, use_inotify=use_inotify)
+            assert_equal(x.uses_inotify, use_inotify and platform._is_linux)
+            assert(x.wait(i, timeout=0))
+            assert(not x.wait(i + 1, timeout=0.01))
+            assert(not x.wait(i + 1, interrupt=lambda: True))
+            t = threading.Timer(0.05, append_byte)
+            t.start()
+            assert(x.wait(i + 1, timeout=5.0))
+            t.join()
+            x.close()
+            assert(not x.uses_inotify)
+    finally:
+        os.remove(fname)
+
+
 def test_wait_for_creation():
     r"""Test FileComm waiting for creation."""
     msg_send = b'Test message\n'
@@ -46,8 +77,8 @@ class TestFileComm(parent.TestCommBase):
     comm = 'FileComm'
     attr_list = (copy.deepcopy(parent.TestCommBase.attr_list)
                  + ['fd', 'read_meth', 'append', 'in_temp',
-                    'is_series', 'wait_for_creation', 'serializer',
-                    'platform_newline'])
+                    'is_series', 'wait_for_creation', 'follow',
+                    'serializer', 'platform_newline'])
     
     def teardown(self):
         r"""Remove the file."""
@@ -127,6 +158,104 @@ class TestFileComm(parent.TestCommBase):
                 contents = fd.read()
             self.assert_equal(contents, self.testing_options['contents'])
 
+    def test_follow(self):
+        r"""Test receiving data appended to a followed file."""
+        if not self.recv_instance.concats_as_str:
+            # Files must be valid as they are appended to
+            return
+        send_objects = self.testing_options['send']
+        recv_objects_partial = self.testing_options['recv_partial']
+        # Write to file
+        flag = self.send_instance.send(send_objects[0])
+        assert(flag)
+        # Create temp file for receiving
+        recv_kwargs = copy.deepcopy(self.inst_kwargs)
+        recv_kwargs['follow'] = True
+        new_inst_recv = new_comm('follow%s' % self.uuid, **recv_kwargs)
+        assert(new_inst_recv.watcher is not None)
+        self.recv_message_list(new_inst_recv, recv_objects_partial[0],
+                               break_on_empty=True)
+        # Open file in append and receive as messages are sent
+        send_kwargs = copy.deepcopy(self.send_inst_kwargs)
+        send_kwargs['append'] = True
+        new_inst_send = new_comm('append%s' % self.uuid, **send_kwargs)
+        for i in range(1, len(send_objects)):
+            if not recv_objects_partial[i]:
+                flag = new_inst_send.send(send_objects[i])
+                assert(flag)
+                continue
+            t = threading.Timer(self.sleeptime, new_inst_send.send,
+                                args=[send_objects[i]])
+            t.start()
+            msg_list = []
+            for _ in recv_objects_partial[i]:
+                flag, msg_recv = new_inst_recv.recv(timeout=self.timeout)
+                assert(flag)
+                msg_list.append(msg_recv)
+            t.join()
+            self.assert_msg_lists_equal(msg_list, recv_objects_partial[i])
+        # Nothing more to receive
+        flag, msg_recv = new_inst_recv.recv(timeout=self.sleeptime)
+        assert(flag)
+        assert(new_inst_recv.is_empty_recv(msg_recv))
+        self.remove_instance(new_inst_send)
+        self.remove_instance(new_inst_recv)
+
+    def test_follow_timeout(self):
+        r"""Test that wake-ups for partial lines do not extend the timeout
+        for a receive from a followed file."""
+        if self.recv_instance.read_meth != 'readline':
+            return
+        flag = self.send_instance.send(self.testing_options['send'][0])
+        assert(flag)
+        recv_kwargs = copy.deepcopy(self.inst_kwargs)
+        recv_kwargs['follow'] = True
+        new_inst_recv = new_comm('follow%s' % self.uuid, **recv_kwargs)
+        self.recv_message_list(new_inst_recv,
+                               self.testing_options['recv_partial'][0],
+                               break_on_empty=True)
+        stop = threading.Event()
+
+        def append_partial():
+            while not stop.wait(0.05):
+                with open(new_inst_recv.address, 'ab') as fd:
+                    fd.write(b'x')
+
+        t = threading.Thread(target=append_partial)
+        t.start()
+        try:
+            t0 = time.perf_counter()
+            flag, msg_recv = new_inst_recv.recv(timeout=0.5)
+            assert((time.perf_counter() - t0) < 2.0)
+        finally:
+            stop.set()
+            t.join()
+        assert(flag)
+        assert(new_inst_recv.is_empty_recv(msg_recv))
+        self.remove_instance(new_inst_recv)
+
+    def test_follow_close(self):
+        r"""Test that closing a followed file with linger interrupts a
+        receive that is blocked without a timeout."""
+        if not self.recv_instance.concats_as_str:
+            return
+        recv_kwargs = copy.deepcopy(self.inst_kwargs)
+        recv_kwargs.update(follow=True, recv_timeout=False)
+        new_inst_recv = new_comm('follow%s' % self.uuid, **recv_kwargs)
+        t_recv = threading.Thread(target=new_inst_recv.recv)
+        t_recv.start()
+        time.sleep(0.1)
+        assert(t_recv.is_alive())
+        t_close = threading.Thread(target=new_inst_recv.close,
+                                   kwargs={'linger': True})
+        t_close.start()
+        t_close.join(self.timeout)
+        assert(not t_close.is_alive())
+        t_recv.join(self.timeout)
+        assert(not t_recv.is_alive())
+        assert(new_inst_recv.is_closed)
+        self.remove_instance(new_inst_recv)
+
     def test_series(self):
         r"""Test sending/receiving to/from a series of files."""
         # Set up series
@@ -0,0 +1,13 @@
+from yggdrasil.communication.tests.test_FileComm import TestFileComm
+
+
+class TestPlyFileComm(TestFileComm):
+    r"""Test for PlyFileComm communication class."""
+
+    comm = 'PlyFileComm'
+
+
+class TestPlyFileCommBinary(TestPlyFileComm):
+    r"""Test for PlyFileComm communication class with binary format."""
+
+    testing_option_kws = {'plyformat': 'binary_little_endian 1.0'}
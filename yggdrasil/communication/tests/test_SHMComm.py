@@ -0,0 +1,75 @@
+import os
+import copy
+import unittest
+from yggdrasil.tests import assert_raises, assert_equal
+from yggdrasil.communication import new_comm
+from yggdrasil.communication import SHMComm, CommBase
+from yggdrasil.communication.tests import test_AsyncComm
+
+
+_shm_installed = SHMComm.SHMComm.is_installed(language='python')
+
+
+@unittest.skipIf(not _shm_installed, "Shared memory library not installed")
+def test_segment():
+    r"""Test creation/removal of shared memory segment."""
+    x = SHMComm.get_segment()
+    assert(os.path.isfile(x.address))
+    assert(CommBase.is_registered('SHMComm', x.address))
+    assert(SHMComm.get_segment(x.address) is x)
+    y = SHMComm.SharedRingBuffer(x.address)
+    assert_equal(y.capacity, x.capacity)
+    CommBase.unregister_comm('SHMComm', x.address)
+    assert(not CommBase.is_registered('SHMComm', x.address))
+    assert(not os.path.isfile(x.address))
+    assert_raises(SHMComm.sysv_ipc.ExistentialError,
+                  SHMComm.SharedRingBuffer, x.address)
+    assert(not x.remove())
+
+
+@unittest.skipIf(not _shm_installed, "Shared memory library not installed")
+def test_ring_buffer():
+    r"""Test wrapping and filling of the ring buffer."""
+    x = SHMComm.SharedRingBuffer.create(capacity=64)
+    y = SHMComm.SharedRingBuffer(x.address)
+    try:
+        assert_equal(y.read(), None)
+        assert_raises(ValueError, x.write, 64 * b'a')
+        for i in range(10):
+            msg = (i + 1) * str(i).encode('utf-8')
+            assert(x.write(msg))
+            assert_equal(y.nmsg, 1)
+            assert_equal(y.read(), msg)
+        assert(x.write(20 * b'a'))
+        assert(x.write(20 * b'b'))
+        assert(not x.write(20 * b'c'))
+        assert_equal(y.nmsg, 2)
+        assert_equal(y.read(), 20 * b'a')
+        assert(x.write(20 * b'c'))
+        assert_equal(y.read(), 20 * b'b')
+        assert_equal(y.read(), 20 * b'c')
+        assert_equal(y.nmsg, 0)
+    finally:
+        x.remove()
+
+
+@unittest.skipIf(not _shm_installed, "Shared memory library not installed")
+class TestSHMComm(test_AsyncComm.TestAsyncComm):
+    r"""Test for SHMComm communication class."""
+
+    comm = 'SHMComm'
+    attr_list = (copy.deepcopy(test_AsyncComm.TestAsyncComm.attr_list)
+                 + ['segment'])
+
+
+@unittest.skipIf(_shm_installed, "Shared memory library installed")
+def test_segment_not_installed():  # pragma: windows
+    r"""Test return of get_segment if shared memory is not installed."""
+    assert_equal(SHMComm.get_segment(), None)
+
+
+@unittest.skipIf(_shm_installed, "Shared memory library installed")
+def test_not_running():  # pragma: windows
+    r"""Test raise of an error if shared memory is not installed."""
+    comm_kwargs = dict(comm='SHMComm', direction='send', reverse_names=True)
+    assert_raises(RuntimeError, new_comm, 'test', **comm_kwargs)
@@ -37,6 +37,14 @@ class TestServerComm(test_CommBase.TestCommBase):
         r"""Disabled: Test creating/removing a work comm."""
         pass  # pragma: no cover
 
+    def test_send_recv_nolimit_reuse(self):
+        r"""Disabled: Test reuse of work comms for large messages."""
+        pass  # pragma: no cover
+
+    def test_send_recv_nolimit_partner_language(self):
+        r"""Disabled: Test work comms used for non-Python partners."""
+        pass  # pragma: no cover
+
     def test_newcomm_server(self):
         r"""Test creation of server using newcomm."""
         inst = new_comm('testserver_%s' % str(uuid.uuid4()), comm=self.comm)
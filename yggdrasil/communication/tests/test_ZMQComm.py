@@ -2,6 +2,7 @@ import unittest
 import zmq
 import copy
 from yggdrasil import platform
+from yggdrasil.config import temp_config
 from yggdrasil.tests import assert_raises, assert_equal
 from yggdrasil.communication import new_comm
 from yggdrasil.communication.tests import test_AsyncComm
@@ -43,6 +44,48 @@ def test_invalid_protocol():
                   comm='ZMQComm', protocol='invalid')
 
 
+@unittest.skipIf(not _zmq_installed, "ZMQ library not installed")
+def test_select_protocol():
+    r"""Test selection of the protocol based on the host."""
+    assert_equal(ZMQComm.select_protocol('remotehost.example.com'), 'tcp')
+    if platform._is_win:  # pragma: windows
+        assert_equal(ZMQComm.select_protocol(), 'tcp')
+    else:
+        assert_equal(ZMQComm.select_protocol(), 'ipc')
+        assert_equal(ZMQComm.select_protocol('localhost'), 'ipc')
+    with temp_config(zmq_protocol='auto'):
+        assert_equal(ZMQComm.get_default_protocol(), 'auto')
+        _, kws = ZMQComm.ZMQComm.new_comm_kwargs('test_select_protocol')
+        assert_equal(ZMQComm.parse_address(kws['address'])['protocol'],
+                     ZMQComm.select_protocol())
+
+
+@unittest.skipIf(not _zmq_installed, "ZMQ library not installed")
+@unittest.skipIf(platform._is_win, "Testing on Windows")
+def test_inproc_alias():
+    r"""Test connection through the inproc alias for an ipc address."""
+    address = ZMQComm.format_address('ipc', ZMQComm.get_ipc_host())
+    ctx = zmq.Context.instance()
+    s = ctx.socket(zmq.PAIR)
+    r = ctx.socket(zmq.PAIR)
+    try:
+        ZMQComm.bind_socket(s, address)
+        alias = ZMQComm.bind_inproc_alias(s, address, ctx)
+        assert_equal(alias, ZMQComm.get_inproc_alias(address))
+        assert_equal(ZMQComm.get_connect_address(address, ctx), alias)
+        assert_equal(ZMQComm.get_connect_address(address, zmq.Context()),
+                     address)
+        r.connect(ZMQComm.get_connect_address(address, ctx))
+        msg = b'a' * (2 * ZMQComm._zero_copy_threshold)
+        s.send(msg, copy=False)
+        assert_equal(r.recv(), msg)
+        ZMQComm.unbind_inproc_alias(s, address)
+        assert_equal(ZMQComm.get_connect_address(address, ctx), address)
+    finally:
+        s.close(linger=0)
+        r.close(linger=0)
+
+
 @unittest.skipIf(not _zmq_installed, "ZMQ library not installed")
 @unittest.skipIf(platform._is_mac, "Testing on MacOS")
 @unittest.skipIf(platform._is_win, "Testing on Windows")
@@ -131,6 +174,22 @@ class TestZMQCommIPC(TestZMQComm):
 class TestZMQCommIPC_client(TestZMQComm_client, TestZMQCommIPC):
     r"""Test for ZMQComm communication class with IPC socket."""
     pass
+
+
+class TestZMQCommAUTO(TestZMQComm):
+    r"""Test for ZMQComm communication class with the protocol selected
+    automatically."""
+
+    protocol = 'auto'
+
+    def test_protocol(self):
+        r"""Test that the fastest available transport was selected."""
+        assert_equal(self.instance.protocol, ZMQComm.select_protocol())
+        if self.instance.protocol == 'ipc':
+            # Comms in the same process connect through the inproc alias
+            assert_equal(ZMQComm.get_connect_address(
+                self.instance.address, self.instance.context),
+                ZMQComm.get_inproc_alias(self.instance.address))
     
 
 # Unsupported
@@ -185,6 +244,14 @@ class TestZMQCommREQ(TestZMQComm):
     def test_send_recv_condition(self):
         r"""Test send/recv with conditional."""
         pass
+
+    def test_send_recv_nolimit_reuse(self):
+        r"""Disabled: Test reuse of work comms for large messages."""
+        pass
+
+    def test_send_recv_nolimit_partner_language(self):
+        r"""Disabled: Test work comms used for non-Python partners."""
+        pass
     
 
 class TestZMQCommROUTER(TestZMQComm):
@@ -306,9 +306,10 @@ class ArrayTransform(TransformBase):
 
         Args:
             x (object): Message object to transform.
-            no_copy (bool, optional): If True, the transformation occurs in
-                place. Otherwise a copy is created and transformed. Defaults
-                to False.
+            no_copy (bool, optional): If True, the transformed message may
+                share data with the input message, but the input message
+                will not be modified. Otherwise a copy is created and
+                transformed. Defaults to False.
 
         Returns:
             object: The transformed message.
@@ -316,10 +317,12 @@ class ArrayTransform(TransformBase):
         """
         out = x
         np_dtype = type2numpy(self.transformed_datatype)
+        # Only arrays that may share data with the input need to be
+        # copied, all other branches create a new array
         if isinstance(x, pandas.DataFrame):
-            out = pandas2numpy(x).astype(np_dtype, copy=True)
+            out = pandas2numpy(x).astype(np_dtype, copy=False)
         elif isinstance(x, np.ndarray):
-            out = x.astype(np_dtype, copy=True)
+            out = x.astype(np_dtype, copy=(not no_copy))
         elif np_dtype and isinstance(x, (list, tuple, dict,
                                          np.ndarray)):
             if len(x) == 0:
@@ -332,8 +335,6 @@ class ArrayTransform(TransformBase):
             # warning?
             raise TypeError(("Cannot consolidate object of type %s "
                              "into a structured numpy array.") % type(x))
-        if not no_copy:
-            out = copy.deepcopy(out)
         return out
     
     @classmethod
@@ -5,15 +5,17 @@ class DirectTransform(TransformBase):
     r"""Base class for message transforms."""
 
     _transformtype = 'direct'
+    accepts_lazy = True
 
     def evaluate_transform(self, x, no_copy=False):
         r"""Call transform on the provided message.
 
         Args:
             x (object): Message object to transform.
-            no_copy (bool, optional): If True, the transformation occurs in
-                place. Otherwise a copy is created and transformed. Defaults
-                to False.
+            no_copy (bool, optional): If True, the transformed message may
+                share data with the input message, but the input message
+                will not be modified. Otherwise a copy is created and
+                transformed. Defaults to False.
 
         Returns:
             object: The transformed message.
@@ -22,9 +22,9 @@ class FunctionTransform(TransformBase):
 
         Args:
             x (object): Message object to transform.
-            no_copy (bool, optional): If True, the transformation occurs in
-                place. Otherwise a copy is created and transformed. Defaults
-                to False.
+            no_copy (bool, optional): Unused. The message is passed to the
+                function as is, so the function should not modify it.
+                Defaults to False.
 
         Returns:
             object: The transformed message.
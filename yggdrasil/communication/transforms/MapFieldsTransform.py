@@ -45,9 +45,10 @@ class MapFieldsTransform(TransformBase):
 
         Args:
             x (object): Message object to transform.
-            no_copy (bool, optional): If True, the transformation occurs in
-                place. Otherwise a copy is created and transformed. Defaults
-                to False.
+            no_copy (bool, optional): If True, the transformed message may
+                share data with the input message, but the input message
+                will not be modified. Otherwise a copy is created and
+                transformed. Defaults to False.
 
         Returns:
             object: The transformed message.
@@ -55,19 +56,28 @@ class MapFieldsTransform(TransformBase):
         """
         out = x
         if isinstance(x, dict):
-            if not no_copy:
+            # A shallow copy is sufficient to prevent modifying the input
+            if no_copy:
+                out = copy.copy(x)
+            else:
                 out = copy.deepcopy(x)
             for kold, knew in self.map.items():
                 out[knew] = out.pop(kold)
         elif isinstance(x, (list, tuple)):
             pass
         elif isinstance(x, np.ndarray):
-            if not no_copy:
-                out = copy.deepcopy(x)
+            # Renaming via a view prevents modifying the input's dtype
             new_names = list(x.dtype.names)
             for kold, knew in self.map.items():
                 new_names[new_names.index(kold)] = knew
-            out.dtype.names = new_names
+            fields = [x.dtype.fields[k] for k in x.dtype.names]
+            new_dtype = np.dtype({'names': new_names,
+                                  'formats': [f[0] for f in fields],
+                                  'offsets': [f[1] for f in fields],
+                                  'itemsize': x.dtype.itemsize})
+            out = x.view(new_dtype)
+            if not no_copy:
+                out = out.copy()
         else:
             raise TypeError("Cannot map fields from object of type '%s'" % type(x))
         return out
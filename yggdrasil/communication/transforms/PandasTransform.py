@@ -13,9 +13,10 @@ class PandasTransform(ArrayTransform):
 
         Args:
             x (object): Message object to transform.
-            no_copy (bool, optional): If True, the transformation occurs in
-                place. Otherwise a copy is created and transformed. Defaults
-                to False.
+            no_copy (bool, optional): If True, the transformed message may
+                share data with the input message, but the input message
+                will not be modified. Otherwise a copy is created and
+                transformed. Defaults to False.
 
         Returns:
             object: The transformed message.
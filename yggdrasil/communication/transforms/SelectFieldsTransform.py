@@ -2,6 +2,8 @@ import numpy as np
 import pandas
 import copy
 from yggdrasil import serialize
+from yggdrasil.metaschema.datatypes.JSONObjectMetaschemaType import (
+    LazyObject)
 from yggdrasil.communication.transforms.TransformBase import TransformBase
 
 
@@ -24,6 +26,7 @@ class SelectFieldsTransform(TransformBase):
                           'original_order': {'type': 'array',
                                              'items': {'type': 'string'}},
                           'single_as_scalar': {'type': 'boolean'}}
+    accepts_lazy = True
 
     def set_original_datatype(self, datatype):
         r"""Set datatype.
@@ -111,16 +114,23 @@ class SelectFieldsTransform(TransformBase):
 
         Args:
             x (object): Message object to transform.
-            no_copy (bool, optional): If True, the transformation occurs in
-                place. Otherwise a copy is created and transformed. Defaults
-                to False.
+            no_copy (bool, optional): If True, the transformed message may
+                share data with the input message, but the input message
+                will not be modified. Otherwise a copy is created and
+                transformed. Defaults to False.
 
         Returns:
             object: The transformed message.
 
         """
         out = x
-        if isinstance(x, dict):
+        if isinstance(x, LazyObject):
+            # Only the selected fields are decoded
+            if self.as_single:
+                out = x[self.selected[0]]
+            else:
+                out = x.select(self.selected)
+        elif isinstance(x, dict):
             if self.as_single:
                 out = x[self.selected[0]]
             else:
@@ -160,7 +170,11 @@ class SelectFieldsTransform(TransformBase):
                                 'type': 'object',
                                 'properties': {x: {'type': 'int'}
                                                for x in 'abc'}}},
-                 'in/out': [(dict(zip('abc', range(3))), {'a': 0, 'c': 2})],
+                 'in/out': [(dict(zip('abc', range(3))), {'a': 0, 'c': 2}),
+                            (LazyObject(dict(zip('abc', range(3))),
+                                        {x: {'type': 'integer'}
+                                         for x in 'abc'}),
+                             {'a': 0, 'c': 2})],
                  'in/out_t': [({'type': 'object',
                                 'properties': {x: {'type': 'int'}
                                                for x in 'abc'}},
@@ -173,7 +187,10 @@ class SelectFieldsTransform(TransformBase):
                                 'type': 'object',
                                 'properties': {x: {'type': 'int'}
                                                for x in 'abc'}}},
-                 'in/out': [(dict(zip('abc', range(3))), 0)],
+                 'in/out': [(dict(zip('abc', range(3))), 0),
+                            (LazyObject(dict(zip('abc', range(3))),
+                                        {x: {'type': 'integer'}
+                                         for x in 'abc'}), 0)],
                  'in/out_t': [({'type': 'object',
                                 'properties': {x: {'type': 'int'}
                                                for x in 'abc'}},
@@ -32,8 +32,8 @@ class StatementTransform(TransformBase):
 
         Args:
             x (object): Message object to transform.
-            no_copy (bool, optional): If True, the transformation occurs in
-                place. Otherwise a copy is created and transformed. Defaults
+            no_copy (bool, optional): Unused. The statement is evaluated
+                on the message as is, so it should not modify it. Defaults
                 to False.
 
         Returns:
@@ -11,6 +11,11 @@ class TransformBase(ComponentBase):
         original_datatype (dict, optional): Datatype associated with expected
             messages. Defaults to None.
 
+    Class Attributes:
+        accepts_lazy (bool): True if the transform can be applied to
+            messages that have not been completely decoded (see
+            yggdrasil.metaschema.datatypes.JSONObjectMetaschemaType.LazyObject).
+
     """
 
     _transformtype = None
@@ -18,6 +23,7 @@ class TransformBase(ComponentBase):
     _schema_subtype_key = 'transformtype'
     _schema_properties = {'initial_state': {'type': 'object'},
                           'original_datatype': {'type': 'schema'}}
+    accepts_lazy = False
 
     def __init__(self, *args, **kwargs):
         self._state = {}
@@ -80,9 +86,10 @@ class TransformBase(ComponentBase):
 
         Args:
             x (object): Message object to transform.
-            no_copy (bool, optional): If True, the transformation occurs in
-                place. Otherwise a copy is created and transformed. Defaults
-                to False.
+            no_copy (bool, optional): If True, the transformed message may
+                share data with the input message, but the input message
+                will not be modified. Otherwise a copy is created and
+                transformed. Defaults to False.
 
         Returns:
             object: The transformed message.
@@ -95,9 +102,10 @@ class TransformBase(ComponentBase):
 
         Args:
             x (object): Message object to transform.
-            no_copy (bool, optional): If True, the transformation occurs in
-                place. Otherwise a copy is created and transformed. Defaults
-                to False.
+            no_copy (bool, optional): If True, the transformed message may
+                share data with the input message, but the input message
+                will not be modified. Otherwise a copy is created and
+                transformed. Defaults to False.
             no_init (bool, optional): If True, the datatype is not initialized
                 if it is not already set. Defaults to False.
 
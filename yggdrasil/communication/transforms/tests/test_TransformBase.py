@@ -1,3 +1,4 @@
+import copy
 import pprint
 from yggdrasil.tests import YggTestClass
 
@@ -45,6 +46,21 @@ class TestTransformBase(YggTestClass):
                             pprint.pprint(x)
                         raise
 
+    def test_transform_no_copy(self):
+        r"""Test that transforms do not modify the input message when
+        no_copy is True."""
+        for x in self.get_options():
+            inst = self.import_cls(**x.get('kwargs', {}))
+            for msg_in, msg_exp in x.get('in/out', []):
+                if isinstance(msg_exp, type(BaseException)):
+                    continue
+                msg_orig = copy.deepcopy(msg_in)
+                msg_out = inst(msg_in, no_copy=True)
+                self.assert_equal(msg_out, msg_exp)
+                self.assert_equal(msg_in, msg_orig)
+                if hasattr(msg_in, 'dtype'):
+                    self.assert_equal(msg_in.dtype, msg_orig.dtype)
+
     def test_transform_type(self):
         r"""Test transform_type."""
         for x in self.get_options():
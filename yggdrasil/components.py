@@ -1,8 +1,9 @@
 import os
+import sys
 import glob
 import copy
 import six
-import inspect
+import json
 import importlib
 # import warnings
 import weakref
@@ -37,19 +38,46 @@ _comptype2mod = {'serializer': 'serialize',
 # 'compiler': 'drivers',
 # 'linker': 'drivers',
 # 'archiver': 'drivers'}
+_manifest_fname = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '.ygg_components.json'))
+_manifest = None
+_class_registries = []
 
 
 class ClassRegistry(OrderedDict):
     r"""Class for registering classes."""
 
     def __init__(self, *args, import_function=None, **kwargs):
-        module = inspect.getmodule(inspect.stack()[1][0])
-        self._module = module.__name__
-        self._directory = os.path.dirname(module.__file__)
+        module_globals = sys._getframe(1).f_globals
+        self._module = module_globals['__name__']
+        self._directory = os.path.dirname(module_globals['__file__'])
         # self._schema_directory = os.path.join(self._directory, 'schemas')
         self._import_function = import_function
         self._imported = False
         super(ClassRegistry, self).__init__(*args, **kwargs)
+        _class_registries.append(self)
+
+    def import_class(self, key):
+        r"""Import the module containing the class registered under a key,
+        using the manifest to avoid importing all classes in the directory
+        if possible. If the key is not in the manifest (e.g. the manifest
+        is out of date), all classes in the directory are imported.
+
+        Args:
+            key (str): Key to import the class for.
+
+        """
+        if self._imported:
+            return
+        entries = None
+        if self._import_function is None:
+            entries = get_manifest(create=False).get(
+                'registries', {}).get(self._module, None)
+        if (entries is not None) and (key in entries):
+            importlib.import_module(entries[key])
+            if self.has_entry(key):
+                return
+        self.import_classes()
 
     def import_classes(self):
         r"""Import all classes in the same directory."""
@@ -81,7 +109,7 @@ class ClassRegistry(OrderedDict):
 
     def get(self, key, default=None):
         if (not self.has_entry(key)):
-            self.import_classes()
+            self.import_class(key)
         return super(ClassRegistry, self).get(key, default)
 
     def __getitem__(self, *args, **kwargs):
@@ -115,6 +143,143 @@ def init_registry():
     return _registry
 
 
+def create_manifest():
+    r"""Create a manifest mapping component subtypes to the module and class
+    that implement them from the registry. The manifest allows components to
+    be imported without importing every component module or loading the
+    schema.
+
+    Returns:
+        dict: Mapping from component type to a dictionary containing the
+            default subtype ('default'), the name of the base class ('base'),
+            and mappings from subtypes ('subtypes') and class names
+            ('classes') to strings of the form '<module>:<class>'. The
+            'registries' entry maps from the modules of class registries
+            to mappings from registry key to the module defining the class.
+
+    """
+    from yggdrasil.schema import get_schema
+    registry = init_registry()
+    s = get_schema()
+    out = {'registries': {}}
+    for x in _class_registries:
+        if x._import_function is None:
+            out['registries'][x._module] = {
+                k: v.__module__ for k, v in x.items()}
+    for comptype in sorted(registry.keys()):
+        entry = {'default': _registry_defaults[comptype],
+                 'base': _registry_base_classes[comptype],
+                 'subtypes': {}, 'classes': {}}
+        for cls_name, subtypes in s[comptype].class2subtype.items():
+            cls = registry[comptype][cls_name]
+            cls_path = '%s:%s' % (cls.__module__, cls.__name__)
+            entry['classes'][cls_name] = cls_path
+            for x in subtypes:
+                entry['subtypes'][x] = cls_path
+        out[comptype] = entry
+    return out
+
+
+def save_manifest(fname=None):
+    r"""Create the component manifest and save it to a file.
+
+    Args:
+        fname (str, optional): Full path to the file that the manifest should
+            be saved to. Defaults to _manifest_fname.
+
+    Returns:
+        dict: Manifest.
+
+    """
+    if fname is None:
+        fname = _manifest_fname
+    out = create_manifest()
+    with open(fname, 'w') as fd:
+        json.dump(out, fd, indent=2, sort_keys=True)
+        fd.write('\n')
+    return out
+
+
+def clear_manifest():
+    r"""Clear the global component manifest."""
+    global _manifest
+    _manifest = None
+
+
+def get_manifest(fname=None, create=True):
+    r"""Return the manifest mapping component subtypes to the module and
+    class that implement them.
+
+    Args:
+        fname (str, optional): Full path to the file that the manifest should
+            be loaded from. Defaults to _manifest_fname.
+        create (bool, optional): If True and the file dosn't exist, it is
+            created. If False and the file dosn't exist, an empty dictionary
+            is returned. Defaults to True.
+
+    Returns:
+        dict: Manifest.
+
+    """
+    global _manifest
+    if (fname is None) and (_manifest is not None):
+        return _manifest
+    if fname is None:
+        fname = _manifest_fname
+    if os.path.isfile(fname):
+        with open(fname, 'r') as fd:
+            out = json.load(fd)
+    elif create:
+        out = save_manifest(fname)
+    else:
+        return {}
+    if fname == _manifest_fname:
+        _manifest = out
+    return out
+
+
+def get_manifest_entry(comptype, subtype=None):
+    r"""Get the module and class implementing a component subtype from the
+    manifest.
+
+    Args:
+        comptype (str): Component type.
+        subtype (str, optional): Component subtype or the name of the class
+            implementing it. Defaults to None and the default subtype is used.
+
+    Returns:
+        tuple(str, str): Module and class names. (None, None) is returned if
+            the subtype is not in the manifest.
+
+    """
+    manifest = get_manifest(create=False).get(comptype, {})
+    if subtype is None:
+        subtype = manifest.get('default', None)
+    entry = manifest.get('subtypes', {}).get(
+        subtype, manifest.get('classes', {}).get(subtype, None))
+    if entry is None:
+        return None, None
+    return tuple(entry.split(':'))
+
+
+def get_component_subtypes(comptype):
+    r"""Get the subtypes registered for a component type, using the manifest
+    if possible to avoid loading the schema.
+
+    Args:
+        comptype (str): Component type.
+
+    Returns:
+        list: Registered subtypes.
+
+    """
+    manifest = get_manifest(create=False)
+    if comptype in manifest:
+        return list(manifest[comptype]['subtypes'].keys())
+    from yggdrasil.schema import get_schema
+    return list(get_schema()[comptype].subtypes)
+
+
 # This dosn't work as desried because classes that have already been imported
 # will not call registration on second import
 # def clear_registry():
@@ -241,11 +406,14 @@ def import_component(comptype, subtype=None, without_schema=False,
         out_cls = _registry[comptype][_registry_class2subtype[comptype][subtype]]
     else:
         # Get class name
+        module_name = None
         if without_schema:
             if subtype is None:  # pragma: debug
                 raise ValueError("subtype must be provided if without_schema is True.")
             class_name = subtype
         else:
+            module_name, class_name = get_manifest_entry(comptype, subtype)
+        if class_name is None:
             from yggdrasil.schema import get_schema
             s = get_schema().get(comptype, None)
             if s is None:  # pragma: debug
@@ -267,8 +435,10 @@ def import_component(comptype, subtype=None, without_schema=False,
                             pass
                     raise ValueError("Unrecognized %s subtype: %s"
                                      % (comptype, subtype))
+        if module_name is None:
+            module_name = 'yggdrasil.%s.%s' % (mod, class_name)
         try:
-            out_mod = importlib.import_module('yggdrasil.%s.%s' % (mod, class_name))
+            out_mod = importlib.import_module(module_name)
         except ImportError:  # pragma: debug
             import_all_components(comptype)
             return import_component(comptype, subtype=subtype,
@@ -630,19 +800,18 @@ class ComponentBase(object):
         if (((comptype is not None) and (subtype is not None)
              and (not skip_component_schema_normalization))):
             from yggdrasil.schema import get_schema
-            s = get_schema().get_component_schema(
-                comptype, subtype, relaxed=True,
-                allow_instance_definitions=True)
+            # Properties that shouldn't be validated in class are removed
+            s = get_schema().get_checked_schema(
+                comptype, subtype=subtype, relaxed=True,
+                allow_instance_definitions=True,
+                exclude_properties=self._schema_excluded_from_class_validation)
             props = list(s['properties'].keys())
             if not skip_component_schema_normalization:
                 from yggdrasil import metaschema
                 kwargs.setdefault(self._schema_subtype_key, subtype)
-                # Remove properties that shouldn't ve validated in class
-                for k in self._schema_excluded_from_class_validation:
-                    if k in s['properties']:
-                        del s['properties'][k]
                 # Validate and normalize
-                metaschema.validate_instance(kwargs, s, normalize=False)
+                metaschema.validate_instance(kwargs, s, normalize=False,
+                                             skip_check=True)
                 # TODO: Normalization performance needs improvement
                 # import pprint
                 # print('before')
@@ -51,6 +51,11 @@ _cfg_map = {
                  '\'True\': all messages (decreases performance), '
                  '\'False\': no messages, or '
                  '\'First\': only the first message a comm sends/receives.')},
+    ('jsonschema', 'cache_dir'): {
+        'env': 'YGG_SCHEMA_CACHE', 'type': str,
+        'help': ('Directory where compiled schemas and normalized YAML '
+                 'specifications are cached (\'False\' disables caching). '
+                 'Defaults to ~/.ygg_cache.')},
     ('rmq', 'namespace'): {
         'env': 'YGG_NAMESPACE', 'help': 'RabbitMQ namespace.'},
     ('rmq', 'host'): {
@@ -87,9 +92,56 @@ _cfg_map = {
         'env': 'YGG_TEST_PRODUCTION_RUNS',
         'action': 'store_true',
         'help': 'Run production level tests when encountered.'},
+    ('compilation', 'build_cache'): {
+        'env': 'YGG_BUILD_CACHE', 'type': str,
+        'help': ('Directory where compilation products are cached '
+                 '(\'False\' disables caching). Defaults to '
+                 '~/.ygg_cache/build. To share the cache between users, '
+                 'use a group-owned directory with the setgid bit set.')},
+    ('compilation', 'build_cache_size'): {
+        'env': 'YGG_BUILD_CACHE_SIZE', 'type': int,
+        'help': ('Maximum size of the compilation cache in bytes. Defaults '
+                 'to 1 GB.')},
+    ('compilation', 'build_workers'): {
+        'env': 'YGG_BUILD_WORKERS', 'type': int,
+        'help': ('Maximum number of compilation processes that should be '
+                 'run concurrently. Defaults to the number of CPUs.')},
+    ('python', 'warm_pool'): {
+        'env': 'YGG_PYTHON_WARM_POOL', 'arg': 'python-warm-pool',
+        'action': 'store_true',
+        'help': ('Run Python models by forking a warm interpreter that has '
+                 'already imported common modules (POSIX only).')},
+    ('python', 'warm_pool_preload'): {
+        'env': 'YGG_PYTHON_WARM_POOL_PRELOAD', 'type': str,
+        'help': ('Comma separated list of modules that warm Python '
+                 'interpreters should import before running models. '
+                 'Defaults to the yggdrasil interface and numpy.')},
     ('general', 'default_comm'): {
         'env': 'YGG_DEFAULT_COMM', 'type': str,
-        'help': 'Comm type that should be used by default.'}
+        'help': 'Comm type that should be used by default.'},
+    ('general', 'metrics_file'): {
+        'env': 'YGG_METRICS_FILE', 'type': str,
+        'help': ('JSON file that runtime metrics for each connection '
+                 'should be written to when a run is shut down.')},
+    ('general', 'trace_file'): {
+        'env': 'YGG_TRACE_FILE', 'type': str,
+        'help': ('Chrome trace event file that timestamps recorded in '
+                 'message headers at each hop (model send, connection '
+                 'receive, transform, forward, model receive) should be '
+                 'written to. Tracing is disabled if not set.')},
+    ('general', 'stage_profile_file'): {
+        'env': 'YGG_STAGE_PROFILE_FILE', 'type': str,
+        'help': ('JSON file that the wall time sampled in each stage of the '
+                 'send/recv pipelines of comms in the runner process should '
+                 'be written to. Sampling is disabled if not set.')},
+    ('general', 'zmq_protocol'): {
+        'env': 'YGG_ZMQ_PROTOCOL', 'type': str,
+        'choices': ['auto', 'tcp', 'ipc'],
+        'help': ('Transport that should be used for new ZeroMQ addresses. '
+                 'If \'auto\', ipc is used on the local host when it is '
+                 'supported (connections within a single process are '
+                 'upgraded to inproc) and tcp is used otherwise. Defaults '
+                 'to tcp.')}
 }
 _key2env = {}
 for k, v in _cfg_map.items():
@@ -482,9 +482,10 @@ class CModelDriver(CompiledModelDriver):
     language = 'c'
     language_ext = ['.c', '.h']
     interface_library = 'ygg'
-    supported_comms = ['ipc', 'zmq']
+    supported_comms = ['ipc', 'zmq', 'shm']
     supported_comm_options = {
         'ipc': {'platforms': ['MacOS', 'Linux']},
+        'shm': {'platforms': ['MacOS', 'Linux']},
         'zmq': {'libraries': ['zmq', 'czmq']}}
     interface_dependencies = ['rapidjson']
     interface_directories = [_incl_interface]
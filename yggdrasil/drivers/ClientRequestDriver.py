@@ -151,8 +151,9 @@ class ClientRequestDriver(ConnectionDriver):
         super(ClientRequestDriver, self).before_loop()
         # self.sleep()  # Help ensure that the server is connected
         self.debug("Sending client sign on")
-        super(ClientRequestDriver, self).send_message(YGG_CLIENT_INI,
-                                                      header_kwargs={'raw': True})
+        super(ClientRequestDriver, self).send_message(
+            YGG_CLIENT_INI, header_kwargs={'raw': True},
+            defer_1st_send=(self.reactor is not None))
         self.ocomm._send_serializer = True
         # self.info("%s: before loop complete", self.name)
 
@@ -182,7 +183,7 @@ class ClientRequestDriver(ConnectionDriver):
                     return False
                 drv_args = [self.model_response_address]
                 drv_kwargs = dict(comm=self.comm, msg_id=self.request_id,
-                                  request_name=self.name)
+                                  request_name=self.name, reactor=self.reactor)
                 self.debug("Creating response comm: address = %s, request_id = %s",
                            self.model_response_address, self.request_id)
                 try:
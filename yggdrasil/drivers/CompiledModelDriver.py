@@ -3,12 +3,17 @@ import re
 import six
 import copy
 import glob
+import json
+import stat
+import hashlib
 import logging
 import warnings
+import threading
 import subprocess
+import multiprocessing
 import shutil
 from collections import OrderedDict
-from yggdrasil import platform, tools, scanf
+from yggdrasil import platform, tools, scanf, multitasking
 from yggdrasil.drivers.ModelDriver import ModelDriver, remove_products
 from yggdrasil.components import import_component
 
@@ -161,6 +166,495 @@ def get_compilation_tool(tooltype, name, default=False):
     return default
 
 
+_include_regex = re.compile(
+    r'^\s*(?:#\s*include|include)\s*[<"\']([^>"\']+)[>"\']',
+    re.MULTILINE | re.IGNORECASE)
+
+
+class BuildCache(object):
+    r"""Content-addressed cache for compilation products. Products are
+    stored under a key determined from the contents of the input files
+    (including any included headers that can be located), the identity of
+    the compilation tool, and the flags passed to it. This allows products
+    to be reused across runs and working directories. The cache can be
+    shared by users on the same machine by configuring a group-owned
+    directory with the setgid bit set (see check_directory). Products are
+    written atomically and their contents are checked against the hash
+    recorded when they were stored before they are retrieved. The least
+    recently used entries are evicted when the total size of the cache
+    exceeds the maximum size.
+
+    Args:
+        directory (str, optional): Directory where products should be
+            cached. Defaults to the value of the YGG_BUILD_CACHE environment
+            variable or the 'build_cache' option in the 'compilation' config
+            section, falling back to 'build' in the '.ygg_cache' directory
+            in the user's home directory.
+        max_size (int, optional): Maximum size of the cache in bytes.
+            Defaults to the value of the YGG_BUILD_CACHE_SIZE environment
+            variable or the 'build_cache_size' option in the 'compilation'
+            config section, falling back to 1 GB.
+
+    Attributes:
+        directory (str): Directory where products are cached.
+        max_size (int): Maximum size of the cache in bytes.
+        is_default (bool): True if the directory is the default per-user
+            directory, False if it was configured explicitly.
+        shared (bool): True if the directory is shared with other users
+            in its group.
+
+    """
+
+    _default_max_size = 2**30
+    _entry_file = 'entry.json'
+
+    def __init__(self, directory=None, max_size=None):
+        from yggdrasil.config import ygg_cfg, usr_dir
+        if directory is None:
+            directory = os.environ.get(
+                'YGG_BUILD_CACHE',
+                ygg_cfg.get('compilation', 'build_cache', None))
+        self.is_default = (directory is None)
+        if directory is None:
+            directory = os.path.join(usr_dir, '.ygg_cache', 'build')
+        if max_size is None:
+            max_size = os.environ.get(
+                'YGG_BUILD_CACHE_SIZE',
+                ygg_cfg.get('compilation', 'build_cache_size', None))
+        if max_size is None:
+            max_size = self._default_max_size
+        self.directory = directory
+        self.max_size = int(max_size)
+        self.shared = False
+
+    def check_directory(self):
+        r"""Create the cache directory (accessible only by the current user)
+        if it does not exist and check that it can be trusted. Cached
+        products are copied into working directories and run, so
+        directories writable by all users are refused. Other directories
+        must be owned by the current user and not writable by the group
+        unless they were configured explicitly and have the setgid bit
+        set, in which case the cache is shared with the directory's group.
+
+        Returns:
+            bool: True if the directory can be used, False otherwise.
+
+        """
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            st = os.stat(self.directory)
+        except OSError as e:
+            warnings.warn("Build cache directory %s could not be created, "
+                          "caching is disabled: %s" % (self.directory, e))
+            return False
+        self.shared = False
+        if platform._is_win:  # pragma: windows
+            return True
+        if st.st_mode & stat.S_IWOTH:
+            warnings.warn("Build cache directory %s is writable by all "
+                          "users, caching is disabled." % self.directory)
+            return False
+        if (st.st_uid == os.getuid()) and not (st.st_mode & stat.S_IWGRP):
+            return True
+        if (not self.is_default) and (st.st_mode & stat.S_ISGID):
+            if not os.access(self.directory, os.R_OK | os.W_OK | os.X_OK):
+                warnings.warn("Shared build cache directory %s is not "
+                              "accessible by the current user, caching is "
+                              "disabled." % self.directory)
+                return False
+            self.shared = True
+            return True
+        warnings.warn("Build cache directory %s is owned by another user or "
+                      "is writable by the group, caching is disabled. To "
+                      "share the cache between users, configure a "
+                      "group-owned directory with the setgid bit set."
+                      % self.directory)
+        return False
+
+    def make_directory(self, path):
+        r"""Create a directory in the cache. Directories in a shared cache
+        are made accessible to the group.
+
+        Args:
+            path (str): Full path to the directory.
+
+        """
+        if os.path.isdir(path):
+            return
+        os.makedirs(path, exist_ok=True)
+        if self.shared:
+            try:
+                os.chmod(path, 0o2770)
+            except OSError:  # pragma: debug
+                # Created by another user at the same time
+                pass
+
+    @classmethod
+    def hash_file(cls, fname):
+        r"""Get the hash of a file's contents.
+
+        Args:
+            fname (str): Full path to the file.
+
+        Returns:
+            str: Hex digest of the file contents.
+
+        """
+        h = hashlib.sha256()
+        with open(fname, 'rb') as fd:
+            for chunk in iter(lambda: fd.read(2**20), b''):
+                h.update(chunk)
+        return h.hexdigest()
+
+    @classmethod
+    def find_includes(cls, fname, include_dirs, found=None):
+        r"""Locate the headers included by a source file (recursively).
+        Headers that cannot be located (e.g. system headers) are ignored
+        as they are covered by the identity of the compilation tool.
+
+        Args:
+            fname (str): Full path to the source file.
+            include_dirs (list): Directories that should be searched for
+                included files after the directory containing the file.
+            found (list, optional): Existing list that located headers
+                should be added to. Defaults to None and a new list is
+                created.
+
+        Returns:
+            list: Full paths to included headers.
+
+        """
+        if found is None:
+            found = []
+        try:
+            with open(fname, 'r') as fd:
+                contents = fd.read()
+        except (UnicodeDecodeError, OSError):
+            return found
+        search_dirs = [os.path.dirname(fname)] + include_dirs
+        for x in _include_regex.findall(contents):
+            for d in search_dirs:
+                ix = os.path.normpath(os.path.join(d, x))
+                if os.path.isfile(ix):
+                    if ix not in found:
+                        found.append(ix)
+                        cls.find_includes(ix, include_dirs, found=found)
+                    break
+        return found
+
+    def get_key(self, tool, cmd, out, inputs=None):
+        r"""Determine the key for the products of a command.
+
+        Args:
+            tool (CompilationToolBase): Tool being called.
+            cmd (list): Command that will be run.
+            out (str): Full path to the primary product.
+            inputs (list, optional): Existing list that the full paths to
+                the files the products depend on should be added to.
+                Defaults to None and a new list is created.
+
+        Returns:
+            str: Key for the products of the command. None is returned if
+                the command cannot be cached (e.g. one of the inputs is a
+                directory).
+
+        """
+        h = hashlib.sha256()
+        executable = shutil.which(cmd[0])
+        if executable is None:
+            return None
+        st = os.stat(executable)
+        h.update(json.dumps([tool.tooltype, tool.toolname, executable,
+                             st.st_size, st.st_mtime]).encode('utf-8'))
+        include_dirs = []
+        lib_dirs = []
+        for i, x in enumerate(cmd):
+            for k, dst in [('-I', include_dirs), ('/I', include_dirs),
+                           ('-L', lib_dirs)]:
+                if x == k and (i + 1) < len(cmd):
+                    dst.append(cmd[i + 1])
+                elif x.startswith(k) and (len(x) > len(k)):
+                    dst.append(x[len(k):])
+        if inputs is None:
+            inputs = []
+        for x in cmd[1:]:
+            if out in x:
+                x = x.replace(out, '<out>')
+            elif os.path.isdir(x) and (x not in include_dirs + lib_dirs):
+                return None
+            elif os.path.isfile(x):
+                inputs.append(x)
+                x = '<input>'
+            elif x.startswith('-l'):
+                if x.startswith('-l:'):
+                    names = [x[3:]]
+                else:
+                    names = ['lib%s%s' % (x[2:], ext) for ext in
+                             ['.a', '.so', '.dylib', '.lib']]
+                for d in lib_dirs:
+                    for ilib in names:
+                        ilib = os.path.join(d, ilib)
+                        if os.path.isfile(ilib):
+                            inputs.append(ilib)
+            h.update(x.encode('utf-8'))
+        for x in list(inputs):
+            if tool.tooltype == 'compiler':
+                self.find_includes(x, include_dirs, found=inputs)
+        for x in inputs:
+            h.update(self.hash_file(x).encode('utf-8'))
+        return h.hexdigest()
+
+    def get_entry(self, key):
+        r"""Get the directory containing a cache entry.
+
+        Args:
+            key (str): Entry key.
+
+        Returns:
+            str: Full path to the entry directory.
+
+        """
+        return os.path.join(self.directory, key[:2], key)
+
+    def fetch(self, key, out, products):
+        r"""Copy cached products to their destination.
+
+        Args:
+            key (str): Entry key.
+            out (str): Full path to the primary product.
+            products (list): Full paths to all products that may have been
+                produced.
+
+        Returns:
+            bool: True if the products were retrieved, False otherwise.
+
+        """
+        entry = self.get_entry(key)
+        entry_file = os.path.join(entry, self._entry_file)
+        if not os.path.isfile(entry_file):
+            return False
+        tmps = []
+        try:
+            with open(entry_file, 'r') as fd:
+                files = json.load(fd)
+            out_dir = os.path.dirname(out)
+            # Check all of the products before replacing any of them
+            for i, (x, digest) in enumerate(files):
+                dst = os.path.normpath(os.path.join(out_dir, x))
+                tmp = '%s.%s.%s.tmp' % (dst, os.getpid(),
+                                        threading.current_thread().ident)
+                shutil.copy(os.path.join(entry, str(i)), tmp)
+                tmps.append((tmp, dst))
+                if self.hash_file(tmp) != digest:
+                    raise ValueError("Contents of cached product %s do not "
+                                     "match the recorded hash." % x)
+            for tmp, dst in tmps:
+                os.replace(tmp, dst)
+            # Update access time for LRU eviction
+            os.utime(entry, None)
+        except (OSError, ValueError, TypeError) as e:
+            logger.debug("Failed to fetch cached products for %s: %s"
+                         % (out, e))
+            for tmp, _ in tmps:
+                if os.path.isfile(tmp):
+                    os.remove(tmp)
+            if isinstance(e, (ValueError, TypeError)):
+                # Corrupted entry
+                shutil.rmtree(entry, ignore_errors=True)
+            return False
+        logger.debug("Retrieved %s from the build cache (%s)" % (out, key))
+        return True
+
+    def store(self, key, out, products):
+        r"""Add products to the cache.
+
+        Args:
+            key (str): Entry key.
+            out (str): Full path to the primary product.
+            products (list): Full paths to all products that may have been
+                produced.
+
+        """
+        entry = self.get_entry(key)
+        if os.path.isdir(entry) or (not os.path.isfile(out)):
+            return
+        out_dir = os.path.dirname(out)
+        files = [x for x in products if os.path.isfile(x)]
+        tmp = '%s.%s.%s.tmp' % (entry, os.getpid(),
+                                threading.current_thread().ident)
+        try:
+            self.make_directory(os.path.dirname(entry))
+            os.makedirs(tmp)
+            if self.shared:
+                os.chmod(tmp, 0o2770)
+            for i, x in enumerate(files):
+                shutil.copy(x, os.path.join(tmp, str(i)))
+                if self.shared:
+                    os.chmod(os.path.join(tmp, str(i)), 0o660)
+            with open(os.path.join(tmp, self._entry_file), 'w') as fd:
+                json.dump([[os.path.relpath(x, out_dir), self.hash_file(x)]
+                           for x in files], fd)
+            os.rename(tmp, entry)
+        except OSError as e:
+            # Another process may have stored the same entry
+            logger.debug("Failed to cache products for %s: %s" % (out, e))
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        self.evict()
+
+    def entries(self):
+        r"""Get the entries in the cache along with their size and the time
+        they were last used.
+
+        Returns:
+            list: (last used time, size, path) for each entry.
+
+        """
+        out = []
+        for entry in glob.glob(os.path.join(self.directory, '*', '*')):
+            if entry.endswith('.tmp') or (not os.path.isdir(entry)):
+                continue
+            try:
+                size = sum(os.path.getsize(os.path.join(entry, x))
+                           for x in os.listdir(entry))
+                out.append((os.path.getmtime(entry), size, entry))
+            except OSError:  # pragma: debug
+                pass
+        return out
+
+    @property
+    def size(self):
+        r"""int: Total size of the cache in bytes."""
+        return sum(x[1] for x in self.entries())
+
+    def evict(self):
+        r"""Remove the least recently used entries until the total size of
+        the cache is less than max_size."""
+        entries = sorted(self.entries())
+        total = sum(x[1] for x in entries)
+        while entries and (total > self.max_size):
+            _, size, entry = entries.pop(0)
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        r"""Remove all entries from the cache."""
+        for _, _, entry in self.entries():
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def get_build_cache():
+    r"""Get the build cache used by compilation tools.
+
+    Returns:
+        BuildCache: Build cache. None is returned if caching is disabled
+            by setting the YGG_BUILD_CACHE environment variable or the
+            'build_cache' option in the 'compilation' config section to
+            'False' or if the cache directory cannot be trusted (see
+            BuildCache.check_directory).
+
+    """
+    from yggdrasil.config import ygg_cfg
+    directory = os.environ.get(
+        'YGG_BUILD_CACHE', ygg_cfg.get('compilation', 'build_cache', None))
+    if (directory is not None) and (directory.lower() in
+                                    ['false', 'none', '0', '']):
+        return None
+    out = BuildCache(directory=directory)
+    if not out.check_directory():
+        return None
+    return out
+
+
+_output_locks = {}
+_output_locks_lock = threading.Lock()
+_build_semaphore = None
+
+
+def get_build_workers():
+    r"""Determine the maximum number of compilation tool processes that
+    should be run concurrently.
+
+    Returns:
+        int: Maximum number of concurrent compilation processes. This is
+            set by the YGG_BUILD_WORKERS environment variable or the
+            'build_workers' option in the 'compilation' config section
+            and defaults to the number of CPUs.
+
+    """
+    from yggdrasil.config import ygg_cfg
+    out = os.environ.get(
+        'YGG_BUILD_WORKERS', ygg_cfg.get('compilation', 'build_workers', None))
+    if out is None:
+        out = multiprocessing.cpu_count()
+    return max(1, int(out))
+
+
+def get_build_semaphore():
+    r"""Get the semaphore limiting the number of compilation tool processes
+    that run concurrently.
+
+    Returns:
+        threading.BoundedSemaphore: Semaphore shared by all compilation
+            tools in the current process.
+
+    """
+    global _build_semaphore
+    with _output_locks_lock:
+        if _build_semaphore is None:
+            _build_semaphore = threading.BoundedSemaphore(get_build_workers())
+    return _build_semaphore
+
+
+def get_output_lock(out):
+    r"""Get the lock that must be held while a compilation product is
+    created so that concurrent builds do not write to the same file.
+
+    Args:
+        out (str): Full path to the product.
+
+    Returns:
+        threading.RLock: Lock for the product.
+
+    """
+    if not isinstance(out, str):
+        return threading.RLock()
+    key = os.path.normcase(os.path.abspath(out))
+    with _output_locks_lock:
+        if key not in _output_locks:
+            _output_locks[key] = threading.RLock()
+        return _output_locks[key]
+
+
+def run_build_tasks(tasks, func, dependencies=None, nworkers=None):
+    r"""Call a function on a set of build tasks, running independent tasks
+    concurrently and only starting each task once the tasks it depends on
+    have completed (see multitasking.run_task_graph). The tasks are run on
+    a pool of threads as the work is performed by compilation tool
+    processes, the number of which is limited by the build semaphore.
+
+    Args:
+        tasks (list): Hashable tasks that func should be called for.
+        func (callable): Function that should be called with each task as
+            its only argument.
+        dependencies (dict, optional): Mapping from task to a list of the
+            tasks that must be complete before it can be started. Defaults
+            to None and the tasks are assumed to be independent.
+        nworkers (int, optional): Maximum number of tasks that should be
+            run concurrently. Defaults to get_build_workers(). If 1, the
+            tasks are run sequentially in the calling thread.
+
+    Returns:
+        list: The result of calling func for each task in the same order
+            as tasks.
+
+    """
+    if nworkers is None:
+        nworkers = get_build_workers()
+    return multitasking.run_task_graph(tasks, func, dependencies=dependencies,
+                                       nworkers=nworkers)
+
+
 # TODO: Cannot currently make compilation tools components because
 # of circular imports
 class CompilationToolMeta(type):
@@ -279,6 +773,10 @@ class CompilationToolBase(object):
         remove_product_exts (list): List of extensions or directories matching
             entries in product_exts and product_files that should be removed
             during cleanup. Be careful when adding files to this list.
+        is_cacheable (bool): If True, products produced by the tool can be
+            stored in and retrieved from the build cache. This should be
+            False for tools that produce files outside of the products
+            described by product_exts and product_files.
 
     """
 
@@ -316,6 +814,7 @@ class CompilationToolBase(object):
     toolset = None
     compatible_toolsets = []
     is_build_tool = False
+    is_cacheable = True
     tool_suffix_format = '_%sx'
     _language_ext = None  # only update once per class
     
@@ -957,7 +1456,7 @@ class CompilationToolBase(object):
     def call(cls, args, language=None, toolname=None, skip_flags=False,
              dry_run=False, out=None, overwrite=False, products=None,
              allow_error=False, working_dir=None, additional_args=None,
-             suffix='', **kwargs):
+             suffix='', use_cache=True, **kwargs):
         r"""Call the tool with the provided arguments. If the first argument
         resembles the name of the tool executable, the executable will not be
         added.
@@ -983,7 +1482,11 @@ class CompilationToolBase(object):
                 be ignored if skip_flags is True.
             overwrite (bool, optional): If True, the existing compile file will
                 be overwritten. Otherwise, it will be kept and this function
-                will return without recompiling the source file.
+                will return without recompiling the source file. If the
+                build cache is enabled, an existing file is only kept if
+                it matches the cached product for the current inputs or,
+                in the absence of a cached product, is newer than the
+                inputs.
             products (list, optional): Existing Python list that additional
                 products produced by the compilation should be appended to.
                 Defaults to None and is ignored.
@@ -998,6 +1501,12 @@ class CompilationToolBase(object):
                 ignored.
             suffix (str, optional): Suffix that should be added to the
                 output file (before the extension). Defaults to "".
+            use_cache (bool, optional): If True, the products are retrieved
+                from the build cache if the same inputs have been compiled
+                before with the same tool and flags and are added to the
+                cache otherwise. Defaults to True. The cache can be disabled
+                globally by setting the YGG_BUILD_CACHE environment variable
+                to 'False'.
             **kwargs: Additional keyword arguments are passed to
                 cls.get_executable_command. and tools.popen_nobuffer.
 
@@ -1032,62 +1541,94 @@ class CompilationToolBase(object):
                    and (working_dir is not None))):
                 out = os.path.join(working_dir, out)
             assert(out not in args)  # Don't remove source files
-            # Check for file
-            if overwrite and (not dry_run):
-                cls.remove_products(args, out)
-                if os.path.isfile(out) or os.path.isdir(out):  # pragma: debug
-                    raise RuntimeError("Product not removed: %s" % out)
-            if (not dry_run) and (os.path.isfile(out) or os.path.isdir(out)):
-                cls.append_product(products, args, out)
-                return out
-            kwargs['outfile'] = out
-        # Get command
-        unused_kwargs = kwargs.pop('unused_kwargs', {})
-        cmd = cls.get_executable_command(args, skip_flags=skip_flags,
-                                         unused_kwargs=unused_kwargs,
-                                         cwd=working_dir, **kwargs)
-        # Return if dry run, adding potential output to product
-        if dry_run:
-            if skip_flags:
-                return ''
-            else:
-                if out != 'clean':
+        # Prevent concurrent builds from writing to the same product
+        with get_output_lock(out):
+            if (not skip_flags):
+                cache = None
+                if ((use_cache and cls.is_cacheable and (not dry_run)
+                     and (out != 'clean') and (not cls.is_build_tool))):
+                    cache = get_build_cache()
+                # Check for file
+                if overwrite and (not dry_run):
+                    cls.remove_products(args, out)
+                    if os.path.isfile(out) or os.path.isdir(out):  # pragma: debug
+                        raise RuntimeError("Product not removed: %s" % out)
+                if ((cache is None) and (not dry_run)
+                        and (os.path.isfile(out) or os.path.isdir(out))):
                     cls.append_product(products, args, out)
-                return out
-        # Run command
-        output = ''
-        try:
-            if (not skip_flags) and ('env' not in unused_kwargs):
-                unused_kwargs['env'] = cls.set_env()
-            logger.debug('Command: "%s"' % ' '.join(cmd))
-            proc = tools.popen_nobuffer(cmd, **unused_kwargs)
-            output, err = proc.communicate()
-            output = output.decode("utf-8")
-            if (proc.returncode != 0) and (not allow_error):
-                raise RuntimeError("Command '%s' failed with code %d:\n%s."
-                                   % (' '.join(cmd), proc.returncode, output))
+                    return out
+                kwargs['outfile'] = out
+            # Get command
+            unused_kwargs = kwargs.pop('unused_kwargs', {})
+            cmd = cls.get_executable_command(args, skip_flags=skip_flags,
+                                             unused_kwargs=unused_kwargs,
+                                             cwd=working_dir, **kwargs)
+            # Check the build cache
+            cache_key = None
+            if (not skip_flags) and (cache is not None):
+                cache_key = cache.get_key(cls, cmd, out)
+                if cache_key is not None:
+                    new_products = []
+                    cls.append_product(new_products, args, out)
+                    if (not overwrite) and cache.fetch(cache_key, out,
+                                                       new_products):
+                        cls.append_product(products, args, out)
+                        return out
+                    # Existing products may have been built with different
+                    # flags or tools so they are rebuilt rather than being
+                    # added to the cache under this key
+                    if os.path.isfile(out) or os.path.isdir(out):
+                        cls.remove_products(args, out)
+                elif os.path.isfile(out) or os.path.isdir(out):
+                    cls.append_product(products, args, out)
+                    return out
+            # Return if dry run, adding potential output to product
+            if dry_run:
+                if skip_flags:
+                    return ''
+                else:
+                    if out != 'clean':
+                        cls.append_product(products, args, out)
+                    return out
+            # Run command
+            output = ''
             try:
-                logger.debug(' '.join(cmd) + '\n' + output)
-            except UnicodeDecodeError:  # pragma: debug
-                tools.print_encoded(output)
-        except (subprocess.CalledProcessError, OSError) as e:
-            if not allow_error:
-                raise RuntimeError("Could not call command '%s': %s"
-                                   % (' '.join(cmd), e))
-        # Check for output
-        if (not skip_flags):
-            if (out != 'clean'):
-                if not (os.path.isfile(out)
-                        or os.path.isdir(out)):  # pragma: debug
-                    logger.error('%s\n%s' % (' '.join(cmd), output))
-                    raise RuntimeError(("%s tool, %s, failed to produce "
-                                        "result '%s'")
-                                       % (cls.tooltype.title(), cls.toolname, out))
-                logger.debug("%s %s produced %s"
-                             % (cls.tooltype.title(), cls.toolname, out))
-                cls.append_product(products, args, out)
-            return out
-        return output
+                if (not skip_flags) and ('env' not in unused_kwargs):
+                    unused_kwargs['env'] = cls.set_env()
+                logger.debug('Command: "%s"' % ' '.join(cmd))
+                with get_build_semaphore():
+                    proc = tools.popen_nobuffer(cmd, **unused_kwargs)
+                    output, err = proc.communicate()
+                output = output.decode("utf-8")
+                if (proc.returncode != 0) and (not allow_error):
+                    raise RuntimeError("Command '%s' failed with code %d:\n%s."
+                                       % (' '.join(cmd), proc.returncode, output))
+                try:
+                    logger.debug(' '.join(cmd) + '\n' + output)
+                except UnicodeDecodeError:  # pragma: debug
+                    tools.print_encoded(output)
+            except (subprocess.CalledProcessError, OSError) as e:
+                if not allow_error:
+                    raise RuntimeError("Could not call command '%s': %s"
+                                       % (' '.join(cmd), e))
+            # Check for output
+            if (not skip_flags):
+                if (out != 'clean'):
+                    if not (os.path.isfile(out)
+                            or os.path.isdir(out)):  # pragma: debug
+                        logger.error('%s\n%s' % (' '.join(cmd), output))
+                        raise RuntimeError(("%s tool, %s, failed to produce "
+                                            "result '%s'")
+                                           % (cls.tooltype.title(), cls.toolname, out))
+                    logger.debug("%s %s produced %s"
+                                 % (cls.tooltype.title(), cls.toolname, out))
+                    if cache_key is not None:
+                        new_products = []
+                        cls.append_product(new_products, args, out)
+                        cache.store(cache_key, out, new_products)
+                    cls.append_product(products, args, out)
+                return out
+            return output
 
 
 class CompilerBase(CompilationToolBase):
@@ -1480,10 +2021,16 @@ class CompilerBase(CompilationToolBase):
                 kwargs_link = tool.extract_kwargs(kwargs, compiler=cls)
             else:
                 kwargs.pop('linker_language', None)
-            obj_list = []
-            for isrc, iout in zip(args, out_comp):
-                iobj = cls.call(isrc, out=iout, dont_link=True, **kwargs)
-                obj_list.append(iobj)
+
+            def compile_source(i):
+                return cls.call(args[i], out=out_comp[i], dont_link=True,
+                                **kwargs)
+
+            # Sources are independent so they can be compiled concurrently
+            obj_list = run_build_tasks(list(range(len(args))),
+                                       compile_source,
+                                       nworkers=(1 if kwargs.get('dry_run', False)
+                                                 else None))
             if dont_link:
                 return obj_list
             # Link/archive
@@ -2018,10 +2565,15 @@ class CompiledModelDriver(ModelDriver):
         super(CompiledModelDriver, self).__init__(name, args, **kwargs)
         # Compile
         if not skip_compile:
-            self.compile_model()
+            self.build_model()
+
+    def build_model(self):
+        r"""Compile the model executable and add it to the products."""
+        self.compile_model()
+        if self.model_file not in self.products:
             self.products.append(self.model_file)
-            assert(os.path.isfile(self.model_file))
-            self.debug("Compiled %s", self.model_file)
+        assert(os.path.isfile(self.model_file))
+        self.debug("Compiled %s", self.model_file)
 
     @staticmethod
     def after_registration(cls, **kwargs):
@@ -2735,6 +3287,39 @@ class CompiledModelDriver(ModelDriver):
             out = out[:min_dep] + new_deps + out[min_dep:]
         return out
 
+    @classmethod
+    def get_dependency_graph(cls, deps, toolname=None):
+        r"""Get the internal dependencies that must be compiled before each
+        dependency in the dependency order (see get_dependency_order).
+
+        Args:
+            deps (list): Dependencies in order.
+            toolname (str, optional): Name of compiler tool that should be used.
+                Defaults to None and the default compiler for the language will
+                be used.
+
+        Returns:
+            OrderedDict: Mapping from each dependency (in dependency order)
+                to the list of dependencies that it directly depends on.
+
+        """
+        out = OrderedDict()
+        for d in cls.get_dependency_order(deps, toolname=toolname):
+            if isinstance(d, tuple):
+                assert(len(d) == 2)
+                d_lang = d[0]
+                if d_lang == cls.language:
+                    drv = cls
+                else:
+                    drv = import_component('model', d_lang)
+                sub_graph = drv.get_dependency_graph(d[1], toolname=toolname)
+                out[d] = [(d_lang, x) for x in sub_graph.get(d[1], [])]
+            else:
+                dep_info = cls.get_dependency_info(d, toolname=toolname,
+                                                   default={})
+                out[d] = list(dep_info.get('internal_dependencies', []))
+        return out
+
     @classmethod
     def get_compiler_flags(cls, toolname=None, **kwargs):
         r"""Determine the flags required by the current compiler.
@@ -3397,9 +3982,10 @@ class CompiledModelDriver(ModelDriver):
         if (((cls.interface_library is not None) and cls.is_installed()
              and (cls.interface_library not in base_libraries))):
             # cls.call_compiler(cls.interface_library)
-            dep_order = cls.get_dependency_order(cls.interface_library,
+            dep_graph = cls.get_dependency_graph(cls.interface_library,
                                                  toolname=toolname)
-            for k in dep_order[::-1]:
+
+            def compile_dependency(k):
                 if isinstance(k, tuple):
                     assert(len(k) == 2)
                     ikw = dict(kwargs, language=k[0],
@@ -3408,6 +3994,13 @@ class CompiledModelDriver(ModelDriver):
                 else:
                     cls.call_compiler(k, toolname=toolname, **kwargs)
 
+            # Dependencies are compiled concurrently once the libraries
+            # they depend on have been compiled
+            run_build_tasks(list(dep_graph.keys())[::-1], compile_dependency,
+                            dependencies=dep_graph,
+                            nworkers=(1 if kwargs.get('dry_run', False)
+                                      else None))
+
     @classmethod
     def cleanup_dependencies(cls, products=None, **kwargs):
         r"""Cleanup dependencies."""
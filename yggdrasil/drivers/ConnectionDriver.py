@@ -1,10 +1,11 @@
 """Module for funneling messages from one comm to another."""
 import os
 import copy
+import time
 import numpy as np
 import functools
 import queue
-from yggdrasil import multitasking
+from yggdrasil import multitasking, metrics, tracing, tools
 from yggdrasil.communication import new_comm
 from yggdrasil.drivers.Driver import Driver
 from yggdrasil.components import (
@@ -140,6 +141,14 @@ class ConnectionDriver(Driver):
         onexit (str, optional): Class method that should be called when a
             model that the connection interacts with exits, but before the
             connection driver is shut down. Defaults to None.
+        fanout (str, optional): How messages are sent when there is more
+            than one output. If 'serial', the message is sent to each output
+            in turn. If 'broadcast', the message is sent to all of the
+            outputs concurrently. Defaults to 'serial'.
+        fanin (str, optional): How messages are received when there is more
+            than one input. If 'round_robin', the inputs are checked in turn.
+            If 'wait', the inputs are waited on together. Defaults to
+            'round_robin'.
         **kwargs: Additonal keyword arguments are passed to the parent class.
 
     Attributes:
@@ -152,6 +161,8 @@ class ConnectionDriver(Driver):
         nsent (int): Number of messages sent.
         nskip (int): Number of messages skipped.
         state (str): Descriptor of last action taken.
+        metrics (metrics.Metrics): Latency histograms for receiving,
+            processing, and sending messages through the connection.
         translator (func): Function that will be used to translate messages from
             the input communicator before passing them to the output communicator.
         timeout_send_1st (float): Time in seconds that should be waited before
@@ -160,6 +171,10 @@ class ConnectionDriver(Driver):
             loop.
         onexit (str): Class method that should be called when the corresponding
             model exits, but before the driver is shut down.
+        fanout (str): How messages are sent when there is more than one
+            output.
+        fanin (str): How messages are received when there is more than one
+            input.
 
     """
 
@@ -199,7 +214,11 @@ class ConnectionDriver(Driver):
                        'items': {'oneOf': [
                            {'type': 'function'},
                            {'$ref': '#/definitions/transform'}]}},
-        'onexit': {'type': 'string'}}
+        'onexit': {'type': 'string'},
+        'fanout': {'type': 'string', 'enum': ['serial', 'broadcast'],
+                   'default': 'serial'},
+        'fanin': {'type': 'string', 'enum': ['round_robin', 'wait'],
+                  'default': 'round_robin'}}
     _schema_excluded_from_class_validation = ['inputs', 'outputs']
     _disconnect_attr = Driver._disconnect_attr + [
         '_comm_closed', '_skip_after_loop', 'shared', 'task_thread']
@@ -227,7 +246,12 @@ class ConnectionDriver(Driver):
         self._last_header = None
         self._eof_sent = False
         self._first_send_done = False
+        self._pending_1st_send = None
         self._used = False
+        self.metrics = metrics.Metrics(
+            self.name, kind='connection',
+            connection_type=self._connection_type)
+        self._trace_file = tracing.get_trace_file()
         self.onexit = None
         self.task_thread = None
         if self.as_process:
@@ -292,6 +316,11 @@ class ConnectionDriver(Driver):
             elif not isinstance(x, dict):
                 comm_kws['comm'][i] = dict(comm=x)
             comm_kws['comm'][i].setdefault('comm', comm_type)
+        if len(comm_kws['comm']) > 1:
+            if io == 'input':
+                comm_kws.setdefault('fanin', self.fanin)
+            else:
+                comm_kws.setdefault('fanout', self.fanout)
         any_files = False
         all_files = True
         if not touches_model:
@@ -317,6 +346,8 @@ class ConnectionDriver(Driver):
             kwargs.setdefault('timeout_send_1st', 60)
         self.debug('%s comm_kws:\n%s', attr_comm, self.pprint(comm_kws, 1))
         comm_kws['touches_model'] = touches_model
+        if self.reactor is not None:
+            comm_kws['reactor'] = self.reactor
         setattr(self, attr_comm, new_comm(**comm_kws))
         setattr(self, '%s_kws' % attr_comm, comm_kws)
         if touches_model:
@@ -409,6 +440,13 @@ class ConnectionDriver(Driver):
     def close_state(self, x):
         self.shared['close_state'] = x
 
+    @property
+    def pool_weight(self):
+        r"""int: Relative load of the connection used to balance connections
+        between the workers of a task pool."""
+        return sum(len(getattr(x, 'comm_list', [x]))
+                   for x in [self.icomm, self.ocomm])
+
     @property
     def can_run_remotely(self):
         r"""bool: True if process should be run remotely."""
@@ -578,6 +616,34 @@ class ConnectionDriver(Driver):
             self.task_thread.close()
         super(ConnectionDriver, self).cleanup()
 
+    @run_remotely
+    def get_metrics(self):
+        r"""Get metrics for the connection and the comms it uses. If the
+        connection is run on a process that has exited, the metrics
+        published by the process at the end of the loop are returned.
+
+        Returns:
+            dict: Metrics for the connection with the metrics for the input
+                and output comms under the 'comms' key.
+
+        """
+        if not self.in_process:
+            return copy.deepcopy(self.shared.get('metrics', {}))
+        out = self.metrics.to_dict()
+        out['counters'].update(received=self.nrecv, processed=self.nproc,
+                               skipped=self.nskip, sent=self.nsent)
+        out['comms'] = {}
+        for k, x in [('input', self.icomm), ('output', self.ocomm)]:
+            out['comms'][k] = [y.metrics.to_dict() for y in
+                               getattr(x, 'comm_list', [x])]
+        return out
+
+    def publish_metrics(self):
+        r"""Store a snapshot of the metrics where they can be accessed
+        after the connection process exits."""
+        if self.in_process:
+            self.shared['metrics'] = self.get_metrics()
+
     @run_remotely
     def printStatus(self, beg_msg='', end_msg=''):
         r"""Print information on the status of the ConnectionDriver.
@@ -692,6 +758,7 @@ class ConnectionDriver(Driver):
         r"""Actions to perform after sending messages."""
         self.state = 'after loop'
         self.debug('')
+        self.publish_metrics()
         # Close input comm in case loop did not
         self.confirm_input(timeout=False)
         self.debug('Confirmed input')
@@ -710,6 +777,7 @@ class ConnectionDriver(Driver):
         if self.as_process and self.ocomm.touches_model:
             self.drain_output(timeout=False, dont_confirm_eof=True)
         self.debug('Finished')
+        self.publish_metrics()
         if self.as_process:
             self.after_loop_process()
 
@@ -835,15 +903,21 @@ class ConnectionDriver(Driver):
             flag = self.ocomm.send(*args, **kwargs)
             return flag
         
-    def _send_1st_message(self, *args, **kwargs):
+    def _send_1st_message(self, *args, defer=False, **kwargs):
         r"""Send the first message, trying multiple times.
 
         Args:
             *args: Arguments are passed to the output comm send method.
+            defer (bool, optional): If True and the driver is hosted by a
+                reactor, a failed first attempt is not retried here.
+                Instead the message is stored and the retries are made by
+                later loop iterations (see _retry_1st_message) so that the
+                reactor is not blocked. Defaults to False.
             *kwargs: Keyword arguments are passed to the output comm send method.
 
         Returns:
-            bool: Success or failure of send.
+            bool: Success or failure of send. None is returned if the send
+                was deferred.
 
         """
         self.ocomm._multiple_first_send = False
@@ -853,12 +927,30 @@ class ConnectionDriver(Driver):
         if (not flag) and (not self.ocomm._type_errors):
             self.debug("1st send failed, will keep trying for %f s in silence.",
                        float(self.timeout_send_1st))
+            if defer and (self.reactor is not None):
+                self.stop_timeout()
+                self._pending_1st_send = dict(
+                    args=args, kwargs=kwargs, count=False,
+                    timeout=tools.TimeOut(self.timeout_send_1st))
+                return None
             while ((not T.is_out) and (not flag)
                    and self.ocomm.is_open):  # pragma: debug
                 flag = self._send_message(*args, **kwargs)
                 if not flag:
                     self.sleep()
         self.stop_timeout()
+        return self._finish_1st_message(flag)
+
+    def _finish_1st_message(self, flag):
+        r"""Record the result of sending the first message.
+
+        Args:
+            flag (bool): Success or failure of the first send.
+
+        Returns:
+            bool: Success or failure of send.
+
+        """
         self.ocomm.suppress_special_debug = False
         self._first_send_done = True
         if not flag:
@@ -867,6 +959,28 @@ class ConnectionDriver(Driver):
             self.debug("1st send succeded")
         return flag
 
+    def _retry_1st_message(self):
+        r"""Make a single attempt at sending a first message that was
+        deferred by _send_1st_message. If the attempt fails and the
+        timeout has not been reached, the loop sleeps so that the reactor
+        can run other tasks before the next attempt.
+
+        Returns:
+            bool: Success or failure of send. None is returned if the send
+                is still pending.
+
+        """
+        pending = self._pending_1st_send
+        flag = self._send_message(*pending['args'], **pending['kwargs'])
+        if (not flag) and (not pending['timeout'].is_out) and self.ocomm.is_open:
+            self.loop_sleep()
+            return None
+        self._pending_1st_send = None
+        flag = self._finish_1st_message(flag)
+        if pending['count']:
+            self.after_send_message(flag, pending['t_send'])
+        return flag
+
     def send_eof(self):
         r"""Send EOF message.
 
@@ -887,21 +1001,25 @@ class ConnectionDriver(Driver):
 
         Args:
             *args: Arguments are passed to the output comm send method.
-            *kwargs: Keyword arguments are passed to the output comm send method.
+            *kwargs: Keyword arguments are passed to the output comm send
+                method, except 'defer_1st_send' which is passed to
+                _send_1st_message as 'defer' if this is the first message.
 
         Returns:
-            bool: Success or failure of send.
+            bool: Success or failure of send. None is returned if the first
+                send was deferred.
 
         """
         assert(self.in_process)
         self.debug('')
         kwargs.pop('is_eof', False)
+        defer = kwargs.pop('defer_1st_send', False)
         with self.lock:
             self._used = True
         if self._first_send_done:
             flag = self._send_message(*args, **kwargs)
         else:
-            flag = self._send_1st_message(*args, **kwargs)
+            flag = self._send_1st_message(*args, defer=defer, **kwargs)
         # if self.single_use:
         #     with self.lock:
         #         self.debug('Used')
@@ -948,8 +1066,13 @@ class ConnectionDriver(Driver):
             self.set_close_state('invalid')
             self.set_break_flag()
             return
+        if self._pending_1st_send is not None:
+            self.state = 'sending'
+            self._retry_1st_message()
+            return
         # Receive a message
         self.state = 'receiving'
+        t0 = time.perf_counter()
         msg = self.recv_message()
         if msg is False:
             self.debug('No more messages')
@@ -959,8 +1082,10 @@ class ConnectionDriver(Driver):
         if self.icomm.is_empty_recv(msg):
             self.state = 'waiting'
             self.verbose_debug(':run: Waiting for next message.')
-            self.sleep()
+            self.loop_sleep()
             return
+        t1 = time.perf_counter()
+        self.metrics.observe('recv', t1 - t0)
         self.nrecv += 1
         self.state = 'received'
         if isinstance(msg, bytes):
@@ -975,6 +1100,8 @@ class ConnectionDriver(Driver):
         # Process message
         self.state = 'processing'
         msg = self.on_message(msg)
+        t2 = time.perf_counter()
+        self.metrics.observe('process', t2 - t1)
         if msg is False:  # pragma: debug
             self.error('Could not process message.')
             self.set_break_flag()
@@ -989,12 +1116,38 @@ class ConnectionDriver(Driver):
         self.debug('Processed message.')
         # Send a message
         self.state = 'sending'
-        ret = self.send_message(msg)
-        if ret is False:
+        send_kwargs = {}
+        if self._trace_file:
+            # Carry the trace from the received message to the sent message
+            trace = tracing.get_header_kwargs(self._last_header)
+            if trace:
+                send_kwargs['header_kwargs'] = tracing.stamp(
+                    trace, 'transform', comm=self.name,
+                    filename=self._trace_file)
+        if self.reactor is not None:
+            send_kwargs['defer_1st_send'] = True
+        ret = self.send_message(msg, **send_kwargs)
+        if ret is None:
+            # First send deferred, retried by the next iterations
+            self._pending_1st_send.update(count=True, t_send=t2)
+            return
+        self.after_send_message(ret, t2)
+
+    def after_send_message(self, flag, t_send):
+        r"""Record the result of sending a message from the loop.
+
+        Args:
+            flag (bool): Success or failure of the send.
+            t_send (float): Time (from time.perf_counter) at which the send
+                started.
+
+        """
+        if flag is False:
             self.error('Could not send message.')
             self.set_break_flag()
             self.set_close_state('sending')
             return
+        self.metrics.observe('send', time.perf_counter() - t_send)
         self.nsent += 1
         self.state = 'sent'
         self.debug('Sent message to %s.', self.ocomm.address)
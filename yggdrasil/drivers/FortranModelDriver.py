@@ -33,6 +33,7 @@ class FortranCompilerBase(CompilerBase):
     default_executable = None
     default_archiver = None
     product_exts = ['mod']
+    is_cacheable = False  # Module files are written to the module directory
 
     @classmethod
     def get_flags(cls, **kwargs):
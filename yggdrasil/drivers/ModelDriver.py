@@ -296,6 +296,8 @@ class ModelDriver(Driver):
         'source_products': {'type': 'array', 'default': [],
                             'items': {'type': 'string'}},
         'working_dir': {'type': 'string'},
+        'env': {'type': 'object',
+                'additionalProperties': {'type': 'string'}},
         'overwrite': {'type': 'boolean', 'default': True},
         'preserve_cache': {'type': 'boolean', 'default': False},
         'function': {'type': 'string'},
@@ -349,7 +351,8 @@ class ModelDriver(Driver):
                            'items': {'type': 'string'}},
         'outputs_in_inputs': {'type': 'boolean'},
         'logging_level': {'type': 'string', 'default': ''}}
-    _schema_excluded_from_class = ['name', 'language', 'args', 'working_dir']
+    _schema_excluded_from_class = ['name', 'language', 'args', 'working_dir',
+                                   'env']
     _schema_excluded_from_class_validation = ['inputs', 'outputs']
     
     language = None
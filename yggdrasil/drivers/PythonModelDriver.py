@@ -1,7 +1,7 @@
 import os
 import sys
 import importlib
-from yggdrasil import tools
+from yggdrasil import tools, warmpool
 from yggdrasil.drivers.InterpretedModelDriver import InterpretedModelDriver
 
 
@@ -17,6 +17,8 @@ class PythonModelDriver(InterpretedModelDriver):
     supported_comm_options = {
         'ipc': {'platforms': ['MacOS', 'Linux'],
                 'libraries': ['sysv_ipc']},
+        'shm': {'platforms': ['MacOS', 'Linux'],
+                'libraries': ['sysv_ipc']},
         'zmq': {'libraries': ['zmq']},
         'rmq': {'libraries': ['pika']}}
     type_map = {
@@ -174,3 +176,28 @@ class PythonModelDriver(InterpretedModelDriver):
                 kwargs['filename'] = os.path.splitext(os.path.basename(fname))[0]
         kwargs['default'] = default
         return super(PythonModelDriver, cls).format_function_param(key, **kwargs)
+
+    def run_model(self, return_process=True, **kwargs):
+        r"""Run the model. If warm interpreter pools are enabled (see
+        :func:`yggdrasil.warmpool.is_enabled`), the model is run in a process
+        forked from a preloaded interpreter instead of a new interpreter.
+
+        Args:
+            return_process (bool, optional): If True, the process running
+                the model is returned. If False, the process will block until
+                the model finishes running. Defaults to True.
+            **kwargs: Keyword arguments are passed to the parent class's
+                method.
+
+        """
+        if (return_process and (not kwargs) and warmpool.is_enabled()
+                and (not (self.with_strace or self.with_valgrind))
+                and (not self.get_interpreter_flags())):
+            env = self.set_env()
+            command = self.model_command()
+            self.debug('Running %s from a warm interpreter in %s',
+                       ' '.join(command), self.working_dir)
+            pool = warmpool.get_interpreter_pool(self.get_interpreter())
+            return pool.run(command, env=env, working_dir=self.working_dir)
+        return super(PythonModelDriver, self).run_model(
+            return_process=return_process, **kwargs)
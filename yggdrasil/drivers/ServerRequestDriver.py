@@ -183,7 +183,7 @@ class ServerRequestDriver(ConnectionDriver):
                     return False
                 drv_args = [self.response_address]
                 drv_kwargs = dict(comm=self.comm, msg_id=self.request_id,
-                                  request_name=self.name)
+                                  request_name=self.name, reactor=self.reactor)
                 try:
                     response_driver = ServerResponseDriver(*drv_args, **drv_kwargs)
                     self.response_drivers.append(response_driver)
@@ -83,6 +83,11 @@ class TestClientDriverNoStart(TestClientParam,
         for k in err_attr:
             assert_raises(AttributeError, getattr, self.instance, k)
 
+    def test_defer_1st_send(self):
+        r"""Disabled: Test deferring retries of the first send to the loop.
+        Requests cannot be sent before one is received from the model."""
+        pass
+
 
 class TestClientDriverNoInit(TestClientParam,
                              parent.TestConnectionDriverNoInit):
@@ -1,4 +1,11 @@
 import os
+import sys
+import glob
+import shutil
+import tempfile
+import unittest
+import warnings
+from yggdrasil import platform
 from yggdrasil.config import ygg_cfg
 from yggdrasil.tests import assert_equal, assert_raises, YggTestClass
 from yggdrasil.drivers import CompiledModelDriver
@@ -53,6 +60,269 @@ def test_CompilationToolBase():
                   invalid='invalid')
 
 
+def test_BuildCache():
+    r"""Test BuildCache."""
+    directory = tempfile.mkdtemp()
+    srcdir = tempfile.mkdtemp()
+    try:
+        cache = CompiledModelDriver.BuildCache(directory=directory)
+        src = os.path.join(srcdir, 'src.c')
+        hdr = os.path.join(srcdir, 'src.h')
+        out = os.path.join(srcdir, 'src.o')
+        with open(src, 'w') as fd:
+            fd.write('#include "src.h"\n#include <stdio.h>\n')
+        with open(hdr, 'w') as fd:
+            fd.write('#define A 1\n')
+        cmd = [sys.executable, '-c', src, '-o', out]
+        inputs = []
+        key0 = cache.get_key(DummyCompiler, cmd, out, inputs=inputs)
+        assert_equal(inputs, [src, hdr])
+        assert_equal(cache.get_key(DummyCompiler, cmd, out), key0)
+        assert(not cache.fetch(key0, out, [out]))
+        # Store
+        with open(out, 'w') as fd:
+            fd.write('product')
+        cache.store(key0, out, [out, out + '.missing'])
+        assert_equal(len(cache.entries()), 1)
+        size = cache.size
+        assert(size > len('product'))
+        cache.store(key0, out, [out])
+        assert_equal(len(cache.entries()), 1)
+        # Fetch
+        os.remove(out)
+        assert(cache.fetch(key0, out, [out]))
+        with open(out, 'r') as fd:
+            assert_equal(fd.read(), 'product')
+        # Entries with contents that don't match the hash are removed
+        with open(os.path.join(cache.get_entry(key0), '0'), 'w') as fd:
+            fd.write('tampered')
+        assert(not cache.fetch(key0, out, [out]))
+        with open(out, 'r') as fd:
+            assert_equal(fd.read(), 'product')
+        assert_equal(cache.entries(), [])
+        assert_equal(glob.glob(out + '.*.tmp'), [])
+        cache.store(key0, out, [out])
+        # Key changes with included files and flags
+        with open(hdr, 'w') as fd:
+            fd.write('#define A 2\n')
+        key1 = cache.get_key(DummyCompiler, cmd, out)
+        assert(key1 != key0)
+        assert(cache.get_key(DummyCompiler, cmd + ['-O2'], out) != key1)
+        assert_equal(cache.get_key(DummyCompiler, cmd + [srcdir], out),
+                     None)
+        assert_equal(cache.get_key(DummyCompiler, ['invalid'] + cmd[1:],
+                                   out), None)
+        # Eviction of least recently used
+        cache.store(key1, out, [out])
+        assert_equal(len(cache.entries()), 2)
+        os.utime(cache.get_entry(key0), (0, 0))
+        cache.max_size = size
+        cache.evict()
+        assert_equal([x[2] for x in cache.entries()],
+                     [cache.get_entry(key1)])
+        cache.clear()
+        assert_equal(cache.entries(), [])
+    finally:
+        shutil.rmtree(directory)
+        shutil.rmtree(srcdir)
+
+
+@unittest.skipIf(platform._is_win, "Unix permissions")
+def test_BuildCache_shared():
+    r"""Test that entries in a shared BuildCache are accessible to the
+    group."""
+    directory = tempfile.mkdtemp()
+    srcdir = tempfile.mkdtemp()
+    try:
+        os.chmod(directory, 0o2770)
+        cache = CompiledModelDriver.BuildCache(directory=directory)
+        assert(cache.check_directory())
+        assert(cache.shared)
+        out = os.path.join(srcdir, 'src.o')
+        with open(out, 'w') as fd:
+            fd.write('product')
+        key = 'ab' * 32
+        cache.store(key, out, [out])
+        entry = cache.get_entry(key)
+        for x in [os.path.dirname(entry), entry]:
+            assert_equal(os.stat(x).st_mode & 0o7777, 0o2770)
+        assert_equal(os.stat(os.path.join(entry, '0')).st_mode & 0o777,
+                     0o660)
+        os.remove(out)
+        assert(cache.fetch(key, out, [out]))
+    finally:
+        shutil.rmtree(directory)
+        shutil.rmtree(srcdir)
+
+
+def test_get_build_cache():
+    r"""Test get_build_cache."""
+    old_env = os.environ.get('YGG_BUILD_CACHE', None)
+    directory = os.path.join(tempfile.mkdtemp(), 'test_dir')
+    try:
+        os.environ['YGG_BUILD_CACHE'] = 'False'
+        assert_equal(CompiledModelDriver.get_build_cache(), None)
+        os.environ['YGG_BUILD_CACHE'] = directory
+        assert_equal(CompiledModelDriver.get_build_cache().directory,
+                     directory)
+        if not platform._is_win:
+            # Created so only the user has access
+            assert_equal(os.stat(directory).st_mode & 0o777, 0o700)
+            # Directories writable by all users are refused
+            os.chmod(directory, 0o777)
+            with warnings.catch_warnings(record=True):
+                warnings.simplefilter('always')
+                assert_equal(CompiledModelDriver.get_build_cache(), None)
+            # Group writable directories must be setgid to be shared
+            os.chmod(directory, 0o770)
+            with warnings.catch_warnings(record=True):
+                warnings.simplefilter('always')
+                assert_equal(CompiledModelDriver.get_build_cache(), None)
+            os.chmod(directory, 0o2770)
+            assert(CompiledModelDriver.get_build_cache().shared)
+    finally:
+        if old_env is None:
+            del os.environ['YGG_BUILD_CACHE']
+        else:  # pragma: debug
+            os.environ['YGG_BUILD_CACHE'] = old_env
+        shutil.rmtree(os.path.dirname(directory))
+
+
+def test_BuildCache_check_directory():
+    r"""Test BuildCache.check_directory."""
+    assert(CompiledModelDriver.BuildCache().directory.endswith(
+        os.path.join('.ygg_cache', 'build')))
+    directory = tempfile.mkdtemp()
+    try:
+        fname = os.path.join(directory, 'file')
+        with open(fname, 'w') as fd:
+            fd.write('not a directory')
+        cache = CompiledModelDriver.BuildCache(directory=fname)
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter('always')
+            assert(not cache.check_directory())
+        if not platform._is_win:
+            # Directory owned by another user
+            if os.getuid() == 0:
+                other = os.path.join(directory, 'other')
+                os.mkdir(other, 0o700)
+                os.chown(other, os.getuid() + 1, -1)
+            else:
+                other = os.path.abspath(os.sep)
+            cache = CompiledModelDriver.BuildCache(directory=other)
+            with warnings.catch_warnings(record=True):
+                warnings.simplefilter('always')
+                assert(not cache.check_directory())
+            # Shared group directory owned by another user
+            if os.getuid() == 0:
+                os.chmod(other, 0o2770)
+                cache = CompiledModelDriver.BuildCache(directory=other)
+                assert(cache.check_directory())
+                assert(cache.shared)
+                # Only allowed if configured explicitly
+                cache.is_default = True
+                with warnings.catch_warnings(record=True):
+                    warnings.simplefilter('always')
+                    assert(not cache.check_directory())
+    finally:
+        shutil.rmtree(directory)
+
+
+@unittest.skipIf(shutil.which('gcc') is None, "gcc not installed")
+def test_call_build_cache():
+    r"""Test that compilation products are retrieved from the build cache
+    across working directories."""
+    import_component('model', subtype='c')
+    gcc = CompiledModelDriver.get_compilation_tool('compiler', 'gcc')
+    directory = tempfile.mkdtemp()
+    wdirs = [tempfile.mkdtemp() for _ in range(2)]
+    old_env = os.environ.get('YGG_BUILD_CACHE', None)
+    os.environ['YGG_BUILD_CACHE'] = directory
+    try:
+        for x in wdirs:
+            with open(os.path.join(x, 'src.c'), 'w') as fd:
+                fd.write('#include "src.h"\nint f(void) { return A; }\n')
+            with open(os.path.join(x, 'src.h'), 'w') as fd:
+                fd.write('#define A 1\n')
+        cache = CompiledModelDriver.get_build_cache()
+        outs = []
+        for x in wdirs:
+            outs.append(gcc.call([os.path.join(x, 'src.c')], dont_link=True,
+                                 working_dir=x))
+            assert_equal(len(cache.entries()), 1)
+        with open(outs[0], 'rb') as fd0, open(outs[1], 'rb') as fd1:
+            assert_equal(fd0.read(), fd1.read())
+        # Stale product is rebuilt
+        with open(os.path.join(wdirs[1], 'src.h'), 'w') as fd:
+            fd.write('#define A 2\n')
+        os.utime(outs[1], (0, 0))
+        gcc.call([os.path.join(wdirs[1], 'src.c')], dont_link=True,
+                 working_dir=wdirs[1])
+        assert_equal(len(cache.entries()), 2)
+        # Existing products not built by the call are rebuilt, not cached
+        cache.clear()
+        with open(outs[0], 'rb') as fd:
+            expected = fd.read()
+        with open(outs[0], 'wb') as fd:
+            fd.write(b'foreign')
+        gcc.call([os.path.join(wdirs[0], 'src.c')], dont_link=True,
+                 working_dir=wdirs[0])
+        with open(outs[0], 'rb') as fd:
+            assert_equal(fd.read(), expected)
+        os.remove(outs[0])
+        assert(cache.fetch(cache.entries()[0][2].split(os.sep)[-1],
+                           outs[0], [outs[0]]))
+        with open(outs[0], 'rb') as fd:
+            assert_equal(fd.read(), expected)
+        # Overwrite rebuilds without using the cache or existing products
+        with open(outs[0], 'wb') as fd:
+            fd.write(b'foreign')
+        entry = cache.entries()[0][2]
+        with open(os.path.join(entry, '0'), 'wb') as fd:
+            fd.write(b'foreign')
+        gcc.call([os.path.join(wdirs[0], 'src.c')], dont_link=True,
+                 working_dir=wdirs[0], overwrite=True)
+        with open(outs[0], 'rb') as fd:
+            assert_equal(fd.read(), expected)
+    finally:
+        if old_env is None:
+            del os.environ['YGG_BUILD_CACHE']
+        else:  # pragma: debug
+            os.environ['YGG_BUILD_CACHE'] = old_env
+        for x in [directory] + wdirs:
+            shutil.rmtree(x)
+
+
+def test_run_build_tasks():
+    r"""Test run_build_tasks."""
+    completed = []
+
+    def func(x):
+        if x == 'error':
+            raise RuntimeError("Test error")
+        completed.append(x)
+        return x.upper()
+
+    tasks = ['a', 'b', 'c', 'd']
+    dependencies = {'a': ['b', 'c'], 'b': ['c'], 'd': ['invalid']}
+    for nworkers in [1, 4]:
+        del completed[:]
+        assert_equal(CompiledModelDriver.run_build_tasks(
+            tasks, func, dependencies=dependencies, nworkers=nworkers),
+            ['A', 'B', 'C', 'D'])
+        assert_equal(sorted(completed), tasks)
+        assert(completed.index('c') < completed.index('b'))
+        assert(completed.index('b') < completed.index('a'))
+        assert_raises(RuntimeError, CompiledModelDriver.run_build_tasks,
+                      ['error', 'a'], func, dependencies={'a': ['error']},
+                      nworkers=nworkers)
+    assert_raises(ValueError, CompiledModelDriver.run_build_tasks,
+                  ['a', 'b'], func, dependencies={'a': ['b'], 'b': ['a']})
+    assert(CompiledModelDriver.get_build_workers() >= 1)
+    assert(CompiledModelDriver.get_output_lock('test')
+           is CompiledModelDriver.get_output_lock(os.path.abspath('test')))
+
+
 class DummyCompiler(CompiledModelDriver.CompilerBase):
     r"""Dummy test class."""
     _dont_register = True
@@ -269,6 +539,16 @@ class TestCompiledModelDriverNoInit(TestCompiledModelParam,
         deps = list(self.import_cls.internal_libraries.keys())
         self.import_cls.get_dependency_order(deps)
 
+    def test_get_dependency_graph(self):
+        r"""Test get_dependency_graph."""
+        deps = list(self.import_cls.internal_libraries.keys())
+        graph = self.import_cls.get_dependency_graph(deps)
+        order = self.import_cls.get_dependency_order(deps)
+        self.assert_equal(list(graph.keys()), order)
+        for k, v in graph.items():
+            for x in v:
+                assert(order.index(x) > order.index(k))
+
     def test_get_flags(self):
         r"""Test get_flags."""
         compiler = self.import_cls.get_tool('compiler')
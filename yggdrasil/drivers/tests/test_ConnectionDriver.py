@@ -1,5 +1,5 @@
 import unittest
-from yggdrasil import tools, platform
+from yggdrasil import tools, platform, multitasking
 from yggdrasil.tests import MagicTestError, assert_raises
 from yggdrasil.schema import get_schema
 from yggdrasil.components import import_component
@@ -270,6 +270,31 @@ class TestConnectionDriverNoStart(TestConnectionParam, parent.TestDriverNoStart)
         assert(not flag)
         self.assert_equal(ret, None)
 
+    def test_defer_1st_send(self):
+        r"""Test deferring retries of the first send to the loop."""
+        nfail = [2]
+
+        def _send_message(*args, **kwargs):
+            nfail[0] -= 1
+            return (nfail[0] < 0)
+
+        self.instance.open_comm()
+        self.instance._send_message = _send_message
+        self.instance.reactor = multitasking.YggReactor()
+        try:
+            assert(self.instance.send_message(self.test_msg,
+                                              defer_1st_send=True) is None)
+            assert(not self.instance._first_send_done)
+            assert(self.instance._retry_1st_message() is None)
+            assert(self.instance._loop_idle)
+            self.instance._pending_1st_send.update(count=True, t_send=0.0)
+            assert(self.instance._retry_1st_message())
+            assert(self.instance._first_send_done)
+            assert(self.instance._pending_1st_send is None)
+            self.assert_equal(self.instance.nsent, 1)
+        finally:
+            self.instance.reactor = None
+
         
 class TestConnectionDriverNoInit(TestConnectionParam):
     r"""Test class for the ConnectionDriver class without init."""
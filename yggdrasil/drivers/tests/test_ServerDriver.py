@@ -88,6 +88,11 @@ class TestServerDriverNoStart(TestServerParam,
         for k in err_attr:
             assert_raises(AttributeError, getattr, self.instance, k)
 
+    def test_defer_1st_send(self):
+        r"""Disabled: Test deferring retries of the first send to the loop.
+        Responses cannot be forwarded before a request is received."""
+        pass
+
 
 class TestServerDriverNoInit(TestServerParam,
                              parent.TestConnectionDriverNoInit):
@@ -0,0 +1,425 @@
+"""This module provides tools for running an ensemble of members of an
+integration (e.g. a parameter sweep). The integration is parsed and its
+models compiled once and the members are then run concurrently, each with
+its own runner, namespace, and output directory.
+
+An ensemble is specified by a YAML file with the following entries:
+
+* models (str, list): One or more YAML files specifying the integration
+  (relative to the ensemble specification).
+* members (list, optional): Members of the ensemble. Each member is a
+  dictionary that can contain a 'name', environment variables that
+  should be set for all of the models ('env'), and model specific
+  overrides ('models'), which map from model name to a dictionary that
+  can contain environment variables ('env') and additional command line
+  arguments ('args') for that model.
+* sweep (dict, optional): Mapping from environment variable to the values
+  it should take. A member is added for every combination of values.
+* concurrency (int, optional): Maximum number of members that should be
+  run at once. Defaults to the number of CPUs.
+* output_dir (str, optional): Directory where the output files for each
+  member are placed (in a sub-directory named for the member). Defaults
+  to '<spec name>_output' in the directory containing the specification.
+
+Because the integration is only parsed once, members should be
+parameterized via environment variables or command line arguments rather
+than by templating the integration YAMLs.
+
+"""
+import os
+import copy
+import json
+import time
+import signal
+import itertools
+import threading
+import traceback
+import multiprocessing
+from collections import OrderedDict
+from yggdrasil import yamlfile, multitasking, tracing
+from yggdrasil.tools import YggClass
+from yggdrasil.config import ygg_cfg, temp_config
+from yggdrasil.components import import_component
+from yggdrasil.runner import YggRunner, get_runner
+
+
+def load_ensemble(spec):
+    r"""Load and normalize an ensemble specification.
+
+    Args:
+        spec (str, dict): Path to a YAML file containing the ensemble
+            specification or the loaded specification.
+
+    Returns:
+        dict: Normalized ensemble specification with absolute paths to the
+            model YAMLs and output directory and a list of members that
+            includes members generated by any sweep.
+
+    Raises:
+        YAMLSpecificationError: If the specification is invalid.
+
+    """
+    name = 'ensemble'
+    if isinstance(spec, str):
+        name = os.path.splitext(os.path.basename(spec))[0]
+        spec = yamlfile.load_yaml(spec)
+    else:
+        spec = copy.deepcopy(spec)
+        spec.setdefault('working_dir', os.getcwd())
+    working_dir = spec['working_dir']
+    models = spec.get('models', None)
+    if isinstance(models, str):
+        models = [models]
+    if not models:
+        raise yamlfile.YAMLSpecificationError(
+            "Ensemble specification must include 'models'.")
+    spec['models'] = [os.path.normpath(os.path.join(working_dir, x))
+                      for x in models]
+    members = []
+    for i, x in enumerate(spec.get('members', [])):
+        if not isinstance(x, dict):
+            raise yamlfile.YAMLSpecificationError(
+                "Ensemble member %d is not a dictionary." % i)
+        members.append(dict(x))
+    sweep = spec.get('sweep', {})
+    if not isinstance(sweep, dict):
+        raise yamlfile.YAMLSpecificationError(
+            "Ensemble 'sweep' must map environment variables to values.")
+    if sweep:
+        keys = sorted(sweep.keys())
+        values = [v if isinstance(v, list) else [v] for v in
+                  (sweep[k] for k in keys)]
+        for x in itertools.product(*values):
+            members.append({'env': dict(zip(keys, x))})
+    if not members:
+        raise yamlfile.YAMLSpecificationError(
+            "Ensemble specification does not include any members.")
+    names = set()
+    for i, x in enumerate(members):
+        x.setdefault('name', 'member%d' % i)
+        x['name'] = str(x['name'])
+        if x['name'] in names:
+            raise yamlfile.YAMLSpecificationError(
+                "Ensemble member name '%s' is not unique." % x['name'])
+        names.add(x['name'])
+        x['env'] = {k: str(v) for k, v in x.get('env', {}).items()}
+        x.setdefault('models', {})
+    spec['members'] = members
+    spec['output_dir'] = os.path.join(
+        working_dir, spec.get('output_dir', '%s_output' % name))
+    return spec
+
+
+class YggEnsemble(YggClass):
+    r"""This class handles running the members of an ensemble.
+
+    Args:
+        spec (str, dict): Path to a YAML file containing the ensemble
+            specification or the loaded specification (see
+            :func:`load_ensemble`).
+        concurrency (int, optional): Maximum number of members that should
+            be run at once. Defaults to the value in the specification or
+            the number of CPUs if it is not set.
+        output_dir (str, optional): Directory where the outputs of each
+            member should be placed. Defaults to the value in the
+            specification.
+        namespace (str, optional): Namespace that member namespaces should
+            be derived from. Defaults to the value in the config file.
+        production_run (bool, optional): If True, the members are run in
+            production mode. Defaults to False.
+        trace_file (str, optional): Full path to a Chrome trace event file
+            that all of the members should append message traces to.
+            Defaults to the 'trace_file' option in the 'general' section
+            of the config file. If not set, messages are not traced.
+        **kwargs: Additional keyword arguments are passed to the runner
+            for each member.
+
+    Attributes:
+        spec (dict): Normalized ensemble specification.
+        members (list): Member specifications.
+        concurrency (int): Maximum number of members that are run at once.
+        output_dir (str): Directory containing the outputs for each member.
+        namespace (str): Namespace that member namespaces are derived from.
+        trace_file (str): Full path to the Chrome trace event file that
+            the members append message traces to if tracing is enabled.
+        drivers (dict): Driver information parsed from the integration
+            YAMLs, which is copied for each member.
+        results (OrderedDict): Results for each member including the
+            time spent on each step of the run ('times'), the total time
+            for the member ('elapsed'), whether an error occurred ('error'),
+            and the paths to output files ('outputs').
+        times (dict): Timing statistics for the ensemble.
+
+    """
+
+    def __init__(self, spec, concurrency=None, output_dir=None,
+                 namespace=None, production_run=False, trace_file=None,
+                 **kwargs):
+        super(YggEnsemble, self).__init__('ensemble')
+        self.spec = load_ensemble(spec)
+        self.members = self.spec['members']
+        if concurrency is None:
+            concurrency = self.spec.get('concurrency', None)
+        if concurrency is None:
+            concurrency = multiprocessing.cpu_count()
+        self.concurrency = max(1, int(concurrency))
+        if output_dir is None:
+            output_dir = self.spec['output_dir']
+        self.output_dir = os.path.abspath(output_dir)
+        if namespace is None:
+            namespace = ygg_cfg.get('rmq', 'namespace', 'yggdrasil')
+        self.namespace = namespace
+        self.production_run = production_run
+        if trace_file is None:
+            trace_file = tracing.get_trace_file()
+        elif trace_file:
+            trace_file = os.path.abspath(trace_file)
+        self.trace_file = trace_file
+        self.runner_kwargs = kwargs
+        self.results = OrderedDict()
+        self.times = {}
+        self._compiled = []
+        self._runners = {}
+        self._lock = threading.Lock()
+        self._terminated = False
+        t0 = time.perf_counter()
+        self.drivers = yamlfile.parse_yaml(self.spec['models'])
+        self.times['parse'] = time.perf_counter() - t0
+        for x in self.members:
+            for k in x['models'].keys():
+                if k not in self.drivers['model']:
+                    raise yamlfile.YAMLSpecificationError(
+                        "Ensemble member '%s' sets parameters for model "
+                        "'%s', which is not part of the integration."
+                        % (x['name'], k))
+
+    def compileModels(self):
+        r"""Compile the models in the integration that need to be compiled
+        so that the members can share the products."""
+        from yggdrasil.drivers import create_driver
+        from yggdrasil.drivers.CompiledModelDriver import run_build_tasks
+        ymls = []
+        for yml in self.drivers['model'].values():
+            drv_cls = import_component('model', yml['driver'],
+                                       without_schema=True)
+            if drv_cls.executable_type == 'compiler':
+                yml = copy.deepcopy(yml)
+                yml['skip_compile'] = True
+                ymls.append(yml)
+
+        def compile_model(i):
+            yml = ymls[i]
+            with YggRunner.working_directory(yml.get('working_dir', None)):
+                drv = create_driver(yml=yml, namespace=self.namespace, **yml)
+            drv.build_model()
+            with self._lock:
+                self._compiled.append(drv)
+
+        if ymls:
+            self.debug("Compiling models: %s", [x['name'] for x in ymls])
+            run_build_tasks(list(range(len(ymls))), compile_model)
+
+    def member_drivers(self, member):
+        r"""Create the driver information for a member of the ensemble.
+
+        Args:
+            member (dict): Member specification.
+
+        Returns:
+            tuple: Driver information for the member and a dictionary
+                mapping from the names of output drivers to the files they
+                write to.
+
+        """
+        drivers = copy.deepcopy(self.drivers)
+        for name, yml in drivers['model'].items():
+            overrides = member['models'].get(name, {})
+            env = dict(member['env'])
+            env.update({k: str(v) for k, v in
+                        overrides.get('env', {}).items()})
+            yml['env'] = dict(yml.get('env', {}), **env)
+            args = overrides.get('args', [])
+            if not isinstance(args, list):
+                args = [args]
+            yml['args'] = yml['args'] + [str(x) for x in args]
+            # Products are shared between members and removed by the
+            # ensemble once all of the members have finished
+            yml['overwrite'] = False
+        # Place output files in a directory for the member
+        member_dir = os.path.join(self.output_dir, member['name'])
+        outputs = {}
+        for name, yml in drivers['output'].items():
+            for x in yml['ocomm_kws']['comm']:
+                if not x.get('filetype', None):
+                    continue
+                x['address'] = os.path.join(
+                    member_dir, os.path.basename(x['address']))
+                x['in_temp'] = False
+                outputs[name] = x['address']
+        if outputs and (not os.path.isdir(member_dir)):
+            os.makedirs(member_dir)
+        return drivers, outputs
+
+    def run_member(self, member):
+        r"""Run one member of the ensemble.
+
+        Args:
+            member (dict): Member specification.
+
+        """
+        name = member['name']
+        result = {'error': False, 'outputs': {}, 'times': {}}
+        with self._lock:
+            self.results[name] = result
+            if self._terminated:
+                result['error'] = 'terminated'
+                return
+        t0 = time.perf_counter()
+        try:
+            drivers, result['outputs'] = self.member_drivers(member)
+            kwargs = dict(self.runner_kwargs, drivers=drivers,
+                          compile_models=False)
+            # Metrics for each member are written to the member's directory
+            if ((kwargs.get('metrics_file', None)
+                 or ygg_cfg.get('general', 'metrics_file', None))):
+                member_dir = os.path.join(self.output_dir, name)
+                if not os.path.isdir(member_dir):
+                    os.makedirs(member_dir)
+                kwargs['metrics_file'] = os.path.join(member_dir,
+                                                      'metrics.json')
+            # Members append to the trace file for the ensemble
+            kwargs.update(trace_file=(self.trace_file or False),
+                          append_trace=True)
+            runner = get_runner(self.spec['models'],
+                                namespace='%s_%s' % (self.namespace, name),
+                                **kwargs)
+            with self._lock:
+                self._runners[name] = runner
+            times = runner.run(timer=time.perf_counter, t0=t0)
+            # Convert to the time spent on each step
+            tprev = t0
+            for k in ['init', 'load drivers', 'start drivers', 'run models',
+                      'close channels', 'clean up']:
+                result['times'][k] = times[k] - tprev
+                tprev = times[k]
+            result['times']['drivers'] = times['drivers']
+            result['error'] = runner.error_flag
+        except BaseException:  # pragma: debug
+            self.error("Error running member %s:\n%s", name,
+                       traceback.format_exc())
+            result['error'] = True
+        finally:
+            with self._lock:
+                self._runners.pop(name, None)
+        result['elapsed'] = time.perf_counter() - t0
+        self.info("Member %s finished in %f s%s", name, result['elapsed'],
+                  ' with errors' if result['error'] else '')
+
+    def signal_handler(self, sig, frame):
+        r"""Terminate all members on interrupt."""
+        self.terminate()
+
+    def terminate(self):
+        r"""Stop running members and skip members that have not started."""
+        with self._lock:
+            self._terminated = True
+            runners = list(self._runners.values())
+        for x in runners:
+            x.terminate()
+
+    def cleanup(self):
+        r"""Remove products created by compiling the models."""
+        for drv in self._compiled:
+            drv.cleanup_products()
+        self._compiled = []
+
+    def run(self):
+        r"""Run all of the members of the ensemble.
+
+        Returns:
+            OrderedDict: Results for each member in the order the members
+                were specified.
+
+        """
+        old_handler = None
+        if threading.current_thread() is threading.main_thread():
+            old_handler = signal.signal(signal.SIGINT, self.signal_handler)
+        old_trace_env = os.environ.get('YGG_TRACE_FILE', None)
+        if self.trace_file:
+            # Set before the members are started so that runners in
+            # different threads restore the same value
+            os.environ['YGG_TRACE_FILE'] = self.trace_file
+            tracing.start(self.trace_file)
+        try:
+            with temp_config(production_run=self.production_run):
+                t0 = time.perf_counter()
+                self.compileModels()
+                self.times['compile'] = time.perf_counter() - t0
+                t0 = time.perf_counter()
+                members = OrderedDict([(x['name'], x) for x in self.members])
+                try:
+                    multitasking.run_task_graph(
+                        list(members.keys()),
+                        lambda name: self.run_member(members[name]),
+                        nworkers=self.concurrency)
+                finally:
+                    self.times['run members'] = time.perf_counter() - t0
+                    self.cleanup()
+        finally:
+            if self.trace_file:
+                tracing.finalize(self.trace_file)
+                if old_trace_env is None:
+                    os.environ.pop('YGG_TRACE_FILE', None)
+                else:
+                    os.environ['YGG_TRACE_FILE'] = old_trace_env
+            if old_handler is not None:
+                signal.signal(signal.SIGINT, old_handler)
+        results = OrderedDict([(x['name'], self.results[x['name']])
+                               for x in self.members])
+        self.results = results
+        self.write_summary()
+        return results
+
+    @property
+    def error_flag(self):
+        r"""bool: True if one or more members generated errors."""
+        return any(x['error'] for x in self.results.values())
+
+    def write_summary(self):
+        r"""Log the timing for each member and write the results for the
+        ensemble to 'ensemble.json' in the output directory.
+
+        Returns:
+            str: Path to the file containing the results.
+
+        """
+        for k, v in self.results.items():
+            self.info('%20s\t%f%s', k, v.get('elapsed', 0.0),
+                      '\tERROR' if v['error'] else '')
+        self.info(40 * '=')
+        for k in ['parse', 'compile', 'run members']:
+            self.info('%20s\t%f', k, self.times.get(k, 0.0))
+        out = os.path.join(self.output_dir, 'ensemble.json')
+        if not os.path.isdir(self.output_dir):
+            os.makedirs(self.output_dir)
+        with open(out, 'w') as fd:
+            json.dump({'times': self.times,
+                       'concurrency': self.concurrency,
+                       'members': self.results}, fd, indent=4,
+                      default=str)
+        return out
+
+
+def run_ensemble(spec, **kwargs):
+    r"""Run an ensemble.
+
+    Args:
+        spec (str, dict): Path to a YAML file containing the ensemble
+            specification or the loaded specification.
+        **kwargs: Additional keyword arguments are passed to YggEnsemble.
+
+    Returns:
+        OrderedDict: Results for each member of the ensemble.
+
+    """
+    return YggEnsemble(spec, **kwargs).run()
@@ -0,0 +1,277 @@
+r"""Hooks around the stages of the comm send/recv pipelines.
+
+Hooks are objects with ``enter`` and ``exit`` methods (see PipelineHook)
+that are registered via register and called when a comm enters or leaves
+one of the following stages:
+
+* send: CommBase.send (filter, send_multipart, and bookkeeping)
+* serialize: CommBase.serialize
+* send_multipart: CommBase.send_multipart (serialize and transmission)
+* recv: CommBase.recv (recv_multipart, filter, and conversion)
+* recv_multipart: CommBase.recv_multipart (waiting for, receiving, and
+  parsing a message)
+* _recv_multipart: CommBase._recv_multipart (receiving the remainder of a
+  message that was split across multiple parts)
+* deserialize: CommBase.deserialize
+* apply_transform: CommBase.apply_transform
+
+Stages are nested (e.g. serialize occurs within send_multipart which occurs
+within send). When no hooks are registered for a stage, the only overhead
+is a dictionary lookup.
+
+"""
+import json
+import time
+import functools
+import threading
+
+
+_stages = ['send', 'serialize', 'send_multipart',
+           'recv', 'recv_multipart', '_recv_multipart', 'deserialize',
+           'apply_transform']
+_lock = threading.Lock()
+# Hooks registered for each stage. Tuples are replaced rather than modified
+# so that they can be iterated over without a lock.
+_stage_hooks = {}
+
+
+class PipelineHook(object):
+    r"""Base class for hooks called around the stages of the comm
+    send/recv pipelines."""
+
+    def enter(self, stage, comm):
+        r"""Actions to perform when a comm enters a stage.
+
+        Args:
+            stage (str): Name of the stage.
+            comm (CommBase): Comm that is entering the stage.
+
+        """
+        pass
+
+    def exit(self, stage, comm):
+        r"""Actions to perform when a comm exits a stage (including when
+        the stage raises an error).
+
+        Args:
+            stage (str): Name of the stage.
+            comm (CommBase): Comm that is exiting the stage.
+
+        """
+        pass
+
+
+def register(hook, stages=None):
+    r"""Register a hook so that it is called around pipeline stages.
+
+    Args:
+        hook (PipelineHook): Hook to register.
+        stages (list, optional): Stages that the hook should be called
+            for. Defaults to None and the hook is called for all stages.
+
+    Raises:
+        ValueError: If a stage is not valid.
+
+    """
+    if stages is None:
+        stages = _stages
+    for k in stages:
+        if k not in _stages:
+            raise ValueError("Invalid stage '%s'. Valid stages are: %s"
+                             % (k, _stages))
+    with _lock:
+        for k in stages:
+            if hook not in _stage_hooks.get(k, ()):
+                _stage_hooks[k] = _stage_hooks.get(k, ()) + (hook, )
+
+
+def unregister(hook):
+    r"""Unregister a hook from all stages.
+
+    Args:
+        hook (PipelineHook): Hook to unregister.
+
+    """
+    with _lock:
+        for k in list(_stage_hooks.keys()):
+            remaining = tuple(x for x in _stage_hooks[k] if x is not hook)
+            if remaining:
+                _stage_hooks[k] = remaining
+            else:
+                del _stage_hooks[k]
+
+
+def get_hooks(stage):
+    r"""Get the hooks registered for a stage.
+
+    Args:
+        stage (str): Name of the stage.
+
+    Returns:
+        tuple: Registered hooks.
+
+    """
+    return _stage_hooks.get(stage, ())
+
+
+def stage(name):
+    r"""Decorator for marking a comm method as a pipeline stage so that
+    registered hooks are called around it.
+
+    Args:
+        name (str): Name of the stage.
+
+    Returns:
+        function: Decorator.
+
+    """
+    assert(name in _stages)
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapped(self, *args, **kwargs):
+            hooks = _stage_hooks.get(name, None)
+            if not hooks:
+                return method(self, *args, **kwargs)
+            for x in hooks:
+                x.enter(name, self)
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                for x in reversed(hooks):
+                    x.exit(name, self)
+        return wrapped
+    return decorator
+
+
+class StageSampler(PipelineHook):
+    r"""Statistical profiler that attributes wall time to pipeline stages
+    for each comm. The stages that each thread is in are tracked by the
+    hook and a background thread periodically samples them, attributing the
+    time since the previous sample to the innermost stage (exclusive) and to
+    every stage on the stack (inclusive).
+
+    Args:
+        interval (float, optional): Time (in seconds) between samples.
+            Defaults to 0.001.
+
+    Attributes:
+        interval (float): Time (in seconds) between samples.
+        samples (dict): Sampled wall time for each comm and stage.
+        nsamples (int): Number of samples taken.
+
+    """
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.samples = {}
+        self.nsamples = 0
+        self._stacks = {}
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._last_sample = time.perf_counter()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def enter(self, stage, comm):
+        r"""Push a stage onto the stack for the current thread.
+
+        Args:
+            stage (str): Name of the stage.
+            comm (CommBase): Comm that is entering the stage.
+
+        """
+        ident = threading.get_ident()
+        stack = self._stacks.get(ident, None)
+        if stack is None:
+            stack = self._stacks.setdefault(ident, [])
+        stack.append((comm.name, stage))
+
+    def exit(self, stage, comm):
+        r"""Pop a stage off of the stack for the current thread.
+
+        Args:
+            stage (str): Name of the stage.
+            comm (CommBase): Comm that is exiting the stage.
+
+        """
+        stack = self._stacks.get(threading.get_ident(), None)
+        if stack:
+            stack.pop()
+
+    @property
+    def is_running(self):
+        r"""bool: True if the sampler is running."""
+        return (self._thread is not None) and self._thread.is_alive()
+
+    def start(self):
+        r"""Register the hook and start sampling."""
+        if self.is_running:
+            return
+        register(self)
+        self._stop_event.clear()
+        self._last_sample = time.perf_counter()
+        self._thread = threading.Thread(target=self._run,
+                                        name='StageSampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        r"""Stop sampling and unregister the hook."""
+        unregister(self)
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+        self._stacks.clear()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        r"""Attribute the time since the last sample to the stages that
+        each thread is currently in."""
+        now = time.perf_counter()
+        elapsed = now - self._last_sample
+        self._last_sample = now
+        self.nsamples += 1
+        for stack in list(self._stacks.values()):
+            stack = stack[:]
+            if not stack:
+                continue
+            for i, (comm, stage) in enumerate(stack):
+                if (comm, stage) in stack[(i + 1):]:
+                    continue  # Recursive stages are only counted once
+                entry = self.samples.setdefault(comm, {}).setdefault(
+                    stage, {'exclusive': 0.0, 'inclusive': 0.0})
+                entry['inclusive'] += elapsed
+            self.samples[stack[-1][0]][stack[-1][1]]['exclusive'] += elapsed
+
+    def to_dict(self):
+        r"""Get a JSON serializable copy of the sampled times.
+
+        Returns:
+            dict: Inclusive and exclusive wall time (in seconds) for each
+                stage keyed by comm name and then stage name.
+
+        """
+        return {comm: {k: dict(v) for k, v in stages.items()}
+                for comm, stages in list(self.samples.items())}
+
+    def dump(self, filename):
+        r"""Write the sampled times to a JSON file.
+
+        Args:
+            filename (str): Full path to the file that should be written.
+
+        """
+        with open(filename, 'w') as fd:
+            json.dump({'interval': self.interval, 'nsamples': self.nsamples,
+                       'comms': self.to_dict()},
+                      fd, indent=2, sort_keys=True)
+            fd.write('\n')
@@ -337,6 +337,18 @@ int ygg_recv_nolimit(yggInput_t yggQ, char **data, const size_t len){
 #define yggRecv commRecv
 #define yggRecvRealloc commRecvRealloc
 
+/*!
+  @brief Send an array to an output queue as a raw buffer without
+  serialization. See commSendArray for arguments.
+ */
+#define yggSendArray commSendArray
+
+/*!
+  @brief Receive an array from an input queue, optionally directly into a
+  heap buffer. See commRecvArray for arguments.
+ */
+#define yggRecvArray commRecvArray
+
 
 /*! @brief Definitions for symmetry, but there is no difference. */
 #define vyggSend vcommSend
@@ -12,7 +12,8 @@ extern "C" {
 /*! @brief Communicator types. */
 enum comm_enum { NULL_COMM, IPC_COMM, ZMQ_COMM,
 		 SERVER_COMM, CLIENT_COMM,
-		 ASCII_FILE_COMM, ASCII_TABLE_COMM, ASCII_TABLE_ARRAY_COMM };
+		 ASCII_FILE_COMM, ASCII_TABLE_COMM, ASCII_TABLE_ARRAY_COMM,
+		 SHM_COMM };
 typedef enum comm_enum comm_type;
 #define COMM_NAME_SIZE 100
 #define COMM_ADDRESS_SIZE 500
@@ -42,6 +43,7 @@ typedef struct comm_t {
   void *reply; //!< Reply information.
   int is_file; //!< Flag specifying if the comm connects directly to a file.
   int is_work_comm; //!< Flag specifying if comm is a temporary work comm.
+  struct comm_t **work_comm; //!< Work comm reused for multipart messages.
   int is_global; //!< Flag specifying if the comm is global.
   int thread_id; //!< ID for the thread that created the comm.
 } comm_t;
@@ -82,6 +84,10 @@ int free_comm_base(comm_t *x) {
     free(x->used);
     x->used = NULL;
   }
+  if (x->work_comm != NULL) {
+    free(x->work_comm);
+    x->work_comm = NULL;
+  }
   if (x->datatype != NULL) {
     destroy_dtype(&(x->datatype));
     x->datatype = NULL;
@@ -120,6 +126,7 @@ comm_t empty_comm_base() {
   ret.reply = NULL;
   ret.is_file = 0;
   ret.is_work_comm = 0;
+  ret.work_comm = NULL;
   ret.is_global = 0;
   ret.thread_id = 0;
   return ret;
@@ -183,6 +190,13 @@ comm_t* new_comm_base(char *address, const char *direction,
     free_comm_base(ret);
     return NULL;
   }
+  ret->work_comm = (comm_t**)malloc(sizeof(comm_t*));
+  if (ret->work_comm == NULL) {
+    ygglog_error("new_comm_base: Error mallocing work_comm.");
+    free_comm_base(ret);
+    return NULL;
+  }
+  ret->work_comm[0] = NULL;
   ret->last_send[0] = 0;
   ret->sent_eof[0] = 0;
   ret->recv_eof[0] = 0;
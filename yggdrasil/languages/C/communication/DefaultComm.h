@@ -14,6 +14,16 @@ static comm_type _default_comm = IPC_COMM;
 #define default_comm_nmsg ipc_comm_nmsg
 #define default_comm_send ipc_comm_send
 #define default_comm_recv ipc_comm_recv
+// Shared memory Comm
+#elif defined(SHMDEF)
+#include <SHMComm.h>
+static comm_type _default_comm = SHM_COMM;
+#define new_default_address new_shm_address
+#define init_default_comm init_shm_comm
+#define free_default_comm free_shm_comm
+#define default_comm_nmsg shm_comm_nmsg
+#define default_comm_send shm_comm_send
+#define default_comm_recv shm_comm_recv
 // ZMQ Comm
 #else
 #include <ZMQComm.h>
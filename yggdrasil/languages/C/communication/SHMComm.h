@@ -0,0 +1,576 @@
+/*! @brief Flag for checking if this header has already been included. */
+#ifndef YGGSHMCOMM_H_
+#define YGGSHMCOMM_H_
+
+#ifdef SHMINSTALLED
+#include <fcntl.h>           /* For O_* constants */
+#include <sys/stat.h>        /* For mode constants */
+#include <sys/mman.h>
+#include <sys/types.h>
+#include <sys/ipc.h>
+#include <sys/sem.h>
+#endif /*SHMINSTALLED*/
+#include <CommBase.h>
+
+#ifdef __cplusplus /* If this is a C++ compiler, use C linkage */
+extern "C" {
+#endif
+
+#ifdef SHMINSTALLED
+
+/*! @brief Identifier at the start of shared memory segments. */
+#define YGG_SHM_MAGIC "YGGSHMRB"
+/*! @brief Default size of the ring buffer in shared memory segments. */
+#define YGG_SHM_CAPACITY 4194304
+/*! @brief Maximum value of a SysV semaphore. */
+#define YGG_SHM_SEMVMX 32767
+
+static unsigned _shm_rand_seeded = 0;
+
+/*!
+  @brief Header at the start of a shared memory segment. This must match
+  the layout in yggdrasil/communication/SHMComm.py. The head and tail are
+  the total number of bytes written to and read from the ring buffer.
+*/
+typedef struct shm_header_t {
+  char magic[8]; //!< Identifier for yggdrasil shared memory segments.
+  uint64_t capacity; //!< Size of the ring buffer in bytes.
+  uint64_t head; //!< Total number of bytes written.
+  uint64_t tail; //!< Total number of bytes read.
+  int64_t count_key; //!< Key for the semaphore counting messages.
+  int64_t lock_key; //!< Key for the semaphore used as a lock.
+  char reserved[16]; //!< Padding to 64 bytes.
+} shm_header_t;
+
+/*!
+  @brief Handle for a mapped shared memory segment.
+*/
+typedef struct shm_handle_t {
+  shm_header_t *header; //!< Header at the start of the mapping.
+  char *data; //!< Start of the ring buffer.
+  size_t size; //!< Size of the mapping in bytes.
+  int count_id; //!< ID of the semaphore counting messages.
+  int lock_id; //!< ID of the semaphore used as a lock.
+} shm_handle_t;
+
+/*! @brief Argument for semctl (not defined by all platforms). */
+union ygg_semun {
+  int val;
+  struct semid_ds *buf;
+  unsigned short *array;
+};
+
+/*!
+  @brief Perform an operation on a semaphore, retrying if interrupted.
+  @param[in] id int ID of the semaphore.
+  @param[in] op short Value that should be added to the semaphore.
+  @param[in] flags short Flags for the operation.
+  @returns int -1 on error, 0 otherwise.
+ */
+static inline
+int shm_semop(const int id, const short op, const short flags) {
+  struct sembuf sb;
+  sb.sem_num = 0;
+  sb.sem_op = op;
+  sb.sem_flg = flags;
+  int ret;
+  while (1) {
+    ret = semop(id, &sb, 1);
+    if ((ret == 0) || (errno != EINTR))
+      break;
+  }
+  return ret;
+};
+
+/*!
+  @brief Create a new semaphore with a random key.
+  @param[in] value int Initial value of the semaphore.
+  @param[out] key int64_t* Pointer to memory where the key should be stored.
+  @returns int ID of the semaphore, -1 on error.
+ */
+static inline
+int shm_new_semaphore(const int value, int64_t *key) {
+  int id = -1;
+  int k = 0;
+  while (id < 0) {
+    k = rand();
+    if (k == 0)
+      continue;
+    id = semget((key_t)k, 1, (IPC_CREAT | IPC_EXCL | 0600));
+    if ((id < 0) && (errno != EEXIST)) {
+      ygglog_error("shm_new_semaphore: semget(%d) errno(%d): %s",
+		   k, errno, strerror(errno));
+      return -1;
+    }
+  }
+  union ygg_semun arg;
+  arg.val = value;
+  if (semctl(id, 0, SETVAL, arg) < 0) {
+    ygglog_error("shm_new_semaphore: semctl(%d, SETVAL) errno(%d): %s",
+		 id, errno, strerror(errno));
+    semctl(id, 0, IPC_RMID);
+    return -1;
+  }
+  key[0] = (int64_t)k;
+  return id;
+};
+
+/*!
+  @brief Copy bytes into the ring buffer, wrapping around the end.
+  @param[in] h shm_handle_t* Segment handle.
+  @param[in] pos uint64_t Position in the ring buffer (before wrapping).
+  @param[in] src const char* Bytes to copy.
+  @param[in] len size_t Number of bytes to copy.
+ */
+static inline
+void shm_copy_in(shm_handle_t *h, const uint64_t pos,
+		 const char *src, const size_t len) {
+  size_t start = (size_t)(pos % h->header->capacity);
+  size_t n = (size_t)(h->header->capacity) - start;
+  if (n > len)
+    n = len;
+  memcpy(h->data + start, src, n);
+  if (n < len)
+    memcpy(h->data, src + n, len - n);
+};
+
+/*!
+  @brief Copy bytes out of the ring buffer, wrapping around the end.
+  @param[in] h shm_handle_t* Segment handle.
+  @param[in] pos uint64_t Position in the ring buffer (before wrapping).
+  @param[out] dst char* Buffer that bytes should be copied to.
+  @param[in] len size_t Number of bytes to copy.
+ */
+static inline
+void shm_copy_out(shm_handle_t *h, const uint64_t pos,
+		  char *dst, const size_t len) {
+  size_t start = (size_t)(pos % h->header->capacity);
+  size_t n = (size_t)(h->header->capacity) - start;
+  if (n > len)
+    n = len;
+  memcpy(dst, h->data + start, n);
+  if (n < len)
+    memcpy(dst + n, h->data, len - n);
+};
+
+/*!
+  @brief Map a shared memory segment from an open file.
+  @param[in] fd int File descriptor.
+  @param[in] size size_t Size of the file.
+  @returns shm_handle_t* Segment handle, NULL on error.
+ */
+static inline
+shm_handle_t* shm_map_segment(const int fd, const size_t size) {
+  void *ptr = mmap(NULL, size, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+  if (ptr == MAP_FAILED) {
+    ygglog_error("shm_map_segment: mmap errno(%d): %s",
+		 errno, strerror(errno));
+    return NULL;
+  }
+  shm_handle_t *h = (shm_handle_t*)malloc(sizeof(shm_handle_t));
+  if (h == NULL) {
+    ygglog_error("shm_map_segment: Could not malloc handle.");
+    munmap(ptr, size);
+    return NULL;
+  }
+  h->header = (shm_header_t*)ptr;
+  h->data = (char*)ptr + sizeof(shm_header_t);
+  h->size = size;
+  h->count_id = -1;
+  h->lock_id = -1;
+  return h;
+};
+
+/*!
+  @brief Create a new shared memory segment.
+  @param[in] comm comm_t * Comm structure initialized with new_comm_base.
+  @returns int -1 if the address could not be created.
+*/
+static inline
+int new_shm_address(comm_t *comm) {
+  if (!(_shm_rand_seeded)) {
+    srand(ptr2seed(comm));
+    _shm_rand_seeded = 1;
+  }
+  const char *dir = NULL;
+#ifdef __linux__
+  if (access("/dev/shm", W_OK) == 0)
+    dir = "/dev/shm";
+#endif
+  if (dir == NULL)
+    dir = getenv("TMPDIR");
+  if (dir == NULL)
+    dir = "/tmp";
+  int fd = -1;
+  int key = 0;
+  while (fd < 0) {
+    key = rand();
+    sprintf(comm->address, "%s/ygg-%d-%d.shm", dir, (int)ygg_getpid(), key);
+    fd = open(comm->address, O_RDWR | O_CREAT | O_EXCL, 0600);
+    if ((fd < 0) && (errno != EEXIST)) {
+      ygglog_error("new_shm_address: open(%s) errno(%d): %s",
+		   comm->address, errno, strerror(errno));
+      return -1;
+    }
+  }
+  if (strlen(comm->name) == 0) {
+    sprintf(comm->name, "tempnewSHM.%d", key);
+  }
+  size_t size = sizeof(shm_header_t) + YGG_SHM_CAPACITY;
+  if (ftruncate(fd, size) < 0) {
+    ygglog_error("new_shm_address: ftruncate errno(%d): %s",
+		 errno, strerror(errno));
+    close(fd);
+    unlink(comm->address);
+    return -1;
+  }
+  shm_handle_t *h = shm_map_segment(fd, size);
+  close(fd);
+  if (h == NULL) {
+    unlink(comm->address);
+    return -1;
+  }
+  memcpy(h->header->magic, YGG_SHM_MAGIC, 8);
+  h->header->capacity = YGG_SHM_CAPACITY;
+  h->header->head = 0;
+  h->header->tail = 0;
+  h->count_id = shm_new_semaphore(0, &(h->header->count_key));
+  if (h->count_id >= 0)
+    h->lock_id = shm_new_semaphore(1, &(h->header->lock_key));
+  if (h->lock_id < 0) {
+    if (h->count_id >= 0)
+      semctl(h->count_id, 0, IPC_RMID);
+    munmap(h->header, h->size);
+    free(h);
+    unlink(comm->address);
+    return -1;
+  }
+  comm->handle = (void*)h;
+  return 0;
+};
+
+/*!
+  @brief Initialize a shared memory communicator.
+  @param[in] comm comm_t * Comm structure initialized with init_comm_base.
+  @returns int -1 if the comm could not be initialized.
+ */
+static inline
+int init_shm_comm(comm_t *comm) {
+  if (comm->valid == 0)
+    return -1;
+  if (strlen(comm->name) == 0) {
+    snprintf(comm->name, COMM_NAME_SIZE, "tempinitSHM.%s", comm->address);
+  }
+  int fd = open(comm->address, O_RDWR);
+  if (fd < 0) {
+    ygglog_error("init_shm_comm: open(%s) errno(%d): %s",
+		 comm->address, errno, strerror(errno));
+    return -1;
+  }
+  struct stat st;
+  if ((fstat(fd, &st) < 0) || ((size_t)st.st_size <= sizeof(shm_header_t))) {
+    ygglog_error("init_shm_comm: %s is not a shared memory segment.",
+		 comm->address);
+    close(fd);
+    return -1;
+  }
+  shm_handle_t *h = shm_map_segment(fd, (size_t)st.st_size);
+  close(fd);
+  if (h == NULL)
+    return -1;
+  if (memcmp(h->header->magic, YGG_SHM_MAGIC, 8) != 0) {
+    ygglog_error("init_shm_comm: %s is not a shared memory segment.",
+		 comm->address);
+    munmap(h->header, h->size);
+    free(h);
+    return -1;
+  }
+  h->count_id = semget((key_t)(h->header->count_key), 1, 0600);
+  h->lock_id = semget((key_t)(h->header->lock_key), 1, 0600);
+  if ((h->count_id < 0) || (h->lock_id < 0)) {
+    ygglog_error("init_shm_comm: semget errno(%d): %s",
+		 errno, strerror(errno));
+    munmap(h->header, h->size);
+    free(h);
+    return -1;
+  }
+  comm->handle = (void*)h;
+  return 0;
+};
+
+/*!
+  @brief Perform deallocation for a shared memory communicator. The
+  segment is removed by the receiving comm.
+  @param[in] x comm_t* Pointer to communicator to deallocate.
+  @returns int 1 if there is an error, 0 otherwise.
+*/
+static inline
+int free_shm_comm(comm_t *x) {
+  if (x->handle != NULL) {
+    shm_handle_t *h = (shm_handle_t*)(x->handle);
+    if (strcmp(x->direction, "recv") == 0) {
+      semctl(h->count_id, 0, IPC_RMID);
+      semctl(h->lock_id, 0, IPC_RMID);
+      unlink(x->address);
+    }
+    munmap(h->header, h->size);
+    free(x->handle);
+    x->handle = NULL;
+  }
+  return 0;
+};
+
+/*!
+  @brief Get number of messages in the comm.
+  @param[in] comm_t* Communicator to check.
+  @returns int Number of messages. -1 indicates an error.
+ */
+static inline
+int shm_comm_nmsg(const comm_t *x) {
+  if (x->handle == NULL) {
+    ygglog_error("shm_comm_nmsg: Segment handle is NULL.");
+    return -1;
+  }
+  int ret = semctl(((shm_handle_t*)(x->handle))->count_id, 0, GETVAL);
+  if (ret < 0) {
+    /* ygglog_error("shm_comm_nmsg: Could not access semaphore."); */
+    return 0;
+  }
+  return ret;
+};
+
+/*!
+  @brief Send a message to the comm.
+  Send a message smaller than YGG_MSG_MAX bytes to an output comm by
+  copying it into the ring buffer. If the buffer is full, this will sleep
+  until there is room for the message.
+  @param[in] x comm_t* structure that comm should be sent to.
+  @param[in] data character pointer to message that should be sent.
+  @param[in] len size_t length of message to be sent.
+  @returns int 0 if send succesfull, -1 if send unsuccessful.
+ */
+static inline
+int shm_comm_send(const comm_t *x, const char *data, const size_t len) {
+  ygglog_debug("shm_comm_send(%s): %d bytes", x->name, (int)len);
+  if (comm_base_send(x, data, len) == -1)
+    return -1;
+  shm_handle_t *h = (shm_handle_t*)(x->handle);
+  uint64_t size = (uint64_t)len;
+  uint64_t total = sizeof(uint64_t) + size;
+  if (total > h->header->capacity) {
+    ygglog_error("shm_comm_send(%s): message (%d bytes) is larger than the shared memory buffer",
+		 x->name, (int)len);
+    return -1;
+  }
+  while (1) {
+    if (semctl(h->count_id, 0, GETVAL) < YGG_SHM_SEMVMX) {
+      if (shm_semop(h->lock_id, -1, SEM_UNDO) < 0) {
+	ygglog_error("shm_comm_send(%s): lock errno(%d): %s",
+		     x->name, errno, strerror(errno));
+	return -1;
+      }
+      uint64_t head = h->header->head;
+      if ((h->header->capacity - (head - h->header->tail)) >= total) {
+	shm_copy_in(h, head, (const char*)(&size), sizeof(uint64_t));
+	shm_copy_in(h, head + sizeof(uint64_t), data, len);
+	h->header->head = head + total;
+	shm_semop(h->lock_id, 1, SEM_UNDO);
+	break;
+      }
+      shm_semop(h->lock_id, 1, SEM_UNDO);
+    }
+    ygglog_debug("shm_comm_send(%s): buffer full, sleep", x->name);
+    usleep(YGG_SLEEP_TIME);
+  }
+  if (shm_semop(h->count_id, 1, 0) < 0) {
+    ygglog_error("shm_comm_send(%s): signal errno(%d): %s",
+		 x->name, errno, strerror(errno));
+    return -1;
+  }
+  ygglog_debug("shm_comm_send(%s): returning 0", x->name);
+  return 0;
+};
+
+/*!
+  @brief Receive a message from an input comm.
+  Receive a message from an input comm, blocking on the semaphore counting
+  messages until one is available and then copying the message directly
+  from the ring buffer into the provided buffer.
+  @param[in] x comm_t* structure that message should be sent to.
+  @param[out] data char ** pointer to allocated buffer where the message
+  should be saved. This should be a malloc'd buffer if allow_realloc is 1.
+  @param[in] len const size_t length of the allocated message buffer in bytes.
+  @param[in] allow_realloc const int If 1, the buffer will be realloced if it
+  is not large enought. Otherwise an error will be returned.
+  @returns int -1 if message could not be received. Length of the received
+  message if message was received.
+ */
+static inline
+int shm_comm_recv(const comm_t *x, char **data, const size_t len,
+		  const int allow_realloc) {
+  ygglog_debug("shm_comm_recv(%s)", x->name);
+  shm_handle_t *h = (shm_handle_t*)(x->handle);
+  if (shm_semop(h->count_id, -1, 0) < 0) {
+    ygglog_debug("shm_comm_recv(%s): wait errno(%d): %s",
+		 x->name, errno, strerror(errno));
+    return -1;
+  }
+  if (shm_semop(h->lock_id, -1, SEM_UNDO) < 0) {
+    ygglog_error("shm_comm_recv(%s): lock errno(%d): %s",
+		 x->name, errno, strerror(errno));
+    return -1;
+  }
+  uint64_t tail = h->header->tail;
+  uint64_t size = 0;
+  shm_copy_out(h, tail, (char*)(&size), sizeof(uint64_t));
+  int len_recv = (int)size + 1;
+  if (len_recv > (int)len) {
+    if (allow_realloc) {
+      ygglog_debug("shm_comm_recv(%s): reallocating buffer from %d to %d bytes.",
+		   x->name, (int)len, len_recv);
+      (*data) = (char*)realloc(*data, len_recv);
+      if (*data == NULL) {
+	ygglog_error("shm_comm_recv(%s): failed to realloc buffer.", x->name);
+	shm_semop(h->lock_id, 1, SEM_UNDO);
+	return -1;
+      }
+    } else {
+      ygglog_error("shm_comm_recv(%s): buffer (%d bytes) is not large enough for message (%d bytes)",
+		   x->name, (int)len, len_recv);
+      // Leave the message in the buffer
+      shm_semop(h->lock_id, 1, SEM_UNDO);
+      shm_semop(h->count_id, 1, 0);
+      return -(len_recv - 1);
+    }
+  }
+  shm_copy_out(h, tail + sizeof(uint64_t), *data, (size_t)size);
+  (*data)[len_recv - 1] = '\0';
+  h->header->tail = tail + sizeof(uint64_t) + size;
+  shm_semop(h->lock_id, 1, SEM_UNDO);
+  ygglog_debug("shm_comm_recv(%s): returns %d bytes", x->name, len_recv - 1);
+  return len_recv - 1;
+};
+
+
+// Definitions in the case where shared memory is not installed
+#else /*SHMINSTALLED*/
+
+/*!
+  @brief Print error message about shared memory not being installed.
+ */
+static inline
+void shm_install_error() {
+  ygglog_error("Compiler flag 'SHMINSTALLED' not defined so shared memory bindings are disabled.");
+};
+
+/*!
+  @brief Perform deallocation for a shared memory communicator.
+  @param[in] x comm_t* Pointer to communicator to deallocate.
+  @returns int 1 if there is an error, 0 otherwise.
+*/
+static inline
+int free_shm_comm(comm_t *x) {
+  // Prevent C4100 warning on windows by referencing param
+#ifdef _WIN32
+  UNUSED(x);
+#endif
+  shm_install_error();
+  return 1;
+};
+
+/*!
+  @brief Create a new shared memory segment.
+  @param[in] comm comm_t * Comm structure initialized with new_comm_base.
+  @returns int -1 if the address could not be created.
+*/
+static inline
+int new_shm_address(comm_t *comm) {
+  // Prevent C4100 warning on windows by referencing param
+#ifdef _WIN32
+  UNUSED(comm);
+#endif
+  shm_install_error();
+  return -1;
+};
+
+/*!
+  @brief Initialize a shared memory communicator.
+  @param[in] comm comm_t * Comm structure initialized with init_comm_base.
+  @returns int -1 if the comm could not be initialized.
+ */
+static inline
+int init_shm_comm(comm_t *comm) {
+  // Prevent C4100 warning on windows by referencing param
+#ifdef _WIN32
+  UNUSED(comm);
+#endif
+  shm_install_error();
+  return -1;
+};
+
+/*!
+  @brief Get number of messages in the comm.
+  @param[in] x comm_t Communicator to check.
+  @returns int Number of messages. -1 indicates an error.
+ */
+static inline
+int shm_comm_nmsg(const comm_t *x) {
+  // Prevent C4100 warning on windows by referencing param
+#ifdef _WIN32
+  UNUSED(x);
+#endif
+  shm_install_error();
+  return -1;
+};
+
+/*!
+  @brief Send a message to the comm.
+  @param[in] x comm_t* structure that comm should be sent to.
+  @param[in] data character pointer to message that should be sent.
+  @param[in] len size_t length of message to be sent.
+  @returns int 0 if send succesfull, -1 if send unsuccessful.
+ */
+static inline
+int shm_comm_send(const comm_t *x, const char *data, const size_t len) {
+  // Prevent C4100 warning on windows by referencing param
+#ifdef _WIN32
+  UNUSED(x);
+  UNUSED(data);
+  UNUSED(len);
+#endif
+  shm_install_error();
+  return -1;
+};
+
+/*!
+  @brief Receive a message from an input comm.
+  @param[in] x comm_t* structure that message should be sent to.
+  @param[out] data char ** pointer to allocated buffer where the message
+  should be saved. This should be a malloc'd buffer if allow_realloc is 1.
+  @param[in] len const size_t length of the allocated message buffer in bytes.
+  @param[in] allow_realloc const int If 1, the buffer will be realloced if it
+  is not large enought. Otherwise an error will be returned.
+  @returns int -1 if message could not be received. Length of the received
+  message if message was received.
+ */
+static inline
+int shm_comm_recv(const comm_t *x, char **data, const size_t len,
+		  const int allow_realloc) {
+  // Prevent C4100 warning on windows by referencing param
+#ifdef _WIN32
+  UNUSED(x);
+  UNUSED(data);
+  UNUSED(len);
+  UNUSED(allow_realloc);
+#endif
+  shm_install_error();
+  return -1;
+};
+
+#endif /*SHMINSTALLED*/
+
+#ifdef __cplusplus /* If this is a C++ compiler, end C linkage */
+}
+#endif
+
+#endif /*YGGSHMCOMM_H_*/
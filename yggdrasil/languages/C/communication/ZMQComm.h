@@ -36,6 +36,41 @@ typedef struct zmq_reply_t {
 } zmq_reply_t;
 
 
+/*!
+  @brief Select the transport for new addresses based on the
+  YGG_ZMQ_PROTOCOL environment variable set from the yggdrasil config.
+  If 'auto' or 'ipc', ipc is used where it is supported (models always run
+  on the same host as the connections they create addresses for) and tcp
+  is used otherwise.
+  @param[out] protocol char* Buffer that the protocol should be copied to.
+*/
+static inline
+void get_zmq_protocol(char *protocol) {
+  strncpy(protocol, "tcp", 50);
+#ifndef _WIN32
+  char *env_protocol = getenv("YGG_ZMQ_PROTOCOL");
+  if ((env_protocol != NULL) &&
+      ((strcmp(env_protocol, "auto") == 0) ||
+       (strcmp(env_protocol, "ipc") == 0))) {
+    strncpy(protocol, "ipc", 50);
+  }
+#endif
+};
+
+/*!
+  @brief Format a new ipc address in the temporary directory.
+  @param[out] address char* Buffer that the address should be written to.
+  @param[in] key int Unique key to include in the address.
+*/
+static inline
+void new_ipc_address(char *address, const int key) {
+  const char *tmpdir = getenv("TMPDIR");
+  if ((tmpdir == NULL) || (strlen(tmpdir) == 0) || (strlen(tmpdir) > 50))
+    tmpdir = "/tmp";
+  sprintf(address, "ipc://%s/yggZMQ-%d-%d.ipc", tmpdir,
+	  (int)ygg_getpid(), key);
+};
+
 // Forward declarations
 static inline
 int zmq_comm_nmsg(const comm_t *x);
@@ -291,25 +326,41 @@ char *set_reply_send(const comm_t *comm) {
       return out;
     }
     char protocol[50] = "tcp";
+    get_zmq_protocol(protocol);
     char host[50] = "localhost";
     if (strcmp(host, "localhost") == 0)
       strncpy(host, "127.0.0.1", 50);
     char address[100];
-    if (_last_port_set == 0) {
-      ygglog_debug("model_index = %s", getenv("YGG_MODEL_INDEX"));
-      _last_port = 49152 + 1000 * atoi(getenv("YGG_MODEL_INDEX"));
-      _last_port_set = 1;
-      ygglog_debug("_last_port = %d", _last_port);
-    }
-    sprintf(address, "%s://%s:*[%d-]", protocol, host, _last_port + 1);
-    int port = zsock_bind(zrep->sockets[0], "%s", address);
-    if (port == -1) {
-      ygglog_error("set_reply_send(%s): Could not bind socket to address = %s",
-		   comm->name, address);
-      return out;
+    if (strcmp(protocol, "ipc") == 0) {
+      if (!(_zmq_rand_seeded)) {
+	srand(ptr2seed((void*)comm));
+	_zmq_rand_seeded = 1;
+      }
+      int key = 0;
+      while (key == 0) key = rand();
+      new_ipc_address(address, key);
+      if (zsock_bind(zrep->sockets[0], "%s", address) == -1) {
+	ygglog_error("set_reply_send(%s): Could not bind socket to address = %s",
+		     comm->name, address);
+	return out;
+      }
+    } else {
+      if (_last_port_set == 0) {
+	ygglog_debug("model_index = %s", getenv("YGG_MODEL_INDEX"));
+	_last_port = 49152 + 1000 * atoi(getenv("YGG_MODEL_INDEX"));
+	_last_port_set = 1;
+	ygglog_debug("_last_port = %d", _last_port);
+      }
+      sprintf(address, "%s://%s:*[%d-]", protocol, host, _last_port + 1);
+      int port = zsock_bind(zrep->sockets[0], "%s", address);
+      if (port == -1) {
+	ygglog_error("set_reply_send(%s): Could not bind socket to address = %s",
+		     comm->name, address);
+	return out;
+      }
+      _last_port = port;
+      sprintf(address, "%s://%s:%d", protocol, host, port);
     }
-    _last_port = port;
-    sprintf(address, "%s://%s:%d", protocol, host, port);
     zrep->addresses = (char**)malloc(sizeof(char*));
     zrep->addresses[0] = (char*)malloc((strlen(address) + 1)*sizeof(char));
     strncpy(zrep->addresses[0], address, strlen(address) + 1);
@@ -386,19 +437,20 @@ int set_reply_recv(const comm_t *comm, const char* address) {
   @param[in] comm comm_t* Comm that confirmation is for.
   @param[in] data char* Message that reply info should be added to.
   @param[in] len int Length of the outgoing message.
-  @returns char* Message with reply information added.
+  @param[out] new_len int* Length of the message with reply information.
+  @returns const char* Message with reply information added. No
+  information is currently added so this is data and the message is only
+  copied once, when the frame is created.
  */
 static inline
-char* check_reply_send(const comm_t *comm, const char *data, const int len,
-		       int *new_len) {
+const char* check_reply_send(const comm_t *comm, const char *data,
+			     const int len, int *new_len) {
   // Prevent C4100 warning on windows by referencing param
 #ifdef _WIN32
   UNUSED(comm);
 #endif
-  char *out = (char*)malloc(len + 1);
-  memcpy(out, data, len + 1);
   new_len[0] = len;
-  return out;
+  return data;
 };
 
 
@@ -463,8 +515,9 @@ int check_reply_recv(const comm_t *comm, char *data, const size_t len) {
 */
 static inline
 int new_zmq_address(comm_t *comm) {
-  // TODO: Get protocol/host from input
+  // TODO: Get host from input
   char protocol[50] = "tcp";
+  get_zmq_protocol(protocol);
   char host[50] = "localhost";
   char address[100];
   comm->msgBufSize = 100;
@@ -481,7 +534,10 @@ int new_zmq_address(comm_t *comm) {
     while (key == 0) key = rand();
     if (strlen(comm->name) == 0)
       sprintf(comm->name, "tempnewZMQ-%d", key);
-    sprintf(address, "%s://%s", protocol, comm->name);
+    if (strcmp(protocol, "ipc") == 0)
+      new_ipc_address(address, key);
+    else
+      sprintf(address, "%s://%s", protocol, comm->name);
   } else {
      if (_last_port_set == 0) {
       ygglog_debug("model_index = %s", getenv("YGG_MODEL_INDEX"));
@@ -672,13 +728,16 @@ int zmq_comm_send(const comm_t *x, const char *data, const size_t len) {
     return -1;
   }
   int new_len = 0;
-  char *new_data = check_reply_send(x, data, (int)len, &new_len);
+  const char *new_data = check_reply_send(x, data, (int)len, &new_len);
   if (new_data == NULL) {
     ygglog_error("zmq_comm_send(%s): Adding reply address failed.", x->name);
     return -1;
   }
-  zframe_t *f = zframe_new(new_data, new_len);
+  // The caller retains ownership of data and may free it as soon as this
+  // returns (including when the reply times out and the frame is still
+  // queued), so the frame takes a copy rather than referencing data.
   int ret = -1;
+  zframe_t *f = zframe_new(new_data, new_len);
   if (f == NULL) {
     ygglog_error("zmq_comm_send(%s): frame handle is NULL", x->name);
   } else {
@@ -700,7 +759,6 @@ int zmq_comm_send(const comm_t *x, const char *data, const size_t len) {
     }
   }
   ygglog_debug("zmq_comm_send(%s): returning %d", x->name, ret);
-  free(new_data);
   return ret;
 };
 
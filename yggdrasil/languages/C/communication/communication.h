@@ -7,6 +7,7 @@
 #include "CommBase.h"
 #include "IPCComm.h"
 #include "ZMQComm.h"
+#include "SHMComm.h"
 #include "ServerComm.h"
 #include "ClientComm.h"
 #include "AsciiFileComm.h"
@@ -94,6 +95,8 @@ int free_comm_type(comm_t *x) {
   }
   if (t == IPC_COMM)
     ret = free_ipc_comm(x);
+  else if (t == SHM_COMM)
+    ret = free_shm_comm(x);
   else if (t == ZMQ_COMM)
     ret = free_zmq_comm(x);
   else if (t == SERVER_COMM)
@@ -135,6 +138,11 @@ int free_comm(comm_t *x) {
       ygglog_error("free_comm(%s): Error registered", x->name);
     }
   }
+  // Free the work comm used for multipart messages
+  if ((x->work_comm != NULL) && (x->work_comm[0] != NULL)) {
+    free_comm(x->work_comm[0]);
+    x->work_comm[0] = NULL;
+  }
   ret = free_comm_type(x);
   int idx = x->index_in_register;
   free_comm_base(x);
@@ -217,6 +225,8 @@ int new_comm_type(comm_t *x) {
   int flag;
   if (t == IPC_COMM)
     flag = new_ipc_address(x);
+  else if (t == SHM_COMM)
+    flag = new_shm_address(x);
   else if (t == ZMQ_COMM)
     flag = new_zmq_address(x);
   else if (t == SERVER_COMM)
@@ -248,6 +258,8 @@ int init_comm_type(comm_t *x) {
   int flag;
   if (t == IPC_COMM)
     flag = init_ipc_comm(x);
+  else if (t == SHM_COMM)
+    flag = init_shm_comm(x);
   else if (t == ZMQ_COMM)
     flag = init_zmq_comm(x);
   else if (t == SERVER_COMM)
@@ -420,6 +432,8 @@ int comm_nmsg(const comm_t *x) {
   comm_type t = x->type;
   if (t == IPC_COMM)
     ret = ipc_comm_nmsg(x);
+  else if (t == SHM_COMM)
+    ret = shm_comm_nmsg(x);
   else if (t == ZMQ_COMM)
     ret = zmq_comm_nmsg(x);
   else if (t == SERVER_COMM)
@@ -460,6 +474,8 @@ int comm_send_single(const comm_t *x, const char *data, const size_t len) {
   comm_type t = x->type;
   if (t == IPC_COMM)
     ret = ipc_comm_send(x, data, len);
+  else if (t == SHM_COMM)
+    ret = shm_comm_send(x, data, len);
   else if (t == ZMQ_COMM)
     ret = zmq_comm_send(x, data, len);
   else if (t == SERVER_COMM)
@@ -483,6 +499,71 @@ int comm_send_single(const comm_t *x, const char *data, const size_t len) {
 };
 
 
+/*!
+  @brief Get the work comm that should be used to send/receive the parts
+  of a multipart message. The work comm is stored on the parent comm and
+  reused for subsequent multipart messages unless the parent may be
+  connected to more than one partner (i.e. client and server comms). Only
+  the work comm for the most recent address is cached and it is freed when
+  a different address is received, so Python partners only use one work
+  comm to send to comms in other languages.
+  @param[in] x comm_t* Comm that the multipart message is sent to or
+  received from.
+  @param[in] address char* Address of the work comm. If NULL, a new address
+  will be generated if there is not already a work comm.
+  @param[in] direction const char* Direction of the work comm.
+  @returns comm_t* Work comm, NULL if there is an error.
+*/
+static
+comm_t* get_work_comm(const comm_t *x, char *address,
+		      const char *direction) {
+  int reuse = ((x->work_comm != NULL) && (x->type != SERVER_COMM) &&
+	       (x->type != CLIENT_COMM));
+  comm_t *xmulti = NULL;
+  if (reuse && (x->work_comm[0] != NULL)) {
+    xmulti = x->work_comm[0];
+    if ((address == NULL) || (strcmp(xmulti->address, address) == 0)) {
+      return xmulti;
+    }
+    free_comm(xmulti);
+    x->work_comm[0] = NULL;
+  }
+  xmulti = new_comm(address, direction, x->type, NULL);
+  if ((xmulti == NULL) || (!(xmulti->valid))) {
+    ygglog_error("get_work_comm: Failed to initialize a new comm.");
+    return NULL;
+  }
+  xmulti->sent_eof[0] = 1;
+  xmulti->recv_eof[0] = 1;
+  xmulti->is_work_comm = 1;
+  if (reuse) {
+    x->work_comm[0] = xmulti;
+  }
+  return xmulti;
+};
+
+/*!
+  @brief Release a work comm returned by get_work_comm. Work comms that are
+  not stored on the parent comm, or that encountered an error, are freed.
+  @param[in] x comm_t* Comm that the work comm belongs to.
+  @param[in] xmulti comm_t* Work comm.
+  @param[in] failed int If 1, there was an error using the work comm and it
+  will not be reused.
+*/
+static
+void release_work_comm(const comm_t *x, comm_t *xmulti, const int failed) {
+  if (xmulti == NULL) {
+    return;
+  }
+  if ((x->work_comm != NULL) && (x->work_comm[0] == xmulti)) {
+    if (!(failed)) {
+      return;
+    }
+    x->work_comm[0] = NULL;
+  }
+  free_comm(xmulti);
+};
+
 /*!
   @brief Create header for multipart message.
   @param[in] x comm_t* structure that header will be sent to.
@@ -544,29 +625,24 @@ comm_head_t comm_send_multipart_header(const comm_t *x, const char * data,
 };
 
 /*!
-  @brief Send a large message in multiple parts via a new comm.
+  @brief Send a message with a prepared header in one or more parts.
   @param[in] x comm_t* Structure that message should be sent to.
+  @param[in] head comm_head_t Header that should be sent before the message
+  body.
   @param[in] data const char * Message that should be sent.
   @param[in] len size_t Size of data.
+  @param[in] no_type int If 1, type information will not be added to the
+  header.
   @returns: int 0 if send successfull, -1 if send unsuccessful.
 */
 static
-int comm_send_multipart(const comm_t *x, const char *data, const size_t len) {
+int comm_send_multipart_head(const comm_t *x, comm_head_t head,
+			     const char *data, const size_t len,
+			     const int no_type) {
   //char headbuf[YGG_MSG_BUF];
   size_t headbuf_len = YGG_MSG_BUF;
   int headlen = 0, ret = -1;
   comm_t* xmulti = NULL;
-  int no_type = is_eof(data);
-  if ((x == NULL) || (x->valid == 0)) {
-    ygglog_error("comm_send_multipart: Invalid comm");
-    return ret;
-  }
-  // Get header
-  comm_head_t head = comm_send_multipart_header(x, data, len);
-  if (head.valid == 0) {
-    ygglog_error("comm_send_multipart: Invalid header generated.");
-    return -1;
-  }
   char *headbuf = (char*)malloc(headbuf_len);
   if (headbuf == NULL) {
     ygglog_error("comm_send_multipart: Failed to malloc headbuf.");
@@ -601,21 +677,20 @@ int comm_send_multipart(const comm_t *x, const char *data, const size_t len) {
   }
   // Get head string
   if (head.multipart == 1) {
-    // Get address for new comm and add to header
-    xmulti = new_comm(NULL, "send", x->type, NULL);
-    if ((xmulti == NULL) || (!(xmulti->valid))) {
+    // Get address for work comm and add to header
+    xmulti = get_work_comm(x, NULL, "send");
+    if (xmulti == NULL) {
       ygglog_error("comm_send_multipart: Failed to initialize a new comm.");
       free(headbuf);
       return -1;
     }
-    xmulti->sent_eof[0] = 1;
-    xmulti->recv_eof[0] = 1;
-    xmulti->is_work_comm = 1;
     strcpy(head.address, xmulti->address);
     if (xmulti->type == ZMQ_COMM) {
       char *reply_address = set_reply_send(xmulti);
       if (reply_address == NULL) {
 	ygglog_error("comm_send_multipart: Could not set worker reply address.");
+	release_work_comm(x, xmulti, 1);
+	free(headbuf);
 	return -1;
       }
       strcpy(head.zmq_reply_worker, reply_address);
@@ -628,9 +703,7 @@ int comm_send_multipart(const comm_t *x, const char *data, const size_t len) {
     if (headlen < 0) {
       ygglog_error("comm_send_multipart: Failed to format header.");
       free(headbuf);
-      if (xmulti != NULL) {
-	free_comm(xmulti);
-      }
+      release_work_comm(x, xmulti, 1);
       return -1;
     }
   }
@@ -644,9 +717,7 @@ int comm_send_multipart(const comm_t *x, const char *data, const size_t len) {
   }
   if (ret < 0) {
     ygglog_error("comm_send_multipart: Failed to send header.");
-    if (xmulti != NULL) {
-      free_comm(xmulti);
-    }
+    release_work_comm(x, xmulti, 1);
     free(headbuf);
     return -1;
   }
@@ -677,9 +748,7 @@ int comm_send_multipart(const comm_t *x, const char *data, const size_t len) {
   head.size = head.size - data_in_header;
   if (ret < 0) {
     ygglog_error("comm_send_multipart: Failed to send data from header.");
-    if (xmulti != NULL) {
-      free_comm(xmulti);
-    }
+    release_work_comm(x, xmulti, 1);
     free(headbuf);
     return -1;
   }
@@ -703,16 +772,36 @@ int comm_send_multipart(const comm_t *x, const char *data, const size_t len) {
   }
   if (ret == 0)
     ygglog_debug("comm_send_multipart(%s): %d bytes completed", x->name, head.size);
-  // Free multipart
-  if (xmulti != NULL) {
-    free_comm(xmulti);
-  }
+  // Release multipart
+  release_work_comm(x, xmulti, (ret < 0));
   free(headbuf);
   if (ret >= 0)
     x->used[0] = 1;
   return ret;
 };
 
+/*!
+  @brief Send a large message in multiple parts via a new comm.
+  @param[in] x comm_t* Structure that message should be sent to.
+  @param[in] data const char * Message that should be sent.
+  @param[in] len size_t Size of data.
+  @returns: int 0 if send successfull, -1 if send unsuccessful.
+*/
+static
+int comm_send_multipart(const comm_t *x, const char *data, const size_t len) {
+  if ((x == NULL) || (x->valid == 0)) {
+    ygglog_error("comm_send_multipart: Invalid comm");
+    return -1;
+  }
+  // Get header
+  comm_head_t head = comm_send_multipart_header(x, data, len);
+  if (head.valid == 0) {
+    ygglog_error("comm_send_multipart: Invalid header generated.");
+    return -1;
+  }
+  return comm_send_multipart_head(x, head, data, len, is_eof(data));
+};
+
 
 /*!
   @brief Send a message to the comm.
@@ -807,6 +896,8 @@ int comm_recv_single(comm_t *x, char **data, const size_t len,
   comm_type t = x->type;
   if (t == IPC_COMM)
     ret = ipc_comm_recv(x, data, len, allow_realloc);
+  else if (t == SHM_COMM)
+    ret = shm_comm_recv(x, data, len, allow_realloc);
   else if (t == ZMQ_COMM)
     ret = zmq_comm_recv(x, data, len, allow_realloc);
   else if (t == SERVER_COMM)
@@ -831,11 +922,15 @@ int comm_recv_single(comm_t *x, char **data, const size_t len,
   @param[in] headlen size_t Size of header in data buffer.
   @param[in] allow_realloc int If 1, data will be realloced if the incoming
   message is larger than the buffer. Otherwise, an error will be returned.
+  @param[out] raw_array int* Pointer to flag that will be set to 1 if the
+  message body is a raw array buffer and 0 otherwise. If NULL, an error
+  will be returned if a raw array buffer is received.
   @returns int -1 if unsucessful, size of message received otherwise.
 */
 static
-int comm_recv_multipart(comm_t *x, char **data, const size_t len,
-			const size_t headlen, const int allow_realloc) {
+int comm_recv_multipart_array(comm_t *x, char **data, const size_t len,
+			      const size_t headlen, const int allow_realloc,
+			      int *raw_array) {
   int ret = -1;
   if ((x == NULL) || (x->valid == 0)) {
     ygglog_error("comm_recv_multipart: Invalid comm");
@@ -878,25 +973,21 @@ int comm_recv_multipart(comm_t *x, char **data, const size_t len,
 	return -1;
       }
     }
-    if (head.multipart) {
-      // Return early if header contained entire message
-      if (head.size == head.bodysiz) {
-        x->used[0] = 1;
-	return (int)(head.bodysiz);
-      }
-      // Get address for new comm
-      comm_t* xmulti = new_comm(head.address, "recv", x->type, NULL);
-      if ((xmulti == NULL) || (!(xmulti->valid))) {
+    if (raw_array != NULL)
+      raw_array[0] = head.raw_array;
+    // Header may contain the entire message
+    if ((head.multipart) && (head.size != head.bodysiz)) {
+      // Get work comm for the address
+      comm_t* xmulti = get_work_comm(x, head.address, "recv");
+      if (xmulti == NULL) {
 	ygglog_error("comm_recv_multipart: Failed to initialize a new comm.");
 	return -1;
       }
-      xmulti->sent_eof[0] = 1;
-      xmulti->recv_eof[0] = 1;
-      xmulti->is_work_comm = 1;
       if (xmulti->type == ZMQ_COMM) {
 	int reply_socket = set_reply_recv(xmulti, head.zmq_reply_worker);
 	if (reply_socket < 0) {
 	  ygglog_error("comm_recv_multipart: Failed to set worker reply address.");
+	  release_work_comm(x, xmulti, 1);
 	  return -1;
 	}
       }
@@ -911,14 +1002,14 @@ int comm_recv_multipart(comm_t *x, char **data, const size_t len,
 	    ygglog_error("comm_recv_multipart(%s): Failed to realloc buffer",
 			 x->name);
 	    free(*data);
-	    free_comm(xmulti);
+	    release_work_comm(x, xmulti, 1);
 	    return -1;
 	  }
 	  *data = t_data;
  	} else {
 	  ygglog_error("comm_recv_multipart(%s): buffer is not large enough",
 		       x->name);
-	  free_comm(xmulti);
+	  release_work_comm(x, xmulti, 1);
 	  return -1;
 	}
       }
@@ -945,6 +1036,7 @@ int comm_recv_multipart(comm_t *x, char **data, const size_t len,
 	  ret = update_dtype(updtype, head.dtype);
 	  if (ret != 0) {
 	    ygglog_error("comm_recv_multipart(%s): Error updating existing datatype.", x->name);
+	    release_work_comm(x, xmulti, 1);
 	    return -1;
 	  } else {
 	    ret = (int)prev;
@@ -955,16 +1047,37 @@ int comm_recv_multipart(comm_t *x, char **data, const size_t len,
 	ygglog_debug("comm_recv_multipart(%s): %d bytes completed", x->name, prev);
 	ret = (int)prev;
       }
-      free_comm(xmulti);
+      release_work_comm(x, xmulti, (ret < 0));
     } else {
       ret = (int)(head.bodysiz);
     }
   }
+  if ((ret >= 0) && (head.raw_array) && (raw_array == NULL)) {
+    ygglog_error("comm_recv_multipart(%s): Received a raw array buffer that "
+		 "must be received via commRecvArray.", x->name);
+    ret = -1;
+  }
   if (ret >= 0)
     x->used[0] = 1;
   return ret;
 };
 
+/*!
+  @brief Receive a message in multiple parts.
+  @param[in] x comm_t* Comm that message should be recieved from.
+  @param[in] data char ** Pointer to buffer where message should be stored.
+  @param[in] len size_t Size of data buffer.
+  @param[in] headlen size_t Size of header in data buffer.
+  @param[in] allow_realloc int If 1, data will be realloced if the incoming
+  message is larger than the buffer. Otherwise, an error will be returned.
+  @returns int -1 if unsucessful, size of message received otherwise.
+*/
+static
+int comm_recv_multipart(comm_t *x, char **data, const size_t len,
+			const size_t headlen, const int allow_realloc) {
+  return comm_recv_multipart_array(x, data, len, headlen, allow_realloc, NULL);
+};
+
 /*!
   @brief Receive a message from an input comm.
   An error will be returned if the buffer is not large enough.
@@ -1233,6 +1346,155 @@ int ncommRecv(comm_t *x, const int allow_realloc, size_t nargs, ...) {
 #define commRecv commRecvStack
 #define commRecvRealloc commRecvHeap
 
+/*!
+  @brief Send an array to an output comm as a raw buffer.
+  The array buffer is sent as is (without serialization or copying into
+  an intermediate buffer) along with a header describing the array type.
+  @param[in] x comm_t* structure for comm that array should be sent to.
+  @param[in] subtype const char* Name of the array element type
+  ("int", "uint", "float", "complex", "bytes", or "unicode").
+  @param[in] precision size_t Precision of the array elements in bits.
+  @param[in] ndim size_t Number of dimensions in the array.
+  @param[in] shape const size_t* Pointer to array containing the size of
+  the array in each dimension.
+  @param[in] units const char* Units that should be associated with the
+  array. Empty string or NULL indicates no units.
+  @param[in] data const void* Pointer to the contiguous array buffer.
+  @returns int 0 if send succesfull, -1 if send unsuccessful.
+ */
+static
+int commSendArray(const comm_t *x, const char *subtype, const size_t precision,
+		  const size_t ndim, const size_t *shape, const char *units,
+		  const void *data) {
+  int ret = -1;
+  if ((x == NULL) || (x->valid == 0)) {
+    ygglog_error("commSendArray: Invalid comm");
+    return ret;
+  }
+  if (x->is_file) {
+    ygglog_error("commSendArray(%s): Raw arrays cannot be sent to files.",
+		 x->name);
+    return ret;
+  }
+  if ((ndim == 0) || (shape == NULL) || (data == NULL)) {
+    ygglog_error("commSendArray(%s): Array data and shape must be provided.",
+		 x->name);
+    return ret;
+  }
+  size_t i, len = precision / 8;
+  for (i = 0; i < ndim; i++) {
+    len *= shape[i];
+  }
+  const char *data_c = (const char*)data;
+  comm_head_t head = comm_send_multipart_header(x, data_c, len);
+  if (head.valid == 0) {
+    ygglog_error("commSendArray(%s): Invalid header generated.", x->name);
+    return ret;
+  }
+  dtype_t *array_dtype;
+  if (ndim == 1) {
+    array_dtype = create_dtype_1darray(subtype, precision, shape[0],
+				       units, false);
+  } else {
+    array_dtype = create_dtype_ndarray(subtype, precision, ndim, shape,
+				       units, false);
+  }
+  if (array_dtype == NULL) {
+    ygglog_error("commSendArray(%s): Failed to create array datatype.",
+		 x->name);
+    return ret;
+  }
+  head.dtype = array_dtype;
+  head.raw_array = 1;
+  ret = comm_send_multipart_head(x, head, data_c, len, 0);
+  destroy_dtype(&array_dtype);
+  if (ret >= 0)
+    x->used[0] = 1;
+  return ret;
+};
+
+/*!
+  @brief Receive an array sent as a raw buffer from an input comm.
+  Arrays serialized by other languages are decoded in place. The type
+  and shape of the received array are available from the comm's datatype
+  following the receive.
+  @param[in] x comm_t* structure for comm that array should be received from.
+  @param[in] allow_realloc int If 1, data is assumed to be a pointer to
+  heap memory that the message is received into directly and that will
+  be reallocated if it is not large enough. If 0, the message is received
+  into a temporary buffer and copied into data, returning an error if the
+  array is larger than nbytes.
+  @param[in,out] data void** Pointer to the buffer the array should be
+  received into.
+  @param[in,out] nbytes size_t* Pointer to the size of the buffer in bytes.
+  On return, this is set to the size of the received array in bytes.
+  @returns int -1 if the array could not be received, -2 if EOF is received,
+  and the size of the received array in bytes otherwise.
+ */
+static
+int commRecvArray(comm_t *x, const int allow_realloc, void **data,
+		  size_t *nbytes) {
+  int ret = -1;
+  if ((x == NULL) || (x->valid == 0)) {
+    ygglog_error("commRecvArray: Invalid comm");
+    return ret;
+  }
+  if ((data == NULL) || (nbytes == NULL)) {
+    ygglog_error("commRecvArray(%s): Buffer and size must be provided.",
+		 x->name);
+    return ret;
+  }
+  size_t buf_siz;
+  char *buf = NULL;
+  if (allow_realloc) {
+    buf = (char*)(data[0]);
+    buf_siz = nbytes[0];
+  } else {
+    buf_siz = YGG_MSG_BUF;
+    buf = (char*)malloc(buf_siz);
+    if (buf == NULL) {
+      ygglog_error("commRecvArray(%s): Failed to alloc buffer", x->name);
+      return ret;
+    }
+  }
+  int raw_array = 0;
+  ret = comm_recv_single(x, &buf, buf_siz, 1);
+  if (ret > 0) {
+    if (is_eof(buf)) {
+      ygglog_debug("commRecvArray(%s): EOF received.", x->name);
+      x->recv_eof[0] = 1;
+      ret = -2;
+    } else {
+      ret = comm_recv_multipart_array(x, &buf, buf_siz, ret, 1, &raw_array);
+    }
+  } else {
+    ygglog_error("commRecvArray(%s): Failed to receive header or message.",
+		 x->name);
+  }
+  if ((ret >= 0) && (!(raw_array))) {
+    ret = decode_array_data(buf, (size_t)ret);
+    if (ret < 0) {
+      ygglog_error("commRecvArray(%s): Failed to decode serialized array.",
+		   x->name);
+    }
+  }
+  if (allow_realloc) {
+    data[0] = (void*)buf;
+  } else {
+    if ((ret >= 0) && ((size_t)ret > nbytes[0])) {
+      ygglog_error("commRecvArray(%s): Array (%d bytes) is larger than the "
+		   "buffer (%lu bytes).", x->name, ret, nbytes[0]);
+      ret = -1;
+    }
+    if (ret > 0)
+      memcpy(data[0], buf, (size_t)ret);
+    free(buf);
+  }
+  if (ret >= 0)
+    nbytes[0] = (size_t)ret;
+  return ret;
+};
+
 
 #define vcommSend_nolimit vcommSend
 #define vcommRecv_nolimit vcommRecv
@@ -16,6 +16,7 @@
 #include "rapidjson/document.h"
 #include "rapidjson/writer.h"
 #include "rapidjson/stringbuffer.h"
+#include <chrono>
 
 
 #define CSafe(x)  \
@@ -201,6 +202,18 @@ bool update_header_from_doc(comm_head_t &head, rapidjson::Value &head_doc) {
       head.type_in_data = 0;
     }
   }
+  // Flag specifying that body is a raw array buffer
+  if (head_doc.HasMember("raw_array")) {
+    if (!(head_doc["raw_array"].IsBool())) {
+      ygglog_error("update_header_from_doc: raw_array is not boolean.");
+      return false;
+    }
+    if (head_doc["raw_array"].GetBool()) {
+      head.raw_array = 1;
+    } else {
+      head.raw_array = 0;
+    }
+  }
   // String fields
   const char **n;
   const char *string_fields[] = {"address", "id", "request_id", "response_address",
@@ -498,6 +511,10 @@ rapidjson::StringBuffer format_comm_header_json(const comm_head_t head,
     head_writer.Key("type_in_data");
     head_writer.Bool(true);
   }
+  if (head.raw_array) {
+    head_writer.Key("raw_array");
+    head_writer.Bool(true);
+  }
   // Strings
   const char **n;
   const char *string_fields[] = {"address", "id", "request_id", "response_address",
@@ -526,6 +543,20 @@ rapidjson::StringBuffer format_comm_header_json(const comm_head_t head,
     }
     n++;
   }
+  // Start a trace for the message if tracing is enabled (EOF messages are
+  // not traced)
+  const char *trace_file = getenv("YGG_TRACE_FILE");
+  if ((!(no_type)) && (trace_file != NULL) && (strlen(trace_file) > 0) &&
+      (strcmp(trace_file, "False") != 0) && (strlen(head.id) > 0)) {
+    double now = std::chrono::duration<double>(
+      std::chrono::system_clock::now().time_since_epoch()).count();
+    head_writer.Key("trace_id");
+    head_writer.String(head.id);
+    head_writer.Key("trace_t");
+    head_writer.Double(now);
+    head_writer.Key("trace_hop");
+    head_writer.String("model_send");
+  }
   head_writer.EndObject();
   return head_buf;
 };
@@ -3124,6 +3155,41 @@ extern "C" {
     }
   }
 
+  int decode_array_data(char *buf, const size_t buf_siz) {
+    try {
+      rapidjson::Document data_doc;
+      data_doc.Parse(buf, buf_siz);
+      if (data_doc.HasParseError()) {
+	ygglog_throw_error("decode_array_data: Error parsing serialized array.");
+      }
+      const rapidjson::Value* data = &data_doc;
+      if ((data->IsArray()) && (data->Size() == 1)) {
+	data = &((*data)[0]);
+      }
+      if (!(data->IsString())) {
+	ygglog_throw_error("decode_array_data: Serialized array is not a string.");
+      }
+      size_t decoded_len = 0;
+      unsigned char* decoded_bytes = base64_decode((const unsigned char*)(data->GetString()),
+						   data->GetStringLength(),
+						   &decoded_len);
+      if (decoded_bytes == NULL) {
+	ygglog_throw_error("decode_array_data: Error decoding array.");
+      }
+      if (decoded_len > buf_siz) {
+	free(decoded_bytes);
+	ygglog_throw_error("decode_array_data: Decoded array (%lu bytes) is larger than the buffer (%lu bytes).",
+			   decoded_len, buf_siz);
+      }
+      memcpy(buf, decoded_bytes, decoded_len);
+      free(decoded_bytes);
+      return (int)decoded_len;
+    } catch(...) {
+      ygglog_error("decode_array_data: C++ exception thrown.");
+      return -1;
+    }
+  }
+
   comm_head_t parse_comm_header(const char *buf, const size_t buf_siz) {
     comm_head_t out = init_header(0, NULL, NULL);
     int ret;
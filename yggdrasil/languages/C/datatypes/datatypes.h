@@ -75,6 +75,7 @@ typedef struct comm_head_t {
   char zmq_reply[COMMBUFFSIZ]; //!< Reply address for ZMQ sockets.
   char zmq_reply_worker[COMMBUFFSIZ]; //!< Reply address for worker socket.
   int type_in_data; //!< 1 if type is stored with the data during serialization.
+  int raw_array; //!< 1 if the body is a raw array buffer that is not serialized.
   // These should be removed once JSON fully implemented
   int serializer_type; //!< Code indicating the type of serializer.
   char format_str[COMMBUFFSIZ]; //!< Format string for serializer.
@@ -1245,6 +1246,7 @@ comm_head_t init_header(const size_t size, const char *address, const char *id)
   out.valid = 1;
   out.nargs_populated = 0;
   out.type_in_data = 0;
+  out.raw_array = 0;
   // Parameters sent in header
   out.size = size;
   if (address == NULL)
@@ -1359,6 +1361,18 @@ int format_comm_header(comm_head_t *head, char **buf, size_t buf_siz,
 int parse_type_in_data(char **buf, const size_t buf_siz,
 		       comm_head_t* head);
 
+
+/*!
+  @brief Decode a serialized (base64 encoded) array in place so that buf
+  contains the raw array buffer.
+  @param[in,out] buf char* Serialized array that will be replaced by the
+  decoded array bytes.
+  @param[in] buf_siz size_t Size of the serialized array in buf.
+  @returns: int -1 if there is an error, size of the decoded array in
+  bytes otherwise.
+ */
+int decode_array_data(char *buf, const size_t buf_siz);
+
   
 /*!
   @brief Extract header information from a string.
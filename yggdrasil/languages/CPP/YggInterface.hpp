@@ -172,6 +172,22 @@ public:
     va_end(va.va);
     return ret;
   }
+
+  /*!
+    @brief Receive an array sent as a raw buffer from the input queue.
+    See yggRecvArray from YggInterface.h for details.
+    @param[in,out] data void** Pointer to the buffer the array should be
+    received into.
+    @param[in,out] nbytes size_t* Pointer to the size of the buffer in
+    bytes that will be set to the size of the received array.
+    @param[in] allow_realloc bool If true, data must be heap memory that
+    the array is received into directly and that is reallocated as needed.
+    @returns int -1 if the array could not be received, -2 if EOF is
+    received, and the size of the received array otherwise.
+   */
+  int recvArray(void **data, size_t *nbytes, const bool allow_realloc=false) {
+    return yggRecvArray(_pi, (int)allow_realloc, data, nbytes);
+  }
   
 };
 
@@ -321,6 +337,23 @@ public:
     @returns int 0 if send was succesfull. All other values indicate errors.
    */
   int send_eof() { return ygg_send_eof(_pi); }
+
+  /*!
+    @brief Send an array to the output queue as a raw buffer without
+    serialization. See yggSendArray from YggInterface.h for details.
+    @param[in] subtype const char* Name of the array element type.
+    @param[in] precision size_t Precision of the array elements in bits.
+    @param[in] ndim size_t Number of dimensions in the array.
+    @param[in] shape const size_t* Size of the array in each dimension.
+    @param[in] data const void* Pointer to the contiguous array buffer.
+    @param[in] units const char* Units of the array elements.
+    @returns int 0 if send succesfull, -1 if send unsuccessful.
+   */
+  int sendArray(const char *subtype, const size_t precision,
+		const size_t ndim, const size_t *shape, const void *data,
+		const char *units="") {
+    return yggSendArray(_pi, subtype, precision, ndim, shape, units, data);
+  }
 };
 	
 
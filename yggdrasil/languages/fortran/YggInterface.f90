@@ -1766,6 +1766,66 @@ contains
     end if
   end function ygg_recv
 
+  function ygg_send_array(ygg_q, subtype, precision, shape, data, &
+       units) result (flag)
+    ! Fortran arrays are column-major while the array is sent as a
+    ! row-major buffer without copying, so the shape is reversed and
+    ! receivers get the transpose of arrays with more than one dimension
+    ! (e.g. an array with shape (2, 3) is received with shape (3, 2)).
+    implicit none
+    type(yggcomm), intent(in) :: ygg_q
+    character(len=*), intent(in) :: subtype
+    integer, intent(in) :: precision
+    integer(kind=c_size_t), dimension(:), intent(in) :: shape
+    type(c_ptr), intent(in) :: data
+    character(len=*), intent(in), optional :: units
+    logical :: flag
+    character(len=len_trim(subtype)+1) :: c_subtype
+    integer(kind=c_size_t) :: c_precision
+    integer(kind=c_size_t) :: c_ndim
+    integer(kind=c_size_t), dimension(size(shape)), target :: c_shape
+    character(len=:), allocatable :: c_units
+    integer(kind=c_int) :: c_flag
+    integer :: i
+    c_subtype = trim(subtype)//c_null_char
+    c_precision = precision
+    c_ndim = size(shape)
+    do i = 1, size(shape)
+       c_shape(i) = shape(size(shape) + 1 - i)
+    end do
+    if (present(units)) then
+       c_units = trim(units)//c_null_char
+    else
+       c_units = c_null_char
+    end if
+    c_flag = ygg_send_array_c(ygg_q%comm, c_subtype, c_precision, &
+         c_ndim, c_loc(c_shape(1)), c_units, data)
+    if (c_flag.ge.0) then
+       flag = .true.
+    else
+       flag = .false.
+    end if
+  end function ygg_send_array
+
+  function ygg_recv_array(ygg_q, data, nbytes) result (flag)
+    ! Arrays are received as row-major buffers, so arrays with more than
+    ! one dimension should be accessed with the shape reversed (i.e. as
+    ! the transpose of the array that was sent).
+    implicit none
+    type(yggcomm) :: ygg_q
+    type(c_ptr), intent(in) :: data
+    integer(kind=c_size_t), intent(inout) :: nbytes
+    logical :: flag
+    integer(kind=c_int) :: c_flag
+    c_flag = ygg_recv_array_c(ygg_q%comm, data, nbytes)
+    if (c_flag.ge.0) then
+       flag = .true.
+       nbytes = c_flag
+    else
+       flag = .false.
+    end if
+  end function ygg_recv_array
+
   function ygg_send_nolimit(ygg_q, data, data_len) result (flag)
     implicit none
     type(yggcomm), intent(in) :: ygg_q
@@ -467,6 +467,32 @@
        integer(kind=c_int) :: flag
      end function ygg_recv_c
 
+     function ygg_send_array_c(ygg_q, subtype, precision, ndim, &
+          shape, units, data) result (flag) &
+          bind(c, name="ygg_send_array_f")
+       use, intrinsic :: iso_c_binding, only: c_ptr, c_char, &
+            c_int, c_size_t
+       implicit none
+       type(c_ptr), value, intent(in) :: ygg_q
+       character(kind=c_char), dimension(*), intent(in) :: subtype
+       integer(kind=c_size_t), value, intent(in) :: precision
+       integer(kind=c_size_t), value, intent(in) :: ndim
+       type(c_ptr), value, intent(in) :: shape
+       character(kind=c_char), dimension(*), intent(in) :: units
+       type(c_ptr), value, intent(in) :: data
+       integer(kind=c_int) :: flag
+     end function ygg_send_array_c
+
+     function ygg_recv_array_c(ygg_q, data, nbytes) result (flag) &
+          bind(c, name="ygg_recv_array_f")
+       use, intrinsic :: iso_c_binding, only: c_ptr, c_int, c_size_t
+       implicit none
+       type(c_ptr), value :: ygg_q
+       type(c_ptr), value :: data
+       integer(kind=c_size_t), value, intent(in) :: nbytes
+       integer(kind=c_int) :: flag
+     end function ygg_recv_array_c
+
      function ygg_send_var_c(ygg_q, nargs, args) result (flag) &
           bind(c, name="ygg_send_var_f")
        use, intrinsic :: iso_c_binding, only: c_ptr, c_int
@@ -233,6 +233,19 @@ int ygg_recv_f(void *yggQ, char *data, const size_t len) {
   return ygg_recv((comm_t*)yggQ, data, len);
 }
 
+int ygg_send_array_f(const void *yggQ, const char *subtype,
+		     const size_t precision, const size_t ndim,
+		     void *shape, const char *units, const void *data) {
+  return yggSendArray((const comm_t*)yggQ, subtype, precision, ndim,
+		      (size_t*)shape, units, data);
+}
+
+int ygg_recv_array_f(void *yggQ, void *data, const size_t nbytes) {
+  void *c_data = data;
+  size_t c_nbytes = nbytes;
+  return yggRecvArray((comm_t*)yggQ, 0, &c_data, &c_nbytes);
+}
+
 int ygg_send_var_f(const void *yggQ, int nargs, void *args) {
   if (args == NULL) {
     ygglog_error("ygg_send_var_f: args pointer is NULL.");
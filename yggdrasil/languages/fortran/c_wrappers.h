@@ -77,6 +77,10 @@ void *create_dtype_any_f(const bool use_generic);
 // Methods for sending/receiving
 int ygg_send_f(const void *yggQ, const char *data, const size_t len);
 int ygg_recv_f(void *yggQ, char *data, const size_t len);
+int ygg_send_array_f(const void *yggQ, const char *subtype,
+		     const size_t precision, const size_t ndim,
+		     void *shape, const char *units, const void *data);
+int ygg_recv_array_f(void *yggQ, void *data, const size_t nbytes);
 int ygg_send_var_f(const void *yggQ, int nargs, void *args);
 int ygg_recv_var_f(void *yggQ, int nargs, void *args);
 int ygg_recv_var_realloc_f(void *yggQ, int nargs, void *args);
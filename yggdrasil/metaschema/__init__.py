@@ -162,12 +162,15 @@ def validate_schema(obj):
 #     return cls.normalize_schema(obj)
 
 
-def validate_instance(obj, schema, **kwargs):
+def validate_instance(obj, schema, skip_check=False, **kwargs):
     r"""Validate an instance against a schema.
 
     Args:
         obj (object): Object to be validated using the provided schema.
         schema (dict): Schema to use to validate the provided object.
+        skip_check (bool, optional): If True, the schema is assumed to
+            have already been validated against the metaschema. Defaults
+            to False.
         **kwargs: Additional keyword arguments are passed to validate.
 
     Raises:
@@ -175,16 +178,20 @@ def validate_instance(obj, schema, **kwargs):
 
     """
     cls = get_validator()
-    cls.check_schema(schema)
+    if not skip_check:
+        cls.check_schema(schema)
     return cls(schema).validate(obj, **kwargs)
 
 
-def normalize_instance(obj, schema, **kwargs):
+def normalize_instance(obj, schema, skip_check=False, **kwargs):
     r"""Normalize an object using the provided schema.
 
     Args:
         obj (object): Object to be normalized using the provided schema.
         schema (dict): Schema to use to normalize the provided object.
+        skip_check (bool, optional): If True, the schema is assumed to
+            have already been validated against the metaschema. Defaults
+            to False.
         **kwargs: Additional keyword arguments are passed to normalize.
     
     Returns:
@@ -192,5 +199,6 @@ def normalize_instance(obj, schema, **kwargs):
 
     """
     cls = get_validator()
-    cls.check_schema(schema)
+    if not skip_check:
+        cls.check_schema(schema)
     return cls(schema).normalize(obj, **kwargs)
@@ -1,10 +1,79 @@
 import numpy as np
 import pandas as pd
 from collections import OrderedDict
+from collections.abc import Mapping
+from yggdrasil.metaschema.datatypes import get_type_class
 from yggdrasil.metaschema.datatypes.ContainerMetaschemaType import (
     ContainerMetaschemaType)
 
 
+class LazyObject(Mapping):
+    r"""Read-only mapping for a decoded JSON object message where the
+    type specific decoding of each field is deferred until the field is
+    accessed.
+
+    Args:
+        encoded (dict): JSON decoded fields that have not been decoded
+            based on type.
+        typedefs (dict): Type definitions for each field.
+        decoded (dict, optional): Fields that have already been decoded.
+            Defaults to None.
+
+    """
+
+    def __init__(self, encoded, typedefs, decoded=None):
+        self._encoded = encoded
+        self._typedefs = typedefs
+        if decoded is None:
+            decoded = {}
+        self._decoded = decoded
+
+    def __getitem__(self, key):
+        if key not in self._decoded:
+            v = self._encoded[key]
+            vtypedef = self._typedefs.get(key, {})
+            vcls = get_type_class(vtypedef['type'])
+            self._decoded[key] = vcls.decode_data(v, vtypedef)
+        return self._decoded[key]
+
+    def __iter__(self):
+        return iter(self._encoded)
+
+    def __len__(self):
+        return len(self._encoded)
+
+    def __contains__(self, key):
+        return (key in self._encoded)
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, list(self._encoded.keys()))
+
+    def select(self, keys):
+        r"""Get a lazy object containing a subset of the fields without
+        decoding them.
+
+        Args:
+            keys (list): Fields that should be included.
+
+        Returns:
+            LazyObject: Object containing only the selected fields.
+
+        """
+        return self.__class__(
+            {k: self._encoded[k] for k in keys},
+            {k: self._typedefs[k] for k in keys if k in self._typedefs},
+            {k: self._decoded[k] for k in keys if k in self._decoded})
+
+    def materialize(self):
+        r"""Decode all of the fields.
+
+        Returns:
+            dict: Decoded object.
+
+        """
+        return {k: self[k] for k in self._encoded.keys()}
+
+
 class JSONObjectMetaschemaType(ContainerMetaschemaType):
     r"""Type associated with a map.
 
@@ -99,6 +168,28 @@ class JSONObjectMetaschemaType(ContainerMetaschemaType):
         """
         return (index in container)
 
+    @classmethod
+    def decode_data_lazy(cls, obj, typedef):
+        r"""Decode an object such that fields are only decoded when they are
+        accessed.
+
+        Args:
+            obj (string): Encoded object to decode.
+            typedef (dict): Type definition that should be used to decode the
+                object.
+
+        Returns:
+            LazyObject: Object that decodes fields on access.
+
+        """
+        # Subclasses that decode the object as a whole (e.g. ply) cannot
+        # be decoded lazily
+        if ((isinstance(obj, dict) and (cls._json_property in typedef)
+             and (cls.decode_data.__func__
+                  is JSONObjectMetaschemaType.decode_data.__func__))):
+            return LazyObject(obj, typedef[cls._json_property])
+        return cls.decode_data(obj, typedef)
+
     @classmethod
     def _encode_data_alias(cls, obj, typedef, func_encode, container_type=None):
         r"""Encode an object's data using a sepcified function.
@@ -141,6 +141,23 @@ class MetaschemaType(object):
         """
         raise NotImplementedError("Method must be overridden by the subclass.")
 
+    @classmethod
+    def decode_data_lazy(cls, obj, typedef):
+        r"""Decode an object such that the contents are only decoded when
+        they are accessed. Types that do not support lazy decoding decode the
+        entire object.
+
+        Args:
+            obj (string): Encoded object to decode.
+            typedef (dict): Type definition that should be used to decode the
+                object.
+
+        Returns:
+            object: Decoded object.
+
+        """
+        return cls.decode_data(obj, typedef)
+
     @classmethod
     def transform_type(cls, obj, typedef=None):
         r"""Transform an object based on type info.
@@ -576,7 +593,7 @@ class MetaschemaType(object):
 
     @classmethod
     def decode(cls, metadata, data, typedef=None, typedef_validated=False,
-               dont_check=False):
+               dont_check=False, lazy=False):
         r"""Decode an object.
 
         Args:
@@ -590,6 +607,9 @@ class MetaschemaType(object):
                 validated again during the encoding process. Defaults to False.
             dont_check (bool, optional): If True, the metadata will not be
                 checked against the type definition. Defaults to False.
+            lazy (bool, optional): If True, the object will be decoded
+                using decode_data_lazy so that the contents of containers
+                are only decoded when accessed. Defaults to False.
 
         Returns:
             object: Decoded object.
@@ -604,7 +624,8 @@ class MetaschemaType(object):
             metatype = metadata.get('type', None)
             if (metatype not in [None, 'bytes']) and is_default_typedef(typedef):
                 new_cls = get_type_class(metatype)
-                return new_cls.decode(metadata, data, dont_check=dont_check)
+                return new_cls.decode(metadata, data, dont_check=dont_check,
+                                      lazy=lazy)
             if metatype != cls.name:
                 conv_func = conversions.get_conversion(metatype, cls.name)
                 if (((conv_func is None)
@@ -617,6 +638,8 @@ class MetaschemaType(object):
         if conv_func:
             new_cls = get_type_class(metadata['type'])
             out = conv_func(new_cls.decode(metadata, data, dont_check=dont_check))
+        elif lazy:
+            out = cls.decode_data_lazy(data, metadata)
         else:
             out = cls.decode_data(data, metadata)
         out = cls.transform_type(out, typedef)
@@ -690,7 +713,7 @@ class MetaschemaType(object):
         return msg
     
     def deserialize(self, msg, no_data=False, metadata=None, dont_decode=False,
-                    dont_check=False):
+                    dont_check=False, lazy=False):
         r"""Deserialize a message.
 
         Args:
@@ -705,6 +728,9 @@ class MetaschemaType(object):
                 False.
             dont_check (bool, optional): If True, the metadata will not be
                 checked against the type definition. Defaults to False.
+            lazy (bool, optional): If True, the contents of container
+                messages will only be decoded when they are accessed.
+                Defaults to False.
 
         Returns:
             tuple(obj, dict): Deserialized message and header information.
@@ -749,13 +775,19 @@ class MetaschemaType(object):
             return metadata
         elif len(data) == 0:
             return self._empty_msg, metadata
+        elif (metadata.get('raw_array', False)
+              and not (metadata['incomplete'] or dont_decode)):
+            # Array buffer sent as is (without JSON/base64 encoding)
+            obj = self.decode(metadata['datatype'], data, self._typedef,
+                              typedef_validated=True, dont_check=dont_check)
         elif (metadata['incomplete'] or metadata.get('raw', False)
               or (metadata.get('type', None) == 'direct') or dont_decode):
             return data, metadata
         else:
             data = encoder.decode_json(data)
             obj = self.decode(metadata['datatype'], data, self._typedef,
-                              typedef_validated=True, dont_check=dont_check)
+                              typedef_validated=True, dont_check=dont_check,
+                              lazy=lazy)
         return obj, metadata
 
     # TESTING METHODS
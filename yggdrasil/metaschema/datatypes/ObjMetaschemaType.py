@@ -57,6 +57,10 @@ _map_element2code = {'material': 'usemtl', 'vertices': 'v',
                      'points': 'p', 'lines': 'l', 'faces': 'f',
                      'curves': 'curv', 'curve2Ds': 'curv2', 'surfaces': 'surf'}
 _map_code2element = {v: k for k, v in _map_element2code.items()}
+# Minimum number of values on a line for elements that can be
+# encoded/decoded as a block
+_block_min_values = {'vertices': 3, 'params': 2, 'normals': 3, 'texcoords': 1,
+                     'points': 1, 'curve2Ds': 2, 'lines': 2, 'faces': 3}
 
 
 def create_schema(overwrite=False):
@@ -818,6 +822,145 @@ class ObjMetaschemaType(JSONObjectMetaschemaType):
                 out = cls._decode_object_property([values], [order[0]])
         return out
 
+    @classmethod
+    def _encode_element_block(cls, e, values, newline='\n'):
+        r"""Encode all of the values for an element using a single format
+        operation.
+
+        Args:
+            e (str): Element name.
+            values (list): Element values.
+            newline (str, optional): String that should be used to delineated
+                end of lines. Defaults to '\n'.
+
+        Returns:
+            str: Encoded lines for the element. None is returned if the
+                values cannot be encoded as a block (e.g. if the properties
+                vary between values), in which case they should be encoded
+                individually.
+
+        """
+        if (e not in _block_min_values) or (not values):
+            return None
+        code = _map_element2code[e]
+        order = _default_property_order[e]
+        if isinstance(order, list):
+            # Elements with scalar properties (e.g. vertices)
+            props = [k for k in order if k in values[0]]
+            keys = set(props)
+            if (not props) or (len(keys) != len(values[0])):
+                return None
+            for x in values:
+                if x.keys() != keys:
+                    return None
+            fmt = ' '.join([code] + [_default_property_formats[k]
+                                     for k in props])
+            flat = [x[k] for x in values for k in props]
+            line_fmts = len(values) * [fmt]
+        elif isinstance(order, tuple):
+            # Elements composed of index sets (e.g. faces)
+            props = [k for k in order if k in values[0][0]]
+            keys = set(props)
+            if (not props) or (len(keys) != len(values[0][0])):
+                return None
+            for x in values:
+                for v in x:
+                    if v.keys() != keys:
+                        return None
+            vfmt = '/'.join([_default_property_formats[k] if k in keys else ''
+                             for k in order])
+            flat = [v[k] + 1 for x in values for v in x for k in props]
+            line_fmts = [' '.join([code] + len(x) * [vfmt]) for x in values]
+        else:
+            # Elements composed of index lists (e.g. points)
+            vfmt = _default_property_formats[order]
+            flat = [v + 1 for x in values for v in x]
+            line_fmts = [' '.join([code] + len(x) * [vfmt]) for x in values]
+        return newline.join(line_fmts) % tuple(flat)
+
+    @classmethod
+    def _decode_element_block(cls, e, lines):
+        r"""Decode all of the lines for an element using numpy to parse the
+        values for each property as a block.
+
+        Args:
+            e (str): Element name.
+            lines (list): Lines containing the values for each instance of
+                the element (without the element code).
+
+        Returns:
+            list: Decoded element values. None is returned if the lines cannot
+                be decoded as a block (e.g. if the index properties included
+                vary between lines), in which case they should be decoded
+                individually.
+
+        Raises:
+            ValueError: If any of the lines does not contain the minimum
+                number of values required by the element.
+
+        """
+        if e not in _block_min_values:
+            return None
+        order = _default_property_order[e]
+        counts = np.array([len(x.split()) for x in lines])
+        if counts.min() < _block_min_values[e]:
+            raise ValueError("%d values is less than the minimum (%d) "
+                             "required for '%s' element."
+                             % (counts.min(), _block_min_values[e], e))
+        if isinstance(order, list):
+            # Elements with scalar properties (e.g. vertices)
+            out = len(lines) * [None]
+            for n in np.unique(counts):
+                idx = np.where(counts == n)[0]
+                if len(idx) == len(lines):
+                    block = lines
+                else:
+                    block = [lines[i] for i in idx]
+                props = order[:n]
+                arr = np.array(' '.join(block).split(),
+                               dtype='float64').reshape(len(idx), n)
+                columns = []
+                for j, k in enumerate(props):
+                    if ((_default_property_converters[k] == _color_conv)
+                            and np.any(arr[:, j] != np.floor(arr[:, j]))):
+                        raise ValueError("Color values must be integers.")
+                    columns.append(
+                        arr[:, j].astype(_default_property_converters[k]))
+                for i, x in zip(idx, zip(*columns)):
+                    out[i] = dict(zip(props, x))
+            return out
+        flat = np.array(' '.join(lines).split())
+        ends = np.cumsum(counts).tolist()
+        starts = [0] + ends[:-1]
+        if isinstance(order, tuple):
+            # Elements composed of index sets (e.g. faces)
+            nslash = np.char.count(flat, '/')
+            if ((not np.all(nslash == nslash[0]))
+                    or (nslash[0] not in [0, len(order) - 1])):
+                return None
+            props = []
+            columns = []
+            rest = flat
+            for i, k in enumerate(order[:(nslash[0] + 1)]):
+                if i < nslash[0]:
+                    parts = np.char.partition(rest, '/')
+                    field, rest = parts[..., 0], parts[..., 2]
+                else:
+                    field = rest
+                empty = (field == '')
+                if np.all(empty) and (k != order[0]):
+                    continue
+                elif np.any(empty):
+                    return None
+                props.append(k)
+                columns.append(
+                    field.astype(_default_property_converters[k]) - 1)
+            flat = [dict(zip(props, x)) for x in zip(*columns)]
+        else:
+            # Elements composed of index lists (e.g. points)
+            flat = list(flat.astype(_default_property_converters[order]) - 1)
+        return [flat[i:j] for i, j in zip(starts, ends)]
+
     @classmethod
     def encode_data(cls, obj, typedef, comments=[], newline='\n'):
         r"""Encode an object's data.
@@ -851,6 +994,10 @@ class ObjMetaschemaType(JSONObjectMetaschemaType):
             if (e == 'material'):
                 body.append('%s %s' % (_map_element2code[e], obj['material']))
                 continue
+            block = cls._encode_element_block(e, obj[e], newline=newline)
+            if block is not None:
+                body.append(block)
+                continue
             for ie in obj[e]:
                 ivalue = cls._encode_object_property(ie, _default_property_order[e])
                 iline = '%s %s' % (_map_element2code[e], ivalue)
@@ -889,12 +1036,12 @@ class ObjMetaschemaType(JSONObjectMetaschemaType):
         lines = msg.splitlines()
         metadata = {'comments': []}
         out = {}
-        # Parse
+        # Sort lines by element
         for line_count, line in enumerate(lines):
             if line.startswith('#'):
                 metadata['comments'].append(line)
                 continue
-            values = line.split()
+            values = line.split(None, 1)
             if not values:
                 continue
             if values[0] not in _map_code2element:
@@ -904,14 +1051,25 @@ class ObjMetaschemaType(JSONObjectMetaschemaType):
             if e not in out:
                 out[e] = []
             if e in ['material']:
-                out[e] = values[1]
-                continue
+                out[e] = values[1].split()[0]
             else:
-                out[e].append(
-                    cls._decode_object_property(values[1:], _default_property_order[e]))
+                out[e].append(values[-1] if len(values) > 1 else '')
+        # Parse elements, falling back to parsing each line individually
+        # for elements that cannot be parsed as a block. Elements parsed as a
+        # block are already known to be valid.
+        validate = False
+        for e in out.keys():
+            if e in ['material']:
+                continue
+            values = cls._decode_element_block(e, out[e])
+            if values is None:
+                validate = True
+                values = [cls._decode_object_property(
+                    x.split(), _default_property_order[e]) for x in out[e]]
+            out[e] = values
         # Return
         # out.update(**metadata)
-        return ObjDict(out)
+        return ObjDict.from_dict(out, validate=validate)
 
     @classmethod
     def coerce_type(cls, obj, typedef=None, **kwargs):
@@ -28,6 +28,9 @@ _map_ply2py = {'char': 'int8', 'uchar': 'uint8',
                'int': 'int32', 'uint': 'uint32',
                'float': 'float32', 'double': 'float64'}
 _map_py2ply = {v: k for k, v in _map_ply2py.items()}
+_map_plyformat2byteorder = {'ascii': None,
+                            'binary_little_endian': '<',
+                            'binary_big_endian': '>'}
 _default_element_order = ['material', 'vertices', 'faces', 'edges']
 _default_property_order = {'vertices': ['x', 'y', 'z', 'red', 'green', 'blue'],
                            'faces': [],
@@ -191,6 +194,21 @@ def translate_ply2py(type_ply):
     return np.dtype(_map_ply2py[type_ply]).type
 
 
+def translate_ply2dtype(type_ply, byteorder='='):
+    r"""Get the corresponding numpy data type for the Ply type string.
+
+    Args:
+        type_ply (str): Ply type string.
+        byteorder (str, optional): Numpy byte order character that should be
+            used for the data type. Defaults to '=' (native).
+
+    Returns:
+        np.dtype: Numpy data type.
+
+    """
+    return np.dtype(translate_ply2py(type_ply)).newbyteorder(byteorder)
+
+
 def translate_py2ply(py_obj):
     r"""Get the correpsonding Ply type string for the provided Python object.
 
@@ -211,6 +229,222 @@ def translate_py2ply(py_obj):
     return _map_py2ply[type_np]
 
 
+def translate_count2ply(count):
+    r"""Get the smallest unsigned Ply type string that can hold the number of
+    entries in a list property.
+
+    Args:
+        count (int): Maximum number of entries in the list property.
+
+    Returns:
+        str: Ply type string.
+
+    Raises:
+        ValueError: If the count is too large for any Ply integer type.
+
+    """
+    for type_ply in ['uchar', 'ushort', 'uint']:
+        if count <= np.iinfo(_map_ply2py[type_ply]).max:
+            return type_ply
+    raise ValueError("No Ply type can hold a list count of %d." % count)
+
+
+def translate_plyformat2byteorder(plyformat):
+    r"""Get the byte order associated with a Ply format string.
+
+    Args:
+        plyformat (str): Ply format string (e.g. 'ascii 1.0' or
+            'binary_little_endian 1.0').
+
+    Returns:
+        str: Numpy byte order character ('<' or '>') for binary formats, None
+            for ascii.
+
+    Raises:
+        ValueError: If the format is not a valid Ply format.
+
+    """
+    fmt = plyformat.split()[0] if plyformat else ''
+    if fmt not in _map_plyformat2byteorder:
+        raise ValueError("Unsupported ply format '%s'." % plyformat)
+    return _map_plyformat2byteorder[fmt]
+
+
+def get_ply_dtype(type_map, property_order, byteorder, list_counts=None):
+    r"""Get the numpy structured data type for a Ply element in a binary file.
+
+    Args:
+        type_map (dict): Mapping from property name to Ply type string.
+        property_order (list): Order of properties in the element.
+        byteorder (str): Numpy byte order character ('<' or '>').
+        list_counts (dict, optional): Number of entries in each list property.
+            Required if any of the properties are lists. Defaults to None.
+
+    Returns:
+        np.dtype: Structured data type with one field per scalar property and
+            a count field plus a subarray field for each list property.
+
+    """
+    fields = []
+    for p in property_order:
+        vars = type_map[p].split()
+        if vars[0] == 'list':
+            fields.append(('_count_' + p,
+                           translate_ply2dtype(vars[1], byteorder)))
+            fields.append((p, translate_ply2dtype(vars[2], byteorder),
+                           (list_counts[p],)))
+        else:
+            fields.append((p, translate_ply2dtype(vars[0], byteorder)))
+    return np.dtype(fields)
+
+
+def encode_ply_element_binary(elements, property_order, type_map, byteorder):
+    r"""Encode a Ply element as bytes using whole block operations where
+    possible.
+
+    Args:
+        elements (list): Dictionaries containing properties for each element.
+        property_order (list): Order of properties in the element.
+        type_map (dict): Mapping from property name to Ply type string.
+        byteorder (str): Numpy byte order character ('<' or '>').
+
+    Returns:
+        bytes: Encoded element block.
+
+    Raises:
+        ValueError: If a list property has more entries than can be stored
+            by the count type.
+
+    """
+    list_props = [p for p in property_order if type_map[p].startswith('list')]
+    for p in list_props:
+        count_type = type_map[p].split()[1]
+        max_count = max(len(x[p]) for x in elements)
+        if max_count > np.iinfo(translate_ply2py(count_type)).max:
+            raise ValueError(("List property '%s' has %d entries, more than "
+                              "the Ply count type '%s' can hold.")
+                             % (p, max_count, count_type))
+    list_counts = {}
+    for p in list_props:
+        counts = set(len(x[p]) for x in elements)
+        if len(counts) != 1:
+            break
+        list_counts[p] = counts.pop()
+    else:
+        # All lists have uniform lengths so the element is a fixed width table
+        dtype = get_ply_dtype(type_map, property_order, byteorder,
+                              list_counts=list_counts)
+        arr = np.empty(len(elements), dtype=dtype)
+        for p in property_order:
+            arr[p] = [x[p] for x in elements]
+            if p in list_counts:
+                arr['_count_' + p] = list_counts[p]
+        return arr.tobytes()
+    # Variable length lists require each element to be written individually
+    prop_dtypes = {}
+    for p in property_order:
+        vars = type_map[p].split()
+        prop_dtypes[p] = [translate_ply2dtype(v, byteorder)
+                          for v in vars if v != 'list']
+    out = []
+    for x in elements:
+        for p in property_order:
+            if p in list_props:
+                out.append(np.array(len(x[p]), prop_dtypes[p][0]).tobytes())
+                out.append(np.array(x[p], prop_dtypes[p][1]).tobytes())
+            else:
+                out.append(np.array(x[p], prop_dtypes[p][0]).tobytes())
+    return b''.join(out)
+
+
+def decode_ply_element_binary(msg, offset, count, property_order, type_map,
+                              byteorder):
+    r"""Decode a Ply element from bytes using whole block operations where
+    possible.
+
+    Args:
+        msg (bytes): Buffer containing the encoded element.
+        offset (int): Offset of the start of the element block in msg.
+        count (int): Number of elements in the block.
+        property_order (list): Order of properties in the element.
+        type_map (dict): Mapping from property name to Ply type string.
+        byteorder (str): Numpy byte order character ('<' or '>').
+
+    Returns:
+        tuple(list, int): Dictionaries of properties for each element and the
+            offset of the end of the element block in msg.
+
+    Raises:
+        ValueError: If the buffer is too short to contain the element block.
+
+    """
+    list_props = [p for p in property_order if type_map[p].startswith('list')]
+    if count == 0:
+        return [], offset
+    # Assume list lengths are the same as those in the first element. This
+    # is only accepted if the count for every element matches, in which case
+    # every element was located correctly.
+    list_counts = {}
+    pos = offset
+    for p in property_order:
+        vars = type_map[p].split()
+        if vars[0] == 'list':
+            count_dtype = translate_ply2dtype(vars[1], byteorder)
+            item_dtype = translate_ply2dtype(vars[2], byteorder)
+            if (pos + count_dtype.itemsize) > len(msg):
+                raise ValueError("Ply message is too short.")
+            list_counts[p] = int(np.frombuffer(msg, count_dtype, 1, pos)[0])
+            pos += count_dtype.itemsize + list_counts[p] * item_dtype.itemsize
+        else:
+            pos += translate_ply2dtype(vars[0]).itemsize
+    dtype = get_ply_dtype(type_map, property_order, byteorder,
+                          list_counts=list_counts)
+    arr = None
+    if (offset + count * dtype.itemsize) <= len(msg):
+        arr = np.frombuffer(msg, dtype, count, offset)
+        for p in list_props:
+            if not np.all(arr['_count_' + p] == list_counts[p]):
+                arr = None
+                break
+    if arr is not None:
+        arr = arr.astype(dtype.newbyteorder('='))
+        columns = []
+        for p in property_order:
+            if p in list_props:
+                columns.append([list(x) for x in arr[p]])
+            else:
+                columns.append(arr[p])
+        out = [dict(zip(property_order, x)) for x in zip(*columns)]
+        return out, offset + count * dtype.itemsize
+    # Variable length lists require each element to be read individually
+    prop_dtypes = {}
+    for p in property_order:
+        vars = type_map[p].split()
+        prop_dtypes[p] = [translate_ply2dtype(v, byteorder)
+                          for v in vars if v != 'list']
+    out = []
+    for i in range(count):
+        new = {}
+        for p in property_order:
+            idtype = prop_dtypes[p][0]
+            if (offset + idtype.itemsize) > len(msg):
+                raise ValueError("Ply message is too short.")
+            ival = np.frombuffer(msg, idtype, 1, offset)[0]
+            offset += idtype.itemsize
+            if p in list_props:
+                idtype = prop_dtypes[p][1]
+                nval = int(ival)
+                if (offset + nval * idtype.itemsize) > len(msg):
+                    raise ValueError("Ply message is too short.")
+                ival = np.frombuffer(msg, idtype, nval, offset)
+                new[p] = list(ival.astype(idtype.newbyteorder('=')))
+                offset += nval * idtype.itemsize
+            else:
+                new[p] = ival.astype(idtype.newbyteorder('='))
+        out.append(new)
+    return out, offset
+
+
 def singular2plural(e_sing):
     r"""Get the plural version of a singular element name. If the singular
     version ends with the suffix 'ex' it is replaced with the plural suffix
@@ -270,9 +504,26 @@ class PlyDict(dict):
         r"""Check fields and convert arrays to nested structures."""
 
     @classmethod
-    def from_dict(cls, in_dict):
-        r"""Get a version of the object from a dictionary."""
-        out = cls(**in_dict)
+    def from_dict(cls, in_dict, validate=True):
+        r"""Get a version of the object from a dictionary.
+
+        Args:
+            in_dict (dict): Dictionary of elements.
+            validate (bool, optional): If False, the dictionary is assumed to
+                be valid and is not validated against the schema (e.g. when
+                it was produced by a decoder that already checked the
+                elements). Defaults to True.
+
+        Returns:
+            PlyDict: New object.
+
+        """
+        if validate:
+            return cls(**in_dict)
+        out = cls.__new__(cls)
+        dict.__init__(out, **in_dict)
+        out.setdefault('vertices', [])
+        out.setdefault('faces', [])
         return out
 
     def as_dict(self):
@@ -810,10 +1061,13 @@ class PlyMetaschemaType(JSONObjectMetaschemaType):
             newline (str, optional): String that should be used to delineated end
                 of lines. Defaults to '\n'.
             plyformat (str, optional): String describing the ply format and version.
-                Defaults to 'ascii 1.0'.
+                Defaults to 'ascii 1.0'. Binary formats
+                ('binary_little_endian 1.0' and 'binary_big_endian 1.0') are
+                also supported.
 
         Returns:
-            bytes, str: Serialized message.
+            bytes, str: Serialized message. Messages in binary formats are
+                returned as bytes.
 
         """
         if trimesh and isinstance(obj, trimesh.base.Trimesh):
@@ -836,6 +1090,7 @@ class PlyMetaschemaType(JSONObjectMetaschemaType):
                     continue
                 property_order[e] = get_key_order(obj[e][0].keys(),
                                                   _default_property_order.get(e, []))
+        byteorder = translate_plyformat2byteorder(plyformat)
         # Get information needed
         size_map = {}
         type_map = {}
@@ -850,7 +1105,9 @@ class PlyMetaschemaType(JSONObjectMetaschemaType):
             for p in property_order[e]:
                 if isinstance(obj[e][0][p], list):
                     subtype = translate_py2ply(obj[e][0][p][0])
-                    type_map[e][p] = 'list uchar %s' % subtype
+                    count_type = translate_count2ply(
+                        max(len(x[p]) for x in obj[e]))
+                    type_map[e][p] = 'list %s %s' % (count_type, subtype)
                 else:
                     type_map[e][p] = translate_py2ply(obj[e][0][p])
         # Encode header
@@ -867,6 +1124,14 @@ class PlyMetaschemaType(JSONObjectMetaschemaType):
                         header.append('property %s %s' % (type_map[e][p], p))
         header.append('end_header')
         # Encode body
+        if byteorder is not None:
+            body = [tools.str2bytes(newline.join(header) + newline)]
+            for e in element_order:
+                if (e not in obj) or (e == 'material') or (size_map[e] == 0):
+                    continue
+                body.append(encode_ply_element_binary(
+                    obj[e], property_order[e], type_map[e], byteorder))
+            return b''.join(body)
         body = []
         for e in element_order:
             if (e not in obj) or (e == 'material'):
@@ -918,11 +1183,18 @@ class PlyMetaschemaType(JSONObjectMetaschemaType):
             object: Decoded object.
 
         """
-        msg = tools.bytes2str(msg)
-        lines = msg.splitlines()
+        msg = tools.str2bytes(msg)
+        headend = msg.find(b'end_header')
+        if headend >= 0:
+            headend = msg.find(b'\n', headend) + 1
+            if headend == 0:
+                headend = len(msg)
+        lines = tools.bytes2str(msg[:headend]).splitlines()
         metadata = {'comments': [], 'element_order': [], 'property_order': {}}
-        if lines[0] != 'ply':
+        if (not lines) or (lines[0] != 'ply'):
             raise ValueError("The first line must be 'ply'")
+        if headend < 0:
+            raise ValueError("The header is not terminated by 'end_header'")
         # Parse header
         e = None
         p = None
@@ -953,10 +1225,21 @@ class PlyMetaschemaType(JSONObjectMetaschemaType):
                 type_map[e][p] = ' '.join(vars[1:-1])
                 metadata['property_order'][e].append(p)
             elif 'end_header' in line:
-                headline = i + 1
                 break
         # Parse body
-        i = headline
+        byteorder = translate_plyformat2byteorder(
+            metadata.get('plyformat', 'ascii 1.0'))
+        if byteorder is not None:
+            offset = headend
+            for e in metadata['element_order']:
+                if e == 'material':
+                    continue
+                obj[e], offset = decode_ply_element_binary(
+                    msg, offset, size_map[e], metadata['property_order'][e],
+                    type_map[e], byteorder)
+            return PlyDict(obj)
+        lines = tools.bytes2str(msg[headend:]).splitlines()
+        i = 0
         for e in metadata['element_order']:
             if e == 'material':
                 continue
@@ -174,7 +174,9 @@ class ScalarMetaschemaType(MetaschemaType):
         r"""Decode an object.
 
         Args:
-            obj (string): Encoded object to decode.
+            obj (string, bytes): Encoded object to decode. Bytes are
+                treated as the raw array buffer (sent without base64
+                encoding).
             typedef (dict): Type definition that should be used to decode the
                 object.
 
@@ -182,9 +184,10 @@ class ScalarMetaschemaType(MetaschemaType):
             object: Decoded object.
 
         """
-        bytes = base64.decodebytes(obj.encode('ascii'))
+        if isinstance(obj, str):
+            obj = base64.decodebytes(obj.encode('ascii'))
         dtype = ScalarMetaschemaProperties.definition2dtype(typedef)
-        arr = np.frombuffer(bytes, dtype=dtype)
+        arr = np.frombuffer(obj, dtype=dtype)
         # arr = np.fromstring(bytes, dtype=dtype)
         if 'shape' in typedef:
             arr = arr.reshape(typedef['shape'])
@@ -3,7 +3,7 @@ import numpy as np
 from yggdrasil import serialize
 from yggdrasil.tests import assert_equal
 from yggdrasil.metaschema.datatypes.JSONObjectMetaschemaType import (
-    JSONObjectMetaschemaType)
+    JSONObjectMetaschemaType, LazyObject)
 from yggdrasil.metaschema.datatypes.tests import test_MetaschemaType as parent
 from yggdrasil.metaschema.datatypes.tests import (
     test_ContainerMetaschemaType as container_utils)
@@ -60,3 +60,36 @@ class TestJSONObjectMetaschemaType(parent.TestMetaschemaType):
         cls._invalid_encoded.append(copy.deepcopy(cls._fulldef))
         cls._invalid_encoded[-1]['properties']['a']['type'] = 'invalid'
         cls._compatible_objects = [(cls._value, cls._value, None)]
+
+    def test_decode_data_lazy(self):
+        r"""Test lazy decoding of fields."""
+        typedef = self.import_cls.encode_type(self._value)
+        data = self.import_cls.encode_data(self._value, typedef)
+        x = self.import_cls.decode_data_lazy(data, typedef)
+        if self._cls != 'JSONObjectMetaschemaType':
+            # Subclasses that decode the object as a whole
+            assert(not isinstance(x, LazyObject))
+            return
+        assert(isinstance(x, LazyObject))
+        self.assert_equal(len(x._decoded), 0)
+        self.assert_equal(sorted(x.keys()), sorted(self._value.keys()))
+        assert('a' in x)
+        self.assert_result_equal(x['a'], self._value['a'])
+        self.assert_equal(list(x._decoded.keys()), ['a'])
+        y = x.select(['a', 'b'])
+        self.assert_equal(len(y), 2)
+        self.assert_equal(list(y._decoded.keys()), ['a'])
+        self.assert_result_equal(x.materialize(), self._value)
+        repr(x)
+        # Types without properties are decoded completely
+        assert(not isinstance(
+            self.import_cls.decode_data_lazy(data, {'type': 'object'}),
+            LazyObject))
+
+    def test_deserialize_lazy(self):
+        r"""Test deserialize with lazy decoding."""
+        msg = self.instance.serialize(self._value)
+        x = self.instance.deserialize(msg, lazy=True)[0]
+        if isinstance(x, LazyObject):
+            x = x.materialize()
+        self.assert_result_equal(x, self._value)
@@ -210,3 +210,35 @@ class TestObjMetaschemaType(parent.TestPlyMetaschemaType):
             if isinstance(y, ObjMetaschemaType.trimesh.base.Trimesh):
                 y = ObjMetaschemaType.ObjDict.from_trimesh(y)
         super(TestObjMetaschemaType, cls).assert_result_equal(x, y)
+
+    def test_decode_data_errors(self):
+        r"""Test errors in decode_data."""
+        self.assert_raises(ValueError, self.import_cls.decode_data,
+                           'invalid 0 0 0', None)
+        self.assert_raises(ValueError, self.import_cls.decode_data,
+                           'v 0 0', None)
+        self.assert_raises(ValueError, self.import_cls.decode_data,
+                           'v 0 0 0 0.5', None)
+        self.assert_raises(ValueError, self.import_cls.decode_data,
+                           'v 0 0 0\nf 1 1', None)
+
+    def test_encode_data_long_list(self):
+        r"""Disabled: Obj faces do not have list count types."""
+        pass  # pragma: no cover
+
+    def test_decode_data_mixed(self):
+        r"""Test decoding elements with properties that vary between lines."""
+        msg = ('v 0 0 0\nv 0 0 1 255 0 0\nv 0 1 1\nvt 0.5\nvt 0.5 0.5\n'
+               'vn 1 0 0\nf 1 2 3\nf 1/1/1 2/2/1 3//1\nl 1 2\nl 1/1 2/2\n'
+               'p 1 2 3')
+        x = self.import_cls.decode_data(msg, None)
+        self.assert_equal(len(x['vertices']), 3)
+        self.assert_equal(x['vertices'][1]['red'], 255)
+        self.assert_equal(x['faces'][1][2],
+                          {'vertex_index': 2, 'normal_index': 0})
+        self.assert_equal(x['lines'][1][1],
+                          {'vertex_index': 1, 'texcoord_index': 1})
+        self.assert_equal(x['points'], [[0, 1, 2]])
+        y = self.import_cls.decode_data(
+            self.import_cls.encode_data(x, None), None)
+        self.assert_equal(y, x)
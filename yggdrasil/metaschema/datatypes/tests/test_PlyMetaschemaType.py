@@ -6,6 +6,7 @@ import numpy as np
 import unittest
 from yggdrasil.metaschema.datatypes.tests import (
     test_JSONObjectMetaschemaType as parent)
+from yggdrasil import tools
 from yggdrasil.metaschema.datatypes import PlyMetaschemaType
 from yggdrasil.tests import YggTestClassInfo, assert_raises, assert_equal
 from yggdrasil.drivers.LPyModelDriver import LPyModelDriver
@@ -84,6 +85,22 @@ def test_translate_py2ply_errors():
     assert_raises(ValueError, PlyMetaschemaType.translate_py2ply, 'float128')
 
 
+def test_translate_count2ply():
+    r"""Test translate_count2ply."""
+    assert_equal(PlyMetaschemaType.translate_count2ply(255), 'uchar')
+    assert_equal(PlyMetaschemaType.translate_count2ply(256), 'ushort')
+    assert_equal(PlyMetaschemaType.translate_count2ply(65536), 'uint')
+    assert_raises(ValueError, PlyMetaschemaType.translate_count2ply, 2**32)
+
+
+def test_encode_ply_element_binary_errors():
+    r"""Test errors in encode_ply_element_binary."""
+    elements = [{'vertex_index': list(range(300))}]
+    assert_raises(ValueError, PlyMetaschemaType.encode_ply_element_binary,
+                  elements, ['vertex_index'],
+                  {'vertex_index': 'list uchar int'}, '<')
+
+
 def test_singular2plural():
     r"""Test conversion from singular element names to plural ones and back."""
     pairs = [('face', 'faces'), ('vertex', 'vertices'),
@@ -274,3 +291,56 @@ class TestPlyMetaschemaType(parent.TestJSONObjectMetaschemaType):
     def test_decode_data_errors(self):
         r"""Test errors in decode_data."""
         self.assert_raises(ValueError, self.import_cls.decode_data, 'hello', None)
+
+    def test_encode_data_long_list(self):
+        r"""Test encode/decode of list properties with more than 255
+        entries."""
+        nvert = 300
+        obj = {'vertices': [{'x': np.float32(i), 'y': np.float32(0),
+                             'z': np.float32(0)} for i in range(nvert)],
+               'faces': [{'vertex_index': [np.int32(i) for i in range(nvert)]},
+                         {'vertex_index': [np.int32(0), np.int32(1),
+                                           np.int32(2)]}]}
+        msg = self.import_cls.encode_data(obj, None,
+                                          **self._encode_data_kwargs)
+        assert(b'property list ushort int vertex_index'
+               in tools.str2bytes(msg))
+        res = self.import_cls.decode_data(msg, None)
+        self.assert_equal(len(res['faces'][0]['vertex_index']), nvert)
+        self.assert_equal([int(x) for x in res['faces'][0]['vertex_index']],
+                          list(range(nvert)))
+
+
+class TestPlyMetaschemaTypeBinaryLittleEndian(TestPlyMetaschemaType):
+    r"""Test class for PlyMetaschemaType class with little endian binary
+    format."""
+
+    @staticmethod
+    def after_class_creation(cls):
+        r"""Actions to be taken during class construction."""
+        TestPlyMetaschemaType.after_class_creation(cls)
+        cls._encode_data_kwargs = {'comments': ['Test comment'],
+                                   'plyformat': 'binary_little_endian 1.0'}
+
+    def test_decode_data_binary_errors(self):
+        r"""Test errors in decode_data for binary formats."""
+        msg = self.import_cls.encode_data(
+            self._value, None, **self._encode_data_kwargs)
+        self.assert_raises(ValueError, self.import_cls.decode_data,
+                           msg[:-4], None)
+        self.assert_raises(ValueError, self.import_cls.decode_data,
+                           b'ply\nformat invalid 1.0\nend_header\n', None)
+        self.assert_raises(ValueError, self.import_cls.decode_data,
+                           b'ply\nformat ascii 1.0\n', None)
+
+
+class TestPlyMetaschemaTypeBinaryBigEndian(TestPlyMetaschemaType):
+    r"""Test class for PlyMetaschemaType class with big endian binary
+    format."""
+
+    @staticmethod
+    def after_class_creation(cls):
+        r"""Actions to be taken during class construction."""
+        TestPlyMetaschemaType.after_class_creation(cls)
+        cls._encode_data_kwargs = {'comments': ['Test comment'],
+                                   'plyformat': 'binary_big_endian 1.0'}
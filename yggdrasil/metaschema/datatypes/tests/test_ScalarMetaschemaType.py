@@ -1,6 +1,8 @@
 import copy
 import numpy as np
 from yggdrasil import units, platform
+from yggdrasil.metaschema import encoder
+from yggdrasil.metaschema.datatypes import YGG_MSG_HEAD
 from yggdrasil.metaschema.datatypes.tests import test_MetaschemaType as parent
 from yggdrasil.metaschema.properties.ScalarMetaschemaProperties import (
     _valid_types)
@@ -106,6 +108,18 @@ class TestScalarMetaschemaType(parent.TestMetaschemaType):
         self.assert_equal(self.instance.from_array(self._array, **test_kws),
                           test_val)
 
+    def test_deserialize_raw_array(self):
+        r"""Test deserialization of messages with raw array buffers."""
+        x = self._valid_decoded[0]
+        body = self.import_cls.to_array(x).tobytes()
+        metadata = {'datatype': self.import_cls.encode_type(x),
+                    'size': len(body), 'raw_array': True}
+        msg = (YGG_MSG_HEAD + encoder.encode_json(metadata)
+               + YGG_MSG_HEAD + body)
+        y, header = self.instance.deserialize(msg)
+        self.assert_result_equal(y, x)
+        assert(header['raw_array'])
+
 
 # Dynamically create tests for dynamic and explicitly typed scalars
 for t in _valid_types.keys():
@@ -0,0 +1,306 @@
+r"""Lightweight runtime metrics (counters, gauges, and latency histograms)
+for comms and connections."""
+import json
+import bisect
+import threading
+import weakref
+
+
+# Upper bounds (in seconds) of histogram buckets, spaced by factors of 2
+# from 1 microsecond to ~17 seconds. Values larger than the last bound are
+# counted in an overflow bucket.
+_bucket_bounds = [1.0e-6 * (2 ** i) for i in range(25)]
+
+
+class LatencyHistogram(object):
+    r"""Histogram of latencies with logarithmically spaced buckets.
+
+    Attributes:
+        counts (list): Number of values in each bucket.
+        count (int): Total number of values.
+        total (float): Sum of all values.
+        min (float): Smallest value.
+        max (float): Largest value.
+
+    """
+
+    __slots__ = ['counts', 'count', 'total', 'min', 'max']
+
+    def __init__(self):
+        self.counts = [0 for _ in range(len(_bucket_bounds) + 1)]
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        r"""Add a value to the histogram.
+
+        Args:
+            value (float): Latency (in seconds).
+
+        """
+        self.counts[bisect.bisect_left(_bucket_bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if (self.min is None) or (value < self.min):
+            self.min = value
+        if (self.max is None) or (value > self.max):
+            self.max = value
+
+    @property
+    def mean(self):
+        r"""float: Average value."""
+        if self.count == 0:
+            return None
+        return self.total / self.count
+
+    def percentile(self, q):
+        r"""Estimate a percentile from the bucket upper bounds.
+
+        Args:
+            q (float): Percentile (between 0 and 100).
+
+        Returns:
+            float: Upper bound of the bucket containing the percentile,
+                limited to the largest value. None is returned if there
+                are no values.
+
+        """
+        if self.count == 0:
+            return None
+        target = q * self.count / 100.0
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            cumulative += n
+            if (n > 0) and (cumulative >= target):
+                if i < len(_bucket_bounds):
+                    return min(_bucket_bounds[i], self.max)
+                break
+        return self.max
+
+    def to_dict(self):
+        r"""Get a JSON serializable summary of the histogram.
+
+        Returns:
+            dict: Summary statistics and counts of non-empty buckets keyed
+                by the upper bound of the bucket ('inf' for values larger
+                than the last bound).
+
+        """
+        buckets = {}
+        for i, n in enumerate(self.counts):
+            if n > 0:
+                if i < len(_bucket_bounds):
+                    buckets['%g' % _bucket_bounds[i]] = n
+                else:
+                    buckets['inf'] = n
+        return {'count': self.count, 'total': self.total,
+                'mean': self.mean, 'min': self.min, 'max': self.max,
+                'p50': self.percentile(50), 'p90': self.percentile(90),
+                'p99': self.percentile(99), 'buckets': buckets}
+
+
+class Metrics(object):
+    r"""Counters, gauges, and latency histograms for a single comm or
+    connection. Metrics are registered with the process wide registry on
+    creation.
+
+    Args:
+        name (str): Name of the comm or connection.
+        kind (str, optional): Type of object the metrics are for. Defaults
+            to 'comm'.
+        **info: Additional keyword arguments are stored as information about
+            the object.
+
+    Attributes:
+        name (str): Name of the comm or connection.
+        kind (str): Type of object the metrics are for.
+        info (dict): Information about the object.
+        counters (dict): Counters.
+        gauges (dict): Current and maximum values of gauges.
+        histograms (dict): Latency histograms.
+
+    """
+
+    def __init__(self, name, kind='comm', **info):
+        self.name = name
+        self.kind = kind
+        self.info = info
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+        get_registry().register(self)
+
+    def __getstate__(self):
+        out = self.__dict__.copy()
+        out.pop('_lock')
+        return out
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        get_registry().register(self)
+
+    def increment(self, key, value=1):
+        r"""Increment a counter.
+
+        Args:
+            key (str): Name of the counter.
+            value (int, optional): Amount to increment the counter by.
+                Defaults to 1.
+
+        """
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, key, value):
+        r"""Set the current value of a gauge, updating its maximum.
+
+        Args:
+            key (str): Name of the gauge.
+            value (float): Current value.
+
+        """
+        with self._lock:
+            gauge = self.gauges.get(key, None)
+            if gauge is None:
+                self.gauges[key] = {'current': value, 'max': value}
+            else:
+                gauge['current'] = value
+                if value > gauge['max']:
+                    gauge['max'] = value
+
+    def observe(self, key, value):
+        r"""Add a latency to a histogram.
+
+        Args:
+            key (str): Name of the histogram.
+            value (float): Latency (in seconds).
+
+        """
+        with self._lock:
+            hist = self.histograms.get(key, None)
+            if hist is None:
+                hist = LatencyHistogram()
+                self.histograms[key] = hist
+            hist.add(value)
+
+    def record(self, key, nbytes, elapsed):
+        r"""Record a message being sent or received.
+
+        Args:
+            key (str): Direction of the message ('sent' or 'recv').
+            nbytes (int): Size of the message in bytes.
+            elapsed (float): Time (in seconds) that it took to send or
+                receive the message.
+
+        """
+        with self._lock:
+            self.counters['messages_' + key] = (
+                self.counters.get('messages_' + key, 0) + 1)
+            self.counters['bytes_' + key] = (
+                self.counters.get('bytes_' + key, 0) + nbytes)
+            hist = self.histograms.get(key, None)
+            if hist is None:
+                hist = LatencyHistogram()
+                self.histograms[key] = hist
+            hist.add(elapsed)
+
+    def to_dict(self):
+        r"""Get a JSON serializable copy of the metrics.
+
+        Returns:
+            dict: Metrics.
+
+        """
+        with self._lock:
+            return {'name': self.name, 'kind': self.kind,
+                    'info': dict(self.info),
+                    'counters': dict(self.counters),
+                    'gauges': {k: dict(v) for k, v in self.gauges.items()},
+                    'histograms': {k: v.to_dict() for k, v in
+                                   self.histograms.items()}}
+
+
+class MetricsRegistry(object):
+    r"""Process wide registry of metrics for live comms and connections.
+    Metrics are held by weak reference so that they are removed when the
+    object that owns them is garbage collected."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = weakref.WeakValueDictionary()
+        self._count = 0
+
+    def register(self, metrics):
+        r"""Register metrics.
+
+        Args:
+            metrics (Metrics): Metrics to register.
+
+        """
+        with self._lock:
+            self._count += 1
+            self._entries['%s:%s:%d' % (metrics.kind, metrics.name,
+                                        self._count)] = metrics
+
+    def get(self, name=None, kind=None):
+        r"""Get registered metrics.
+
+        Args:
+            name (str, optional): Name of the object that metrics should be
+                returned for. Defaults to None and metrics for all objects
+                are returned.
+            kind (str, optional): Type of object that metrics should be
+                returned for. Defaults to None and metrics for all types
+                are returned.
+
+        Returns:
+            list: Matching metrics.
+
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+        return [x for x in entries
+                if (((name is None) or (x.name == name))
+                    and ((kind is None) or (x.kind == kind)))]
+
+    def snapshot(self, **kwargs):
+        r"""Get JSON serializable copies of registered metrics.
+
+        Args:
+            **kwargs: Keyword arguments are passed to get.
+
+        Returns:
+            list: Dictionaries of metrics.
+
+        """
+        return [x.to_dict() for x in self.get(**kwargs)]
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry():
+    r"""Get the process wide metrics registry.
+
+    Returns:
+        MetricsRegistry: Registry.
+
+    """
+    return _registry
+
+
+def dump(metrics, filename):
+    r"""Write metrics to a JSON file.
+
+    Args:
+        metrics (dict, list): Metrics to write.
+        filename (str): Full path to the file that should be written.
+
+    """
+    with open(filename, 'w') as fd:
+        json.dump(metrics, fd, indent=2, sort_keys=True)
+        fd.write('\n')
@@ -1,12 +1,16 @@
 import os
 import sys
 import six
+import time
 import atexit
+import asyncio
 import weakref
 import logging
 import threading
 import queue
 import multiprocessing
+from concurrent import futures
+from collections import OrderedDict
 from yggdrasil.tools import YggClass
 
 
@@ -16,6 +20,10 @@ _main_thread = threading.main_thread()
 _thread_registry = weakref.WeakValueDictionary()
 _lock_registry = weakref.WeakValueDictionary()
 logger = logging.getLogger(__name__)
+if hasattr(asyncio, 'current_task'):
+    _current_async_task = asyncio.current_task
+else:  # pragma: no cover
+    _current_async_task = asyncio.Task.current_task
 
 
 def check_processes():  # pragma: debug
@@ -561,6 +569,213 @@ class Task(ContextObject):
             self._base.kill(*args, **kwargs)
 
 
+class ReactorTask(object):
+    r"""Stand-in for a thread that runs a coroutine on the event loop of a
+    :class:`YggReactor` instead of on a dedicated thread.
+
+    Args:
+        reactor (YggReactor): Reactor that should host the coroutine.
+        name (str, optional): Name of the task. Defaults to None.
+        target (function, optional): Coroutine function that should be run
+            when the task is started. Defaults to None.
+        daemon (bool, optional): Ignored, reactor hosted tasks are
+            never waited on at exit. Defaults to False.
+        group (None, optional): Ignored, provided for compatibility with
+            threading.Thread.
+
+    Attributes:
+        reactor (YggReactor): Reactor hosting the coroutine.
+        future (concurrent.futures.Future): Future for the coroutine once
+            it has been scheduled.
+
+    """
+
+    def __init__(self, reactor, name=None, target=None, daemon=False,
+                 group=None):
+        self.reactor = reactor
+        self.name = name
+        self.daemon = daemon
+        self._target = target
+        self.future = None
+        self._finished = threading.Event()
+
+    def start(self):
+        r"""Schedule the coroutine on the reactor."""
+        if self.future is not None:  # pragma: debug
+            raise RuntimeError("Task can only be started once.")
+        self.future = self.reactor.add_coroutine(self._run())
+
+    async def _run(self):
+        try:
+            if self._target is not None:
+                await self._target()
+        finally:
+            self._finished.set()
+
+    def join(self, timeout=None):
+        r"""Wait for the coroutine to finish.
+
+        Args:
+            timeout (float, optional): Maximum time to wait. Defaults to None
+                and is infinite.
+
+        """
+        if self.future is not None:
+            self._finished.wait(timeout)
+
+    def is_alive(self):
+        r"""Determine if the coroutine has been scheduled, but has not
+        finished."""
+        return ((self.future is not None) and (not self._finished.is_set()))
+
+    @property
+    def exitcode(self):
+        r"""int: Exit code. 1 if error, 0 otherwise."""
+        if not self._finished.is_set():
+            return None
+        if self.future.cancelled() or (self.future.exception() is not None):
+            return 1
+        return 0
+
+    @property
+    def pid(self):
+        r"""Process ID."""
+        return os.getpid()
+
+    @property
+    def ident(self):
+        r"""Identifier of the thread running the reactor."""
+        return self.reactor.ident
+
+    def kill(self, *args, **kwargs):
+        r"""Cancel the coroutine."""
+        if self.future is not None:
+            self.future.cancel()
+
+
+class PoolTask(object):
+    r"""Stand-in for a process that runs a task on a thread inside one of
+    the worker processes of a :class:`YggTaskPool` instead of in its own
+    process.
+
+    Args:
+        pool (YggTaskPool): Pool that the task will be run by.
+        owner (YggTask): Task that will be run.
+        name (str, optional): Name of the task. Defaults to None.
+        daemon (bool, optional): Ignored, provided for compatibility with
+            multiprocessing.Process. Defaults to False.
+        group (None, optional): Ignored, provided for compatibility with
+            multiprocessing.Process.
+
+    Attributes:
+        pool (YggTaskPool): Pool that the task will be run by. This is
+            not available on the worker process.
+        owner (YggTask): Task that will be run.
+        context (Context): Context of the owner.
+        worker_index (int): Index of the worker in the pool that the task
+            was assigned to.
+
+    """
+
+    def __init__(self, pool, owner, name=None, daemon=False, group=None):
+        self.pool = pool
+        self.owner = owner
+        self.name = name
+        self.daemon = daemon
+        self.context = owner.context
+        self.worker_index = None
+        self._start_event = mp_ctx_spawn.Event()
+        self._finished = mp_ctx_spawn.Event()
+        self._stop_event = pool.stop_event
+
+    def __getstate__(self):
+        out = self.__dict__.copy()
+        out['pool'] = None
+        return out
+
+    def start(self):
+        r"""Signal the worker process that it should start the task."""
+        if (self.pool is not None) and (not self.pool.was_started):
+            raise RuntimeError("Pool %s must be started before task %s."
+                               % (self.pool.name, self.name))
+        self._start_event.set()
+
+    def run_in_worker(self):
+        r"""Wait for the task to be started and then run it. This is called
+        on a thread in the worker process."""
+        while not self._start_event.wait(0.1):
+            if self._stop_event.is_set():
+                return
+        try:
+            self.owner.run()
+        finally:
+            self._finished.set()
+
+    def join(self, timeout=None):
+        r"""Wait for the task to finish.
+
+        Args:
+            timeout (float, optional): Maximum time to wait. Defaults to None
+                and is infinite.
+
+        """
+        if self._start_event.is_set():
+            self._finished.wait(timeout)
+
+    def is_alive(self):
+        r"""Determine if the task was started, but has not finished."""
+        if (not self._start_event.is_set()) or self._finished.is_set():
+            return False
+        if self.pool is not None:
+            return self.pool.workers[self.worker_index].is_alive()
+        return True
+
+    @property
+    def exitcode(self):
+        r"""int: Exit code. 0 if finished, None otherwise. Errors are
+        recorded by the owner's error flag."""
+        if not self._finished.is_set():
+            return None
+        return 0
+
+    @property
+    def pid(self):
+        r"""Process ID of the worker process running the task."""
+        if self.pool is None:
+            return os.getpid()
+        if not self.pool.was_started:
+            return None
+        return self.pool.workers[self.worker_index].pid
+
+    @property
+    def ident(self):
+        r"""Process ID of the worker process running the task."""
+        return self.pid
+
+    def kill(self, *args, **kwargs):
+        r"""Tasks in a pool cannot be killed individually, the owner's
+        terminate method should be used to stop the task."""
+        pass
+
+
+def _run_pool_worker(tasks, stop_event):
+    r"""Run a set of tasks on threads in a pool worker process.
+
+    Args:
+        tasks (list): Tasks that should be run.
+        stop_event (multiprocessing.Event): Event that will be set if tasks
+            that have not been started should not be run.
+
+    """
+    threads = []
+    for x in tasks:
+        threads.append(SafeThread(target=x.process_instance.run_in_worker,
+                                  name=x.name, daemon=True))
+        threads[-1].start()
+    for x in threads:
+        x.join()
+
+
 class DummyQueue(DummyContextObject):  # pragma: no cover
 
     def empty(self):
@@ -777,7 +992,15 @@ class LockedDict(LockedObject):
 
 
 class YggTask(YggClass):
-    r"""Class for managing Ygg thread/process."""
+    r"""Class for managing Ygg thread/process.
+
+    Attributes:
+        completion_queue (Queue): Queue that the name of the task is put in
+            when the task finishes running. If None (the default), the
+            completion of the task is not signaled. Only supported for tasks
+            that are not run in a separate process.
+
+    """
 
     _disconnect_attr = (YggClass._disconnect_attr
                         + ['context', 'lock', 'process_instance',
@@ -785,9 +1008,20 @@ class YggTask(YggClass):
     
     def __init__(self, name=None, target=None, args=(), kwargs=None,
                  daemon=False, group=None, task_method='thread',
-                 context=None, with_pipe=False, **ygg_kwargs):
+                 context=None, with_pipe=False, reactor=None, pool=None,
+                 **ygg_kwargs):
         if kwargs is None:
             kwargs = {}
+        if (pool is not None) and (task_method not in ['process',
+                                                       'multiprocessing',
+                                                       'parallel']):
+            raise ValueError("Tasks run by a pool must use "
+                             "task_method='process', not '%s'" % task_method)
+        if (reactor is not None) and (task_method not in ['thread', 'threading',
+                                                          'concurrent']):
+            raise ValueError("Tasks hosted by a reactor must use "
+                             "task_method='thread', not '%s'" % task_method)
+        self.reactor = reactor
         if (target is not None) and ('target' in self._schema_properties):
             ygg_kwargs['target'] = target
             target = None
@@ -803,10 +1037,18 @@ class YggTask(YggClass):
                 kwargs['send_pipe'] = self.pipe[1]
         else:
             self.in_process = True
-        process_kwargs = dict(
-            name=name, group=group, daemon=daemon,
-            target=self.run)
-        self.process_instance = self.context.Task(**process_kwargs)
+        if self.reactor is not None:
+            self.process_instance = ReactorTask(
+                self.reactor, name=name, group=group, daemon=daemon,
+                target=self.run_task_async)
+        elif pool is not None:
+            self.process_instance = pool.Task(
+                self, name=name, group=group, daemon=daemon)
+        else:
+            process_kwargs = dict(
+                name=name, group=group, daemon=daemon,
+                target=self.run_task)
+            self.process_instance = self.context.Task(**process_kwargs)
         self._ygg_target = target
         self._ygg_args = args
         self._ygg_kwargs = kwargs
@@ -815,8 +1057,9 @@ class YggTask(YggClass):
         self.create_flag_attr('start_flag')
         self.create_flag_attr('terminate_flag')
         self._calling_thread = None
+        self.completion_queue = None
         super(YggTask, self).__init__(name, **ygg_kwargs)
-        if not self.as_process:
+        if (not self.as_process) and (self.reactor is None):
             global _thread_registry
             global _lock_registry
             _thread_registry[self.name] = self.process_instance._base
@@ -879,6 +1122,26 @@ class YggTask(YggClass):
         starting the thread/process."""
         self.debug('')
 
+    def run_task(self, *args, **kwargs):
+        r"""Run the task, signaling completion once it finishes."""
+        try:
+            self.run(*args, **kwargs)
+        finally:
+            self.signal_completion()
+
+    async def run_task_async(self):
+        r"""Coroutine equivalent of run_task."""
+        try:
+            await self.run_async()
+        finally:
+            self.signal_completion()
+
+    def signal_completion(self):
+        r"""Signal that the task has finished running by putting its name
+        in the completion queue (if one was set)."""
+        if (self.completion_queue is not None) and (not self.as_process):
+            self.completion_queue.put(self.name)
+
     def run(self, *args, **kwargs):
         r"""Continue running until terminate event set."""
         self.debug("Starting method")
@@ -890,6 +1153,18 @@ class YggTask(YggClass):
         finally:
             self.run_finally()
 
+    async def run_async(self):
+        r"""Coroutine equivalent of run that is used when the task is hosted
+        by a reactor."""
+        self.debug("Starting coroutine")
+        try:
+            self.run_init()
+            await self.call_target_async()
+        except BaseException:  # pragma: debug
+            self.run_error()
+        finally:
+            self.run_finally()
+
     def run_init(self):
         r"""Actions to perform at beginning of run."""
         # atexit.register(self.atexit)
@@ -903,6 +1178,10 @@ class YggTask(YggClass):
         if self._ygg_target:
             self._ygg_target(*self._ygg_args, **self._ygg_kwargs)
 
+    async def call_target_async(self):
+        r"""Coroutine equivalent of call_target."""
+        self.call_target()
+
     def run_error(self):
         r"""Actions to perform on error in try/except wrapping run."""
         self.exception("%s ERROR", self.context.task_method.upper())
@@ -984,7 +1263,7 @@ class YggTask(YggClass):
             # if self.is_alive():
             #     self.join(self.timeout)
             self.wait(timeout=self.timeout)
-            assert(not self.is_alive())
+            assert(self.in_reactor_thread or (not self.is_alive()))
         # if self.as_process:
         #     self.process_instance.terminate()
 
@@ -1027,9 +1306,19 @@ class YggTask(YggClass):
         r"""bool: True if the main thread/process has terminated."""
         return (not self.get_main_proc().is_alive())
 
+    @property
+    def in_reactor_thread(self):
+        r"""bool: True if the task is hosted by a reactor and the current
+        thread is one of the reactor's threads (see
+        YggReactor.hosts_current_thread)."""
+        return ((self.reactor is not None)
+                and self.reactor.hosts_current_thread)
+
     def wait(self, timeout=None, key=None):
         r"""Wait until thread/process finish to return using sleeps rather than
-        blocking.
+        blocking. If called from one of the threads of the reactor hosting
+        the task, this returns immediately as the task may need the thread
+        in order to progress.
 
         Args:
             timeout (float, optional): Maximum time that should be waited for
@@ -1038,6 +1327,9 @@ class YggTask(YggClass):
                 Defaults to None and is set based on the stack trace.
 
         """
+        if self.in_reactor_thread:
+            self.debug("Cannot wait for task from the reactor thread.")
+            return
         T = self.start_timeout(timeout, key_level=1, key=key)
         while self.is_alive() and not T.is_out:
             self.verbose_debug('Waiting for %s to finish...',
@@ -1057,10 +1349,14 @@ class YggTaskLoop(YggTask):
 
     _disconnect_attr = (YggTask._disconnect_attr
                         + ['break_flag', 'loop_flag'])
+    # If True, iterations may block and are run on the reactor's pool of
+    # threads when the loop is hosted by a reactor
+    _reactor_blocking = True
 
     def __init__(self, *args, **kwargs):
         super(YggTaskLoop, self).__init__(*args, **kwargs)
         self._1st_main_terminated = False
+        self._loop_idle = False
         self.create_flag_attr('break_flag')
         self.create_flag_attr('loop_flag')
 
@@ -1120,6 +1416,34 @@ class YggTaskLoop(YggTask):
         r"""Actions performed after the loop."""
         self.debug('')
 
+    def loop_sleep(self, t=None):
+        r"""Sleep between loop iterations that did not have any work to do.
+        If the loop is hosted by a reactor, the iteration is marked as idle
+        and the reactor runs other loops instead of blocking.
+
+        Args:
+            t (float, optional): Time that should be slept. Defaults to
+                the attribute 'sleeptime'.
+
+        """
+        if t is None:
+            t = self.sleeptime
+        if self.reactor is None:
+            self.sleep(t)
+        else:
+            self._loop_idle = t
+
+    def loop_iteration(self):
+        r"""Perform a single iteration of the loop."""
+        if ((self.main_terminated
+             and (not self._1st_main_terminated))):  # pragma: debug
+            self.on_main_terminated()
+        else:
+            try:
+                self.run_loop()
+            except BreakLoopException:
+                self.set_break_flag()
+
     def call_target(self):
         r"""Call target."""
         self.debug("Starting loop")
@@ -1127,15 +1451,38 @@ class YggTaskLoop(YggTask):
         if (not self.was_break):
             self.set_loop_flag()
         while (not self.was_break):
-            if ((self.main_terminated
-                 and (not self._1st_main_terminated))):  # pragma: debug
-                self.on_main_terminated()
-            else:
-                try:
-                    self.run_loop()
-                except BreakLoopException:
-                    self.set_break_flag()
+            self.loop_iteration()
+        self.set_break_flag()
+
+    async def call_target_async(self):
+        r"""Coroutine equivalent of call_target that yields to the reactor
+        between iterations."""
+        self.debug("Starting loop")
+        await self.call_in_reactor(self.before_loop)
+        if (not self.was_break):
+            self.set_loop_flag()
+        while (not self.was_break):
+            self._loop_idle = False
+            await self.call_in_reactor(self.loop_iteration)
+            await asyncio.sleep(self._loop_idle or 0)
         self.set_break_flag()
+
+    async def call_in_reactor(self, func):
+        r"""Call a method of a loop hosted by a reactor. If the loop's
+        iterations may block (see _reactor_blocking), the method is run on
+        the reactor's pool of threads so that the other coroutines hosted
+        by the reactor are not stalled.
+
+        Args:
+            func (callable): Method that should be called.
+
+        Returns:
+            object: Result of the method.
+
+        """
+        if self._reactor_blocking:
+            return await self.reactor.run_blocking(func)
+        return func()
         
     def run_loop(self, *args, **kwargs):
         r"""Actions performed on each loop iteration."""
@@ -1152,6 +1499,15 @@ class YggTaskLoop(YggTask):
     def run(self, *args, **kwargs):
         r"""Continue running until terminate event set."""
         super(YggTaskLoop, self).run(*args, **kwargs)
+        self.run_after_loop()
+
+    async def run_async(self):
+        r"""Coroutine equivalent of run."""
+        await super(YggTaskLoop, self).run_async()
+        await self.call_in_reactor(self.run_after_loop)
+
+    def run_after_loop(self):
+        r"""Call after_loop, recording any errors."""
         try:
             self.after_loop()
         except BaseException:  # pragma: debug
@@ -1162,3 +1518,343 @@ class YggTaskLoop(YggTask):
         r"""Also set break flag."""
         self.set_break_flag()
         super(YggTaskLoop, self).terminate(*args, **kwargs)
+
+
+class YggReactor(YggTask):
+    r"""Thread running an asyncio event loop that hosts task loops (e.g.
+    connection drivers and comm backlogs) as coroutines so that they do
+    not each require a dedicated thread. Tasks are hosted by passing the
+    reactor to their constructor via the 'reactor' keyword.
+
+    Args:
+        name (str, optional): Name of the reactor. Defaults to 'YggReactor'.
+        max_workers (int, optional): Maximum number of threads that should
+            be used to run calls that may block (e.g. iterations of
+            connection driver loops) so that they do not stall the event
+            loop. Defaults to None and the concurrent.futures default is
+            used.
+        **kwargs: Additional keyword arguments are passed to the parent
+            class.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): Event loop run by the reactor.
+        max_workers (int): Maximum number of threads used to run calls
+            that may block.
+        executor (concurrent.futures.ThreadPoolExecutor): Pool of threads
+            used to run calls that may block.
+
+    """
+
+    def __init__(self, name='YggReactor', max_workers=None, **kwargs):
+        kwargs['task_method'] = 'thread'
+        kwargs.setdefault('daemon', True)
+        self.loop = None
+        self.max_workers = max_workers
+        self.executor = None
+        self._loop_ready = threading.Event()
+        self._hosted = set()
+        self._pool_threads = set()
+        super(YggReactor, self).__init__(name=name, **kwargs)
+
+    @property
+    def hosts_current_thread(self):
+        r"""bool: True if the current thread is the one running the event
+        loop or one of the threads running blocking calls for the reactor."""
+        ident = threading.get_ident()
+        return ((ident == self.ident) or (ident in self._pool_threads))
+
+    async def run_blocking(self, func, *args, **kwargs):
+        r"""Run a call that may block on the reactor's pool of threads and
+        wait for the result without blocking the event loop.
+
+        Args:
+            func (callable): Function that should be called.
+            *args: Arguments are passed to func.
+            **kwargs: Keyword arguments are passed to func.
+
+        Returns:
+            object: Result of func.
+
+        """
+        return await asyncio.get_event_loop().run_in_executor(
+            self.executor, self._call_blocking, func, args, kwargs)
+
+    def _call_blocking(self, func, args, kwargs):
+        self._pool_threads.add(threading.get_ident())
+        return func(*args, **kwargs)
+
+    @property
+    def nhosted(self):
+        r"""int: Number of coroutines currently hosted by the reactor."""
+        return len(self._hosted)
+
+    def add_coroutine(self, coro):
+        r"""Schedule a coroutine on the reactor, starting the reactor if it
+        is not already running.
+
+        Args:
+            coro (coroutine): Coroutine that should be run.
+
+        Returns:
+            concurrent.futures.Future: Future for the coroutine result.
+
+        Raises:
+            RuntimeError: If the reactor was terminated or its event loop
+                could not be started.
+
+        """
+        with self.lock:
+            if self.was_terminated:
+                coro.close()
+                raise RuntimeError("Reactor %s was terminated." % self.name)
+            if not self.was_started:
+                self.start()
+        if not self._loop_ready.wait(self.timeout):  # pragma: debug
+            coro.close()
+            raise RuntimeError("Event loop for reactor %s did not start."
+                               % self.name)
+        return asyncio.run_coroutine_threadsafe(self._host(coro), self.loop)
+
+    async def _host(self, coro):
+        task = _current_async_task()
+        self._hosted.add(task)
+        try:
+            return await coro
+        finally:
+            self._hosted.discard(task)
+
+    def call_target(self):
+        r"""Run the event loop until the reactor is terminated."""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.executor = futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='%s.Blocking' % self.name)
+        try:
+            self.loop.call_soon(self._loop_ready.set)
+            self.loop.run_until_complete(self._wait_for_terminate())
+            remaining = list(self._hosted)
+            for x in remaining:  # pragma: debug
+                x.cancel()
+            if remaining:  # pragma: debug
+                self.loop.run_until_complete(
+                    asyncio.gather(*remaining, return_exceptions=True))
+        finally:
+            self.loop.close()
+            # Calls that are still blocking cannot be interrupted
+            self.executor.shutdown(wait=False)
+
+    async def _wait_for_terminate(self):
+        while not self.was_terminated:
+            await asyncio.sleep(self.sleeptime)
+
+
+def run_task_graph(tasks, func, dependencies=None, nworkers=None):
+    r"""Call a function on a set of tasks, running independent tasks
+    concurrently on a pool of threads and only starting each task once
+    the tasks it depends on have completed.
+
+    Args:
+        tasks (list): Hashable tasks that func should be called for. Tasks
+            that are ready to run at the same time are started in the
+            order they appear in this list.
+        func (callable): Function that should be called with each task as
+            its only argument.
+        dependencies (dict, optional): Mapping from task to a list of the
+            tasks that must be complete before it can be started.
+            Dependencies that are not in tasks are ignored. Defaults to
+            None and the tasks are assumed to be independent.
+        nworkers (int, optional): Maximum number of tasks that should be
+            run concurrently. Defaults to None and all of the tasks are
+            allowed to run concurrently. If 1, the tasks are run
+            sequentially in the calling thread.
+
+    Returns:
+        list: The result of calling func for each task in the same order
+            as tasks.
+
+    Raises:
+        ValueError: If there are circular dependencies between the tasks.
+        Exception: The exception raised by the first task to fail is
+            raised once any tasks that are already running complete. No
+            new tasks are started after a task fails.
+
+    """
+    if dependencies is None:
+        dependencies = {}
+    if nworkers is None:
+        nworkers = len(tasks)
+    remaining = OrderedDict()
+    for k in tasks:
+        remaining[k] = set(x for x in dependencies.get(k, [])
+                           if (x in tasks) and (x != k))
+    results = {}
+    running = {}
+    error = None
+    executor = None
+    if (nworkers > 1) and (len(remaining) > 1):
+        executor = futures.ThreadPoolExecutor(
+            max_workers=min(nworkers, len(remaining)))
+    try:
+        while remaining or running:
+            ready = []
+            if error is None:
+                ready = [k for k, v in remaining.items()
+                         if v.issubset(results)]
+            for k in ready:
+                del remaining[k]
+                if executor is None:
+                    results[k] = func(k)
+                else:
+                    running[executor.submit(func, k)] = k
+            if not running:
+                if error is not None:
+                    break
+                if not ready:
+                    raise ValueError("Circular dependencies between tasks: %s"
+                                     % list(remaining.keys()))
+                continue
+            done, _ = futures.wait(list(running.keys()),
+                                   return_when=futures.FIRST_COMPLETED)
+            for f in done:
+                k = running.pop(f)
+                try:
+                    results[k] = f.result()
+                except BaseException as e:
+                    if error is None:
+                        error = e
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+    if error is not None:
+        raise error
+    return [results[k] for k in tasks]
+
+
+class YggTaskPool(YggClass):
+    r"""Fixed pool of worker processes that process based tasks can be
+    distributed between instead of each starting its own process. Tasks
+    are added to the pool by passing the pool to their constructor via the
+    'pool' keyword and are assigned to workers when the pool is started,
+    balancing the total 'pool_weight' of the tasks assigned to each
+    worker. Each task is run on its own thread within a worker.
+
+    Args:
+        nworkers (int, optional): Maximum number of worker processes.
+            Defaults to the number of CPUs.
+        name (str, optional): Name of the pool. Defaults to 'YggTaskPool'.
+        **kwargs: Additional keyword arguments are passed to the parent
+            class.
+
+    Attributes:
+        nworkers (int): Maximum number of worker processes.
+        tasks (list): Stand-ins for the processes of tasks run by the pool.
+        workers (list): Worker processes. Populated when the pool is
+            started.
+        assignments (list): Tasks assigned to each worker.
+        stop_event (multiprocessing.Event): Event set when the pool is
+            terminated.
+
+    """
+
+    def __init__(self, nworkers=None, name='YggTaskPool', **kwargs):
+        if nworkers is None:
+            nworkers = os.cpu_count() or 1
+        self.nworkers = max(1, nworkers)
+        self.tasks = []
+        self.workers = []
+        self.assignments = []
+        self.stop_event = mp_ctx_spawn.Event()
+        self._start_time = None
+        super(YggTaskPool, self).__init__(name, **kwargs)
+
+    def __getstate__(self):
+        # Tasks may carry a reference to the pool (e.g. in their yaml), but
+        # the worker processes and other tasks are only valid (and only
+        # picklable) on the process that created the pool.
+        out = super(YggTaskPool, self).__getstate__()
+        out['tasks'] = []
+        out['workers'] = []
+        out['assignments'] = []
+        return out
+
+    @property
+    def was_started(self):
+        r"""bool: True if the worker processes were started."""
+        return (self._start_time is not None)
+
+    @property
+    def elapsed(self):
+        r"""float: Time since the pool was started."""
+        if not self.was_started:
+            return 0.0
+        return time.perf_counter() - self._start_time
+
+    def Task(self, owner, name=None, daemon=False, group=None):
+        r"""Create a stand-in process for a task that will be run by the
+        pool.
+
+        Args:
+            owner (YggTask): Task that will be run.
+            name (str, optional): Name of the task. Defaults to None.
+            daemon (bool, optional): Ignored. Defaults to False.
+            group (None, optional): Ignored.
+
+        Returns:
+            PoolTask: Stand-in process.
+
+        Raises:
+            RuntimeError: If the pool has already been started.
+
+        """
+        if self.was_started:
+            raise RuntimeError("Cannot add tasks to pool %s after it was "
+                               "started." % self.name)
+        out = PoolTask(self, owner, name=name, daemon=daemon, group=group)
+        self.tasks.append(out)
+        return out
+
+    def assign_tasks(self):
+        r"""Assign tasks to workers, placing the heaviest tasks first on the
+        worker with the smallest total weight.
+
+        Returns:
+            list: Tasks assigned to each worker.
+
+        """
+        nworkers = min(self.nworkers, len(self.tasks))
+        out = [[] for _ in range(nworkers)]
+        loads = [0 for _ in range(nworkers)]
+        weights = [getattr(x.owner, 'pool_weight', 1) for x in self.tasks]
+        for i in sorted(range(len(self.tasks)), key=lambda i: -weights[i]):
+            iworker = loads.index(min(loads))
+            self.tasks[i].worker_index = iworker
+            out[iworker].append(self.tasks[i])
+            loads[iworker] += weights[i]
+        return out
+
+    def start(self):
+        r"""Assign tasks to workers and start the worker processes. Tasks are
+        run once their start method is called."""
+        if self.was_started:  # pragma: debug
+            raise RuntimeError("Pool %s was already started." % self.name)
+        self.assignments = self.assign_tasks()
+        self._start_time = time.perf_counter()
+        for i, tasks in enumerate(self.assignments):
+            self.workers.append(YggTask(
+                name='%s.Worker%d' % (self.name, i), task_method='process',
+                target=_run_pool_worker,
+                args=([x.owner for x in tasks], self.stop_event)))
+            self.workers[-1].start()
+        self.debug("Started %d workers for %d tasks",
+                   len(self.workers), len(self.tasks))
+
+    def terminate(self):
+        r"""Prevent tasks that have not been started from being run and wait
+        for the worker processes to exit."""
+        self.stop_event.set()
+        for x in self.workers:
+            x.join(self.timeout)
+            if x.is_alive():  # pragma: debug
+                self.error("Worker %s did not exit", x.name)
+                x.process_instance.terminate()
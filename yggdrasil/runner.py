@@ -2,15 +2,20 @@
 import sys
 import os
 import time
+import queue
 import signal
+import threading
 import traceback
+import contextlib
 from pprint import pformat
 from itertools import chain
 import socket
 from yggdrasil.tools import YggClass
 from yggdrasil.config import ygg_cfg, cfg_environment, temp_config
-from yggdrasil import platform, yamlfile
+from yggdrasil import (
+    platform, yamlfile, multitasking, metrics, tracing, hooks)
 from yggdrasil.drivers import create_driver
+from yggdrasil.components import import_component
 
 
 COLOR_TRACE = '\033[30;43;22m'
@@ -37,6 +42,42 @@ class YggRunner(YggClass):
             Defaults to environment variable 'RMQ_DEBUG'.
         ygg_debug_prefix (str, optional): Prefix for Ygg debug messages.
             Defaults to namespace.
+        connection_task_method (str, optional): Method that should be used
+            to run connection drivers. 'thread' and 'process' run each
+            connection on its own thread/process. 'reactor' runs all of the
+            connections (and the backlogs of their comms) as coroutines on
+            a shared asyncio event loop. 'pool' distributes the connections
+            between a fixed pool of worker processes. Defaults to 'thread'.
+        connection_reactors (int, optional): Number of reactors (each with
+            its own event loop and thread) that connections should be
+            distributed between when connection_task_method is 'reactor'.
+            Defaults to 1.
+        connection_workers (int, optional): Maximum number of worker
+            processes that connections should be distributed between when
+            connection_task_method is 'pool'. Defaults to None and the
+            number of CPUs is used.
+        production_run (bool, optional): If True, the run is performed in
+            production mode. Defaults to False.
+        drivers (dict, optional): Driver information for the run that has
+            already been parsed (e.g. by yamlfile.parse_yaml). If provided,
+            modelYmls is not parsed. Defaults to None.
+        compile_models (bool, optional): If False, models that need to be
+            compiled are not compiled and their existing products are used
+            (e.g. when they were compiled ahead of time for an ensemble).
+            Defaults to True.
+        metrics_file (str, optional): Full path to a JSON file that the
+            metrics for each connection should be written to at shutdown.
+            Defaults to the 'metrics_file' option in the 'general' section
+            of the config file. If not set, metrics are not written.
+        trace_file (str, optional): Full path to a Chrome trace event file
+            that message traces should be written to. Defaults to the
+            'trace_file' option in the 'general' section of the config file.
+            If not set, messages are not traced.
+        append_trace (bool, optional): If True, trace events are appended
+            to a trace file that is started and finalized by the caller
+            (e.g. an ensemble whose members share a trace file). Otherwise
+            the trace file is overwritten at the start of the run and
+            finalized at the end. Defaults to False.
 
     Attributes:
         namespace (str): Name that should be used to uniquely identify any RMQ
@@ -50,14 +91,41 @@ class YggRunner(YggClass):
             drivers.
         interrupt_time (float): Time of last interrupt signal.
         error_flag (bool): True if one or more models raises an error.
+        reactors (list): Reactors hosting connection drivers when
+            connection_task_method is 'reactor'.
+        pool (YggTaskPool): Pool of worker processes running connection
+            drivers when connection_task_method is 'pool'.
+        driver_times (dict): Time (in seconds) spent loading, compiling
+            and starting each driver.
+        completion_queue (Queue): Queue that model drivers put their name
+            in when they finish running.
+        event_log (list): Record of model exits and errors during the run.
+            Each entry is a dictionary containing the 'time' (from
+            time.time) of the event, the 'event' type ('exit', 'error', or
+            'exits_complete'), and the name of the 'driver'.
+        metrics_file (str): Full path to the JSON file that metrics will be
+            written to at shutdown.
+        trace_file (str): Full path to the Chrome trace event file that
+            message traces are written to if tracing is enabled.
+        append_trace (bool): True if trace events are appended to a trace
+            file managed by the caller.
+        stage_profile_file (str): Full path to the JSON file that the wall
+            time sampled in each stage of the comm send/recv pipelines will be
+            written to at shutdown if enabled by the 'stage_profile_file'
+            option in the 'general' section of the config file.
 
     ..todo:: namespace, host, and rank do not seem strictly necessary.
 
     """
+    _cwd_cond = threading.Condition()
+    _cwd_state = {'count': 0, 'dir': None, 'orig': None}
+
     def __init__(self, modelYmls, namespace=None, host=None, rank=0,
                  ygg_debug_level=None, rmq_debug_level=None,
                  ygg_debug_prefix=None, connection_task_method='thread',
-                 production_run=False):
+                 connection_reactors=1, connection_workers=None,
+                 production_run=False, drivers=None, compile_models=True,
+                 metrics_file=None, trace_file=None, append_trace=False):
         super(YggRunner, self).__init__('runner')
         if namespace is None:
             namespace = ygg_cfg.get('rmq', 'namespace', False)
@@ -67,6 +135,26 @@ class YggRunner(YggClass):
         self.host = host
         self.rank = rank
         self.connection_task_method = connection_task_method
+        self.reactors = []
+        if connection_task_method == 'reactor':
+            self.reactors = [
+                multitasking.YggReactor(name='YggReactor.%d' % i)
+                for i in range(max(1, connection_reactors))]
+        self.pool = None
+        if connection_task_method == 'pool':
+            self.pool = multitasking.YggTaskPool(
+                nworkers=connection_workers, name='ConnectionPool')
+        self._nconnections = 0
+        self._load_lock = threading.RLock()
+        self.compile_models = compile_models
+        if metrics_file is None:
+            metrics_file = ygg_cfg.get('general', 'metrics_file', None)
+        self.metrics_file = metrics_file
+        self.stage_profile_file = ygg_cfg.get('general', 'stage_profile_file',
+                                              None)
+        self.driver_times = {}
+        self.completion_queue = multitasking.Queue()
+        self.event_log = []
         self.modeldrivers = {}
         self.inputdrivers = {}
         self.outputdrivers = {}
@@ -81,8 +169,15 @@ class YggRunner(YggClass):
                    os.getcwd(), sys.path, namespace, rank)
         # Update environment based on config
         cfg_environment()
+        if trace_file is None:
+            trace_file = tracing.get_trace_file()
+        elif trace_file:
+            trace_file = os.path.abspath(trace_file)
+        self.trace_file = trace_file
+        self.append_trace = append_trace
         # Parse yamls
-        drivers = yamlfile.parse_yaml(modelYmls)
+        if drivers is None:
+            drivers = yamlfile.parse_yaml(modelYmls)
         self.inputdrivers = drivers['input']
         self.outputdrivers = drivers['output']
         self.modeldrivers = drivers['model']
@@ -135,6 +230,10 @@ class YggRunner(YggClass):
                 self.signal_handler.
 
         """
+        if threading.current_thread() is not threading.main_thread():
+            # Signal handlers can only be set from the main thread (e.g.
+            # runners for the members of an ensemble do not set them)
+            return
         if signal_handler is None:
             signal_handler = self.signal_handler
         self._swap_handler(signal.SIGINT, signal_handler)
@@ -162,7 +261,9 @@ class YggRunner(YggClass):
                 using the provided timer if not provided.
 
         Returns:
-            dict: Intermediate times from the run.
+            dict: Intermediate times from the run. The time (in seconds)
+                spent loading, compiling and starting each driver is
+                included under the 'drivers' key.
 
         """
         with temp_config(production_run=self.production_run):
@@ -172,16 +273,44 @@ class YggRunner(YggClass):
                 t0 = timer()
             times = {}
             times['init'] = timer()
-            self.loadDrivers()
-            times['load drivers'] = timer()
-            self.startDrivers()
-            times['start drivers'] = timer()
-            self.set_signal_handler(signal_handler)
-            self.waitModels()
-            times['run models'] = timer()
-            self.reset_signal_handler()
-            self.closeChannels()
-            times['close channels'] = timer()
+            old_trace_env = os.environ.get('YGG_TRACE_FILE', None)
+            if self.trace_file:
+                # Models may run in other directories
+                os.environ['YGG_TRACE_FILE'] = self.trace_file
+                if not self.append_trace:
+                    tracing.start(self.trace_file)
+            sampler = None
+            try:
+                if self.stage_profile_file:
+                    sampler = hooks.StageSampler()
+                    sampler.start()
+                self.loadDrivers()
+                times['load drivers'] = timer()
+                self.startDrivers()
+                times['start drivers'] = timer()
+                self.set_signal_handler(signal_handler)
+                self.waitModels()
+                times['run models'] = timer()
+                self.reset_signal_handler()
+                self.closeChannels()
+                times['close channels'] = timer()
+            finally:
+                # Write the profiling output even if the run failed so
+                # that the hooks are unregistered and the files are valid
+                if self.metrics_file:
+                    self.dump_metrics(self.metrics_file)
+                if self.trace_file:
+                    if not self.append_trace:
+                        tracing.finalize(self.trace_file)
+                    if old_trace_env is None:
+                        os.environ.pop('YGG_TRACE_FILE', None)
+                    else:
+                        os.environ['YGG_TRACE_FILE'] = old_trace_env
+                if sampler is not None:
+                    sampler.stop()
+                    self.debug("Writing stage profile to %s",
+                               self.stage_profile_file)
+                    sampler.dump(self.stage_profile_file)
             self.cleanup()
             times['clean up'] = timer()
             tprev = t0
@@ -192,6 +321,8 @@ class YggRunner(YggClass):
                 tprev = times[k]
             self.info(40 * '=')
             self.info('%20s\t%f', "Total", tprev - t0)
+            times['drivers'] = {k: dict(v) for k, v in
+                                self.driver_times.items()}
         return times
 
     @property
@@ -219,28 +350,76 @@ class YggRunner(YggClass):
                         driver.get('output_drivers', dict()))
         return out
 
-    def createDriver(self, yml):
+    @classmethod
+    @contextlib.contextmanager
+    def working_directory(cls, directory=None):
+        r"""Context manager for changing the working directory while a
+        driver is created. Drivers that use the same working directory can
+        be created concurrently, but the directory will not be changed
+        while drivers are being created in another directory by any
+        runner in the process.
+
+        Args:
+            directory (str, optional): Working directory. Defaults to None
+                and the working directory is not changed.
+
+        """
+        state = cls._cwd_state
+        with cls._cwd_cond:
+            while state['count'] and (state['dir'] != directory):
+                cls._cwd_cond.wait()
+            if not state['count']:
+                state['dir'] = directory
+                if directory is not None:
+                    state['orig'] = os.getcwd()
+                    os.chdir(directory)
+            state['count'] += 1
+        try:
+            yield
+        finally:
+            with cls._cwd_cond:
+                state['count'] -= 1
+                if not state['count']:
+                    if state['dir'] is not None:
+                        os.chdir(state['orig'])
+                    state['dir'] = None
+                    cls._cwd_cond.notify_all()
+
+    def record_driver_time(self, name, step, t0):
+        r"""Record the time spent on a setup step for a driver.
+
+        Args:
+            name (str): Name of the driver.
+            step (str): Name of the setup step (e.g. 'load', 'compile',
+                'start').
+            t0 (float): Time (from time.perf_counter) when the step began.
+
+        """
+        elapsed = time.perf_counter() - t0
+        with self._load_lock:
+            self.driver_times.setdefault(name, {})[step] = elapsed
+
+    def createDriver(self, yml, **kwargs):
         r"""Create a driver instance from the yaml information.
 
         Args:
             yml (yaml): Yaml object containing driver information.
+            **kwargs: Additional keyword arguments are passed to the driver,
+                taking precedence over those in yml without modifying it.
 
         Returns:
             object: An instance of the specified driver.
 
         """
         self.debug('Creating %s, a %s', yml['name'], yml['driver'])
-        curpath = os.getcwd()
+        t0 = time.perf_counter()
         if 'ClientDriver' in yml['driver']:
             yml.setdefault('comm_address', self.serverdrivers[yml['args']])
-        if 'working_dir' in yml:
-            os.chdir(yml['working_dir'])
-        try:
+        with self.working_directory(yml.get('working_dir', None)):
             instance = create_driver(yml=yml, namespace=self.namespace,
-                                     rank=self.rank, **yml)
+                                     rank=self.rank, **dict(yml, **kwargs))
             yml['instance'] = instance
-        finally:
-            os.chdir(curpath)
+        self.record_driver_time(yml['name'], 'load', t0)
         if 'ServerDriver' in yml['driver']:
             self.serverdrivers[yml['args']] = instance.comm_address
         return instance
@@ -255,11 +434,22 @@ class YggRunner(YggClass):
             object: An instance of the specified driver.
 
         """
-        yml['env'] = {}
+        yml['env'] = dict(yml.get('env', {}))
         for iod in self.io_drivers(yml['name']):
             yml['env'].update(iod['instance'].env)
             iod['models'].append(yml['name'])
-        drv = self.createDriver(yml)
+        drv_cls = import_component('model', yml['driver'], without_schema=True)
+        kwargs = {}
+        deferred = ((drv_cls.executable_type == 'compiler')
+                    and (not yml.get('skip_compile', False)))
+        if deferred:
+            # Compilation is deferred to compileModels so that all of the
+            # models can be compiled concurrently
+            kwargs['skip_compile'] = True
+        drv = self.createDriver(yml, **kwargs)
+        yml['_deferred_compile'] = deferred
+        if not drv.as_process:
+            drv.completion_queue = self.completion_queue
         if 'client_of' in yml:
             for srv in yml['client_of']:
                 self.modeldrivers[srv]['clients'].append(yml['name'])
@@ -267,6 +457,29 @@ class YggRunner(YggClass):
                    yml['name'], pformat(yml['instance'].env))
         return drv
 
+    def set_connection_task_method(self, yml):
+        r"""Set the task method for a connection driver, assigning the
+        connection to a reactor in a round-robin fashion if connections
+        are run by reactors or adding it to the pool if connections are
+        run by a pool of worker processes.
+
+        Args:
+            yml (dict): Yaml object containing driver information that will
+                be updated.
+
+        """
+        with self._load_lock:
+            if self.reactors:
+                yml['task_method'] = 'thread'
+                yml['reactor'] = self.reactors[
+                    self._nconnections % len(self.reactors)]
+            elif self.pool is not None:
+                yml['task_method'] = 'process'
+                yml['pool'] = self.pool
+            else:
+                yml['task_method'] = self.connection_task_method
+            self._nconnections += 1
+
     def createInputDriver(self, yml):
         r"""Create an input driver instance from the yaml information.
 
@@ -285,7 +498,7 @@ class YggRunner(YggClass):
                         ("Input driver %s could not locate a "
                          + "corresponding file or output channel %s") % (
                              x["name"], yml["args"]))
-        yml['task_method'] = self.connection_task_method
+        self.set_connection_task_method(yml)
         drv = self.createDriver(yml)
         return drv
 
@@ -310,101 +523,236 @@ class YggRunner(YggClass):
                         ("Output driver %s could not locate a "
                          + "corresponding file or input channel %s") % (
                              x["name"], yml["args"]))
-        yml['task_method'] = self.connection_task_method
+        self.set_connection_task_method(yml)
         drv = self.createDriver(yml)
         return drv
         
+    def get_driver_graph(self):
+        r"""Determine the dependencies between drivers that constrain the
+        order in which they can be created and started. Connections are
+        handled before the models that use them, connections sending
+        messages to another connection are handled after it, and server
+        models are handled before their clients.
+
+        Returns:
+            tuple: List of all of the drivers as (type, name) tuples where
+                type is 'input', 'output', or 'model' and a dictionary
+                mapping from each driver to a list of the drivers that must
+                be created/started before it.
+
+        """
+        drivers = []
+        dependencies = {}
+        servers = {}
+        connections = [('input', self.inputdrivers),
+                       ('output', self.outputdrivers)]
+        for t, x in connections:
+            for v in x.values():
+                drivers.append((t, v['name']))
+                if 'ServerDriver' in v['driver']:
+                    servers[v['args']] = (t, v['name'])
+        for t, x in connections:
+            for v in x.values():
+                deps = []
+                if ('ClientDriver' in v['driver']) and (v['args'] in servers):
+                    deps.append(servers[v['args']])
+                if (t == 'output') and (v['args'] in self._inputchannels):
+                    deps.append(('input',
+                                 self._inputchannels[v['args']]['name']))
+                dependencies[(t, v['name'])] = deps
+        for v in self.modeldrivers.values():
+            deps = [('input', x['name']) for x in v.get('input_drivers', [])]
+            deps += [('output', x['name']) for x in v.get('output_drivers', [])]
+            deps += [('model', x) for x in v.get('client_of', [])]
+            drivers.append(('model', v['name']))
+            dependencies[('model', v['name'])] = deps
+        return drivers, dependencies
+
     def loadDrivers(self):
         r"""Load all of the necessary drivers, doing the IO drivers first
-        and adding IO driver environmental variables back tot he models."""
+        and adding IO driver environmental variables back tot he models.
+        Drivers that do not depend on one another (see get_driver_graph)
+        are created concurrently."""
         self.debug('')
-        driver = dict(name='name')
+        drivers, dependencies = self.get_driver_graph()
+        methods = {'input': (self.inputdrivers, self.createInputDriver),
+                   'output': (self.outputdrivers, self.createOutputDriver),
+                   'model': (self.modeldrivers, self.createModelDriver)}
+
+        def load_driver(key):
+            ymls, method = methods[key[0]]
+            self.debug("Loading %s driver %s", key[0], key[1])
+            try:
+                method(ymls[key[1]])
+            except BaseException:  # pragma: debug
+                self.error("%s could not be created.", key[1])
+                raise
+
         try:
-            # Create input drivers
-            self.debug("Loading input drivers")
-            for driver in self.inputdrivers.values():
-                self.createInputDriver(driver)
-            # Create output drivers
-            self.debug("Loading output drivers")
-            for driver in self.outputdrivers.values():
-                self.createOutputDriver(driver)
-            # Create model drivers
-            self.debug("Loading model drivers")
-            for driver in self.modeldrivers.values():
-                self.createModelDriver(driver)
+            multitasking.run_task_graph(drivers, load_driver,
+                                        dependencies=dependencies)
         except BaseException:  # pragma: debug
-            self.error("%s could not be created.", driver['name'])
             self.terminate()
             raise
+        try:
+            self.compileModels()
+        except BaseException:
+            self.error("One or more models could not be compiled.")
+            self.terminate()
+            raise
+
+    def compileModels(self):
+        r"""Compile all of the models whose compilation was deferred when
+        the driver was created. The models (and the interface libraries
+        they depend on) are compiled concurrently, with the number of
+        concurrent compilation processes limited by the 'build_workers'
+        option in the 'compilation' config section. If compile_models is
+        False, the existing products are used instead."""
+        from yggdrasil.drivers.CompiledModelDriver import run_build_tasks
+        drivers = [x['name'] for x in self.modeldrivers.values()
+                   if x.pop('_deferred_compile', False)]
+        if (not drivers) or (not self.compile_models):
+            return
+        self.debug("Compiling models: %s", drivers)
+        # Models that produce the same executable (e.g. copies) are
+        # compiled one after another
+        dependencies = {}
+        previous = {}
+        for name in drivers:
+            model_file = self.modeldrivers[name]['instance'].model_file
+            if model_file in previous:
+                dependencies[name] = [previous[model_file]]
+            previous[model_file] = name
+
+        def compile_driver(name):
+            t0 = time.perf_counter()
+            self.modeldrivers[name]['instance'].build_model()
+            self.record_driver_time(name, 'compile', t0)
+
+        run_build_tasks(drivers, compile_driver, dependencies=dependencies)
 
     def startDrivers(self):
-        r"""Start drivers, starting with the IO drivers."""
+        r"""Start drivers, starting with the IO drivers. Drivers that do not
+        depend on one another (see get_driver_graph) are started
+        concurrently so that each model is started as soon as its
+        connections are running."""
         self.info('Starting I/O drivers and models on system '
                   + '{} in namespace {} with rank {}'.format(
                       self.host, self.namespace, self.rank))
-        driver = dict(name='name')
-        try:
-            # Start connections
-            for driver in self.io_drivers():
+        drivers, dependencies = self.get_driver_graph()
+        ymls = {'input': self.inputdrivers,
+                'output': self.outputdrivers,
+                'model': self.modeldrivers}
+
+        def start_driver(key):
+            driver = ymls[key[0]][key[1]]
+            t0 = time.perf_counter()
+            try:
                 self.debug("Starting driver %s", driver['name'])
                 d = driver['instance']
                 if not d.was_started:
                     d.start()
-            # Ensure connections in loop
-            for driver in self.io_drivers():
-                self.debug("Checking driver %s", driver['name'])
-                d = driver['instance']
-                d.wait_for_loop()
-                assert(d.was_loop)
-                assert(not d.errors)
-            # Start models
-            for driver in self.modeldrivers.values():
-                self.debug("Starting driver %s", driver['name'])
-                d = driver['instance']
-                for n2 in driver.get('client_of', []):
-                    d2 = self.modeldrivers[n2]['instance']
-                    if not d2.was_started:
-                        self.debug("Starting server '%s' before client", d2.name)
-                        d2.start()
-                if not d.was_started:
-                    d.start()
+                if key[0] != 'model':
+                    # Ensure connections in loop
+                    self.debug("Checking driver %s", driver['name'])
+                    d.wait_for_loop()
+                    assert(d.was_loop)
+                    assert(not d.errors)
+            except BaseException:  # pragma: debug
+                self.error("%s did not start", driver['name'])
+                raise
+            self.record_driver_time(driver['name'], 'start', t0)
+
+        try:
+            # Start pool workers
+            if self.pool is not None:
+                self.pool.start()
+            multitasking.run_task_graph(drivers, start_driver,
+                                        dependencies=dependencies)
         except BaseException:  # pragma: debug
-            self.error("%s did not start", driver['name'])
             self.terminate()
             raise
         self.debug('ALL DRIVERS STARTED')
 
-    def waitModels(self):
-        r"""Wait for all model drivers to finish. When a model finishes,
-        join the thread and perform exits for associated IO drivers."""
+    def record_event(self, event, name, **kwargs):
+        r"""Add an event to the event log.
+
+        Args:
+            event (str): Type of event.
+            name (str): Name of the driver the event occured for.
+            **kwargs: Additional keyword arguments are added to the entry.
+
+        """
+        entry = dict(kwargs, time=time.time(), event=event, driver=name)
+        with self._load_lock:
+            self.event_log.append(entry)
+
+    def check_model_exit(self, name, timeout=0):
+        r"""Check if a model has exited and, if it has, perform exits for
+        the associated IO drivers.
+
+        Args:
+            name (str): Name of the model.
+            timeout (float, optional): Time that should be waited for the
+                model driver to finish. Defaults to 0.
+
+        Returns:
+            bool: True if the model exited without error, False otherwise.
+
+        """
+        drv = self.modeldrivers[name]
+        d = drv['instance']
+        if not d.errors:
+            d.join(timeout)
+        if d.errors:  # pragma: debug
+            self.error('Error in model %s', name)
+            self.record_event('error', name)
+            self.error_flag = True
+            return False
+        if d.is_alive():
+            self.debug('%s still running', name)
+            return False
+        self.info("%s finished running.", name)
+        self.record_event('exit', name)
+        self.do_model_exits(drv)
+        self.debug("%s completed model exits.", name)
+        self.do_client_exits(drv)
+        self.debug("%s completed client exits.", name)
+        self.record_event('exits_complete', name)
+        self.info("%s finished exiting.", name)
+        return True
+
+    def waitModels(self, poll_interval=1.0):
+        r"""Wait for all model drivers to finish. Model drivers signal that
+        they have finished via the completion queue so that the exits for
+        the associated IO drivers are performed as soon as each model
+        exits. The status of all running models is also checked whenever
+        a signal has not been received within poll_interval.
+
+        Args:
+            poll_interval (float, optional): Maximum time (in seconds) that
+                should be waited for a model to signal that it finished
+                before checking the status of all of the running models.
+                Defaults to 1.0.
+
+        """
         self.debug('')
-        running = [d for d in self.modeldrivers.values()]
-        dead = []
-        while (len(running) > 0) and (not self.error_flag):
-            for drv in running:
-                d = drv['instance']
-                if d.errors:  # pragma: debug
-                    self.error('Error in model %s', drv['name'])
-                    self.error_flag = True
+        running = [d['name'] for d in self.modeldrivers.values()]
+        while running and (not self.error_flag):
+            try:
+                name = self.completion_queue.get(timeout=poll_interval)
+                check = [name]
+                timeout = poll_interval
+            except queue.Empty:
+                check = list(running)
+                timeout = 0
+            for name in check:
+                if name not in running:
+                    continue
+                if self.check_model_exit(name, timeout=timeout):
+                    running.remove(name)
+                if self.error_flag:
                     break
-                d.join(1)
-                if not d.is_alive():
-                    if not d.errors:
-                        self.info("%s finished running.", drv['name'])
-                        self.do_model_exits(drv)
-                        self.debug("%s completed model exits.", drv['name'])
-                        self.do_client_exits(drv)
-                        self.debug("%s completed client exits.", drv['name'])
-                        running.remove(drv)
-                        self.info("%s finished exiting.", drv['name'])
-                else:
-                    self.debug('%s still running', drv['name'])
-            dead = []
-            for drv in self.all_drivers:
-                d = drv['instance']
-                d.join(0.1)
-                if not d.is_alive():
-                    dead.append(drv['name'])
         for d in self.modeldrivers.values():
             if d['instance'].errors:
                 self.error_flag = True
@@ -458,14 +806,23 @@ class YggRunner(YggClass):
                 driver['instance'].terminate()
                 # Terminate should ensure instance not alive
                 assert(not driver['instance'].is_alive())
+        self.stopReactors()
         self.debug('Returning')
 
+    def stopReactors(self):
+        r"""Stop any reactors or pool workers hosting connection drivers."""
+        for x in self.reactors:
+            x.terminate()
+        if self.pool is not None:
+            self.pool.terminate()
+
     def cleanup(self):
         r"""Perform cleanup operations for all drivers."""
         self.debug('')
         for driver in self.all_drivers:
             if 'instance' in driver:
                 driver['instance'].cleanup()
+        self.stopReactors()
 
     def printStatus(self):
         r"""Print the status of all drivers, starting with the IO drivers."""
@@ -473,6 +830,54 @@ class YggRunner(YggClass):
         for driver in self.all_drivers:
             if 'instance' in driver:
                 driver['instance'].printStatus()
+        if self.pool is not None:
+            self.printPoolStatus()
+
+    def get_metrics(self):
+        r"""Get runtime metrics for each connection in the run, including
+        counters and latency histograms for the connection and the comms
+        it uses.
+
+        Returns:
+            dict: Metrics for each connection keyed by connection name.
+
+        """
+        out = {}
+        for drv in self.io_drivers():
+            instance = drv.get('instance', None)
+            if hasattr(instance, 'get_metrics'):
+                out[drv['name']] = instance.get_metrics()
+        return out
+
+    def dump_metrics(self, filename):
+        r"""Write runtime metrics for each connection to a JSON file.
+
+        Args:
+            filename (str): Full path to the file that should be written.
+
+        """
+        self.debug("Writing metrics to %s", filename)
+        metrics.dump({'connections': self.get_metrics(),
+                      'driver_times': {k: dict(v) for k, v in
+                                       self.driver_times.items()}},
+                     filename)
+
+    def printPoolStatus(self):
+        r"""Print the load on each of the workers in the connection pool."""
+        elapsed = max(self.pool.elapsed, 1.0e-9)
+        for i, tasks in enumerate(self.pool.assignments):
+            worker = self.pool.workers[i]
+            drivers = [x.owner for x in tasks]
+            nrecv = sum(x.nrecv for x in drivers)
+            nsent = sum(x.nsent for x in drivers)
+            msg = '%-50s' % ('%s: ' % worker.name)
+            msg += '%-15s' % ('pid %s, ' % worker.pid)
+            msg += '%-15s' % ('alive %s, ' % worker.is_alive())
+            msg += '%-20s' % ('%d connections, ' % len(drivers))
+            msg += '%-15s' % ('%d received, ' % nrecv)
+            msg += '%-15s' % ('%d sent, ' % nsent)
+            msg += '%.1f msg/s' % (nsent / elapsed)
+            print(msg)
 
     def closeChannels(self, force_stop=False):
         r"""Stop IO drivers and join the threads.
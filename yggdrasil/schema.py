@@ -3,6 +3,10 @@ import copy
 import pprint
 import yaml
 import json
+import pickle
+import hashlib
+import logging
+import tempfile
 from collections import OrderedDict
 from jsonschema.exceptions import ValidationError
 from yggdrasil import metaschema
@@ -11,6 +15,8 @@ from yggdrasil import metaschema
 _schema_fname = os.path.abspath(os.path.join(
     os.path.dirname(__file__), '.ygg_schema.yml'))
 _schema = None
+_cache_dirname = '.ygg_cache'
+logger = logging.getLogger(__name__)
 
 
 class SchemaDict(OrderedDict):
@@ -83,13 +89,137 @@ def create_schema():
     return x
 
 
-def load_schema(fname=None):
+def get_cache_dir():
+    r"""Get the directory where compiled schemas and normalized YAML
+    specifications are cached. The directory is set by the YGG_SCHEMA_CACHE
+    environment variable or the jsonschema.cache_dir config option and
+    defaults to '.ygg_cache' in the user's home directory.
+
+    Returns:
+        str: Full path to the cache directory. None is returned if caching
+            is disabled by setting the directory to 'False'.
+
+    """
+    from yggdrasil.config import ygg_cfg, usr_dir
+    out = os.environ.get('YGG_SCHEMA_CACHE',
+                         ygg_cfg.get('jsonschema', 'cache_dir', None))
+    if out is None:
+        out = os.path.join(usr_dir, _cache_dirname)
+    if out.lower() in ['false', 'none', '0', '']:
+        return None
+    return out
+
+
+def get_cache_key(*args):
+    r"""Get a key for cache entries that incorporates the yggdrasil version
+    along with the provided arguments.
+
+    Args:
+        *args: Strings or JSON serializable objects that the key should be
+            based on.
+
+    Returns:
+        str: Hex digest uniquely identifying the arguments.
+
+    """
+    from yggdrasil import __version__
+    h = hashlib.sha256(str(__version__).encode('utf-8'))
+    for x in args:
+        if not isinstance(x, str):
+            x = json.dumps(x, sort_keys=True, default=repr)
+        h.update(x.encode('utf-8'))
+    return h.hexdigest()
+
+
+def get_cache_file(prefix, key):
+    r"""Get the path to the file where an entry is cached.
+
+    Args:
+        prefix (str): Prefix identifying the type of entry.
+        key (str): Key returned by get_cache_key.
+
+    Returns:
+        str: Full path to the cache file. None is returned if caching is
+            disabled.
+
+    """
+    cache_dir = get_cache_dir()
+    if cache_dir is None:
+        return None
+    return os.path.join(cache_dir, '%s_%s.pkl' % (prefix, key))
+
+
+def load_cache(prefix, key):
+    r"""Load an entry from the cache.
+
+    Args:
+        prefix (str): Prefix identifying the type of entry.
+        key (str): Key returned by get_cache_key.
+
+    Returns:
+        object: Cached entry. None is returned if there is not an entry or
+            it cannot be loaded.
+
+    """
+    fname = get_cache_file(prefix, key)
+    if (fname is None) or (not os.path.isfile(fname)):
+        return None
+    try:
+        with open(fname, 'rb') as fd:
+            return pickle.load(fd)
+    except BaseException as e:  # pragma: debug
+        logger.debug("Failed to load cache entry from %s: %s" % (fname, e))
+        return None
+
+
+def save_cache(prefix, key, obj):
+    r"""Save an entry to the cache. Failure to write the entry is not an
+    error.
+
+    Args:
+        prefix (str): Prefix identifying the type of entry.
+        key (str): Key returned by get_cache_key.
+        obj (object): Picklable object that should be cached.
+
+    """
+    fname = get_cache_file(prefix, key)
+    if fname is None:
+        return
+    try:
+        cache_dir = os.path.dirname(fname)
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        # Write to a temporary file first so concurrent runs never see a
+        # partially written entry
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(obj, f)
+        os.replace(tmp, fname)
+    except BaseException as e:  # pragma: debug
+        logger.debug("Failed to save cache entry to %s: %s" % (fname, e))
+
+
+def clear_cache():
+    r"""Remove all entries from the cache."""
+    cache_dir = get_cache_dir()
+    if (cache_dir is None) or (not os.path.isdir(cache_dir)):
+        return
+    for x in os.listdir(cache_dir):
+        if x.endswith('.pkl'):
+            os.remove(os.path.join(cache_dir, x))
+
+
+def load_schema(fname=None, use_cache=True):
     r"""Return the yggdrasil schema for YAML options.
 
     Args:
         fname (str, optional): Full path to the file that the schema should be
             loaded from. If the file dosn't exist, it is created. Defaults to
             _schema_fname.
+        use_cache (bool, optional): If True, the parsed schema (including
+            compiled validation schemas) is loaded from the cache if it
+            exists for this version of yggdrasil and the contents of fname
+            and is added to the cache otherwise. Defaults to True.
 
     Returns:
         dict: yggdrasil YAML options.
@@ -100,7 +230,19 @@ def load_schema(fname=None):
     if not os.path.isfile(fname):
         x = create_schema()
         x.save(fname)
-    return SchemaRegistry.from_file(fname)
+    with open(fname, 'rb') as fd:
+        schema_hash = hashlib.sha256(fd.read()).hexdigest()
+    key = get_cache_key(schema_hash)
+    if use_cache:
+        out = load_cache('schema', key)
+        if isinstance(out, SchemaRegistry):
+            return out
+    out = SchemaRegistry.from_file(fname)
+    out.schema_hash = schema_hash
+    if use_cache:
+        out.compile()
+        save_cache('schema', key, out)
+    return out
 
 
 def get_schema(fname=None):
@@ -648,6 +790,7 @@ class SchemaRegistry(object):
     def __init__(self, registry=None, required=None):
         super(SchemaRegistry, self).__init__()
         self._cache = {}
+        self.schema_hash = None
         self._storage = SchemaDict()
         if required is None:
             required = self._default_required_components
@@ -931,6 +1074,52 @@ class SchemaRegistry(object):
         with open(fname, 'w') as f:
             ordered_dump(out, stream=f, Dumper=yaml.SafeDumper)
 
+    def get_checked_schema(self, comp_name=None, full=False,
+                           exclude_properties=None, **kwargs):
+        r"""Get a schema that has already been validated against the
+        metaschema so that validation of instances can skip that step. The
+        result is cached and should not be modified.
+
+        Args:
+            comp_name (str, optional): Name of the component to get the
+                schema for. Defaults to None and the schema for YAML input
+                files is returned.
+            full (bool, optional): If True and comp_name is None, the schema
+                that fully specifies the properties of each component is
+                returned. Defaults to False.
+            exclude_properties (list, optional): Properties that should be
+                removed from the component schema. Defaults to None.
+            **kwargs: Additional keyword arguments are passed to
+                get_component_schema.
+
+        Returns:
+            dict: Validated schema.
+
+        """
+        if exclude_properties is None:
+            exclude_properties = []
+        cache_key = 'checked_%s' % json.dumps(
+            [comp_name, full, sorted(exclude_properties), kwargs],
+            sort_keys=True)
+        if cache_key not in self._cache:
+            if comp_name is not None:
+                out = self.get_component_schema(comp_name, **kwargs)
+            elif full:
+                out = self.full_schema
+            else:
+                out = self.schema
+            for k in exclude_properties:
+                out.get('properties', {}).pop(k, None)
+            metaschema.validate_schema(out)
+            self._cache[cache_key] = out
+        return self._cache[cache_key]
+
+    def compile(self):
+        r"""Validate the schemas used to validate and normalize YAML input
+        files against the metaschema so they can be cached."""
+        self.get_checked_schema()
+        self.get_checked_schema(full=True)
+
     def validate(self, obj, **kwargs):
         r"""Validate an object against this schema.
 
@@ -943,7 +1132,8 @@ class SchemaRegistry(object):
             kwargs.setdefault('normalizers', self._normalizers)
             # kwargs.setdefault('no_defaults', True)
             kwargs.setdefault('schema_registry', self)
-        return metaschema.validate_instance(obj, self.schema, **kwargs)
+        return metaschema.validate_instance(obj, self.get_checked_schema(),
+                                            skip_check=True, **kwargs)
 
     def validate_component(self, comp_name, obj, **kwargs):
         r"""Validate an object against a specific component.
@@ -955,8 +1145,8 @@ class SchemaRegistry(object):
                 get_component_schema.
 
         """
-        comp_schema = self.get_component_schema(comp_name, **kwargs)
-        return metaschema.validate_instance(obj, comp_schema)
+        comp_schema = self.get_checked_schema(comp_name, **kwargs)
+        return metaschema.validate_instance(obj, comp_schema, skip_check=True)
 
     def normalize(self, obj, backwards_compat=False, **kwargs):
         r"""Normalize an object against this schema.
@@ -973,7 +1163,9 @@ class SchemaRegistry(object):
         kwargs.setdefault('required_defaults', True)
         kwargs.setdefault('no_defaults', True)
         kwargs.setdefault('schema_registry', self)
-        return metaschema.normalize_instance(obj, self.full_schema, **kwargs)
+        return metaschema.normalize_instance(
+            obj, self.get_checked_schema(full=True), skip_check=True,
+            **kwargs)
 
     # def is_valid(self, obj):
     #     r"""Determine if an object is valid under this schema.
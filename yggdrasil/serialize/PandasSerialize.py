@@ -18,6 +18,12 @@ class PandasSerialize(AsciiTableSerialize):
             serialized from/to tables. Defaults to False.
         str_as_bytes (bool, optional): If True, strings in columns are
             read as bytes. Defaults to False.
+        binary_frames (bool, optional): If True, frames will be serialized
+            in a binary columnar format rather than as CSV unless the frame
+            contains columns that cannot be represented in the binary
+            format. Defaults to True. File comms disable this so that files
+            are always written as CSV. Messages in either format can be
+            deserialized regardless of this value.
 
     """
 
@@ -35,6 +41,7 @@ class PandasSerialize(AsciiTableSerialize):
 
     def __init__(self, *args, **kwargs):
         self.write_header_once = False
+        self.binary_frames = kwargs.pop('binary_frames', True)
         self.dont_write_header = kwargs.pop('dont_write_header',
                                             kwargs.get('no_header', False))
         return super(PandasSerialize, self).__init__(*args, **kwargs)
@@ -139,12 +146,8 @@ class PandasSerialize(AsciiTableSerialize):
         if not isinstance(args, pandas.DataFrame):
             raise TypeError(("Pandas DataFrame required. Invalid type "
                              + "of '%s' provided.") % type(args))
-        fd = sio.StringIO()
-        # For Python 3 and higher, bytes need to be encoded
-        args_ = copy.deepcopy(args)
-        for c in args.columns:
-            if isinstance(args_[c][0], bytes):
-                args_[c] = args_[c].apply(lambda s: s.decode('utf-8'))
+        # Shallow copy so that renaming columns does not modify the input
+        args_ = args.copy(deep=False)
         if (self.field_names is None) and (not self.no_header):
             self.field_names = self.get_field_names()
         args_ = self.apply_field_names(args_, self.field_names)
@@ -153,11 +156,20 @@ class PandasSerialize(AsciiTableSerialize):
             if cols == list(range(len(cols))):
                 args_ = self.apply_field_names(args_, ['f%d' % i for i in
                                                        range(len(cols))])
+        if self.binary_frames:
+            out = serialize.pandas2bytes(args_)
+            if out is not None:
+                return out
+        fd = sio.StringIO()
+        # For Python 3 and higher, bytes need to be encoded
+        for c in args_.columns:
+            if (len(args_) > 0) and isinstance(args_[c].iloc[0], bytes):
+                args_[c] = args_[c].apply(lambda s: s.decode('utf-8'))
         args_.to_csv(fd, index=False,
                      # Not in pandas <0.24
                      # line_terminator=self.newline.decode("utf-8"),
                      sep=self.delimiter.decode("utf-8"),
-                     mode='wb', encoding='utf8',
+                     encoding='utf8',
                      header=(not self.dont_write_header))
         if self.write_header_once:
             self.dont_write_header = True
@@ -178,7 +190,6 @@ class PandasSerialize(AsciiTableSerialize):
             obj: Deserialized Python object.
 
         """
-        fd = sio.BytesIO(msg)
         names = None
         dtype = None
         if self.initialized:
@@ -189,25 +200,14 @@ class PandasSerialize(AsciiTableSerialize):
             else:
                 dtype_names = np_dtype.names
             for n in dtype_names:
-                if np_dtype[n].char == 'U':
+                if np_dtype[n].char in ['U', 'S']:
                     dtype[n] = object
                 else:
                     dtype[n] = np_dtype[n]
-        kws = dict(sep=self.delimiter.decode("utf-8"),
-                   names=names,
-                   dtype=dtype,
-                   encoding='utf8',
-                   skipinitialspace=True)
-        if self.no_header:
-            kws['header'] = None
-        out = pandas.read_csv(fd, **kws)
-        out = out.dropna(axis='columns', how='all')
-        fd.close()
-        if self.str_as_bytes:
-            # Make sure strings are bytes
-            for c, d in zip(out.columns, out.dtypes):
-                if (d == object) and isinstance(out[c][0], str):
-                    out[c] = out[c].apply(lambda s: s.encode('utf-8'))
+        if msg.startswith(serialize._pandas_binary_prefix):
+            out = serialize.bytes2pandas(msg, str_as_bytes=self.str_as_bytes)
+        else:
+            out = self.read_csv(msg, names=names, dtype=dtype)
         # On windows, long != longlong and longlong requires special cformat
         # For now, long will be used to preserve the use of %ld to match long
         if platform._is_win:  # pragma: windows
@@ -230,6 +230,38 @@ class PandasSerialize(AsciiTableSerialize):
             self.update_serializer(extract=True, **typedef)
         return out
 
+    def read_csv(self, msg, names=None, dtype=None):
+        r"""Read a frame from a CSV message.
+
+        Args:
+            msg (bytes): CSV message.
+            names (list, optional): Column names that should be used.
+                Defaults to None.
+            dtype (dict, optional): Data types that should be used for each
+                column. Defaults to None.
+
+        Returns:
+            pandas.DataFrame: Frame read from the message.
+
+        """
+        fd = sio.BytesIO(msg)
+        kws = dict(sep=self.delimiter.decode("utf-8"),
+                   names=names,
+                   dtype=dtype,
+                   encoding='utf8',
+                   skipinitialspace=True)
+        if self.no_header:
+            kws['header'] = None
+        out = pandas.read_csv(fd, **kws)
+        out = out.dropna(axis='columns', how='all')
+        fd.close()
+        if self.str_as_bytes:
+            # Make sure strings are bytes
+            for c, d in zip(out.columns, out.dtypes):
+                if (d == object) and isinstance(out[c][0], str):
+                    out[c] = out[c].apply(lambda s: s.encode('utf-8'))
+        return out
+
     @property
     def send_converter(self):
         kws = {}
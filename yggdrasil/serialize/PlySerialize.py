@@ -1,6 +1,8 @@
+from yggdrasil import tools
 from yggdrasil.serialize import _default_newline_str
 from yggdrasil.serialize.SerializeBase import SerializeBase
-from yggdrasil.metaschema.datatypes.PlyMetaschemaType import PlyDict
+from yggdrasil.metaschema.datatypes.PlyMetaschemaType import (
+    PlyDict, PlyMetaschemaType)
 
 
 class PlySerialize(SerializeBase):
@@ -11,11 +13,17 @@ class PlySerialize(SerializeBase):
             serialized output. Defaults to True.
         newline (str, optional): String that should be used for new lines.
             Defaults to '\n'.
+        plyformat (str, optional): Ply format that should be used to
+            serialize structures. Defaults to 'ascii 1.0'. Binary formats
+            ('binary_little_endian 1.0' and 'binary_big_endian 1.0') are
+            faster to read/write and produce smaller files.
 
     Attributes:
         write_header (bool): If True, headers will be added to serialized
             output.
         newline (str): String that should be used for new lines.
+        plyformat (str): Ply format that should be used to serialize
+            structures.
         default_rgb (list): Default color in RGB that should be used for
             missing colors.
 
@@ -25,7 +33,10 @@ class PlySerialize(SerializeBase):
     _schema_subtype_description = ('Serialize 3D structures using Ply format.')
     _schema_properties = {
         'newline': {'type': 'string',
-                    'default': _default_newline_str}}
+                    'default': _default_newline_str},
+        'plyformat': {'type': 'string', 'default': 'ascii 1.0',
+                      'enum': ['ascii 1.0', 'binary_little_endian 1.0',
+                               'binary_big_endian 1.0']}}
     default_datatype = {'type': 'ply'}
     concats_as_str = False
 
@@ -45,7 +56,8 @@ class PlySerialize(SerializeBase):
             bytes: Serialized message.
 
         """
-        return self.datatype.encode_data(args, self.typedef).encode("utf-8")
+        return tools.str2bytes(self.datatype.encode_data(
+            args, self.typedef, plyformat=self.plyformat))
 
     def func_deserialize(self, msg):
         r"""Deserialize a message.
@@ -57,7 +69,10 @@ class PlySerialize(SerializeBase):
             obj: Deserialized message.
 
         """
-        return PlyDict(self.datatype.decode_data(msg, self.typedef))
+        out = self.datatype.decode_data(msg, self.typedef)
+        if not isinstance(out, PlyDict):
+            out = PlyDict(out)
+        return out
 
     @classmethod
     def concatenate(cls, objects, **kwargs):
@@ -80,9 +95,13 @@ class PlySerialize(SerializeBase):
         return [total]
         
     @classmethod
-    def get_testing_options(cls):
+    def get_testing_options(cls, plyformat='ascii 1.0'):
         r"""Method to return a dictionary of testing options for this class.
 
+        Args:
+            plyformat (str, optional): Ply format that should be tested.
+                Defaults to 'ascii 1.0'.
+
         Returns:
             dict: Dictionary of variables to use for testing.
 
@@ -113,4 +132,8 @@ class PlySerialize(SerializeBase):
                              + b'3 0 1 2\n'
                              + b'3 3 4 5\n'))
         out['concatenate'] = [([], [])]
+        if plyformat != 'ascii 1.0':
+            out['kwargs']['plyformat'] = plyformat
+            out['contents'] = PlyMetaschemaType.encode_data(
+                obj.merge(obj), None, plyformat=plyformat)
         return out
@@ -491,7 +491,8 @@ class SerializeBase(tools.YggClass):
                        'commtype', 'filetype', 'response_address', 'request_id',
                        'append', 'in_temp', 'is_series', 'working_dir', 'fmts',
                        'model_driver', 'env', 'send_converter', 'recv_converter',
-                       'typedef_base', 'client_model', 'closed_clients']
+                       'typedef_base', 'client_model', 'closed_clients',
+                       'raw_array']
         kws = list(kwargs.keys())
         for k in kws:
             if (k in _remove_kws) or k.startswith('zmq'):
@@ -1,5 +1,6 @@
 import re
 import copy
+import json
 import numpy as np
 import pandas
 import io as sio
@@ -23,6 +24,8 @@ _fmt_char_str = _fmt_char.decode("utf-8")
 _default_comment_str = _default_comment.decode("utf-8")
 _default_delimiter_str = _default_delimiter.decode("utf-8")
 _default_newline_str = _default_newline.decode("utf-8")
+_pandas_binary_prefix = b'YGG_PANDAS_BINARY:'
+_pandas_binary_align = 8
 
 
 def extract_formats(fmt_str):
@@ -1353,4 +1356,166 @@ def pandas2list(frame):
     return numpy2list(pandas2numpy(frame))
 
 
+def _pad_to_alignment(size, align=_pandas_binary_align):
+    r"""Get the number of padding bytes required to align a buffer.
+
+    Args:
+        size (int): Current size of the buffer.
+        align (int, optional): Alignment in bytes. Defaults to
+            _pandas_binary_align.
+
+    Returns:
+        int: Number of bytes that must be appended.
+
+    """
+    return (-size) % align
+
+
+def pandas2bytes(frame):
+    r"""Encode a Pandas DataFrame in a binary columnar format. Each column
+    is stored as the raw buffer for its numpy representation preceded by a
+    JSON header describing the column names and data types. String/bytes
+    columns are stored as an array of offsets followed by the concatenated
+    utf-8 encoded data. The index is not included.
+
+    Args:
+        frame (pandas.DataFrame): Frame to encode.
+
+    Returns:
+        bytes: Encoded frame. None is returned if the frame contains columns
+            that cannot be represented in the binary format (e.g. object
+            columns with mixed types or missing values).
+
+    Raises:
+        TypeError: If frame is not a Pandas DataFrame.
+
+    """
+    if not isinstance(frame, pandas.DataFrame):
+        raise TypeError("frame must be a pandas data frame, not %s." % type(frame))
+    nrows = len(frame)
+    columns = []
+    buffers = []
+    for i, name in enumerate(frame.columns.tolist()):
+        if isinstance(name, np.generic):
+            name = name.item()
+        if not isinstance(name, (str, int)):
+            return None
+        col = frame.iloc[:, i]
+        if not isinstance(col.dtype, np.dtype):
+            return None
+        values = col.to_numpy()
+        if values.dtype == object:
+            kind = 'str'
+            if (nrows > 0) and isinstance(values[0], bytes):
+                kind = 'bytes'
+            try:
+                if kind == 'str':
+                    encoded = [x.encode('utf-8') for x in values]
+                else:
+                    encoded = values.tolist()
+                data = b''.join(encoded)
+            except (AttributeError, TypeError):
+                return None
+            offsets = np.zeros(nrows + 1, dtype='<i8')
+            np.cumsum(np.fromiter(map(len, encoded), dtype='<i8', count=nrows),
+                      out=offsets[1:])
+            columns.append({'name': name, 'dtype': kind})
+            buffers += [offsets.view(np.uint8), data]
+        else:
+            values = np.ascontiguousarray(values)
+            columns.append({'name': name, 'dtype': values.dtype.str})
+            buffers.append(values.view(np.uint8))
+    header = json.dumps({'nrows': nrows, 'columns': columns}).encode('utf-8')
+    parts = [_pandas_binary_prefix,
+             np.array([len(header)], dtype='<u8').view(np.uint8), header]
+    size = len(_pandas_binary_prefix) + 8 + len(header)
+    for x in buffers:
+        pad = _pad_to_alignment(size)
+        if pad:
+            parts.append(b'\x00' * pad)
+        parts.append(x)
+        size += pad + len(x)
+    return b''.join(parts)
+
+
+def bytes2pandas(msg, str_as_bytes=None):
+    r"""Decode a Pandas DataFrame from the binary columnar format produced
+    by pandas2bytes.
+
+    Args:
+        msg (bytes): Encoded frame.
+        str_as_bytes (bool, optional): If True, string columns will be
+            returned as bytes. If False, string columns will be returned
+            as str. Defaults to None and the type of strings in the
+            original frame is preserved.
+
+    Returns:
+        pandas.DataFrame: Decoded frame.
+
+    Raises:
+        ValueError: If msg is not in the binary columnar format or is
+            truncated.
+
+    """
+    if not msg.startswith(_pandas_binary_prefix):
+        raise ValueError("Message is not a binary encoded pandas data frame.")
+    pos = len(_pandas_binary_prefix)
+    if len(msg) < (pos + 8):
+        raise ValueError("Binary pandas message is too short.")
+    header_size = int(np.frombuffer(msg, dtype='<u8', count=1, offset=pos)[0])
+    pos += 8
+    if len(msg) < (pos + header_size):
+        raise ValueError("Binary pandas message is too short.")
+    header = json.loads(msg[pos:(pos + header_size)].decode('utf-8'))
+    pos += header_size
+    nrows = header['nrows']
+    names = []
+    arrays = []
+    try:
+        for c in header['columns']:
+            pos += _pad_to_alignment(pos)
+            if c['dtype'] in ['str', 'bytes']:
+                offsets = np.frombuffer(msg, dtype='<i8', count=nrows + 1,
+                                        offset=pos).tolist()
+                pos += 8 * (nrows + 1)
+                data = msg[pos:(pos + offsets[-1])]
+                if len(data) != offsets[-1]:
+                    raise ValueError("Binary pandas message is too short.")
+                pos += offsets[-1]
+                as_bytes = str_as_bytes
+                if as_bytes is None:
+                    as_bytes = (c['dtype'] == 'bytes')
+                decode = (not as_bytes)
+                if decode:
+                    # Offsets are in bytes so strings can only be sliced
+                    # after decoding if all characters are single byte
+                    text = data.decode('utf-8')
+                    if len(text) == len(data):
+                        data = text
+                        decode = False
+                values = np.empty(nrows, dtype=object)
+                values[:] = [data[a:b] for a, b in
+                             zip(offsets[:-1], offsets[1:])]
+                if decode:
+                    values[:] = [x.decode('utf-8') for x in values]
+            else:
+                dtype = np.dtype(c['dtype'])
+                values = np.frombuffer(msg, dtype=dtype, count=nrows,
+                                       offset=pos)
+                pos += dtype.itemsize * nrows
+            names.append(c['name'])
+            arrays.append(values)
+    except ValueError as e:
+        if 'buffer is smaller' in str(e):
+            raise ValueError("Binary pandas message is too short.")
+        raise
+    out = pandas.DataFrame(dict(enumerate(arrays)), index=pandas.RangeIndex(nrows))
+    if names and all(isinstance(n, int) for n in names) and (
+            names == list(range(len(names)))):
+        out.columns = pandas.RangeIndex(len(names))
+    else:
+        out.columns = names
+    return out
+
+
 __all__ = []
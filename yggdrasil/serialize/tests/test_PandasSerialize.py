@@ -43,3 +43,24 @@ class TestPandasSerializeBytes(TestPandasSerialize):
     r"""Test class for PandasSerialize class when strings are bytes."""
 
     testing_option_kws = {'table_string_type': 'bytes'}
+
+
+class TestPandasSerializeCSV(TestPandasSerialize):
+    r"""Test class for PandasSerialize class when frames are serialized as
+    CSV."""
+
+    @property
+    def inst_kwargs(self):
+        r"""Keyword arguments for creating the test instance."""
+        out = super(TestPandasSerializeCSV, self).inst_kwargs
+        out['binary_frames'] = False
+        return out
+
+    def test_deserialize_binary(self):
+        r"""Test deserialization of frames serialized in the binary
+        format."""
+        kws = self.instance.get_testing_options()
+        bin_inst = self.import_cls(**kws['kwargs'])
+        x = bin_inst.serialize(kws['objects'][0])
+        y = self.instance.deserialize(x)[0]
+        self.assert_result_equal(y, self.testing_options['objects'][0])
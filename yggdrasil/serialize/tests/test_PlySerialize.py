@@ -0,0 +1,20 @@
+from yggdrasil.serialize.tests.test_SerializeBase import TestSerializeBase
+
+
+class TestPlySerialize(TestSerializeBase):
+    r"""Test class for PlySerialize class."""
+
+    _cls = 'PlySerialize'
+
+
+class TestPlySerializeBinaryLittleEndian(TestPlySerialize):
+    r"""Test class for PlySerialize class with little endian binary
+    format."""
+
+    testing_option_kws = {'plyformat': 'binary_little_endian 1.0'}
+
+
+class TestPlySerializeBinaryBigEndian(TestPlySerialize):
+    r"""Test class for PlySerialize class with big endian binary format."""
+
+    testing_option_kws = {'plyformat': 'binary_big_endian 1.0'}
@@ -1,4 +1,5 @@
 import numpy as np
+import pandas
 from yggdrasil import serialize, platform
 from yggdrasil.tests import assert_raises, assert_equal
 
@@ -514,6 +515,35 @@ def test_numpy2pandas():
         np.testing.assert_array_equal(ans, res)
 
 
+def test_pandas2bytes():
+    r"""Test conversion of a pandas data frame to bytes and back."""
+    assert_raises(TypeError, serialize.pandas2bytes, None)
+    assert_raises(ValueError, serialize.bytes2pandas, b'invalid')
+    nele = 5
+    test_frames = [
+        pandas.DataFrame({'name': ['one', 'two', 'thr\u00e9e', '', 'five'],
+                          'bytes': [b'a', b'bb', b'', b'dddd', b'e'],
+                          'number': np.arange(nele, dtype='i4'),
+                          'value': np.linspace(0.0, 1.0, nele),
+                          'complex': np.ones(nele, 'c16'),
+                          'flag': np.zeros(nele, bool)}),
+        pandas.DataFrame(np.zeros((nele, 2))),
+        pandas.DataFrame({'empty': np.zeros(0, 'f8')})]
+    for ans in test_frames:
+        msg = serialize.pandas2bytes(ans)
+        res = serialize.bytes2pandas(msg)
+        pandas.testing.assert_frame_equal(res, ans)
+        assert_raises(ValueError, serialize.bytes2pandas, msg[:-1])
+    res = serialize.bytes2pandas(serialize.pandas2bytes(test_frames[0]),
+                                 str_as_bytes=True)
+    assert_equal(res['name'][2], 'thr\u00e9e'.encode('utf-8'))
+    # Frames that cannot be represented
+    assert_equal(serialize.pandas2bytes(
+        pandas.DataFrame({'a': ['one', None]})), None)
+    assert_equal(serialize.pandas2bytes(
+        pandas.DataFrame({'a': pandas.Categorical(['a', 'b'])})), None)
+
+
 def test_numpy2list():
     r"""Test conversion of a numpy array to a list and back."""
     assert_raises(TypeError, serialize.numpy2list, None)
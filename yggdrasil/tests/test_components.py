@@ -1,4 +1,5 @@
-from yggdrasil.tests import assert_raises
+import os
+from yggdrasil.tests import assert_raises, assert_equal
 from yggdrasil import components
 
 
@@ -33,3 +34,41 @@ def test_create_component():
     assert(not components.isinstance_component(x, ['comm']))
     x = components.create_component('serializer')
     assert(components.isinstance_component(x, ['serializer']))
+
+
+def test_manifest():
+    r"""Test creating/loading the component manifest."""
+    fname = 'test_manifest.json'
+    if os.path.isfile(fname):  # pragma: debug
+        os.remove(fname)
+    m0 = components.get_manifest(fname)
+    assert(os.path.isfile(fname))
+    m1 = components.get_manifest(fname)
+    os.remove(fname)
+    assert_equal(m1, m0)
+    assert_equal(m0, components.get_manifest())
+    assert_equal(components.get_manifest_entry('serializer', 'direct'),
+                 ('yggdrasil.serialize.DirectSerialize', 'DirectSerialize'))
+    assert_equal(components.get_manifest_entry('serializer'),
+                 ('yggdrasil.serialize.DefaultSerialize', 'DefaultSerialize'))
+    assert_equal(components.get_manifest_entry('serializer', 'invalid'),
+                 (None, None))
+    assert('zmq' in components.get_component_subtypes('comm'))
+
+
+def test_ClassRegistry_import_class():
+    r"""Test that keys missing from the manifest cause all classes in the
+    registry's directory to be imported."""
+    from yggdrasil.metaschema.properties import _metaschema_properties as reg
+    manifest = components.get_manifest(create=False)
+    old_imported = reg._imported
+    try:
+        components._manifest = dict(
+            manifest, registries=dict(manifest.get('registries', {})))
+        components._manifest['registries'][reg._module] = {}
+        reg._imported = False
+        assert(reg.get('invalid') is None)
+        assert(reg._imported)
+    finally:
+        components._manifest = manifest
+        reg._imported = old_imported
@@ -0,0 +1,118 @@
+import os
+import json
+import uuid
+import shutil
+import tempfile
+from yggdrasil import ensemble, yamlfile
+from yggdrasil.tests import assert_raises, assert_equal
+from yggdrasil.examples import yamls as ex_yamls
+
+
+def test_load_ensemble():
+    r"""Test loading ensemble specifications."""
+    spec = {'models': ex_yamls['hello']['python'],
+            'members': [{'name': 'first', 'env': {'A': 0}}],
+            'sweep': {'A': [1, 2], 'B': 'x'}}
+    x = ensemble.load_ensemble(spec)
+    assert_equal(x['models'], [ex_yamls['hello']['python']])
+    assert_equal([m['name'] for m in x['members']],
+                 ['first', 'member1', 'member2'])
+    assert_equal([m['env'] for m in x['members']],
+                 [{'A': '0'}, {'A': '1', 'B': 'x'}, {'A': '2', 'B': 'x'}])
+    assert_equal(x['output_dir'],
+                 os.path.join(os.getcwd(), 'ensemble_output'))
+    for invalid in [{'members': [{}]},
+                    {'models': spec['models']},
+                    {'models': spec['models'], 'members': ['a']},
+                    {'models': spec['models'], 'sweep': ['a']},
+                    {'models': spec['models'],
+                     'members': [{'name': 'a'}, {'name': 'a'}]}]:
+        assert_raises(yamlfile.YAMLSpecificationError,
+                      ensemble.load_ensemble, invalid)
+    assert_raises(yamlfile.YAMLSpecificationError, ensemble.YggEnsemble,
+                  dict(spec, members=[{'models': {'invalid': {}}}]))
+
+
+def test_run_ensemble():
+    r"""Test running the members of an ensemble concurrently."""
+    output_dir = tempfile.mkdtemp()
+    namespace = "test_run_ensemble_%s" % str(uuid.uuid4)
+    spec = {'models': ex_yamls['hello']['python'],
+            'concurrency': 2,
+            'members': [{'name': 'args',
+                         'models': {'hello_python': {'args': ['a']}}}],
+            'sweep': {'HELLO_PARAM': [1, 2]}}
+    try:
+        x = ensemble.YggEnsemble(spec, output_dir=output_dir,
+                                 namespace=namespace)
+        results = x.run()
+        assert(not x.error_flag)
+        assert_equal(list(results.keys()), ['args', 'member1', 'member2'])
+        for k, v in results.items():
+            assert_equal(list(v['outputs'].keys()), ['hello_python:outFile'])
+            fname = v['outputs']['hello_python:outFile']
+            assert_equal(os.path.dirname(fname), os.path.join(output_dir, k))
+            with open(fname, 'r') as fd:
+                assert_equal(fd.read(), 'this is a test')
+            assert('run models' in v['times'])
+        with open(os.path.join(output_dir, 'ensemble.json'), 'r') as fd:
+            summary = json.load(fd)
+        assert_equal(sorted(summary['members'].keys()),
+                     ['args', 'member1', 'member2'])
+        assert_equal(summary['concurrency'], 2)
+    finally:
+        shutil.rmtree(output_dir)
+
+
+def test_run_ensemble_trace():
+    r"""Test that the members of an ensemble append to a single trace
+    file and that the environment is restored afterwards."""
+    output_dir = tempfile.mkdtemp()
+    namespace = "test_run_ensemble_%s" % str(uuid.uuid4)
+    fname = os.path.join(output_dir, 'trace.json')
+    spec = {'models': ex_yamls['hello']['python'],
+            'concurrency': 2,
+            'sweep': {'HELLO_PARAM': [1, 2]}}
+    old_env = os.environ.get('YGG_TRACE_FILE', None)
+    try:
+        x = ensemble.YggEnsemble(spec, output_dir=output_dir,
+                                 namespace=namespace, trace_file=fname)
+        x.run()
+        assert(not x.error_flag)
+        assert_equal(os.environ.get('YGG_TRACE_FILE', None), old_env)
+        with open(fname, 'r') as fd:
+            events = json.load(fd)
+    finally:
+        shutil.rmtree(output_dir)
+    # Each member's model sends a message that is traced
+    traces = set(e['args']['trace_id'] for e in events
+                 if (e['ph'] == 'X') and (e['cat'] == 'model_send'))
+    assert(len(traces) >= 2)
+
+
+def test_member_drivers_env():
+    r"""Test that member environment variables are added to those set by
+    the model YAML."""
+    src_dir = os.path.dirname(ex_yamls['hello']['python'])
+    tmp_dir = tempfile.mkdtemp()
+    fname = os.path.join(tmp_dir, 'hello_env.yml')
+    with open(ex_yamls['hello']['python'], 'r') as fd:
+        contents = fd.read()
+    contents = contents.replace('./', src_dir + os.sep).replace(
+        '  language: python\n',
+        '  language: python\n  env:\n    YAML_PARAM: yaml\n')
+    with open(fname, 'w') as fd:
+        fd.write(contents)
+    spec = {'models': fname,
+            'members': [{'name': 'first', 'env': {'HELLO_PARAM': 1},
+                         'models': {'hello_python': {
+                             'env': {'MODEL_PARAM': 2}}}}]}
+    try:
+        x = ensemble.YggEnsemble(spec, output_dir=tmp_dir)
+        drivers, outputs = x.member_drivers(x.members[0])
+    finally:
+        shutil.rmtree(tmp_dir)
+    env = drivers['model']['hello_python']['env']
+    assert_equal(env.get('YAML_PARAM', None), 'yaml')
+    assert_equal(env.get('HELLO_PARAM', None), '1')
+    assert_equal(env.get('MODEL_PARAM', None), '2')
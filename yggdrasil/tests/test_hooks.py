@@ -0,0 +1,131 @@
+import os
+import json
+import tempfile
+import threading
+from yggdrasil import hooks
+from yggdrasil.communication import new_comm, get_comm
+from yggdrasil.tests import assert_raises, assert_equal
+
+
+class RecordingHook(hooks.PipelineHook):
+    r"""Hook that records the stages it is called for."""
+
+    def __init__(self):
+        self.events = []
+
+    def enter(self, stage, comm):
+        self.events.append(('enter', stage, comm))
+
+    def exit(self, stage, comm):
+        self.events.append(('exit', stage, comm))
+
+
+def get_comm_pair(name):
+    r"""Create a pair of connected comms."""
+    send = new_comm(name, direction='send', reverse_names=True)
+    recv = get_comm(name, **send.opp_comm_kwargs())
+    return send, recv
+
+
+def test_register():
+    r"""Test registering and unregistering hooks."""
+    x = RecordingHook()
+    assert_raises(ValueError, hooks.register, x, stages=['invalid'])
+    try:
+        hooks.register(x, stages=['send'])
+        hooks.register(x, stages=['send', 'recv'])
+        assert_equal(hooks.get_hooks('send'), (x, ))
+        assert_equal(hooks.get_hooks('recv'), (x, ))
+        assert_equal(hooks.get_hooks('serialize'), ())
+    finally:
+        hooks.unregister(x)
+    assert_equal(hooks.get_hooks('send'), ())
+    assert_equal(hooks.get_hooks('recv'), ())
+
+
+def test_stage_hooks():
+    r"""Test that hooks are called around the pipeline stages."""
+    x = RecordingHook()
+    send, recv = get_comm_pair('test_stage_hooks')
+    try:
+        hooks.register(x)
+        assert(send.send('hello'))
+        flag, msg = recv.recv(timeout=10)
+        hooks.unregister(x)
+        assert(flag)
+        assert_equal(msg, 'hello')
+        assert(send.send('goodbye'))
+        assert(recv.recv(timeout=10)[0])
+    finally:
+        hooks.unregister(x)
+        send.close()
+        recv.close()
+    send_stages = [e[1] for e in x.events if ((e[2] is send)
+                                              and (e[1] != 'apply_transform'))]
+    recv_stages = [e[1] for e in x.events if ((e[2] is recv)
+                                              and (e[1] != 'apply_transform'))]
+    assert_equal(send_stages[:3], ['send', 'send_multipart', 'serialize'])
+    assert_equal(send_stages[-1], 'send')
+    assert_equal(recv_stages[:3], ['recv', 'recv_multipart', 'deserialize'])
+    assert_equal(recv_stages[-1], 'recv')
+    # Each enter is matched by an exit and nothing is recorded after the
+    # hook is unregistered
+    for comm in [send, recv]:
+        depth = 0
+        for e in x.events:
+            if e[2] is comm:
+                depth += (1 if e[0] == 'enter' else -1)
+                assert(depth >= 0)
+        assert_equal(depth, 0)
+    assert_equal(len([e for e in x.events if e[0] == 'enter'
+                      and e[1] == 'send']), 1)
+
+
+def test_StageSampler():
+    r"""Test sampling the time spent in each stage."""
+    x = hooks.StageSampler(interval=0.0005)
+    comm = type('DummyComm', (object, ), {'name': 'dummy'})()
+    x.enter('send', comm)
+    x.enter('serialize', comm)
+    x.sample()
+    x.exit('serialize', comm)
+    x.sample()
+    x.exit('send', comm)
+    x.sample()
+    assert_equal(x.nsamples, 3)
+    out = x.to_dict()
+    assert_equal(sorted(out['dummy'].keys()), ['send', 'serialize'])
+    assert(out['dummy']['serialize']['exclusive'] > 0)
+    assert_equal(out['dummy']['serialize']['exclusive'],
+                 out['dummy']['serialize']['inclusive'])
+    assert(out['dummy']['send']['inclusive']
+           > out['dummy']['send']['exclusive'])
+    send, recv = get_comm_pair('test_StageSampler')
+    fname = os.path.join(tempfile.gettempdir(), 'test_stage_profile.json')
+
+    def do_send():
+        for _ in range(20):
+            send.send('hello')
+
+    try:
+        with hooks.StageSampler(interval=0.0005) as y:
+            assert(y.is_running)
+            thread = threading.Thread(target=do_send)
+            thread.start()
+            for _ in range(20):
+                assert(recv.recv(timeout=10)[0])
+            thread.join()
+        assert(not y.is_running)
+        assert_equal(hooks.get_hooks('send'), ())
+        assert(y.nsamples > 0)
+        y.dump(fname)
+        with open(fname, 'r') as fd:
+            contents = json.load(fd)
+        assert_equal(contents['nsamples'], y.nsamples)
+        assert_equal(contents['comms'], y.to_dict())
+        assert(recv.name in contents['comms'])
+    finally:
+        send.close()
+        recv.close()
+        if os.path.isfile(fname):
+            os.remove(fname)
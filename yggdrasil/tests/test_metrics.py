@@ -0,0 +1,66 @@
+import os
+import json
+import pickle
+import tempfile
+from yggdrasil import metrics
+from yggdrasil.tests import assert_equal
+
+
+def test_LatencyHistogram():
+    r"""Test latency histogram."""
+    x = metrics.LatencyHistogram()
+    assert(x.mean is None)
+    assert(x.percentile(50) is None)
+    for v in [1.0e-6, 3.0e-6, 3.0e-6, 1.0e-3, 100.0]:
+        x.add(v)
+    assert_equal(x.count, 5)
+    assert_equal(x.min, 1.0e-6)
+    assert_equal(x.max, 100.0)
+    assert_equal(x.percentile(20), 1.0e-6)
+    assert_equal(x.percentile(50), 4.0e-6)
+    assert_equal(x.percentile(100), 100.0)
+    out = x.to_dict()
+    assert_equal(out['count'], 5)
+    assert_equal(sum(out['buckets'].values()), 5)
+    assert_equal(out['buckets']['inf'], 1)
+
+
+def test_Metrics():
+    r"""Test metrics for a single object."""
+    x = metrics.Metrics('test_metrics', kind='test', address='abc')
+    x.increment('a')
+    x.increment('a', 2)
+    x.set_gauge('depth', 3)
+    x.set_gauge('depth', 1)
+    x.observe('wait', 1.0e-3)
+    x.record('sent', 10, 1.0e-4)
+    x.record('sent', 20, 1.0e-4)
+    out = x.to_dict()
+    assert_equal(out['info'], {'address': 'abc'})
+    assert_equal(out['counters'], {'a': 3, 'messages_sent': 2,
+                                   'bytes_sent': 30})
+    assert_equal(out['gauges'], {'depth': {'current': 1, 'max': 3}})
+    assert_equal(out['histograms']['wait']['count'], 1)
+    assert_equal(out['histograms']['sent']['count'], 2)
+    registry = metrics.get_registry()
+    assert(x in registry.get(name='test_metrics', kind='test'))
+    assert_equal(registry.snapshot(name='test_metrics', kind='test'), [out])
+    y = pickle.loads(pickle.dumps(x))
+    assert_equal(y.to_dict(), out)
+    y.increment('a')
+    del x, y
+    assert_equal(registry.get(name='test_metrics', kind='test'), [])
+
+
+def test_dump():
+    r"""Test writing metrics to a file."""
+    x = metrics.Metrics('test_dump', kind='test')
+    x.record('recv', 10, 1.0e-4)
+    fname = os.path.join(tempfile.gettempdir(), 'test_metrics_dump.json')
+    try:
+        metrics.dump({'test': x.to_dict()}, fname)
+        with open(fname, 'r') as fd:
+            assert_equal(json.load(fd), {'test': x.to_dict()})
+    finally:
+        if os.path.isfile(fname):
+            os.remove(fname)
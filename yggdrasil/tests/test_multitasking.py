@@ -1,4 +1,5 @@
 import pickle
+import threading
 from yggdrasil import multitasking, tools
 from yggdrasil.tests import assert_raises
 from yggdrasil.tests.test_tools import YggTestClass
@@ -46,6 +47,134 @@ def test_TaskProcess():
     assert(not q.is_alive())
 
 
+def test_YggReactor():
+    r"""Test hosting task loops on a reactor."""
+    reactor = multitasking.YggReactor(timeout=10.0)
+    assert_raises(ValueError, multitasking.YggTaskLoop,
+                  task_method='process', reactor=reactor)
+    idents = []
+
+    def loop_target(task, count):
+        idents.append(threading.get_ident())
+        if len(idents) >= count:
+            task.set_break_flag()
+        else:
+            task.loop_sleep()
+
+    tasks = []
+    for i in range(2):
+        tasks.append(multitasking.YggTaskLoop(
+            name='ReactorLoop%d' % i, reactor=reactor, timeout=10.0))
+        tasks[-1]._ygg_args = (tasks[-1], 10)
+        tasks[-1]._ygg_target = loop_target
+    for x in tasks:
+        assert(not x.is_alive())
+        x.start()
+    for x in tasks:
+        x.wait()
+        assert(not x.is_alive())
+        assert(x.was_loop)
+        assert(x.exitcode == 0)
+        x.pid
+        x.ident
+    assert(reactor.is_alive())
+    assert(reactor.nhosted == 0)
+    # Iterations that may block are run on the reactor's pool of threads
+    assert(reactor.ident not in idents)
+    assert(set(idents).issubset(reactor._pool_threads))
+    reactor.terminate()
+    assert(not reactor.is_alive())
+    assert_raises(RuntimeError, reactor.add_coroutine, tasks[0].run_async())
+
+
+class NonBlockingTaskLoop(multitasking.YggTaskLoop):
+
+    _reactor_blocking = False
+
+
+def test_YggReactor_blocking():
+    r"""Test that a blocking iteration of a loop hosted by a reactor does
+    not stall the other loops hosted by the reactor."""
+    reactor = multitasking.YggReactor(timeout=10.0)
+    released = threading.Event()
+    counts = {'blocking': 0, 'nonblocking': 0}
+    in_reactor = []
+
+    def blocking_target(task):
+        counts['blocking'] += 1
+        in_reactor.append(task.in_reactor_thread)
+        released.wait(10.0)
+        task.set_break_flag()
+
+    def nonblocking_target(task):
+        counts['nonblocking'] += 1
+        in_reactor.append(task.in_reactor_thread)
+        if counts['nonblocking'] >= 5:
+            released.set()
+            task.set_break_flag()
+        else:
+            task.loop_sleep()
+
+    tasks = [multitasking.YggTaskLoop(name='BlockingLoop', reactor=reactor,
+                                      timeout=10.0),
+             NonBlockingTaskLoop(name='NonBlockingLoop', reactor=reactor,
+                                 timeout=10.0)]
+    for x, target in zip(tasks, [blocking_target, nonblocking_target]):
+        x._ygg_args = (x, )
+        x._ygg_target = target
+        x.start()
+    for x in tasks:
+        x.wait()
+        assert(not x.is_alive())
+        assert(x.exitcode == 0)
+    # The blocking loop was waiting on the non-blocking loop
+    assert(released.is_set())
+    assert(counts == {'blocking': 1, 'nonblocking': 5})
+    assert(all(in_reactor))
+    assert(not tasks[0].in_reactor_thread)
+    reactor.terminate()
+
+
+def pool_target(pool=None):
+    if pool is not None:
+        # Pools passed to a worker are copied without their workers/tasks
+        assert(not pool.workers)
+        assert(not pool.tasks)
+
+
+def test_YggTaskPool():
+    r"""Test running process tasks on a pool of workers."""
+    pool = multitasking.YggTaskPool(nworkers=2, timeout=60.0)
+    assert_raises(ValueError, multitasking.YggTask, pool=pool)
+    tasks = [multitasking.YggTask(name='PoolTask%d' % i, target=pool_target,
+                                  kwargs={'pool': pool},
+                                  task_method='process', pool=pool,
+                                  timeout=60.0)
+             for i in range(3)]
+    assert(tasks[0].pid is None)
+    assert_raises(RuntimeError, tasks[0].start)
+    pool.start()
+    assert(pool.was_started)
+    assert(pool.elapsed > 0)
+    assert_raises(RuntimeError, multitasking.YggTask, task_method='process',
+                  pool=pool)
+    assert(sorted(len(x) for x in pool.assignments) == [1, 2])
+    for x in tasks[:2]:
+        x.start()
+    for x in tasks[:2]:
+        x.wait()
+        assert(not x.is_alive())
+        assert(x.exitcode == 0)
+        assert(x.pid == pool.workers[x.process_instance.worker_index].pid)
+    # Task that is never started should not prevent the pool from exiting
+    assert(not tasks[2].is_alive())
+    assert(tasks[2].exitcode is None)
+    tasks[2].kill()
+    pool.terminate()
+    for x in pool.workers:
+        assert(not x.is_alive())
+
+
 class TestContextThread(YggTestClass):
     r"""Test for thread based Context."""
 
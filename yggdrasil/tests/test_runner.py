@@ -1,9 +1,15 @@
 import os
+import json
+import shutil
+import tempfile
 import unittest
 import signal
 import uuid
-from yggdrasil import runner, tools, platform
-from yggdrasil.tests import YggTestBase, assert_raises
+from yggdrasil import runner, tools, platform, hooks
+from yggdrasil.config import temp_config
+from yggdrasil.components import import_component
+from yggdrasil.tests import (
+    YggTestBase, assert_raises, assert_equal, requires_language)
 # from yggdrasil.tests import yamls as sc_yamls
 from yggdrasil.examples import yamls as ex_yamls
 
@@ -17,6 +23,37 @@ def test_get_runner():
     cr.sleep()
 
 
+def test_driver_graph():
+    r"""Test that drivers are created/started after their dependencies and
+    that setup times and model exits are recorded."""
+    namespace = "test_driver_graph_%s" % str(uuid.uuid4)
+    cr = runner.get_runner([ex_yamls['hello']['python']],
+                           namespace=namespace)
+    drivers, dependencies = cr.get_driver_graph()
+    assert(('model', 'hello_python') in drivers)
+    for k, v in dependencies.items():
+        for x in v:
+            assert(x in drivers)
+            assert(drivers.index(x) < drivers.index(k))
+    for x in cr.io_drivers('hello_python'):
+        assert(x['name'] in [k[1] for k in
+                             dependencies[('model', 'hello_python')]])
+    times = cr.run()
+    assert(not cr.error_flag)
+    for k in drivers:
+        assert('load' in times['drivers'][k[1]])
+        assert('start' in times['drivers'][k[1]])
+    events = [(x['event'], x['driver']) for x in cr.event_log]
+    assert(events == [('exit', 'hello_python'),
+                      ('exits_complete', 'hello_python')])
+    curdir = os.getcwd()
+    with cr.working_directory(os.path.dirname(__file__)):
+        assert(os.getcwd() == os.path.dirname(__file__))
+        with cr.working_directory(os.path.dirname(__file__)):
+            pass
+    assert(os.getcwd() == curdir)
+
+
 def test_get_run():
     r"""Use run function to start a run."""
     namespace = "test_run_%s" % str(uuid.uuid4)
@@ -26,12 +63,226 @@ def test_get_run():
                namespace=namespace)
 
 
+@requires_language('c')
+def test_skip_compile():
+    r"""Test that models with skip_compile set are not compiled by the
+    runner and that the value is not modified."""
+    namespace = "test_skip_compile_%s" % str(uuid.uuid4)
+    cr = runner.get_runner([ex_yamls['hello']['c']], namespace=namespace)
+    yml = cr.modeldrivers['hello_c']
+    yml['skip_compile'] = True
+    try:
+        cr.loadDrivers()
+        assert(yml['skip_compile'])
+        assert('_deferred_compile' not in yml)
+        assert('compile' not in cr.driver_times.get('hello_c', {}))
+    finally:
+        cr.terminate()
+
+
+@requires_language('c')
+def test_run_multipart_cross_language():
+    r"""Test sending messages larger than the maximum message size from
+    Python to C so that the parts are sent through work comms."""
+    namespace = "test_run_multipart_%s" % str(uuid.uuid4)
+    src_dir = os.path.join(os.path.dirname(ex_yamls['timed_pipe']['python']),
+                           'src')
+    tmpdir = tempfile.mkdtemp()
+    fname_yml = os.path.join(tmpdir, 'multipart.yml')
+    fname_out = os.path.join(tmpdir, 'output.txt')
+    # Send several messages so that the sender's work comm is reused
+    # while the receiver is still draining it
+    msg_count = 3
+    msg_size = import_component(
+        'comm', tools.get_default_comm())._maxMsgSize + 1
+    with open(fname_yml, 'w') as fd:
+        fd.write('\n'.join([
+            'models:',
+            '  - name: multipart_src',
+            '    language: python',
+            '    args: [%s, "%d", "%d"]' % (
+                os.path.join(src_dir, 'timed_pipe_src.py'),
+                msg_count, msg_size),
+            '    outputs: [output_pipe]',
+            '  - name: multipart_dst',
+            '    language: c',
+            '    args: %s' % os.path.join(src_dir, 'timed_pipe_dst.c'),
+            '    inputs: [input_pipe]',
+            '    outputs: [output_file]',
+            'connections:',
+            '  - input: output_pipe',
+            '    output: input_pipe',
+            '  - input: output_file',
+            '    output_file:',
+            '      name: %s' % fname_out,
+            '      filetype: ascii',
+            '']))
+    try:
+        cr = runner.get_runner([fname_yml], namespace=namespace)
+        cr.run()
+        assert(not cr.error_flag)
+        with open(fname_out, 'r') as fd:
+            assert_equal(fd.read(), '0' * (msg_count * msg_size))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+_array_src_c = """#include <stdio.h>
+#include "YggInterface.h"
+
+int main() {
+  int exit_code = 0;
+  size_t shape[2] = {2, 3};
+  double data[6] = {0.0, 1.0, 2.0, 3.0, 4.0, 5.0};
+  yggOutput_t outq = yggOutput("c_output");
+  yggInput_t inq = yggInput("c_input");
+  // Sent as a raw buffer
+  if (yggSendArray(outq, "float", 64, 2, shape, "", data) < 0) {
+    printf("array(C): Error sending array\\n");
+    return -1;
+  }
+  // Received after being serialized by Python
+  size_t nbytes = 8;
+  void *buf = malloc(nbytes);
+  int ret = yggRecvArray(inq, 1, &buf, &nbytes);
+  if ((ret != (int)sizeof(data)) || (nbytes != sizeof(data))) {
+    printf("array(C): Received %d bytes, expected %d\\n", ret,
+           (int)sizeof(data));
+    exit_code = -1;
+  } else if (memcmp(buf, data, sizeof(data)) != 0) {
+    printf("array(C): Received array does not match\\n");
+    exit_code = -1;
+  }
+  free(buf);
+  return exit_code;
+}
+"""
+_array_src_python = """import numpy as np
+from yggdrasil.interface.YggInterface import YggInput, YggOutput
+
+
+if __name__ == '__main__':
+    inq = YggInput('python_input')
+    outq = YggOutput('python_output')
+    flag, msg = inq.recv()
+    assert(flag)
+    np.testing.assert_array_equal(
+        msg, np.arange(6, dtype='float64').reshape((2, 3)))
+    assert(outq.send(msg))
+"""
+
+
+@requires_language('c')
+def test_run_array_cross_language():
+    r"""Test sending an array from C to Python as a raw buffer and back
+    from Python to C as a serialized array."""
+    namespace = "test_run_array_%s" % str(uuid.uuid4)
+    tmpdir = tempfile.mkdtemp()
+    fname_yml = os.path.join(tmpdir, 'array.yml')
+    fname_c = os.path.join(tmpdir, 'array_model.c')
+    fname_py = os.path.join(tmpdir, 'array_model.py')
+    with open(fname_c, 'w') as fd:
+        fd.write(_array_src_c)
+    with open(fname_py, 'w') as fd:
+        fd.write(_array_src_python)
+    with open(fname_yml, 'w') as fd:
+        fd.write('\n'.join([
+            'models:',
+            '  - name: array_c',
+            '    language: c',
+            '    args: %s' % fname_c,
+            '    inputs: [c_input]',
+            '    outputs: [c_output]',
+            '  - name: array_python',
+            '    language: python',
+            '    args: %s' % fname_py,
+            '    inputs: [python_input]',
+            '    outputs: [python_output]',
+            'connections:',
+            '  - input: c_output',
+            '    output: python_input',
+            '  - input: python_output',
+            '    output: c_input',
+            '']))
+    try:
+        cr = runner.get_runner([fname_yml], namespace=namespace)
+        cr.run()
+        assert(not cr.error_flag)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
 def test_run_process_connections():
     r"""Test run with process based connections."""
     namespace = "test_run_%s" % str(uuid.uuid4)
-    runner.run([ex_yamls['hello']['python']],
-               connection_task_method='process',
-               namespace=namespace)
+    cr = runner.get_runner([ex_yamls['hello']['python']],
+                           connection_task_method='process',
+                           namespace=namespace)
+    cr.run()
+    assert(not cr.error_flag)
+    # Metrics are published by the connection processes before they exit
+    for v in cr.get_metrics().values():
+        assert(v['counters']['received'] > 0)
+        assert(v['comms']['input'][0]['counters']['messages_recv'] > 0)
+
+
+def test_run_metrics():
+    r"""Test collection of connection metrics during a run."""
+    namespace = "test_run_%s" % str(uuid.uuid4)
+    fname = os.path.join(tempfile.gettempdir(), '%s.json' % namespace)
+    cr = runner.get_runner([ex_yamls['hello']['python']],
+                           namespace=namespace, metrics_file=fname)
+    try:
+        cr.run()
+        assert(not cr.error_flag)
+        with open(fname, 'r') as fd:
+            out = json.load(fd)
+    finally:
+        if os.path.isfile(fname):
+            os.remove(fname)
+    assert(out['connections'])
+    for v in out['connections'].values():
+        assert_equal(v['kind'], 'connection')
+        assert(v['counters']['sent'] > 0)
+        for k in ['recv', 'process', 'send']:
+            assert(v['histograms'][k]['count'] > 0)
+        icomm = v['comms']['input'][0]
+        ocomm = v['comms']['output'][0]
+        assert(icomm['counters']['bytes_recv'] > 0)
+        assert(ocomm['counters']['bytes_sent'] > 0)
+        if icomm['info']['comm_class'] == 'IPCComm':
+            assert('deserialize' in icomm['histograms'])
+        if ocomm['info']['comm_class'] == 'IPCComm':
+            assert('serialize' in ocomm['histograms'])
+
+
+def test_run_reactor_connections():
+    r"""Test run with connections hosted by reactors."""
+    namespace = "test_run_%s" % str(uuid.uuid4)
+    cr = runner.get_runner([ex_yamls['hello']['python']],
+                           connection_task_method='reactor',
+                           connection_reactors=2,
+                           namespace=namespace)
+    assert(len(cr.reactors) == 2)
+    cr.run()
+    assert(not cr.error_flag)
+    for x in cr.reactors:
+        assert(not x.is_alive())
+
+
+def test_run_pool_connections():
+    r"""Test run with connections run by a pool of worker processes."""
+    namespace = "test_run_%s" % str(uuid.uuid4)
+    cr = runner.get_runner([ex_yamls['hello']['python']],
+                           connection_task_method='pool',
+                           connection_workers=2,
+                           namespace=namespace)
+    cr.run()
+    assert(not cr.error_flag)
+    assert(len(cr.pool.workers) == 2)
+    cr.printStatus()
+    for x in cr.pool.workers:
+        assert(not x.is_alive())
 
 
 # def test_runner_error():
@@ -42,6 +293,88 @@ def test_run_process_connections():
 
 # Spawning fake Ctrl-C works locally for windows, but causes hang on appveyor
 @unittest.skipIf(platform._is_win, "Signal processing not sorted on windows")
+def test_run_trace():
+    r"""Test tracing of messages during a run."""
+    namespace = "test_run_%s" % str(uuid.uuid4)
+    fname = os.path.join(tempfile.gettempdir(), '%s_trace.json' % namespace)
+    old_env = os.environ.get('YGG_TRACE_FILE', None)
+    try:
+        with temp_config(trace_file=fname):
+            cr = runner.get_runner([ex_yamls['hello']['python']],
+                                   namespace=namespace)
+            cr.run()
+        assert(not cr.error_flag)
+        assert_equal(os.environ.get('YGG_TRACE_FILE', None), old_env)
+        # Explicit trace file that is only set in the environment for
+        # the duration of the run
+        cr = runner.get_runner([ex_yamls['hello']['python']],
+                               namespace=namespace, trace_file=fname)
+        cr.run()
+        assert(not cr.error_flag)
+        assert_equal(os.environ.get('YGG_TRACE_FILE', None), old_env)
+        with open(fname, 'r') as fd:
+            events = json.load(fd)
+    finally:
+        if os.path.isfile(fname):
+            os.remove(fname)
+    hops = set(x['name'] for x in events if x['ph'] == 'X')
+    for k in ['connection_recv', 'transform', 'forward', 'model_recv']:
+        assert(k in hops)
+    # The message sent by the model is traced through the connection
+    # and back to the model
+    traces = {}
+    for x in events:
+        if x['ph'] == 'X':
+            traces.setdefault(x['args']['trace_id'], []).append(x['cat'])
+    assert(any('model_send' in v for v in traces.values()))
+
+
+def test_run_stage_profile():
+    r"""Test sampling time spent in comm stages during a run."""
+    namespace = "test_run_%s" % str(uuid.uuid4)
+    fname = os.path.join(tempfile.gettempdir(),
+                         '%s_stage_profile.json' % namespace)
+    try:
+        with temp_config(stage_profile_file=fname):
+            cr = runner.get_runner([ex_yamls['hello']['python']],
+                                   namespace=namespace)
+            cr.run()
+        assert(not cr.error_flag)
+        with open(fname, 'r') as fd:
+            contents = json.load(fd)
+    finally:
+        if os.path.isfile(fname):
+            os.remove(fname)
+    assert(contents['nsamples'] > 0)
+    assert(contents['comms'])
+    for stages in contents['comms'].values():
+        for v in stages.values():
+            assert(v['inclusive'] >= v['exclusive'])
+
+
+def test_run_error_profile():
+    r"""Test that profiling output is written and the stage hooks are
+    unregistered when a run fails."""
+    namespace = "test_run_%s" % str(uuid.uuid4)
+    fnames = {k: os.path.join(tempfile.gettempdir(),
+                              '%s_%s.json' % (namespace, k))
+              for k in ['stage_profile_file', 'metrics_file', 'trace_file']}
+    try:
+        with temp_config(**fnames):
+            cr = runner.get_runner([ex_yamls['hello']['python']],
+                                   namespace=namespace)
+            cr.modeldrivers['hello_python']['driver'] = 'FakeModelDriver'
+            assert_raises(Exception, cr.run)
+        assert(not hooks.get_hooks('send'))
+        for fname in fnames.values():
+            with open(fname, 'r') as fd:
+                json.load(fd)
+    finally:
+        for fname in fnames.values():
+            if os.path.isfile(fname):
+                os.remove(fname)
+
+
 def test_Arunner_interrupt():
     r"""Start a runner then stop it with a keyboard interrupt."""
     cr = runner.get_runner([ex_yamls['hello']['python']])
@@ -122,6 +122,39 @@ def test_create_schema():
     os.remove(fname)
 
 
+def test_schema_cache():
+    r"""Test caching of compiled schemas."""
+    old_env = os.environ.get('YGG_SCHEMA_CACHE', None)
+    cache_dir = tempfile.mkdtemp()
+    os.environ['YGG_SCHEMA_CACHE'] = cache_dir
+    try:
+        assert_equal(schema.get_cache_dir(), cache_dir)
+        s0 = schema.load_schema(use_cache=False)
+        assert(not os.listdir(cache_dir))
+        s1 = schema.load_schema()
+        assert_equal(len(os.listdir(cache_dir)), 1)
+        s2 = schema.load_schema()
+        assert_equal(s1, s0)
+        assert_equal(s2, s0)
+        assert_equal(s2.schema_hash, s0.schema_hash)
+        assert_equal(s2.get_checked_schema(), s0.schema)
+        assert_equal(s2.get_checked_schema(full=True), s0.full_schema)
+        assert_equal(schema.load_cache('invalid', 'invalid'), None)
+        schema.clear_cache()
+        assert(not os.listdir(cache_dir))
+        os.environ['YGG_SCHEMA_CACHE'] = 'False'
+        assert_equal(schema.get_cache_dir(), None)
+        assert_equal(schema.get_cache_file('schema', 'key'), None)
+        schema.save_cache('schema', 'key', s0)
+        schema.clear_cache()
+    finally:
+        if old_env is None:
+            del os.environ['YGG_SCHEMA_CACHE']
+        else:  # pragma: debug
+            os.environ['YGG_SCHEMA_CACHE'] = old_env
+        os.rmdir(cache_dir)
+
+
 def test_cdriver2filetype_error():
     r"""Test errors in cdriver2filetype."""
     assert_raises(ValueError, schema.cdriver2filetype, 'invalid')
@@ -3,7 +3,8 @@ import sys
 import copy
 import unittest
 from yggdrasil import tools, timing, platform
-from yggdrasil.tests import YggTestClass, assert_raises, long_running
+from yggdrasil.tests import (
+    YggTestClass, assert_raises, assert_equal, long_running)
 
 
 _test_size = 1
@@ -50,6 +51,34 @@ def test_platform_error():
     assert_raises(RuntimeError, x.can_run, raise_error=True)
 
 
+def test_microbenchmarks():
+    r"""Test in-process microbenchmarks and comparison to a baseline."""
+    assert_raises(ValueError, timing.micro_message, 'invalid', 1)
+    fname = 'test_microbench123.json'
+    if os.path.isfile(fname):  # pragma: debug
+        os.remove(fname)
+    try:
+        x = timing.run_microbenchmarks(filename=fname, datatypes=['bytes'],
+                                       sizes=[1], nrep=1, loops=1)
+        assert(os.path.isfile(fname))
+        assert_raises(RuntimeError, timing.run_microbenchmarks,
+                      filename=fname, targets=['serialize'],
+                      datatypes=['bytes'], sizes=[1], nrep=1, loops=1)
+        names = x.get_benchmark_names()
+        assert(timing.micro_entry_name('serialize', 'bytes', 1) in names)
+        assert(timing.micro_entry_name('encode', 'bytes', 1) in names)
+        assert(timing.micro_entry_name('comm', 'bytes', 1,
+                                       comm=tools.get_default_comm())
+               in names)
+        assert(not timing.compare_microbenchmarks(fname, baseline=x))
+        assert_equal(sorted(timing.compare_microbenchmarks(
+            x, baseline=fname, threshold=-1.0).keys()), sorted(names))
+        timing.compare_microbenchmarks(x)
+    finally:
+        if os.path.isfile(fname):
+            os.remove(fname)
+
+
 class TimedRunTestBase(YggTestClass):
     r"""Base test class for the TimedRun class."""
 
@@ -0,0 +1,45 @@
+import os
+import tempfile
+from yggdrasil import tracing
+from yggdrasil.config import temp_config
+from yggdrasil.tests import assert_equal
+
+
+def test_get_trace_file():
+    r"""Test getting the trace file from the config."""
+    with temp_config(trace_file='False'):
+        assert(tracing.get_trace_file() is None)
+    with temp_config(trace_file='test_trace.json'):
+        assert_equal(tracing.get_trace_file(),
+                     os.path.abspath('test_trace.json'))
+
+
+def test_stamp():
+    r"""Test recording hops in a trace."""
+    fname = os.path.join(tempfile.gettempdir(), 'test_stamp_trace.json')
+    try:
+        tracing.start(fname)
+        header = tracing.stamp({}, 'model_send', filename=fname)
+        assert_equal(header['trace_hop'], 'model_send')
+        trace_id = header['trace_id']
+        header = dict(header, id='abc')
+        tracing.stamp(header, 'connection_recv', comm='a', filename=fname)
+        kws = tracing.get_header_kwargs(header)
+        assert_equal(sorted(kws.keys()),
+                     ['trace_hop', 'trace_id', 'trace_t'])
+        assert_equal(tracing.get_header_kwargs(None), {})
+        tracing.stamp(kws, 'transform', filename=fname)
+        events = tracing.load(fname)
+        assert_equal(events[0]['ph'], 'M')
+        assert_equal([x['name'] for x in events[1:]],
+                     ['connection_recv', 'transform'])
+        for x in events[1:]:
+            assert_equal(x['args']['trace_id'], trace_id)
+            assert(x['dur'] >= 0)
+        assert_equal(events[1]['cat'], 'model_send')
+        assert_equal(events[1]['args']['comm'], 'a')
+        tracing.finalize(fname)
+        assert_equal(tracing.load(fname), events)
+    finally:
+        if os.path.isfile(fname):
+            os.remove(fname)
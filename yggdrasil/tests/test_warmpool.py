@@ -0,0 +1,88 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from yggdrasil import warmpool
+from yggdrasil.config import temp_config
+from yggdrasil.tests import assert_equal
+
+
+_script = '\n'.join([
+    'import os',
+    'import sys',
+    'print(sys.argv[1:], os.environ.get("YGG_WARMPOOL_TEST", None))',
+    'sys.stderr.write("error\\n")',
+    'sys.exit(int(sys.argv[1]))'])
+
+
+@unittest.skipIf(not warmpool.is_supported(),
+                 "Warm interpreter pools not supported on this platform.")
+def test_InterpreterPool():
+    r"""Test running scripts in a warm interpreter pool."""
+    tmpdir = tempfile.mkdtemp()
+    fname = os.path.join(tmpdir, 'script.py')
+    with open(fname, 'w') as fd:
+        fd.write(_script)
+    pool = warmpool.get_interpreter_pool(sys.executable, ['json'])
+    try:
+        assert(pool is warmpool.get_interpreter_pool(sys.executable, ['json']))
+        env = dict(os.environ, YGG_WARMPOOL_TEST='test')
+        for code in [0, 3]:
+            proc = pool.run([fname, str(code)], env=env, working_dir=tmpdir)
+            out = proc.stdout.read()
+            proc.stdout.close()
+            assert_equal(proc.wait(10), code)
+            assert_equal(proc.poll(), code)
+            assert_equal(out.decode('utf-8').splitlines(),
+                         ["['%d'] test" % code, 'error'])
+        # Killed processes report the signal
+        with open(fname, 'w') as fd:
+            fd.write('import time\ntime.sleep(60)\n')
+        proc = pool.run([fname], env=env, working_dir=tmpdir)
+        assert(proc.poll() is None)
+        proc.kill()
+        assert(proc.wait(10) < 0)
+        proc.stdout.close()
+    finally:
+        warmpool.shutdown_pools()
+        shutil.rmtree(tmpdir)
+    assert(not pool.is_alive())
+
+
+@unittest.skipIf(not warmpool.is_supported(),
+                 "Warm interpreter pools not supported on this platform.")
+def test_PythonModelDriver_warm_pool():
+    r"""Test running a Python model in a warm interpreter pool."""
+    from yggdrasil.drivers.PythonModelDriver import PythonModelDriver
+    tmpdir = tempfile.mkdtemp()
+    fname = os.path.join(tmpdir, 'model.py')
+    fname_out = os.path.join(tmpdir, 'output.txt')
+    with open(fname, 'w') as fd:
+        fd.write('\n'.join([
+            'import os',
+            'import sys',
+            'with open("output.txt", "w") as fd:',
+            '    fd.write("%s %s" % (sys.argv[1],',
+            '                        os.environ["YGG_WARMPOOL_TEST"]))',
+            'sys.exit(int(sys.argv[1]))']))
+    try:
+        with temp_config(python_warm_pool=True):
+            for code in [0, 3]:
+                drv = PythonModelDriver(
+                    'warm_model', args=[fname, str(code)],
+                    working_dir=tmpdir, env={'YGG_WARMPOOL_TEST': 'test'})
+                try:
+                    drv.start()
+                    drv.wait(10)
+                    assert(isinstance(drv.model_process,
+                                      warmpool.PooledProcess))
+                    assert_equal(drv.model_process.returncode, code)
+                    assert_equal(bool(drv.errors), bool(code))
+                finally:
+                    drv.cleanup()
+                with open(fname_out, 'r') as fd:
+                    assert_equal(fd.read(), '%d test' % code)
+    finally:
+        warmpool.shutdown_pools()
+        shutil.rmtree(tmpdir)
@@ -58,6 +58,35 @@ def test_parse_component_error():
                   {}, 'invalid', 'invalid')
 
 
+def test_parse_yaml_cache():
+    r"""Test parsing yaml with cached normalization."""
+    from yggdrasil import schema
+    from yggdrasil.examples import yamls as ex_yamls
+    fname = ex_yamls['hello']['python']
+    old_env = os.environ.get('YGG_SCHEMA_CACHE', None)
+    cache_dir = tempfile.mkdtemp()
+    os.environ['YGG_SCHEMA_CACHE'] = cache_dir
+
+    def count_entries():
+        return len([x for x in os.listdir(cache_dir)
+                    if x.startswith('yaml_')])
+
+    try:
+        x = yamlfile.parse_yaml(fname, use_cache=False)
+        assert_equal(count_entries(), 0)
+        assert_equal(yamlfile.parse_yaml(fname), x)
+        assert_equal(count_entries(), 1)
+        assert_equal(yamlfile.parse_yaml(fname), x)
+        assert_equal(count_entries(), 1)
+    finally:
+        schema.clear_cache()
+        if old_env is None:
+            del os.environ['YGG_SCHEMA_CACHE']
+        else:  # pragma: debug
+            os.environ['YGG_SCHEMA_CACHE'] = old_env
+        os.rmdir(cache_dir)
+
+
 @flaky.flaky(max_runs=3)
 def test_load_yaml_git():
     r"""Test loading a yaml from a remote git repository."""
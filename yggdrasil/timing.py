@@ -9,6 +9,7 @@ import pyperf
 import subprocess
 import warnings
 import tempfile
+import threading
 import itertools
 import numpy as np
 import pandas as pd
@@ -1357,3 +1358,257 @@ def pyperfjson_to_pandas(json_file):
                     data[mk].append(mv)
     x_pd = pd.DataFrame(data)
     return x_pd
+
+
+_micro_sizes = [1, 1000, 100000]
+_micro_datatypes = ['bytes', '1darray', 'object']
+_micro_targets = ['serialize', 'encode', 'comm']
+_micro_baseline = os.path.join(os.path.dirname(__file__), 'tests', 'data',
+                               'microbench_baseline.json')
+
+
+def micro_message(datatype, size):
+    r"""Create a message for in-process microbenchmarks.
+
+    Args:
+        datatype (str): Type of message to create. One of 'bytes',
+            '1darray' (float64 array), or 'object' (dictionary).
+        size (int): Approximate size of the message in bytes.
+
+    Returns:
+        object: Message of the requested type and size.
+
+    Raises:
+        ValueError: If datatype is not supported.
+
+    """
+    size = int(size)
+    if datatype == 'bytes':
+        return size * b'x'
+    elif datatype == '1darray':
+        return np.ones(max(size // 8, 1), 'float64')
+    elif datatype == 'object':
+        return {'data': size * 'x', 'count': size,
+                'values': [1.0, 2.0, 3.0]}
+    raise ValueError("Unsupported microbenchmark datatype '%s'" % datatype)
+
+
+def micro_entry_name(target, datatype, size, comm=None):
+    r"""Get the name of a microbenchmark entry.
+
+    Args:
+        target (str): Operation being timed ('serialize', 'encode', or
+            'comm').
+        datatype (str): Message datatype.
+        size (int): Message size in bytes.
+        comm (str, optional): Communication type for 'comm' entries.
+            Defaults to None.
+
+    Returns:
+        str: Unique name for the benchmark.
+
+    """
+    if target == 'comm':
+        return 'comm_send_recv(%s,%s,%d)' % (comm, datatype, int(size))
+    elif target == 'encode':
+        return 'type_encode_decode(%s,%d)' % (datatype, int(size))
+    return 'serialize_deserialize(%s,%d)' % (datatype, int(size))
+
+
+def micro_serialize(msg, loops, timer=time.perf_counter):
+    r"""Time serialization round trips with the default serializer.
+
+    Args:
+        msg (object): Message to serialize.
+        loops (int): Number of round trips.
+        timer (callable, optional): Timer. Defaults to time.perf_counter.
+
+    Returns:
+        float: Time taken for all of the round trips.
+
+    """
+    serializer = import_component('serializer')()
+    serializer.deserialize(serializer.serialize(msg))
+    t0 = timer()
+    for _ in range(loops):
+        serializer.deserialize(serializer.serialize(msg))
+    return timer() - t0
+
+
+def micro_encode(msg, loops, timer=time.perf_counter):
+    r"""Time MetaschemaType encode/decode round trips.
+
+    Args:
+        msg (object): Message to encode.
+        loops (int): Number of round trips.
+        timer (callable, optional): Timer. Defaults to time.perf_counter.
+
+    Returns:
+        float: Time taken for all of the round trips.
+
+    """
+    from yggdrasil.metaschema.datatypes import get_type_from_def, encode_type
+    datatype = get_type_from_def(encode_type(msg))
+    t0 = timer()
+    for _ in range(loops):
+        datatype.decode(*datatype.encode(msg))
+    return timer() - t0
+
+
+def micro_comm(msg, loops, comm=None, timer=time.perf_counter):
+    r"""Time send/recv through a pair of comms in the same process. Messages
+    are sent from a thread so that messages large enough to require work
+    comms can be received concurrently.
+
+    Args:
+        msg (object): Message to send.
+        loops (int): Number of messages to send.
+        comm (str, optional): Communication type. Defaults to the default
+            comm.
+        timer (callable, optional): Timer. Defaults to time.perf_counter.
+
+    Returns:
+        float: Time taken to send and receive all of the messages.
+
+    Raises:
+        RuntimeError: If a message cannot be sent or received.
+
+    """
+    from yggdrasil.communication import new_comm, get_comm
+    name = 'microbench_%s' % str(uuid.uuid4())[:13]
+    send = new_comm(name, comm=comm, direction='send', reverse_names=True)
+    recv = get_comm(name, **send.opp_comm_kwargs())
+    errors = []
+
+    def do_send(n):
+        for _ in range(n):
+            if not send.send(msg):  # pragma: debug
+                errors.append('send')
+                break
+
+    def do_loop(n):
+        thread = threading.Thread(target=do_send, args=(n, ))
+        thread.start()
+        for _ in range(n):
+            flag, _msg = recv.recv(timeout=60)
+            if not flag:  # pragma: debug
+                errors.append('recv')
+                break
+        thread.join()
+        if errors:  # pragma: debug
+            raise RuntimeError("Error during %s microbenchmark"
+                               % ', '.join(errors))
+
+    try:
+        do_loop(1)  # Establish connection and datatype
+        t0 = timer()
+        do_loop(loops)
+        out = timer() - t0
+    finally:
+        send.close()
+        recv.close()
+    return out
+
+
+def run_microbenchmarks(filename=None, targets=None, datatypes=None,
+                        sizes=None, comms=None, nrep=5, loops=10,
+                        overwrite=False):
+    r"""Time comm send/recv, serialization, and datatype encoding in-process
+    across a grid of message datatypes and sizes without starting models.
+
+    Args:
+        filename (str, optional): pyperf JSON file that results should be
+            saved to. Defaults to None and results are not saved.
+        targets (list, optional): Operations that should be timed. Defaults
+            to _micro_targets.
+        datatypes (list, optional): Message datatypes. Defaults to
+            _micro_datatypes.
+        sizes (list, optional): Message sizes in bytes. Defaults to
+            _micro_sizes.
+        comms (list, optional): Communication types for 'comm' benchmarks.
+            Defaults to the default comm.
+        nrep (int, optional): Number of values recorded for each benchmark.
+            Defaults to 5.
+        loops (int, optional): Number of operations per value. Defaults to
+            10.
+        overwrite (bool, optional): If True, an existing file will be
+            overwritten. Defaults to False.
+
+    Returns:
+        pyperf.BenchmarkSuite: Benchmark results with values in seconds per
+            operation.
+
+    """
+    if targets is None:
+        targets = _micro_targets
+    if datatypes is None:
+        datatypes = _micro_datatypes
+    if sizes is None:
+        sizes = _micro_sizes
+    if comms is None:
+        comms = [tools.get_default_comm()]
+    funcs = {'serialize': micro_serialize, 'encode': micro_encode,
+             'comm': micro_comm}
+    benchmarks = []
+    for target in targets:
+        for datatype in datatypes:
+            for size in sizes:
+                msg = micro_message(datatype, size)
+                for comm in (comms if target == 'comm' else [None]):
+                    kws = {}
+                    if comm is not None:
+                        kws['comm'] = comm
+                    name = micro_entry_name(target, datatype, size, comm=comm)
+                    logger.info('Running %s', name)
+                    values = [funcs[target](msg, loops, **kws) / loops
+                              for _ in range(nrep)]
+                    metadata = {'name': name, 'loops': loops,
+                                'unit': 'second'}
+                    benchmarks.append(pyperf.Benchmark(
+                        [pyperf.Run(values, metadata=metadata,
+                                    collect_metadata=False)]))
+    out = pyperf.BenchmarkSuite(benchmarks)
+    if filename is not None:
+        if os.path.isfile(filename) and (not overwrite):
+            raise RuntimeError("'%s' exists" % filename)
+        out.dump(filename, replace=overwrite)
+    return out
+
+
+def compare_microbenchmarks(results, baseline=None, threshold=0.5):
+    r"""Compare microbenchmark results against a baseline. Benchmarks that
+    are not present in both suites are ignored.
+
+    Args:
+        results (pyperf.BenchmarkSuite, str): Benchmark results or the
+            pyperf JSON file containing them.
+        baseline (pyperf.BenchmarkSuite, str, optional): Baseline results or
+            the pyperf JSON file containing them. Defaults to the baseline
+            checked in with yggdrasil.
+        threshold (float, optional): Fractional slowdown of the mean
+            relative to the baseline above which a benchmark is considered
+            a regression. Defaults to 0.5.
+
+    Returns:
+        dict: Mapping from the names of regressed benchmarks to the ratio of
+            the new mean to the baseline mean.
+
+    """
+    if baseline is None:
+        baseline = _micro_baseline
+    if isinstance(results, str):
+        results = pyperf.BenchmarkSuite.load(results)
+    if isinstance(baseline, str):
+        baseline = pyperf.BenchmarkSuite.load(baseline)
+    base_names = baseline.get_benchmark_names()
+    out = {}
+    for name in results.get_benchmark_names():
+        if name not in base_names:
+            continue
+        ratio = (results.get_benchmark(name).mean()
+                 / baseline.get_benchmark(name).mean())
+        if ratio > (1.0 + threshold):
+            logger.warning('Regression in %s: %.2fx slower than baseline',
+                           name, ratio)
+            out[name] = ratio
+    return out
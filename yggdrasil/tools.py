@@ -624,9 +624,8 @@ def get_supported_lang():
         list: The names of programming languages supported by yggdrasil.
     
     """
-    from yggdrasil import schema
-    s = schema.get_schema()
-    out = s['model'].subtypes
+    from yggdrasil.components import get_component_subtypes
+    out = get_component_subtypes('model')
     if 'c++' in out:
         out[out.index('c++')] = 'cpp'
     # if 'R' in out:
@@ -654,9 +653,8 @@ def get_supported_comm():
         list: The names of communication mechanisms supported by yggdrasil.
 
     """
-    from yggdrasil import schema
-    s = schema.get_schema()
-    out = s['comm'].subtypes
+    from yggdrasil.components import get_component_subtypes
+    out = get_component_subtypes('comm')
     for k in ['CommBase', 'DefaultComm', 'default']:
         if k in out:
             out.remove(k)
@@ -0,0 +1,167 @@
+r"""Opt-in end-to-end tracing of messages using timestamps stored in the
+message headers.
+
+When a trace file is configured (the 'trace_file' option in the 'general'
+section of the config file or the YGG_TRACE_FILE environment variable),
+comms add the following fields to the header of each message they send:
+
+* trace_id (str): ID of the message when it was first sent by a model. This
+  ID is carried along by connections that forward the message.
+* trace_t (float): Time (in seconds since the epoch) of the last hop.
+* trace_hop (str): Name of the last hop.
+
+Each subsequent hop (connection receive, transform, forward, and model
+receive) appends a Chrome trace event spanning the time since the previous
+hop to the trace file. Events from all processes are appended to the same
+file, which can be loaded in chrome://tracing or Perfetto once finalized
+(see finalize).
+"""
+import os
+import json
+import time
+import uuid
+import threading
+from yggdrasil.config import ygg_cfg
+
+
+_header_keys = ['trace_id', 'trace_t', 'trace_hop']
+_lock = threading.Lock()
+_named_processes = set()
+
+
+def get_trace_file():
+    r"""Get the file that trace events should be written to.
+
+    Returns:
+        str: Full path to the trace file or None if tracing is disabled.
+
+    """
+    out = ygg_cfg.get('general', 'trace_file', None)
+    if (not out) or (str(out).lower() == 'false'):
+        return None
+    return os.path.abspath(out)
+
+
+def start(filename):
+    r"""Create a new trace file, overwriting any existing file.
+
+    Args:
+        filename (str): Full path to the trace file.
+
+    """
+    with _lock:
+        with open(filename, 'w') as fd:
+            fd.write('[\n')
+        _named_processes.discard((os.getpid(), filename))
+
+
+def write_events(filename, events):
+    r"""Append events to a trace file. Events are written as lines in a
+    JSON array that is not terminated so that multiple processes can append
+    to the same file.
+
+    Args:
+        filename (str): Full path to the trace file.
+        events (list): Chrome trace events.
+
+    """
+    pid = os.getpid()
+    with _lock:
+        if (pid, filename) not in _named_processes:
+            _named_processes.add((pid, filename))
+            events = [{'name': 'process_name', 'ph': 'M', 'pid': pid,
+                       'args': {'name': (os.environ.get('YGG_MODEL_NAME', '')
+                                         or 'yggdrasil')}}] + events
+        lines = ''.join(json.dumps(x) + ',\n' for x in events)
+        # Writes in append mode are atomic enough that lines written by
+        # different processes are not interleaved.
+        with open(filename, 'a') as fd:
+            fd.write(lines)
+
+
+def stamp(header, hop, comm=None, filename=None):
+    r"""Record a hop for a message. If the header does not contain a trace,
+    a new one is started. Otherwise, an event spanning the time since the
+    last hop is written to the trace file.
+
+    Args:
+        header (dict): Message header (or keyword arguments that will be
+            added to the header). The trace fields are updated in place.
+        hop (str): Name of the hop.
+        comm (str, optional): Name of the comm or connection where the
+            hop occurred. Defaults to None.
+        filename (str, optional): Trace file. Defaults to get_trace_file().
+
+    Returns:
+        dict: Updated header.
+
+    """
+    now = time.time()
+    if 'trace_id' in header:
+        if filename is None:
+            filename = get_trace_file()
+        prev = header.get('trace_hop', '')
+        t0 = float(header.get('trace_t', now))
+        args = {'trace_id': header['trace_id'], 'from': prev,
+                'latency': now - t0}
+        if comm:
+            args['comm'] = comm
+        if filename:
+            write_events(filename, [
+                {'name': hop, 'cat': prev, 'ph': 'X',
+                 'ts': t0 * 1.0e6, 'dur': (now - t0) * 1.0e6,
+                 'pid': os.getpid(), 'tid': threading.get_ident(),
+                 'args': args}])
+    else:
+        header['trace_id'] = str(uuid.uuid4())
+    header['trace_t'] = now
+    header['trace_hop'] = hop
+    return header
+
+
+def get_header_kwargs(header):
+    r"""Get the trace fields from a header so that they can be passed to
+    a comm that forwards the message.
+
+    Args:
+        header (dict): Message header.
+
+    Returns:
+        dict: Trace fields in the header.
+
+    """
+    if not header:
+        return {}
+    return {k: header[k] for k in _header_keys if k in header}
+
+
+def load(filename):
+    r"""Load events from a trace file that may not have been finalized.
+
+    Args:
+        filename (str): Full path to the trace file.
+
+    Returns:
+        list: Chrome trace events.
+
+    """
+    with open(filename, 'r') as fd:
+        contents = fd.read().strip()
+    if not contents.endswith(']'):
+        contents = contents.rstrip(',') + ']'
+    return json.loads(contents)
+
+
+def finalize(filename):
+    r"""Rewrite a trace file as a complete JSON array so that it can be
+    parsed by tools other than the Chrome trace viewer.
+
+    Args:
+        filename (str): Full path to the trace file.
+
+    """
+    with _lock:
+        events = load(filename)
+        with open(filename, 'w') as fd:
+            json.dump(events, fd)
+            fd.write('\n')
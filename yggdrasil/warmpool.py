@@ -0,0 +1,617 @@
+r"""Pool of warm Python interpreters that can be used to run Python models
+without paying the cost of interpreter startup and imports on every run.
+
+Each pool owns a single long-lived 'zygote' interpreter that imports a set
+of modules once (e.g. the yggdrasil interface and numpy) and then forks a
+fresh child for every model run. Children inherit the already imported
+modules, but run in their own process with their own environment, working
+directory, and output stream so that runs remain isolated from each other.
+Communication with the zygote uses JSON messages, one per line, over the
+zygote's stdin/stdout and model output is forwarded through a named pipe.
+
+This is only supported on POSIX systems that provide fork and mkfifo.
+
+"""
+import os
+import sys
+import json
+import errno
+import signal
+import atexit
+import select
+import shutil
+import logging
+import tempfile
+import threading
+import subprocess
+from yggdrasil import tools
+
+
+logger = logging.getLogger(__name__)
+_pools = {}
+_pools_lock = threading.Lock()
+_default_preload = ['yggdrasil.interface.YggInterface', 'numpy']
+
+
+def is_supported():
+    r"""Determine if warm interpreter pools are supported on the current
+    platform.
+
+    Returns:
+        bool: True if pools are supported, False otherwise.
+
+    """
+    return (hasattr(os, 'fork') and hasattr(os, 'mkfifo')
+            and (not sys.platform.startswith('win')))
+
+
+def is_enabled():
+    r"""Determine if Python models should be run using a warm interpreter
+    pool based on the 'warm_pool' option in the 'python' section of the
+    config file (or the YGG_PYTHON_WARM_POOL environment variable).
+
+    Returns:
+        bool: True if pools are enabled and supported, False otherwise.
+
+    """
+    from yggdrasil.config import ygg_cfg
+    enabled = str(ygg_cfg.get('python', 'warm_pool', 'False')).lower()
+    return (is_supported() and (enabled in ['true', '1']))
+
+
+def get_preload():
+    r"""Get the list of modules that should be imported by warm interpreters
+    before any model is run based on the 'warm_pool_preload' option in the
+    'python' section of the config file (or the YGG_PYTHON_WARM_POOL_PRELOAD
+    environment variable).
+
+    Returns:
+        list: Names of modules that should be preloaded.
+
+    """
+    from yggdrasil.config import ygg_cfg
+    out = ygg_cfg.get('python', 'warm_pool_preload', None)
+    if not out:
+        return list(_default_preload)
+    return [x.strip() for x in out.split(',') if x.strip()]
+
+
+def get_interpreter_pool(executable=None, preload=None):
+    r"""Get the interpreter pool for an executable and set of preloaded
+    modules, starting a new one if one does not already exist.
+
+    Args:
+        executable (str, optional): Python executable that should be used.
+            Defaults to sys.executable.
+        preload (list, optional): Modules that should be imported by the
+            interpreter before forking. Defaults to :func:`get_preload`.
+
+    Returns:
+        InterpreterPool: Running interpreter pool.
+
+    """
+    if executable is None:
+        executable = sys.executable
+    if preload is None:
+        preload = get_preload()
+    key = (executable, tuple(preload))
+    with _pools_lock:
+        pool = _pools.get(key, None)
+        if (pool is None) or (not pool.is_alive()):
+            pool = InterpreterPool(executable, preload)
+            _pools[key] = pool
+    return pool
+
+
+def shutdown_pools():
+    r"""Shutdown all running interpreter pools."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for x in pools:
+        x.shutdown()
+
+
+atexit.register(shutdown_pools)
+
+
+class PooledProcess(object):
+    r"""Process started by an interpreter pool. The interface mirrors the
+    subset of subprocess.Popen used by model drivers.
+
+    Args:
+        pool (InterpreterPool): Pool that started the process.
+        job_id (int): ID of the job within the pool.
+
+    Attributes:
+        pool (InterpreterPool): Pool that started the process.
+        job_id (int): ID of the job within the pool.
+        pid (int): Process ID of the model process.
+        stdout (file): Binary stream containing the model's stdout and
+            stderr.
+        error (str): Error message reported by the pool when the process
+            could not be started.
+
+    """
+
+    def __init__(self, pool, job_id):
+        self.pool = pool
+        self.job_id = job_id
+        self.pid = None
+        self.stdout = None
+        self.error = None
+        self._returncode = None
+        self._started = False
+
+    @property
+    def returncode(self):
+        r"""int: Exit code of the process (negative if the process was
+        terminated by a signal) or None if it is still running."""
+        return self._returncode
+
+    def _set_started(self, pid=None, error=None):
+        self.pid = pid
+        self.error = error
+        self._started = True
+
+    def _set_returncode(self, returncode):
+        self._returncode = returncode
+        self._started = True
+
+    def poll(self):
+        r"""Check if the process has finished.
+
+        Returns:
+            int: Exit code if the process has finished, None otherwise.
+
+        """
+        if self._returncode is None:
+            self.pool.dispatch()
+        return self._returncode
+
+    def wait(self, timeout=None):
+        r"""Wait for the process to finish.
+
+        Args:
+            timeout (float, optional): Maximum time to wait (in seconds).
+                Defaults to None and the wait is indefinite.
+
+        Returns:
+            int: Exit code of the process.
+
+        Raises:
+            subprocess.TimeoutExpired: If the process does not finish before
+                the timeout.
+
+        """
+        if not self.pool.wait_for(lambda: self._returncode is not None,
+                                  timeout=timeout):
+            raise subprocess.TimeoutExpired(str(self.pid), timeout)
+        return self._returncode
+
+    def send_signal(self, sig):
+        r"""Send a signal to the process.
+
+        Args:
+            sig (int): Signal to send.
+
+        """
+        if (self.pid is None) or (self._returncode is not None):
+            return
+        try:
+            os.kill(self.pid, sig)
+        except OSError as e:  # pragma: debug
+            if e.errno != errno.ESRCH:
+                raise
+
+    def terminate(self):
+        r"""Terminate the process."""
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        r"""Kill the process."""
+        self.send_signal(signal.SIGKILL)
+
+
+class InterpreterPool(object):
+    r"""Pool of warm interpreters that runs Python scripts by forking a
+    preloaded zygote interpreter.
+
+    Args:
+        executable (str): Python executable used to run the zygote.
+        preload (list): Modules the zygote should import before forking.
+        timeout (float, optional): Time (in seconds) that should be waited
+            for the zygote to start or for a job to be started. Defaults
+            to 60.
+
+    Attributes:
+        executable (str): Python executable used to run the zygote.
+        preload (list): Modules the zygote imports before forking.
+        timeout (float): Time (in seconds) waited for the zygote to start or
+            for a job to be started.
+        process (subprocess.Popen): Zygote process.
+        jobs (dict): Processes started by the pool that have not finished.
+
+    """
+
+    def __init__(self, executable, preload, timeout=60.0):
+        self.executable = executable
+        self.preload = list(preload)
+        self.timeout = timeout
+        self.jobs = {}
+        self._job_count = 0
+        self._lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._buffer = b''
+        self._ready = False
+        self._closed = False
+        env = dict(os.environ)
+        env['YGG_SUBPROCESS'] = 'True'
+        ygg_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env['PYTHONPATH'] = os.pathsep.join(
+            [ygg_path] + [x for x in env.get('PYTHONPATH', '').split(os.pathsep)
+                          if x])
+        self.process = subprocess.Popen(
+            [executable, '-m', 'yggdrasil.warmpool', ','.join(self.preload)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env,
+            close_fds=True)
+        if not self.wait_for(lambda: self._ready or self._closed,
+                             timeout=self.timeout):  # pragma: debug
+            self.shutdown()
+            raise RuntimeError("Warm interpreter pool did not start within "
+                               "%s s." % self.timeout)
+        if self._closed:  # pragma: debug
+            raise RuntimeError("Warm interpreter pool exited during startup.")
+
+    def is_alive(self):
+        r"""Determine if the zygote process is still running.
+
+        Returns:
+            bool: True if the zygote is running, False otherwise.
+
+        """
+        return (not self._closed) and (self.process.poll() is None)
+
+    def dispatch(self, timeout=0):
+        r"""Read messages from the zygote and pass them to the jobs they
+        concern. Messages are read by whichever thread is waiting on the
+        pool so that no thread needs to be dedicated to the pool.
+
+        Args:
+            timeout (float, optional): Time (in seconds) that should be
+                waited for a message. Defaults to 0.
+
+        """
+        if not self._read_lock.acquire(timeout=max(timeout, 0.001)):
+            return
+        try:
+            if self._closed:
+                return
+            fd = self.process.stdout.fileno()
+            if not select.select([fd], [], [], timeout)[0]:
+                return
+            data = os.read(fd, 65536)
+            if not data:
+                self._close_jobs()
+                return
+            self._buffer += data
+            while b'\n' in self._buffer:
+                line, self._buffer = self._buffer.split(b'\n', 1)
+                self._handle_message(line)
+        finally:
+            self._read_lock.release()
+
+    def wait_for(self, condition, timeout=None):
+        r"""Dispatch messages from the zygote until a condition is met.
+
+        Args:
+            condition (callable): Function returning True when the condition
+                is met.
+            timeout (float, optional): Maximum time (in seconds) that should
+                be waited. Defaults to None and the wait is indefinite.
+
+        Returns:
+            bool: True if the condition was met, False otherwise.
+
+        """
+        Tout = tools.TimeOut(timeout if timeout is not None else False)
+        while not condition():
+            if Tout.is_out or self._closed:
+                return condition()
+            self.dispatch(0.05)
+        return True
+
+    def _handle_message(self, line):
+        r"""Handle a single message from the zygote."""
+        try:
+            msg = json.loads(line.decode('utf-8'))
+        except ValueError:  # pragma: debug
+            logger.debug("Unexpected output from warm pool: %s", line)
+            return
+        if msg.get('ready', False):
+            self._ready = True
+            return
+        with self._lock:
+            job = self.jobs.get(msg.get('id', None), None)
+            if (job is not None) and ('returncode' in msg):
+                self.jobs.pop(job.job_id)
+        if job is None:  # pragma: debug
+            return
+        if 'returncode' in msg:
+            job._set_returncode(msg['returncode'])
+        else:
+            job._set_started(pid=msg.get('pid', None),
+                             error=msg.get('error', None))
+
+    def _close_jobs(self):
+        r"""Mark unfinished jobs as failed after the zygote exits, as their
+        exit codes can no longer be reported."""
+        self._closed = True
+        with self._lock:
+            jobs = list(self.jobs.values())
+            self.jobs.clear()
+        for job in jobs:  # pragma: debug
+            job._set_returncode(-1)
+
+    def run(self, args, env=None, working_dir=None):
+        r"""Run a Python script in a process forked from the zygote.
+
+        Args:
+            args (list): Path to the script followed by any arguments that
+                should be passed to it.
+            env (dict, optional): Environment variables for the process.
+                Defaults to a copy of os.environ.
+            working_dir (str, optional): Working directory for the process.
+                Defaults to the current working directory.
+
+        Returns:
+            PooledProcess: Process running the script.
+
+        Raises:
+            RuntimeError: If the process could not be started.
+
+        """
+        if env is None:
+            env = dict(os.environ)
+        if working_dir is None:
+            working_dir = os.getcwd()
+        tmpdir = tempfile.mkdtemp(prefix='ygg_warmpool_')
+        fifo = os.path.join(tmpdir, 'output')
+        rfd = None
+        try:
+            os.mkfifo(fifo)
+            # Opening the read end first ensures that the zygote does not
+            # block opening the write end
+            rfd = os.open(fifo, os.O_RDONLY | os.O_NONBLOCK)
+            with self._lock:
+                self._job_count += 1
+                job = PooledProcess(self, self._job_count)
+                self.jobs[job.job_id] = job
+            msg = {'id': job.job_id, 'args': [str(x) for x in args],
+                   'env': {k: str(v) for k, v in env.items()},
+                   'cwd': working_dir, 'output': fifo}
+            try:
+                with self._write_lock:
+                    self.process.stdin.write(
+                        (json.dumps(msg) + '\n').encode('utf-8'))
+                    self.process.stdin.flush()
+            except (OSError, ValueError) as e:  # pragma: debug
+                with self._lock:
+                    self.jobs.pop(job.job_id, None)
+                raise RuntimeError("Could not send job to warm pool: %s" % e)
+            if ((not self.wait_for(lambda: job._started, timeout=self.timeout))
+                    or (job.pid is None)):
+                raise RuntimeError("Warm pool failed to start '%s': %s"
+                                   % (' '.join(args), job.error))
+            os.set_blocking(rfd, True)
+            job.stdout = os.fdopen(rfd, 'rb', 0)
+            rfd = None
+        finally:
+            if rfd is not None:
+                os.close(rfd)
+            shutil.rmtree(tmpdir, ignore_errors=True)
+        return job
+
+    def shutdown(self, timeout=5.0):
+        r"""Stop the zygote. Processes that are still running are not
+        affected.
+
+        Args:
+            timeout (float, optional): Time (in seconds) that should be waited
+                for the zygote to exit before it is killed. Defaults to 5.
+
+        """
+        try:
+            self.process.stdin.close()
+        except OSError:  # pragma: debug
+            pass
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:  # pragma: debug
+            self.process.kill()
+            self.process.wait()
+        with self._read_lock:
+            if not self._closed:
+                self._close_jobs()
+            self.process.stdout.close()
+
+
+# Zygote side
+def _preload_modules(modules):
+    r"""Import modules that should be shared by all forked processes."""
+    import importlib
+    for x in modules:
+        try:
+            importlib.import_module(x)
+        except ImportError as e:  # pragma: debug
+            logger.info("Warm pool could not preload '%s': %s", x, e)
+
+
+def _send(fd, msg):
+    r"""Send a message from the zygote to the pool."""
+    data = (json.dumps(msg) + '\n').encode('utf-8')
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def _exit_status(status):
+    r"""Convert a waitpid status into a Popen style return code."""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _serve(ctrl_in, ctrl_out):
+    r"""Fork processes for jobs sent by the pool until the pool closes the
+    control stream.
+
+    Args:
+        ctrl_in (int): File descriptor that jobs are read from.
+        ctrl_out (int): File descriptor that messages are written to.
+
+    Returns:
+        dict: Job that the current process should run if it is a forked
+            child, None if the pool was closed.
+
+    """
+    children = {}
+    buf = b''
+    closed = False
+    while not closed:
+        if select.select([ctrl_in], [], [], 0.05)[0]:
+            data = os.read(ctrl_in, 65536)
+            closed = (not data)
+            buf += data
+        while b'\n' in buf:
+            line, buf = buf.split(b'\n', 1)
+            job = json.loads(line.decode('utf-8'))
+            try:
+                wfd = os.open(job['output'], os.O_WRONLY)
+            except OSError as e:  # pragma: debug
+                _send(ctrl_out, {'id': job['id'], 'error': str(e)})
+                continue
+            pid = os.fork()
+            if pid == 0:
+                job['output_fd'] = wfd
+                return job
+            os.close(wfd)
+            children[pid] = job['id']
+            _send(ctrl_out, {'id': job['id'], 'pid': pid})
+        while children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:  # pragma: debug
+                break
+            if pid == 0:
+                break
+            if pid in children:
+                _send(ctrl_out, {'id': children.pop(pid),
+                                 'returncode': _exit_status(status)})
+    # Processes that are still running are left to finish on their own
+    # since the pool is no longer listening
+    return None
+
+
+def _run_job(job):
+    r"""Run a job in a process forked from the zygote.
+
+    Args:
+        job (dict): Job parameters.
+
+    """
+    wfd = job['output_fd']
+    os.dup2(wfd, 1)
+    os.dup2(wfd, 2)
+    os.close(wfd)
+    nullfd = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(nullfd, 0)
+    os.close(nullfd)
+    for x in [sys.stdout, sys.stderr]:
+        if hasattr(x, 'reconfigure'):
+            x.reconfigure(line_buffering=True)
+    os.environ.clear()
+    os.environ.update(job['env'])
+    os.chdir(job['cwd'])
+    script = os.path.abspath(job['args'][0])
+    sys.argv = [script] + job['args'][1:]
+    sys.path[0] = os.path.dirname(script)
+    for x in reversed(job['env'].get('PYTHONPATH', '').split(os.pathsep)):
+        if x and (x not in sys.path):
+            sys.path.insert(1, x)
+    # Forked children share the zygote's random state
+    import random
+    random.seed()
+    if 'numpy' in sys.modules:
+        sys.modules['numpy'].random.seed()
+    if 'yggdrasil.config' in sys.modules:
+        sys.modules['yggdrasil.config'].cfg_logging()
+    import runpy
+    try:
+        runpy.run_path(script, run_name='__main__')
+        code = 0
+    except SystemExit as e:
+        code = e.code
+        if code is None:
+            code = 0
+        elif not isinstance(code, int):
+            sys.stderr.write('%s\n' % code)
+            code = 1
+    except BaseException:
+        import traceback
+        traceback.print_exc()
+        code = 1
+    _exit(code)
+
+
+def _exit(code):
+    r"""Exit a forked process, skipping the teardown of the modules
+    inherited from the zygote, which is slow and unnecessary.
+
+    Args:
+        code (int): Exit code.
+
+    """
+    import atexit
+    try:
+        # Mirror the interpreter's shutdown: wait for non-daemon threads,
+        # then call exit handlers (which close comms and flush logs)
+        for t in threading.enumerate():
+            if (t is not threading.current_thread()) and (not t.daemon):
+                t.join()
+        atexit._run_exitfuncs()
+        for x in [sys.stdout, sys.stderr]:
+            x.flush()
+    finally:
+        os._exit(code)
+
+
+def main(preload):
+    r"""Run the zygote for an interpreter pool.
+
+    Args:
+        preload (list): Modules that should be imported before forking.
+
+    """
+    ctrl_in = os.dup(0)
+    ctrl_out = os.dup(1)
+    # Keep the control stream free of output from preloaded modules
+    nullfd = os.open(os.devnull, os.O_RDWR)
+    os.dup2(nullfd, 0)
+    os.dup2(nullfd, 1)
+    os.close(nullfd)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _preload_modules(preload)
+    _send(ctrl_out, {'ready': True})
+    job = _serve(ctrl_in, ctrl_out)
+    if job is None:
+        return
+    os.close(ctrl_in)
+    os.close(ctrl_out)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    _run_job(job)
+
+
+if __name__ == '__main__':
+    main([x for x in sys.argv[1].split(',') if x] if len(sys.argv) > 1
+         else [])
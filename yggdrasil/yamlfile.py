@@ -6,7 +6,8 @@ import yaml
 import json
 import git
 import io as sio
-from yggdrasil.schema import standardize, get_schema
+from yggdrasil.schema import (
+    standardize, get_schema, get_cache_key, load_cache, save_cache)
 from urllib.parse import urlparse
 from yaml.constructor import (
     ConstructorError, BaseConstructor, Constructor, SafeConstructor)
@@ -159,12 +160,17 @@ def prep_yaml(files):
     return yml_all
 
 
-def parse_yaml(files):
+def parse_yaml(files, use_cache=True):
     r"""Parse list of yaml files.
 
     Args:
         files (str, list): Either the path to a single yaml file or a list of
             yaml files.
+        use_cache (bool, optional): If True, the result of validating and
+            normalizing the YAML contents against the schema is loaded from
+            the cache if the same contents have been parsed before (by the
+            same version of yggdrasil and schema) and is added to the cache
+            otherwise. Defaults to True.
 
     Raises:
         ValueError: If the yml dictionary is missing a required keyword or has
@@ -181,7 +187,14 @@ def parse_yaml(files):
     yml_prep = prep_yaml(files)
     # print('prepped')
     # pprint.pprint(yml_prep)
-    yml_norm = s.validate(yml_prep, normalize=True)
+    yml_norm = None
+    if use_cache and s.schema_hash:
+        cache_key = get_cache_key(s.schema_hash, yml_prep)
+        yml_norm = load_cache('yaml', cache_key)
+    if yml_norm is None:
+        yml_norm = s.validate(yml_prep, normalize=True)
+        if use_cache and s.schema_hash:
+            save_cache('yaml', cache_key, yml_norm)
     # print('normalized')
     # pprint.pprint(yml_norm)
     # Determine if any of the models require synchronization
@@ -533,6 +546,11 @@ def parse_connection(yml, existing):
         xo.update(**yml_conn)
     else:
         xi.update(**yml_conn)
+        # Model outputs are combined by the output driver
+        if xo is not None:
+            for k in ['fanin', 'fanout']:
+                if k in yml_conn:
+                    xo[k] = yml_conn[k]
     yml['name'] = name
     return existing
 